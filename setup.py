@@ -5,7 +5,7 @@ setup(
     version="1.0.0",
     packages=find_packages(),
     package_data={
-        'src.ai_code_converter': ['template.j2'],
+        'src.ai_code_converter': ['template.j2', 'core/jvm/*.java', 'core/node_worker.js'],
     },
     install_requires=[
         'gradio',
@@ -1,20 +1,20 @@
 """Main application module for CodeXchange AI."""
 
+import asyncio
+import functools
 import logging
 import os
-from typing import Any, Dict, Generator, Optional, Tuple
-import re
-from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
 import time
 import threading
 import traceback
+from contextlib import aclosing, closing
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 
-from anthropic import Anthropic, AnthropicError
-import google.generativeai as genai
 import gradio as gr
 from dotenv import load_dotenv
 from jinja2 import Template
-from openai import OpenAI
 
 # Import configuration
 from src.ai_code_converter.config import (
@@ -22,39 +22,108 @@ from src.ai_code_converter.config import (
     MODELS,
     LANGUAGE_MAPPING,
     PREDEFINED_SNIPPETS,
-    SNIPPET_LANGUAGE_MAP,
-    LANGUAGE_FILE_EXTENSIONS
+    SNIPPET_LANGUAGE_MAP
 )
 from src.ai_code_converter.models.ai_streaming import AIModelStreamer
+from src.ai_code_converter.models.async_streaming import AsyncAIModelStreamer
+from src.ai_code_converter.models.single_flight import SingleFlightStreamer
+from src.ai_code_converter.models.hedging import HedgedStreamer
+from src.ai_code_converter.models.prompts import render_prompt
+from src.ai_code_converter.models.circuit_breaker import CircuitBreakerRegistry
+from src.ai_code_converter.models.rate_limiter import RateLimiterRegistry
+from src.ai_code_converter.models.retry_policy import RetryBudget, RetryPolicy
+from src.ai_code_converter.models.stream_events import (
+    FinishReason,
+    StreamAccumulator,
+    StreamError,
+    StreamEvent,
+    TextDelta,
+    Usage,
+)
+from src.ai_code_converter.models.transport import HttpTransportPool
+from src.ai_code_converter.models.cassette import Cassette, RecordingTransport, ReplayTransport
+from src.ai_code_converter.models.providers import (
+    LazyClient,
+    build_claude_client,
+    build_gemini_model,
+    build_openai_client,
+)
 from src.ai_code_converter.core.code_execution import CodeExecutor
 from src.ai_code_converter.core.language_detection import LanguageDetector
 from src.ai_code_converter.core.file_utils import FileHandler
+from src.ai_code_converter.core.conversion_cache import ConversionCache
+from src.ai_code_converter.core.canonicalizer import SourceCanonicalizer
+from src.ai_code_converter.core.code_splitter import CodeSplitter
+from src.ai_code_converter.core.fence_stripper import FenceStripper, strip_code_fences
 from src.ai_code_converter.utils.logger import setup_logger, log_execution_time
+from src.ai_code_converter.utils.update_throttle import UpdateThrottle
 from src.ai_code_converter.config import (
     CUSTOM_CSS,
-    LANGUAGE_MAPPING,
-    MODELS,
-    SUPPORTED_LANGUAGES,
-    OPENAI_MODEL,
-    CLAUDE_MODEL,
-    DEEPSEEK_MODEL,
     GEMINI_MODEL,
-    GROQ_MODEL
+    DEFAULT_TEMPERATURE,
+    MODEL_IDS,
+    CONVERSION_CACHE_ENABLED,
+    CONVERSION_CACHE_PATH,
+    CONVERSION_CACHE_MEMORY_ENTRIES,
+    CONVERSION_CACHE_MAX_ENTRIES,
+    CONVERSION_CACHE_MAX_AGE,
+    HEDGING_ENABLED,
+    HEDGE_BACKUP_MODELS,
+    HEDGE_FIRST_TOKEN_THRESHOLDS,
+    CIRCUIT_BREAKER_SETTINGS,
+    CIRCUIT_BREAKER_REROUTE,
+    PROVIDER_RATE_LIMITS,
+    RETRY_POLICY_SETTINGS,
+    RETRY_BUDGET_SETTINGS,
+    PROVIDER_BASE_URLS,
+    HTTP_POOL_SETTINGS,
+    HTTP2_ENABLED,
+    HTTP_WARMUP_ENABLED,
+    CASSETTE_MODE,
+    CASSETTE_PATH,
+    CASSETTE_REPLAY_SPEED,
+    CASSETTE_STRICT,
+    LARGE_FILE_MODE_ENABLED,
+    LARGE_FILE_SETTINGS,
+    STOP_AT_CLOSING_FENCE,
+    UI_STREAM_UPDATE_RATE
 )
 
 # Initialize logger for this module
 logger = setup_logger(__name__)
 
+
+def _ignore_progress(*args, **kwargs) -> None:
+    """Progress callback for streams whose progress is reported elsewhere."""
+
+
+@dataclass
+class ConversionOutcome:
+    """Result of a conversion, with the details the UI does not show.
+    
+    ``status`` is "converted", "cached", "invalid" (the request was
+    rejected before reaching a model) or "error"; ``output`` is the
+    converted code or, otherwise, the message shown instead.
+    """
+    output: str
+    status: str
+    model: str
+    usage: Optional[Usage] = None
+
 class CodeConverterApp:
     """Main application class for the CodeXchange AI."""
     
-    def __init__(self):
-        """Initialize the application components."""
+    def __init__(self, interface: bool = True):
+        """Initialize the application components.
+        
+        Args:
+            interface: Build the Gradio interface; batch conversions skip it
+        """
         logger.info("Initializing CodeConverterApp")
         try:
             self._setup_environment()
             self._initialize_components()
-            self.demo = self._create_gradio_interface()
+            self.demo = self._create_gradio_interface() if interface else None
             logger.info("CodeConverterApp initialized successfully")
         except Exception as e:
             logger.error("Failed to initialize CodeConverterApp", exc_info=True)
@@ -71,7 +140,7 @@ class CodeConverterApp:
         """
         logger.info(f"Loading predefined snippet: {snippet_name}")
         # Use the imported configuration from config.py
-        from src.ai_code_converter.config import PREDEFINED_SNIPPETS, SNIPPET_LANGUAGE_MAP
+        from src.ai_code_converter.config import PREDEFINED_SNIPPETS
         code = PREDEFINED_SNIPPETS.get(snippet_name, "# No snippet selected")
         language = SNIPPET_LANGUAGE_MAP.get(snippet_name, "Python")
         
@@ -86,21 +155,72 @@ class CodeConverterApp:
         os.environ['OPENAI_API_KEY'] = os.getenv('OPENAI_API_KEY', 'your-key-if-not-using-env')
         os.environ['ANTHROPIC_API_KEY'] = os.getenv('ANTHROPIC_API_KEY', 'your-key-if-not-using-env')
         
-        # Initialize AI clients
-        self.openai = OpenAI()
-        self.claude = Anthropic()
-        self.deepseek = OpenAI(
-            base_url="https://api.deepseek.com/v1",
-            api_key=os.getenv('DEEPSEEK_API_KEY', 'your-key-if-not-using-env')
-        )
-        self.groq = OpenAI(
-            base_url="https://api.groq.com/openai/v1",
-            api_key=os.getenv('GROQ_API_KEY', 'your-key-if-not-using-env')
+        # All clients of a provider share one keep-alive connection pool per host
+        self.transport = HttpTransportPool(
+            http2=HTTP2_ENABLED, wrap_transport=self._setup_cassette(), **HTTP_POOL_SETTINGS
         )
-        
-        # Initialize Gemini
-        genai.configure(api_key=os.getenv('GOOGLE_API_KEY', 'your-key-if-not-using-env'))
-        self.gemini = genai.GenerativeModel('gemini-1.5-flash')
+        urls = PROVIDER_BASE_URLS
+        
+        deepseek_key = os.getenv('DEEPSEEK_API_KEY', 'your-key-if-not-using-env')
+        groq_key = os.getenv('GROQ_API_KEY', 'your-key-if-not-using-env')
+        
+        # Initialize AI clients; each SDK is imported and its client built on first use
+        self.openai = LazyClient("GPT", lambda: build_openai_client(
+            urls["GPT"], self.transport.client(urls["GPT"])
+        ))
+        self.claude = LazyClient("Claude", lambda: build_claude_client(
+            urls["Claude"], self.transport.client(urls["Claude"])
+        ))
+        self.deepseek = LazyClient("DeepSeek", lambda: build_openai_client(
+            urls["DeepSeek"], self.transport.client(urls["DeepSeek"]), api_key=deepseek_key
+        ))
+        self.groq = LazyClient("GROQ", lambda: build_openai_client(
+            urls["GROQ"], self.transport.client(urls["GROQ"]), api_key=groq_key
+        ))
+        
+        # Async clients used by the Gradio handlers so generation does not pin a worker thread
+        self.async_openai = LazyClient("async GPT", lambda: build_openai_client(
+            urls["GPT"], self.transport.async_client(urls["GPT"]), use_async=True
+        ))
+        self.async_claude = LazyClient("async Claude", lambda: build_claude_client(
+            urls["Claude"], self.transport.async_client(urls["Claude"]), use_async=True
+        ))
+        self.async_deepseek = LazyClient("async DeepSeek", lambda: build_openai_client(
+            urls["DeepSeek"], self.transport.async_client(urls["DeepSeek"]), api_key=deepseek_key, use_async=True
+        ))
+        self.async_groq = LazyClient("async GROQ", lambda: build_openai_client(
+            urls["GROQ"], self.transport.async_client(urls["GROQ"]), api_key=groq_key, use_async=True
+        ))
+        
+        # Gemini's SDK has no async client of its own, both streamers share the model
+        self.gemini = LazyClient("Gemini", lambda: build_gemini_model(
+            GEMINI_MODEL, os.getenv('GOOGLE_API_KEY', 'your-key-if-not-using-env')
+        ))
+        
+        if HTTP_WARMUP_ENABLED and CASSETTE_MODE != "replay":
+            # Handshakes run in the background so startup is not delayed
+            threading.Thread(
+                target=self.transport.warm_up,
+                args=(list(urls.values()),),
+                name="http-warm-up",
+                daemon=True
+            ).start()
+
+    def _setup_cassette(self):
+        """Return the transport wrapper that records or replays provider streams, if enabled."""
+        self.cassette = None
+        if CASSETTE_MODE == "record":
+            os.makedirs(os.path.dirname(CASSETTE_PATH) or ".", exist_ok=True)
+            self.cassette = Cassette(CASSETTE_PATH)
+            logger.info(f"Recording provider streams to {CASSETTE_PATH}")
+            return lambda transport: RecordingTransport(transport, self.cassette)
+        if CASSETTE_MODE == "replay":
+            self.cassette = Cassette.load(CASSETTE_PATH)
+            logger.info(f"Replaying provider streams from {CASSETTE_PATH} at speed {CASSETTE_REPLAY_SPEED}")
+            return lambda transport: ReplayTransport(self.cassette, CASSETTE_REPLAY_SPEED, CASSETTE_STRICT)
+        if CASSETTE_MODE:
+            logger.warning(f"Ignoring unknown CASSETTE_MODE {CASSETTE_MODE!r}")
+        return None
 
     def _initialize_components(self) -> None:
         """Initialize application components."""
@@ -113,13 +233,58 @@ class CodeConverterApp:
         self.language_detector = LanguageDetector()
         self.code_executor = CodeExecutor()
         self.file_handler = FileHandler()
+        # Document style labels of the target language selected in the UI
+        self.doc_style_value_map: Dict[str, str] = {}
+        self.canonicalizer = SourceCanonicalizer()
+        self.code_splitter = CodeSplitter(
+            max_chunk_lines=LARGE_FILE_SETTINGS["max_chunk_lines"],
+            context_type_lines=LARGE_FILE_SETTINGS["context_type_lines"]
+        )
+        self.conversion_cache = ConversionCache(
+            CONVERSION_CACHE_PATH,
+            memory_entries=CONVERSION_CACHE_MEMORY_ENTRIES,
+            max_entries=CONVERSION_CACHE_MAX_ENTRIES,
+            max_age=CONVERSION_CACHE_MAX_AGE,
+            enabled=CONVERSION_CACHE_ENABLED
+        )
+        # One breaker per provider, shared by the sync and async streamers
+        self.circuit_breakers = CircuitBreakerRegistry(**CIRCUIT_BREAKER_SETTINGS)
+        # Rate budgets are per account, so both streamers draw from the same buckets
+        self.rate_limiters = RateLimiterRegistry(PROVIDER_RATE_LIMITS)
+        # A single retry budget caps retries across every provider and streamer
+        self.retry_policy = RetryPolicy(
+            budget=RetryBudget(**RETRY_BUDGET_SETTINGS),
+            **RETRY_POLICY_SETTINGS
+        )
         self.model_streamer = AIModelStreamer(
             self.openai,
             self.claude,
             self.deepseek,
             self.groq,
-            self.gemini
+            self.gemini,
+            breakers=self.circuit_breakers,
+            limiters=self.rate_limiters,
+            retry_policy=self.retry_policy
+        )
+        # Identical concurrent conversions share one upstream stream, which
+        # is hedged against a backup provider when the primary stalls
+        async_streamer = AsyncAIModelStreamer(
+            self.async_openai,
+            self.async_claude,
+            self.async_deepseek,
+            self.async_groq,
+            self.gemini,
+            breakers=self.circuit_breakers,
+            limiters=self.rate_limiters,
+            retry_policy=self.retry_policy
         )
+        self.hedged_streamer = HedgedStreamer(
+            async_streamer,
+            HEDGE_BACKUP_MODELS,
+            HEDGE_FIRST_TOKEN_THRESHOLDS,
+            enabled=HEDGING_ENABLED
+        )
+        self.async_model_streamer = SingleFlightStreamer(self.hedged_streamer)
         
         # Extend Gradio's allowed languages
         for lang in LANGUAGE_MAPPING.values():
@@ -335,6 +500,14 @@ class CodeConverterApp:
                 document_checkbox, document_type_dropdown, document_checkbox_state, document_style_state
             )
             
+            self._create_fan_out_section(
+                source_code, source_lang, model, temperature, validation_state, document_checkbox_state
+            )
+            
+            # Async connections belong to the serving event loop, so warm them up from there
+            if HTTP_WARMUP_ENABLED and CASSETTE_MODE != "replay":
+                demo.load(self._warm_up_connections, queue=False)
+            
             return demo
 
     def run(self, share: bool = True) -> None:
@@ -535,6 +708,10 @@ class CodeConverterApp:
             outputs=[document_type_dropdown, document_style_state],
             queue=False
         )
+        
+        # Monitoring endpoints exposing provider health and connection pool usage
+        gr.api(self.provider_health, api_name="provider_health", queue=False)
+        gr.api(self.connection_pools, api_name="connection_pools", queue=False)
 
     def _handle_source_language_change(
         self, code: str, new_lang: str, current_error: str
@@ -729,7 +906,7 @@ class CodeConverterApp:
             logger.error("File upload failed", exc_info=True)
             return "", error_msg, error_msg, gr.update(open=True)
 
-    def _stream_converted_code(
+    async def _stream_converted_code(
         self,
         code: str,
         lang_in: str,
@@ -739,27 +916,203 @@ class CodeConverterApp:
         is_valid: bool,
         document_enabled: bool = True,
         document_style: str = "Standard"
-    ) -> tuple[gr.update, gr.update]:
-        """Stream the converted code with syntax highlighting."""
-        response = self._convert_code(
+    ) -> AsyncIterator[Tuple[Dict, Dict]]:
+        """Stream the converted code with syntax highlighting.
+        
+        Partial code is shown as it is generated, at most
+        ``UI_STREAM_UPDATE_RATE`` times per second; the final update holds
+        the finished conversion and its download.
+        """
+        target_lang = LANGUAGE_MAPPING.get(lang_out, "python").lower()
+        partial = StreamAccumulator()
+        throttle = UpdateThrottle(UI_STREAM_UPDATE_RATE)
+        
+        def on_code(fragment: str) -> None:
+            partial.add(TextDelta(fragment))
+            throttle.notify()
+        
+        conversion = asyncio.ensure_future(self._convert_code_async(
             code, lang_in, lang_out, model, temperature,
-            document_enabled=document_enabled, document_style=document_style
-        )
+            document_enabled=document_enabled, document_style=document_style, on_code=on_code
+        ))
+        try:
+            async for _ in throttle.ticks(conversion):
+                yield gr.update(value=partial.text, language=target_lang, visible=True), gr.update(visible=False)
+            response = await conversion
+        finally:
+            # The client went away before the conversion finished
+            if not conversion.done():
+                conversion.cancel()
+        logger.debug(f"Streamed {throttle.ticks_sent} partial updates for {throttle.notifications} code fragments")
         
         if not response:
-            return gr.update(value="", visible=True), gr.update(visible=False)
-        
-        target_lang = LANGUAGE_MAPPING.get(lang_out, "python").lower()
+            yield gr.update(value="", visible=True), gr.update(visible=False)
+            return
         
         # Prepare download if conversion was successful
         temp_file, filename = self.file_handler.prepare_download(response, lang_out)
         if temp_file and filename:
-            return (
+            yield (
                 gr.update(value=response, language=target_lang, visible=True),
                 gr.update(value=temp_file, visible=True, label=f"Download {lang_out} Code")
             )
+            return
+        
+        yield gr.update(value=response, language=target_lang, visible=True), gr.update(visible=False)
+
+    def _create_fan_out_section(
+        self,
+        source_code: gr.Code,
+        source_lang: gr.Dropdown,
+        model: gr.Dropdown,
+        temperature: gr.Slider,
+        validation_state: gr.State,
+        document_checkbox_state: gr.State
+    ) -> None:
+        """Create the multi-target section: one output panel per language, shown when selected."""
+        with gr.Accordion("Multi-Target Conversion", open=False, elem_classes="accordion"):
+            with gr.Row():
+                fan_out_targets = gr.CheckboxGroup(
+                    choices=[lang for lang in SUPPORTED_LANGUAGES if lang != "Python"],
+                    value=[],
+                    label="Target Languages",
+                    info="Convert the source code into every selected language at once"
+                )
+            fan_out_btn = gr.Button("Convert to Selected Languages", variant="primary", size="sm")
+            
+            # Gradio components cannot be created per request, so every language has a hidden panel
+            panels = {}
+            for lang in SUPPORTED_LANGUAGES:
+                panels[lang] = gr.Code(
+                    label=lang,
+                    language=LANGUAGE_MAPPING.get(lang, "python").lower(),
+                    interactive=False,
+                    visible=False,
+                    elem_classes=["code-container"]
+                )
+        
+        source_lang.change(
+            fn=lambda lang: gr.update(
+                choices=[target for target in SUPPORTED_LANGUAGES if target != lang], value=[]
+            ),
+            inputs=[source_lang],
+            outputs=[fan_out_targets],
+            queue=False
+        )
         
-        return gr.update(value=response, language=target_lang, visible=True), gr.update(visible=False)
+        async def stream_fan_out(code, lang_in, targets, model_name, temp, is_valid, document_enabled):
+            async for update in self._stream_fan_out(
+                panels, code, lang_in, targets, model_name, temp, is_valid, document_enabled
+            ):
+                yield update
+        
+        fan_out_btn.click(
+            fn=stream_fan_out,
+            inputs=[source_code, source_lang, fan_out_targets, model, temperature, validation_state, document_checkbox_state],
+            outputs=list(panels.values()),
+            queue=True,
+            show_progress=True
+        )
+
+    async def _stream_fan_out(
+        self,
+        panels: Dict[str, gr.Code],
+        code: str,
+        lang_in: str,
+        targets: List[str],
+        model: str,
+        temperature: float,
+        is_valid: bool,
+        document_enabled: bool
+    ) -> AsyncIterator[Dict[gr.Code, Any]]:
+        """Show a panel per selected target and stream each target's code into it.
+        
+        Partial code is shown as it is generated, at most
+        ``UI_STREAM_UPDATE_RATE`` times per second for all panels together;
+        a panel gets its finished conversion once its target completes.
+        """
+        targets = [target for target in targets or [] if target in panels and target != lang_in]
+        yield {
+            panel: gr.update(visible=lang in targets, value="", label=f"{lang} (converting...)")
+            for lang, panel in panels.items()
+        }
+        if not targets:
+            return
+        
+        partials = {target: StreamAccumulator() for target in targets}
+        finished: Dict[str, str] = {}
+        changed: Set[str] = set()
+        throttle = UpdateThrottle(UI_STREAM_UPDATE_RATE)
+        
+        def on_code(target: str, fragment: str) -> None:
+            partials[target].add(TextDelta(fragment))
+            changed.add(target)
+            throttle.notify()
+        
+        async def collect() -> None:
+            async for target, output in self.convert_many(
+                code, lang_in, targets, model, temperature, document_enabled, on_code=on_code
+            ):
+                finished[target] = output
+                changed.add(target)
+                throttle.notify()
+        
+        def updates() -> Dict[gr.Code, Any]:
+            shown = {
+                panels[target]: gr.update(value=finished[target], label=target) if target in finished
+                else gr.update(value=partials[target].text)
+                for target in changed
+            }
+            changed.clear()
+            return shown
+        
+        conversion = asyncio.ensure_future(collect())
+        try:
+            async for _ in throttle.ticks(conversion):
+                yield updates()
+            await conversion
+        finally:
+            # The client went away before every target finished
+            if not conversion.done():
+                conversion.cancel()
+        if changed:
+            yield updates()
+
+    async def convert_many(
+        self,
+        code: str,
+        lang_in: str,
+        targets: List[str],
+        model: str,
+        temp: float,
+        document_enabled: bool = True,
+        document_style: str = "standard",
+        on_code: Optional[Callable[[str, str], None]] = None
+    ) -> AsyncIterator[Tuple[str, str]]:
+        """Convert code into several target languages concurrently.
+        
+        One prompt is rendered per target and all of them stream at once,
+        drawing on the provider's shared rate limiter, so the total wait is
+        about that of the slowest target. Results are yielded as
+        ``(target, output)`` in the order they finish; on_code receives
+        ``(target, fragment)`` for each fragment of cleaned code as it
+        arrives.
+        
+        The documentation style applies to every target, so it is given as
+        a style value (such as "standard") rather than a dropdown label.
+        """
+        logger.info(f"Fan-out conversion from {lang_in} to {', '.join(targets)}")
+        
+        async def convert(target: str) -> Tuple[str, str]:
+            output = await self._convert_code_async(
+                code, lang_in, target, model, temp,
+                document_enabled=document_enabled, document_style=document_style,
+                on_code=None if on_code is None else functools.partial(on_code, target)
+            )
+            return target, output
+        
+        for finished in asyncio.as_completed([convert(target) for target in targets]):
+            yield await finished
 
     def _clear_all(self) -> tuple:
         """Clear all fields while retaining language settings."""
@@ -792,8 +1145,8 @@ class CodeConverterApp:
             logger.info(f"Starting execution for language: {language}")
             execution_start = time.time()
             
-            # Execute code and get output and binary
-            output, binary = self.code_executor.execute(code, language)
+            # Execute code and get output and the compiled artifact's path
+            output, artifact = self.code_executor.execute(code, language)
             
             # Log execution results
             execution_time = time.time() - execution_start
@@ -805,19 +1158,13 @@ class CodeConverterApp:
                 logger.warning("Empty output received from code execution")
             
             # Prepare download with compiled binary if available
-            if binary and language in ["C++", "Java", "Go"]:
-                # Ensure binary is bytes
-                binary_data = binary if isinstance(binary, bytes) else None
-                if binary_data:
-                    logger.info(f"Got compiled binary for {language}, size: {len(binary_data)} bytes")
-                else:
-                    logger.warning(f"No valid binary data for {language}")
-                    
+            if artifact and language in ["C++", "Java", "Go"]:
+                logger.info(f"Got compiled binary for {language}: {artifact}")
                 logger.info("Preparing download file with binary")
                 temp_file, filename = self.file_handler.prepare_download(
                     code=code,
                     language=language,
-                    compiled_code=binary_data
+                    compiled_file=artifact
                 )
                 
                 if temp_file and filename:
@@ -918,6 +1265,168 @@ class CodeConverterApp:
         Returns:
             Converted code string
         """
+        return self.convert(
+            code, lang_in, lang_out, model, temp, document_enabled, document_style,
+            progress=gr.Progress(track_tqdm=True)
+        ).output
+
+    def convert(
+        self,
+        code: str,
+        lang_in: str,
+        lang_out: str,
+        model: str,
+        temp: float,
+        document_enabled: bool = True,
+        document_style: str = "Standard",
+        progress: Optional[Any] = None
+    ) -> ConversionOutcome:
+        """Convert code and report how the result was obtained.
+        
+        Same arguments as ``_convert_code``; progress is a ``gr.Progress``
+        or any callable with its signature.
+        """
+        progress = progress or _ignore_progress
+        try:
+            model = self._route_model(model)
+            prompt, cache_key, message = self._prepare_conversion(
+                code, lang_in, lang_out, model, temp, document_enabled, document_style
+            )
+            if prompt is None:
+                return ConversionOutcome(message, "invalid", model)
+            
+            cached = self._cached_conversion(cache_key)
+            if cached is not None:
+                return ConversionOutcome(cached, "cached", model)
+            
+            # Stream model response
+            stream_start = time.time()
+            logger.info(f"Starting {model} stream")
+            
+            plan = self._plan_chunked_conversion(
+                code, lang_in, lang_out, model, temp, document_enabled, document_style
+            )
+            if plan:
+                accumulator = self._stream_parts(model, plan, lang_out, progress, temp)
+            else:
+                accumulator = self._stream_model_response(model, prompt, progress, temp)
+            logger.debug(
+                "Streaming completed in %.4fs",
+                time.time() - stream_start
+            )
+            
+            output = self._finish_conversion(accumulator, lang_out, cache_key)
+            status = "error" if accumulator.error else "converted"
+            return ConversionOutcome(output, status, model, accumulator.usage)
+            
+        except Exception as e:
+            return ConversionOutcome(self._conversion_error(e, lang_in, lang_out, model), "error", model)
+
+    @log_execution_time(logger)
+    async def _convert_code_async(
+        self,
+        code: str,
+        lang_in: str,
+        lang_out: str,
+        model: str,
+        temp: float,
+        document_enabled: bool = True,
+        document_style: str = "Standard",
+        on_code: Optional[Callable[[str], None]] = None
+    ) -> str:
+        """Convert code between programming languages without blocking a worker thread.
+        
+        Same contract as ``_convert_code`` but streams through the
+        ``AsyncAIModelStreamer`` so the Gradio event loop can serve other
+        conversions while this one is generating. on_code receives the
+        cleaned code in fragments while a single-request conversion streams;
+        the returned code is the final result.
+        """
+        try:
+            model = self._route_model(model)
+            prompt, cache_key, message = self._prepare_conversion(
+                code, lang_in, lang_out, model, temp, document_enabled, document_style
+            )
+            if prompt is None:
+                return message
+            
+            cached = self._cached_conversion(cache_key)
+            if cached is not None:
+                return cached
+            
+            stream_start = time.time()
+            logger.info(f"Starting async {model} stream")
+            progress = gr.Progress(track_tqdm=True)
+            
+            plan = self._plan_chunked_conversion(
+                code, lang_in, lang_out, model, temp, document_enabled, document_style
+            )
+            if plan:
+                accumulator = await self._stream_parts_async(model, plan, lang_out, progress, temp)
+            else:
+                accumulator = await self._stream_model_response_async(
+                    model, prompt, progress, cache_key, on_code, temperature=temp
+                )
+            logger.debug(
+                "Streaming completed in %.4fs",
+                time.time() - stream_start
+            )
+            
+            return self._finish_conversion(accumulator, lang_out, cache_key)
+            
+        except Exception as e:
+            return self._conversion_error(e, lang_in, lang_out, model)
+
+    def _route_model(self, model: str) -> str:
+        """Replace a model whose circuit breaker is open with a healthy one."""
+        if not CIRCUIT_BREAKER_REROUTE or not model:
+            return model
+        
+        routed = self.circuit_breakers.pick_healthy(model, MODELS)
+        if routed is None:
+            logger.warning(f"All providers have open circuit breakers, keeping {model}")
+            return model
+        if routed != model:
+            logger.warning(f"Circuit breaker open for {model}, rerouting conversion to {routed}")
+        return routed
+
+    def provider_health(self) -> Dict[str, Dict[str, Any]]:
+        """Return the circuit breaker and rate limit state of every provider for monitoring."""
+        states = self.circuit_breakers.states()
+        for model in MODELS:
+            states.setdefault(model, self.circuit_breakers.get(model).snapshot())
+            states[model]["rate_limit"] = self.rate_limiters.get(model).snapshot()
+        return states
+
+    def connection_pools(self) -> Dict[str, Dict[str, Any]]:
+        """Return request counts and connection pool utilisation per provider host."""
+        return self.transport.stats()
+
+    async def _warm_up_connections(self) -> None:
+        """Open the async provider connections on the event loop serving conversions."""
+        await self.transport.warm_up_async(PROVIDER_BASE_URLS.values())
+
+    def _prepare_conversion(
+        self,
+        code: str,
+        lang_in: str,
+        lang_out: str,
+        model: str,
+        temp: float,
+        document_enabled: bool,
+        document_style: str
+    ) -> Tuple[Optional[str], Optional[str], str]:
+        """Validate the conversion request, render its prompt and cache key.
+        
+        The cache key is computed from the prompt rendered with the
+        canonicalized source, so inputs that only differ in whitespace, line
+        endings or (with documentation off) comments share a cache entry.
+        
+        Returns:
+            A tuple of (prompt, cache_key, message). The prompt is None when
+            the request is invalid, in which case message is what should be
+            shown instead.
+        """
         logger.info("STARTING CODE CONVERSION")
         logger.info(f"Params: {lang_in} → {lang_out} | Model: {model} | Temp: {temp}")
         logger.info(f"Documentation: {document_enabled}, Style: {document_style}")
@@ -928,7 +1437,7 @@ class CodeConverterApp:
             "target_language": lang_out,
             "model": model,
             "temperature": temp,
-            "code_length": len(code),
+            "code_length": len(code) if code else 0,
             "process_id": os.getpid(),
             "thread_id": threading.get_ident()
         })
@@ -944,142 +1453,374 @@ class CodeConverterApp:
             logger.warning("Missing required parameters", extra={
                 "missing_params": missing
             })
-            return ""
-            
-        try:
-            # Code validation
-            validation_start = time.time()
-            logger.info("Starting code validation")
-            is_valid, message = self.language_detector.validate_language(code, lang_in)
-            logger.debug(
-                "Validation completed in %.4fs",
-                time.time() - validation_start
-            )
-            
-            if not is_valid:
-                logger.error("Code validation failed", extra={
-                    "error_message": message,
-                    "source_language": lang_in
-                })
-                return message
-                
-            logger.info("Code validation successful")
-            
-            # Create and execute prompt
-            prompt_start = time.time()
-            
-            # Map the document style label to its value
-            style_value = "standard"  # Default fallback
-            if document_style in self.doc_style_value_map:
-                style_value = self.doc_style_value_map[document_style]
-            else:
-                logger.warning(f"Document style mapping not found for '{document_style}', using 'standard' as fallback")
+            return None, None, ""
+        
+        # Code validation
+        validation_start = time.time()
+        logger.info("Starting code validation")
+        is_valid, message = self.language_detector.validate_language(code, lang_in)
+        logger.debug(
+            "Validation completed in %.4fs",
+            time.time() - validation_start
+        )
+        
+        if not is_valid:
+            logger.error("Code validation failed", extra={
+                "error_message": message,
+                "source_language": lang_in
+            })
+            return None, None, message
             
-            prompt = self.template.render(
+        logger.info("Code validation successful")
+        
+        # Create prompt
+        prompt_start = time.time()
+        
+        style_value = self._doc_style_value(document_style)
+        
+        prompt = render_prompt(
+            self.template,
+            source_language=lang_in,
+            target_language=lang_out,
+            input_code=code,
+            doc_enabled=document_enabled,
+            doc_style=style_value
+        )
+        
+        # Comments only influence the output when documentation is requested
+        canonical_code = self.canonicalizer.canonicalize(code, lang_in, strip_comments=not document_enabled)
+        canonical_prompt = render_prompt(
+            self.template,
+            source_language=lang_in,
+            target_language=lang_out,
+            input_code=canonical_code,
+            doc_enabled=document_enabled,
+            doc_style=style_value
+        )
+        cache_key = self.conversion_cache.make_key(canonical_prompt, MODEL_IDS.get(model, model), temp)
+        logger.debug(
+            "Prompt creation completed in %.4fs",
+            time.time() - prompt_start
+        )
+        
+        logger.info(f"Template: doc_enabled={document_enabled}, style={style_value} (from {document_style})")
+        return prompt, cache_key, ""
+
+    def _doc_style_value(self, document_style: str) -> str:
+        """Map the document style label to its template value."""
+        if document_style in self.doc_style_value_map:
+            return self.doc_style_value_map[document_style]
+        # Outside the UI there is no selected language, so any language's label or value will do
+        from src.ai_code_converter.config import DOCUMENT_STYLES
+        for style in (style for styles in DOCUMENT_STYLES.values() for style in styles):
+            if document_style in (style["label"], style["value"]):
+                return style["value"]
+        logger.warning(f"Document style mapping not found for '{document_style}', using 'standard' as fallback")
+        return "standard"
+
+    def _plan_chunked_conversion(
+        self,
+        code: str,
+        lang_in: str,
+        lang_out: str,
+        model: str,
+        temp: float,
+        document_enabled: bool,
+        document_style: str
+    ) -> Optional[List[Tuple[str, str]]]:
+        """Split a large file into parts and render the prompt and cache key of each.
+        
+        Returns:
+            A (prompt, cache_key) pair per part, or None when the file is
+            converted in one request (large-file mode off, file below the
+            threshold or no top-level declarations to split at)
+        """
+        if not LARGE_FILE_MODE_ENABLED or code.count('\n') + 1 < LARGE_FILE_SETTINGS["threshold_lines"]:
+            return None
+        
+        split = self.code_splitter.split(code, lang_in)
+        if len(split.parts) < 2:
+            logger.info("Large file has no top-level declarations to split at, converting it whole")
+            return None
+        
+        style_value = self._doc_style_value(document_style)
+        model_id = MODEL_IDS.get(model, model)
+        plan = []
+        for index in range(len(split.parts)):
+            prompt = render_prompt(
+                self.template,
                 source_language=lang_in,
                 target_language=lang_out,
-                input_code=code,
+                input_code=split.part_text(index),
                 doc_enabled=document_enabled,
-                doc_style=style_value
-            )
-            logger.debug(
-                "Prompt creation completed in %.4fs",
-                time.time() - prompt_start
-            )
-            
-            logger.info(f"Template: doc_enabled={document_enabled}, style={style_value} (from {document_style})")
-            
-            # Stream model response
-            stream_start = time.time()
-            logger.info(f"Starting {model} stream")
-            progress = gr.Progress(track_tqdm=True)
-            
-            response = self._stream_model_response(model, prompt, progress)
-            logger.debug(
-                "Streaming completed in %.4fs",
-                time.time() - stream_start
-            )
-            
-            # Clean response
-            clean_start = time.time()
-            cleaned_response = self._clean_response(response)
-            logger.debug(
-                "Response cleaning completed in %.4fs",
-                time.time() - clean_start
-            )
-            
-            # If converting to Python, ensure output is visible
-            if lang_out == "Python":
-                cleaned_response = self._prepare_python_code(cleaned_response)
-            
-            logger.info("Code conversion completed successfully", extra={
-                "output_length": len(cleaned_response)
-            })
-            logger.info("="*50)
-            
-            return cleaned_response
-            
-        except Exception as e:
-            logger.error(
-                "Error during code conversion",
-                exc_info=True,
-                extra={
-                    "error_type": type(e).__name__,
-                    "source_language": lang_in,
-                    "target_language": lang_out,
-                    "model": model
-                }
+                doc_style=style_value,
+                part_index=index + 1,
+                part_count=len(split.parts),
+                context_header=split.context(index)
             )
+            plan.append((prompt, self.conversion_cache.make_key(prompt, model_id, temp)))
+        
+        largest = max(sum(unit.line_count for unit in part) for part in split.parts)
+        logger.info(f"Converting large file in {len(plan)} parts (largest part {largest} lines)")
+        return plan
+
+    def _cached_part(self, cache_key: str) -> Optional[StreamAccumulator]:
+        """Accumulator replaying a part converted before, so unchanged parts are not requested again."""
+        cached = self.conversion_cache.get(cache_key)
+        if cached is None:
+            return None
+        return StreamAccumulator().extend([TextDelta(cached), FinishReason("stop")])
+
+    def _stream_parts(
+        self, model: str, plan: List[Tuple[str, str]], lang_out: str, progress: gr.Progress,
+        temperature: float = DEFAULT_TEMPERATURE
+    ) -> StreamAccumulator:
+        """Convert the parts of a large file in parallel threads and stitch the results."""
+        def convert(prompt: str, cache_key: str) -> StreamAccumulator:
+            cached = self._cached_part(cache_key)
+            if cached is not None:
+                return cached
+            return self._stream_model_response(model, prompt, _ignore_progress, temperature)
+        
+        accumulators: List[Optional[StreamAccumulator]] = [None] * len(plan)
+        with ThreadPoolExecutor(max_workers=LARGE_FILE_SETTINGS["max_parallel"]) as executor:
+            futures = {executor.submit(convert, prompt, key): index for index, (prompt, key) in enumerate(plan)}
+            for done, future in enumerate(as_completed(futures), 1):
+                accumulators[futures[future]] = future.result()
+                progress(done / len(plan), desc=f"Converted part {done} of {len(plan)}")
+        return self._merge_parts(plan, accumulators, lang_out)
+
+    async def _stream_parts_async(
+        self, model: str, plan: List[Tuple[str, str]], lang_out: str, progress: gr.Progress,
+        temperature: float = DEFAULT_TEMPERATURE
+    ) -> StreamAccumulator:
+        """Convert the parts of a large file concurrently on the event loop and stitch the results."""
+        semaphore = asyncio.Semaphore(LARGE_FILE_SETTINGS["max_parallel"])
+        done = 0
+        
+        async def convert(prompt: str, cache_key: str) -> StreamAccumulator:
+            nonlocal done
+            accumulator = self._cached_part(cache_key)
+            if accumulator is None:
+                async with semaphore:
+                    accumulator = await self._stream_model_response_async(
+                        model, prompt, _ignore_progress, cache_key, temperature=temperature
+                    )
+            done += 1
+            progress(done / len(plan), desc=f"Converted part {done} of {len(plan)}")
+            return accumulator
+        
+        accumulators = await asyncio.gather(*(convert(prompt, key) for prompt, key in plan))
+        return self._merge_parts(plan, accumulators, lang_out)
+
+    def _merge_parts(
+        self, plan: List[Tuple[str, str]], accumulators: List[StreamAccumulator], lang_out: str
+    ) -> StreamAccumulator:
+        """Stitch the cleaned responses of every part, in order, into one accumulator.
+        
+        Complete parts are cached on their own, so a later conversion of the
+        file with only some units changed reuses the others.
+        """
+        merged = StreamAccumulator()
+        texts = []
+        for (_, cache_key), accumulator in zip(plan, accumulators):
+            if accumulator.error:
+                merged.add(accumulator.error)
+                return merged
+            if accumulator.usage:
+                merged.add(accumulator.usage)
+            served_by_backup = accumulator.hedge and accumulator.hedge.winner != accumulator.hedge.primary
+            if served_by_backup:
+                merged.add(accumulator.hedge)
+            if accumulator.truncated:
+                merged.add(FinishReason("length"))
+            cleaned = self._clean_response(accumulator.text)
+            if not accumulator.truncated and not served_by_backup:
+                self.conversion_cache.set(cache_key, cleaned)
+            texts.append(cleaned)
+        
+        merged.add(TextDelta(self.code_splitter.stitch(texts, lang_out)))
+        if not merged.truncated:
+            merged.add(FinishReason("stop"))
+        return merged
+
+    def _cached_conversion(self, cache_key: str) -> Optional[str]:
+        """Look up a previous conversion result for this prompt."""
+        cache = self.conversion_cache
+        cached = cache.get(cache_key)
+        if cached is None:
+            logger.info(f"Conversion cache miss (hits={cache.hits}, misses={cache.misses})")
+            return None
+        
+        logger.info(f"Conversion cache hit (hits={cache.hits}, misses={cache.misses})")
+        logger.info("="*50)
+        return cached
+
+    def _finish_conversion(self, accumulator: StreamAccumulator, lang_out: str, cache_key: Optional[str] = None) -> str:
+        """Clean the model response into the final converted code and cache it."""
+        if accumulator.error:
             logger.info("="*50)
-            return f"Error during conversion: {str(e)}"
+            return accumulator.error.message
+        
+        clean_start = time.time()
+        cleaned_response = self._clean_response(accumulator.text)
+        logger.debug(
+            "Response cleaning completed in %.4fs",
+            time.time() - clean_start
+        )
+        
+        # If converting to Python, ensure output is visible
+        if lang_out == "Python":
+            cleaned_response = self._prepare_python_code(cleaned_response)
+        
+        logger.info("Code conversion completed successfully", extra={
+            "output_length": len(cleaned_response)
+        })
+        logger.info("="*50)
+        
+        # Truncated responses are incomplete and hedged wins came from a
+        # different model, so neither is served from cache
+        served_by_backup = accumulator.hedge and accumulator.hedge.winner != accumulator.hedge.primary
+        if cache_key and not accumulator.truncated and not served_by_backup:
+            self.conversion_cache.set(cache_key, cleaned_response)
+        
+        return cleaned_response
+
+    def _conversion_error(self, error: Exception, lang_in: str, lang_out: str, model: str) -> str:
+        """Log a failed conversion and return the message shown to the user."""
+        logger.error(
+            "Error during code conversion",
+            exc_info=error,
+            extra={
+                "error_type": type(error).__name__,
+                "source_language": lang_in,
+                "target_language": lang_out,
+                "model": model
+            }
+        )
+        logger.info("="*50)
+        return f"Error during conversion: {str(error)}"
 
-    def _stream_model_response(self, model: str, prompt: str, progress: gr.Progress) -> str:
+    def _stream_model_response(
+        self, model: str, prompt: str, progress: gr.Progress, temperature: float = DEFAULT_TEMPERATURE
+    ) -> StreamAccumulator:
         """Stream response from selected model with logging."""
         logger = logging.getLogger(__name__)
         
         logger.info(f"Streaming response from {model}")
-        response = ""
+        accumulator = StreamAccumulator()
         
         try:
-            if model == "GPT":
-                stream = self.model_streamer.stream_gpt(prompt)
-            elif model == "Claude":
-                stream = self.model_streamer.stream_claude(prompt)
-            elif model == "DeepSeek":
-                stream = self.model_streamer.stream_deepseek(prompt)
-            elif model == "GROQ":
-                stream = self.model_streamer.stream_groq(prompt)
-            elif model == "Gemini":
-                stream = self.model_streamer.stream_gemini(prompt)
-            else:
+            if model not in self.model_streamer.streams:
                 logger.error(f"Unsupported model selected: {model}")
-                return "Unsupported model selected"
+                accumulator.add(StreamError(model, "Unsupported model selected"))
+                return accumulator
             
-            for i, chunk in enumerate(stream):
-                response = chunk
-                progress_value = min(0.99, (1 - (1 / (1 + 0.1 * i))))
-                progress(progress_value, desc=f"Converting - {int(progress_value * 100)}%")
+            fences = FenceStripper()
+            with closing(self.model_streamer.stream(model, prompt, temperature)) as stream:
+                for i, event in enumerate(stream):
+                    accumulator.add(event)
+                    progress_value = min(0.99, (1 - (1 / (1 + 0.1 * i))))
+                    progress(progress_value, desc=f"Converting - {int(progress_value * 100)}%")
+                    if self._code_complete(model, event, fences, accumulator):
+                        break
                 
             logger.info(f"Streaming completed for {model}")
-            return response
+            self._log_stream_summary(model, accumulator)
+            return accumulator
             
         except Exception as e:
             logger.error(f"Error streaming from {model}", exc_info=True)
             raise
 
-    def _clean_response(self, response: str) -> str:
-        """Clean up the model response."""
+    async def _stream_model_response_async(
+        self,
+        model: str,
+        prompt: str,
+        progress: gr.Progress,
+        request_key: Optional[str] = None,
+        on_code: Optional[Callable[[str], None]] = None,
+        temperature: float = DEFAULT_TEMPERATURE
+    ) -> StreamAccumulator:
+        """Stream response from selected model on the event loop.
+        
+        Requests with the same request_key share a single upstream stream.
+        on_code receives each fragment of cleaned code as it arrives.
+        """
+        logger.info(f"Streaming response from {model} (async)")
+        accumulator = StreamAccumulator()
+        
         try:
-            cleaned = re.sub(
-                r'(```\w*\n?)|(^Here is the converted( is the converted)?.*?\n)',
-                '',
-                response,
-                flags=re.MULTILINE
+            if model not in self.async_model_streamer.streams:
+                logger.error(f"Unsupported model selected: {model}")
+                accumulator.add(StreamError(model, "Unsupported model selected"))
+                return accumulator
+            
+            i = 0
+            fences = FenceStripper()
+            async with aclosing(
+                self.async_model_streamer.stream(model, prompt, key=request_key, temperature=temperature)
+            ) as stream:
+                async for event in stream:
+                    accumulator.add(event)
+                    progress_value = min(0.99, (1 - (1 / (1 + 0.1 * i))))
+                    progress(progress_value, desc=f"Converting - {int(progress_value * 100)}%")
+                    i += 1
+                    if self._code_complete(model, event, fences, accumulator, on_code):
+                        break
+                
+            logger.info(f"Streaming completed for {model}")
+            self._log_stream_summary(model, accumulator)
+            return accumulator
+            
+        except Exception:
+            logger.error(f"Error streaming from {model}", exc_info=True)
+            raise
+
+    def _log_stream_summary(self, model: str, accumulator: StreamAccumulator) -> None:
+        """Log token usage and truncation for a finished stream."""
+        if accumulator.usage:
+            logger.info(
+                f"Token usage for {model}: input={accumulator.usage.input_tokens}, "
+                f"output={accumulator.usage.output_tokens}, "
+                f"cache_read={accumulator.usage.cache_read_tokens}, "
+                f"cache_write={accumulator.usage.cache_write_tokens}"
             )
-            return cleaned.strip()
-        except Exception as e:
-            logger.error(f"Error cleaning response: {str(e)}", exc_info=True)
-            return response
+        if accumulator.truncated:
+            logger.warning(f"{model} response was truncated at the output token limit")
+        if accumulator.hedge and accumulator.hedge.hedged:
+            logger.info(
+                f"Hedged request for {model} won by {accumulator.hedge.winner} "
+                f"after {accumulator.hedge.elapsed:.2f}s"
+            )
+
+    def _code_complete(
+        self,
+        model: str,
+        event: StreamEvent,
+        fences: FenceStripper,
+        accumulator: StreamAccumulator,
+        on_code: Optional[Callable[[str], None]] = None
+    ) -> bool:
+        """Pass streamed text through the fence stripper, handing clean code to on_code.
+        
+        Returns whether the code block of the response has closed, so
+        reading can stop early.
+        """
+        if not isinstance(event, TextDelta):
+            return False
+        code = fences.feed(event.text)
+        if code and on_code is not None:
+            on_code(code)
+        if not STOP_AT_CLOSING_FENCE or not fences.closed:
+            return False
+        logger.info(f"Closing code fence received from {model}, not reading the rest of the response")
+        accumulator.add(FinishReason("stop"))
+        return True
+
+    def _clean_response(self, response: str) -> str:
+        """Clean up the model response (chatter line, code fences and any text after them)."""
+        return strip_code_fences(response)
 
     def _prepare_python_code(self, code: str) -> str:
         """Prepare Python code for execution by ensuring output is visible."""
@@ -0,0 +1,259 @@
+"""Batch conversion of many source files for CodeXchange AI.
+
+Converts every file under a directory (or matching a glob) with a bounded
+pool of workers and records the outcome of each file in a JSON manifest
+next to the results. Running the same batch again skips files whose
+content is unchanged since their last successful conversion::
+
+    python -m src.ai_code_converter.batch src/ --from Python --to JavaScript --model GPT --output converted/
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+from src.ai_code_converter.config import LANGUAGE_FILE_EXTENSIONS, MODELS, SUPPORTED_LANGUAGES
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+
+# Statuses of files whose result was written and need not be converted again
+_DONE_STATUSES = ("converted", "cached")
+
+
+@dataclass
+class FileResult:
+    """Outcome of converting one file, as recorded in the manifest."""
+    source: str
+    output: Optional[str]
+    content_hash: str
+    status: str
+    model: str
+    latency: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    error: Optional[str] = None
+
+
+def content_hash(code: str) -> str:
+    """Fingerprint of a source file's content."""
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()
+
+
+def find_sources(source: str, language: str) -> List[str]:
+    """Files to convert: every file with the language's extension under a
+    directory, or every file matching a glob (``**`` recurses)."""
+    if os.path.isdir(source):
+        extension = LANGUAGE_FILE_EXTENSIONS.get(language, "")
+        paths = [
+            os.path.join(root, name)
+            for root, _, names in os.walk(source)
+            for name in names
+            if name.lower().endswith(extension.lower())
+        ]
+    else:
+        paths = [path for path in glob.glob(source, recursive=True) if os.path.isfile(path)]
+    return sorted(paths)
+
+
+class BatchConverter:
+    """Convert many files through the application's conversion pipeline.
+
+    Conversions share the application's caches, rate limiters and retry
+    budget, so the worker count only bounds how many files are in flight;
+    provider limits are still enforced per provider.
+    """
+
+    def __init__(self, app=None, max_workers: int = 4):
+        """Initialize with an application (built without its UI when omitted)."""
+        if app is None:
+            from src.ai_code_converter.app import CodeConverterApp
+            app = CodeConverterApp(interface=False)
+        self.app = app
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+
+    def run(
+        self,
+        source: str,
+        lang_in: str,
+        lang_out: str,
+        model: str,
+        output_dir: str,
+        temperature: float = 0.0,
+        document_enabled: bool = False,
+        document_style: str = "standard"
+    ) -> List[FileResult]:
+        """Convert every file found in source and write the results to output_dir.
+
+        Args:
+            source: Directory or glob pattern of the files to convert
+            lang_in: Source language
+            lang_out: Target language
+            model: Model from MODELS
+            output_dir: Directory receiving the converted files and the manifest
+            temperature: Temperature parameter
+            document_enabled: Whether to include documentation
+            document_style: Documentation style to apply
+
+        Returns:
+            The result of every file, in path order; files skipped because
+            they were already converted have status "skipped"
+        """
+        paths = find_sources(source, lang_in)
+        root = source if os.path.isdir(source) else os.path.commonpath([os.path.dirname(path) for path in paths] or ["."])
+        os.makedirs(output_dir, exist_ok=True)
+        manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+        manifest = self._load_manifest(manifest_path, lang_in, lang_out, model)
+
+        results: Dict[str, FileResult] = {}
+        pending = []
+        for path in paths:
+            relative = os.path.relpath(path, root)
+            with open(path, "r", encoding="utf-8") as f:
+                code = f.read()
+            previous = manifest["files"].get(relative)
+            if self._already_converted(previous, content_hash(code), output_dir):
+                results[relative] = FileResult(**dict(previous, status="skipped"))
+            else:
+                pending.append((relative, code))
+
+        logger.info(f"Batch of {len(paths)} files: {len(pending)} to convert, {len(paths) - len(pending)} unchanged")
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(
+                    self._convert_file, relative, code, lang_in, lang_out, model,
+                    output_dir, temperature, document_enabled, document_style
+                )
+                for relative, code in pending
+            ]
+            for future in as_completed(futures):
+                result = future.result()
+                results[result.source] = result
+                with self._lock:
+                    manifest["files"][result.source] = asdict(result)
+                    self._save_manifest(manifest_path, manifest)
+
+        return [results[relative] for relative in sorted(results)]
+
+    def _convert_file(
+        self,
+        relative: str,
+        code: str,
+        lang_in: str,
+        lang_out: str,
+        model: str,
+        output_dir: str,
+        temperature: float,
+        document_enabled: bool,
+        document_style: str
+    ) -> FileResult:
+        start = time.monotonic()
+        outcome = self.app.convert(code, lang_in, lang_out, model, temperature, document_enabled, document_style)
+        result = FileResult(
+            source=relative,
+            output=None,
+            content_hash=content_hash(code),
+            status=outcome.status,
+            model=outcome.model,
+            latency=round(time.monotonic() - start, 3),
+            input_tokens=outcome.usage.input_tokens if outcome.usage else 0,
+            output_tokens=outcome.usage.output_tokens if outcome.usage else 0,
+            cache_read_tokens=outcome.usage.cache_read_tokens if outcome.usage else 0
+        )
+        if outcome.status not in _DONE_STATUSES:
+            result.error = outcome.output
+            logger.warning(f"Batch conversion of {relative} failed: {outcome.output}")
+            return result
+
+        output = os.path.splitext(relative)[0] + LANGUAGE_FILE_EXTENSIONS.get(lang_out, ".txt")
+        target = os.path.join(output_dir, output)
+        os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+        with open(target, "w", encoding="utf-8") as f:
+            f.write(outcome.output)
+        result.output = output
+        logger.info(f"Converted {relative} -> {output} in {result.latency:.2f}s ({outcome.status})")
+        return result
+
+    @staticmethod
+    def _already_converted(entry: Optional[Dict[str, Any]], code_hash: str, output_dir: str) -> bool:
+        return bool(
+            entry
+            and entry.get("content_hash") == code_hash
+            and entry.get("status") in _DONE_STATUSES
+            and entry.get("output")
+            and os.path.exists(os.path.join(output_dir, entry["output"]))
+        )
+
+    @staticmethod
+    def _load_manifest(path: str, lang_in: str, lang_out: str, model: str) -> Dict[str, Any]:
+        """Read the manifest of a previous run of the same batch, or start a new one."""
+        settings = {"source_language": lang_in, "target_language": lang_out, "model": model}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return dict(settings, files={})
+        except ValueError as e:
+            logger.warning(f"Ignoring unreadable manifest {path}: {str(e)}")
+            return dict(settings, files={})
+        if any(manifest.get(key) != value for key, value in settings.items()):
+            # Results for another language or model cannot be reused
+            logger.info(f"Manifest {path} is for a different conversion, converting every file again")
+            return dict(settings, files={})
+        manifest.setdefault("files", {})
+        return manifest
+
+    @staticmethod
+    def _save_manifest(path: str, manifest: Dict[str, Any]) -> None:
+        """Write the manifest atomically so an interrupted batch keeps a readable one."""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(temp_path, path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Convert a batch of files from the command line; returns the exit status."""
+    from src.ai_code_converter.utils.logger import setup_logger
+    setup_logger("ai_code_converter.batch")
+
+    parser = argparse.ArgumentParser(description="Convert many source files with CodeXchange AI")
+    parser.add_argument("source", help="Directory or glob pattern (quote it) of the files to convert")
+    parser.add_argument("--from", dest="lang_in", required=True, choices=SUPPORTED_LANGUAGES, help="Source language")
+    parser.add_argument("--to", dest="lang_out", required=True, choices=SUPPORTED_LANGUAGES, help="Target language")
+    parser.add_argument("--model", default=MODELS[0], choices=MODELS, help="Model to convert with")
+    parser.add_argument("--output", required=True, help="Directory for the converted files and the manifest")
+    parser.add_argument("--workers", type=int, default=4, help="Files converted at the same time")
+    parser.add_argument("--temperature", type=float, default=0.0, help="Sampling temperature")
+    parser.add_argument("--document", action="store_true", help="Document the converted code")
+    parser.add_argument("--document-style", default="standard", help="Documentation style (label or value)")
+    args = parser.parse_args(argv)
+
+    results = BatchConverter(max_workers=args.workers).run(
+        args.source, args.lang_in, args.lang_out, args.model, args.output,
+        temperature=args.temperature, document_enabled=args.document, document_style=args.document_style
+    )
+
+    counts: Dict[str, int] = {}
+    for result in results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+    print(f"{len(results)} files: {summary or 'nothing to convert'}")
+    print(f"Manifest: {os.path.join(args.output, MANIFEST_NAME)}")
+    return 1 if any(result.status in ("error", "invalid") for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,211 @@
 """Configuration settings for the CodeXchange AI application."""
 
+import os
+
 # Model configurations
 OPENAI_MODEL = "gpt-4o-mini"
 CLAUDE_MODEL = "claude-3-5-sonnet-20241022"
 DEEPSEEK_MODEL = "deepseek-chat"
 GEMINI_MODEL = "gemini-1.5-flash"
 GROQ_MODEL = "llama3-70b-8192"
+DEFAULT_TEMPERATURE = 0.7  # sampling temperature when a caller does not choose one
 
 # Supported languages and models
 SUPPORTED_LANGUAGES = ["Python", "Julia", "JavaScript", "Go", "Java", "C++", "Ruby", "Swift", "Rust", "C#", "TypeScript", "R", "Perl", "Lua", "PHP", "Kotlin", "SQL"]
 MODELS = ["GPT", "Claude", "Gemini", "DeepSeek", "GROQ"]
 
+# Provider model id behind each entry of the model dropdown
+MODEL_IDS = {
+    "GPT": OPENAI_MODEL,
+    "Claude": CLAUDE_MODEL,
+    "Gemini": GEMINI_MODEL,
+    "DeepSeek": DEEPSEEK_MODEL,
+    "GROQ": GROQ_MODEL
+}
+
+# Hedged requests: when the primary model has not produced its first token
+# within its threshold (roughly its p95 time-to-first-token, in seconds), the
+# same prompt is sent to the backup model and the first clean finisher wins
+HEDGING_ENABLED = os.getenv("HEDGING_ENABLED", "false").lower() in ("1", "true", "yes")
+HEDGE_BACKUP_MODELS = {
+    "GPT": "Claude",
+    "Claude": "GPT",
+    "Gemini": "GPT",
+    "DeepSeek": "GPT",
+    "GROQ": "GPT"
+}
+HEDGE_FIRST_TOKEN_THRESHOLDS = {
+    "GPT": 4.0,
+    "Claude": 6.0,
+    "Gemini": 5.0,
+    "DeepSeek": 8.0,
+    "GROQ": 3.0
+}
+
+# Per-provider circuit breakers: a provider is skipped for `cooldown` seconds
+# once its recent error rate or slow-call rate crosses the thresholds
+CIRCUIT_BREAKER_SETTINGS = {
+    "window": 60.0,               # seconds of history considered
+    "min_requests": 5,            # calls needed before the breaker may open
+    "error_rate": 0.5,
+    "slow_call_threshold": 30.0,  # seconds to first token
+    "slow_call_rate": 0.8,
+    "cooldown": 30.0,
+    "half_open_max_calls": 1
+}
+# Send requests for a provider with an open breaker to a healthy model instead
+CIRCUIT_BREAKER_REROUTE = os.getenv("CIRCUIT_BREAKER_REROUTE", "true").lower() not in ("0", "false", "no")
+
+# API endpoints of the providers reached through the shared HTTP transport
+# (Gemini's SDK manages its own connections)
+PROVIDER_BASE_URLS = {
+    "GPT": os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1"),
+    "Claude": os.getenv("ANTHROPIC_BASE_URL", "https://api.anthropic.com"),
+    "DeepSeek": "https://api.deepseek.com/v1",
+    "GROQ": "https://api.groq.com/openai/v1"
+}
+
+# Send GPT, Claude, DeepSeek and GROQ requests to a local mock server
+# (python -m src.ai_code_converter.utils.mock_llm_server) for offline benchmarks
+MOCK_LLM_URL = os.getenv("MOCK_LLM_URL", "").rstrip("/")
+if MOCK_LLM_URL:
+    PROVIDER_BASE_URLS = {
+        "GPT": f"{MOCK_LLM_URL}/v1",
+        "Claude": MOCK_LLM_URL,
+        "DeepSeek": f"{MOCK_LLM_URL}/v1",
+        "GROQ": f"{MOCK_LLM_URL}/v1"
+    }
+
+# Keep-alive connection pools, one per provider host
+HTTP_POOL_SETTINGS = {
+    "max_connections": 20,
+    "max_keepalive_connections": 10,
+    "keepalive_expiry": 120.0,   # seconds an idle connection stays open
+    "connect_timeout": 10.0,     # seconds, including the TLS handshake
+    "read_timeout": 600.0        # seconds between bytes of a response
+}
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() not in ("0", "false", "no")
+# Open provider connections at startup so the first conversion skips the handshake
+HTTP_WARMUP_ENABLED = os.getenv("HTTP_WARMUP_ENABLED", "true").lower() not in ("0", "false", "no")
+
+# Record provider streams to a cassette, or replay them from one ("record", "replay" or empty)
+CASSETTE_MODE = os.getenv("CASSETTE_MODE", "").lower()
+CASSETTE_PATH = os.getenv("CASSETTE_PATH", "cassettes/session.jsonl.gz")
+# Replay timing: 1 is real time, larger values compress it, 0 removes all delays
+CASSETTE_REPLAY_SPEED = float(os.getenv("CASSETTE_REPLAY_SPEED", "1.0"))
+# Only replay exact request matches instead of reusing recordings of the same model
+CASSETTE_STRICT = os.getenv("CASSETTE_STRICT", "false").lower() in ("1", "true", "yes")
+
+# Import-time budgets in seconds (fresh interpreter, ``-X importtime``) guarding
+# startup time, with headroom for slow machines. Provider SDKs are imported on
+# first use, so the streaming layer stays cheap; the app is dominated by Gradio.
+STARTUP_IMPORT_BUDGETS = {
+    "src.ai_code_converter.models.ai_streaming": 1.0,
+    "src.ai_code_converter.models.async_streaming": 1.0,
+    "src.ai_code_converter.app": 20.0
+}
+
+# Client-side rate limits per provider; the providers' rate-limit headers
+# replace these defaults with the account's real budget at runtime
+PROVIDER_RATE_LIMITS = {
+    "GPT": {"requests_per_minute": 500, "tokens_per_minute": 200000},
+    "Claude": {"requests_per_minute": 50, "tokens_per_minute": 40000},
+    "Gemini": {"requests_per_minute": 300, "tokens_per_minute": 1000000},
+    "DeepSeek": {"requests_per_minute": 300, "tokens_per_minute": 500000},
+    "GROQ": {"requests_per_minute": 30, "tokens_per_minute": 60000}
+}
+
+# Retries of failed provider calls: exponential backoff with full jitter,
+# abandoned past the deadline or once retries exceed `ratio` of recent traffic
+RETRY_POLICY_SETTINGS = {
+    "max_attempts": 4,      # attempts per request, including the first
+    "initial_delay": 1.0,   # seconds
+    "max_delay": 20.0,      # seconds
+    "deadline": 60.0        # seconds after the first attempt
+}
+RETRY_BUDGET_SETTINGS = {
+    "ratio": 0.2,           # retries allowed per request in the window
+    "min_retries": 3,       # retries always allowed in the window
+    "window": 60.0          # seconds
+}
+
+# Continuation requests allowed when a response hits the output token limit
+# or its stream breaks off; each one resumes from the text already received
+MAX_CONTINUATIONS = 3
+
+# Stop reading a response once the fence closing its code block arrives,
+# instead of paying for the explanation models tend to append
+STOP_AT_CLOSING_FENCE = os.getenv("STOP_AT_CLOSING_FENCE", "true").lower() not in ("0", "false", "no")
+
+# Most partial-code updates per second pushed to the UI while a conversion streams
+UI_STREAM_UPDATE_RATE = float(os.getenv("UI_STREAM_UPDATE_RATE", "15"))
+
+# Mark the shared start of every prompt (static instructions, then the
+# language-pair instructions) as cacheable for Claude; OpenAI and DeepSeek
+# cache a repeated prompt prefix automatically
+PROMPT_CACHING_ENABLED = os.getenv("PROMPT_CACHING_ENABLED", "true").lower() not in ("0", "false", "no")
+
+# Python snippets run in a pool of worker processes, each run with its own
+# namespace, captured output and time limit
+PYTHON_WORKER_POOL_SETTINGS = {
+    "workers": int(os.getenv("PYTHON_WORKERS", min(4, os.cpu_count() or 1))),
+    "max_runs": 50,          # runs before a worker is replaced
+    "max_memory_mb": 512,    # peak memory after which a worker is replaced
+    "timeout": 30.0          # seconds a snippet may run
+}
+
+# JavaScript, and TypeScript once compiled, runs in a pool of Node.js workers,
+# each run in a fresh vm context with captured output and a time limit
+NODE_WORKER_POOL_SETTINGS = {
+    "workers": int(os.getenv("NODE_WORKERS", min(4, os.cpu_count() or 1))),
+    "max_runs": 100,         # runs before a worker is replaced
+    "max_memory_mb": 512,    # peak memory after which a worker is replaced
+    "timeout": 30.0          # seconds a snippet may run
+}
+
+# Compiled artifacts of executed code, keyed by language, toolchain version, flags and source
+COMPILE_CACHE_ENABLED = os.getenv("COMPILE_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+COMPILE_CACHE_PATH = os.getenv("COMPILE_CACHE_PATH", os.path.join("cache", "compiled"))
+COMPILE_CACHE_MAX_BYTES = int(os.getenv("COMPILE_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+
+# Kotlin is compiled by a resident compiler process instead of a cold kotlinc per run
+KOTLIN_COMPILE_SERVICE_ENABLED = os.getenv("KOTLIN_COMPILE_SERVICE_ENABLED", "true").lower() not in ("0", "false", "no")
+KOTLIN_HOME = os.getenv("KOTLIN_HOME")  # found from kotlinc on the PATH when unset
+KOTLIN_COMPILE_SERVICE_JVM_OPTIONS = ["-Xmx1g", "-Xss4m"]
+KOTLIN_COMPILE_SERVICE_SETTINGS = {
+    "timeout": 120.0,          # seconds one compilation may take
+    "startup_timeout": 60.0,   # seconds a new service has to answer its health check
+    "max_requests": 200        # compilations before the service is restarted
+}
+
+# Java is compiled and run in a resident JVM instead of javac and java per run
+JAVA_RUN_SERVICE_ENABLED = os.getenv("JAVA_RUN_SERVICE_ENABLED", "true").lower() not in ("0", "false", "no")
+# Class data sharing archive for starting the service; built on first use, empty to disable
+JAVA_RUN_SERVICE_CDS_ARCHIVE = os.getenv("JAVA_RUN_SERVICE_CDS_ARCHIVE", os.path.join("cache", "jvm", "java-run-service.jsa"))
+JAVA_RUN_SERVICE_JVM_OPTIONS = ["-Xmx1g", "-Xss4m"]
+JAVA_RUN_SERVICE_SETTINGS = {
+    "timeout": 60.0,           # seconds a compilation may take
+    "startup_timeout": 60.0,   # seconds a new service has to answer its health check
+    "max_requests": 500        # requests before the service is restarted
+}
+JAVA_RUN_TIMEOUT = 30.0  # seconds a program may run
+
+# Large files are split at top-level declarations and their parts converted in parallel
+LARGE_FILE_MODE_ENABLED = os.getenv("LARGE_FILE_MODE_ENABLED", "true").lower() not in ("0", "false", "no")
+LARGE_FILE_SETTINGS = {
+    "threshold_lines": 400,    # files with at least this many lines are converted in parts
+    "max_chunk_lines": 150,    # top-level units are packed into parts of up to this many lines
+    "max_parallel": 4,         # parts converted at the same time
+    "context_type_lines": 20   # type declarations up to this long are shared with every part in full
+}
+
+# Conversion result cache (in-memory LRU in front of SQLite)
+CONVERSION_CACHE_ENABLED = os.getenv("CONVERSION_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+CONVERSION_CACHE_PATH = os.getenv("CONVERSION_CACHE_PATH", os.path.join("cache", "conversions.sqlite"))
+CONVERSION_CACHE_MEMORY_ENTRIES = 256
+CONVERSION_CACHE_MAX_ENTRIES = 5000
+CONVERSION_CACHE_MAX_AGE = 7 * 24 * 3600  # seconds
+
 # Language mapping for syntax highlighting
 LANGUAGE_MAPPING = {
     "Python": "python",
@@ -128,6 +323,159 @@ DOCUMENT_STYLES = {
     ]
 }
 
+# Comment and string literal syntax for each language, used to canonicalize
+# source code: "line" comment markers, "block" comment [open, close] pairs, the
+# quote characters of single-line string literals, [open, close] pairs of
+# literals that may span lines ("multiline" with escape sequences, optionally
+# with the opener of interpolated code; "raw" without), and a pattern of
+# literal syntax the scanner cannot follow, matched with the contents of
+# literals left out. Whitespace is only normalized in code outside literals;
+# code matching "unscannable" is left as it is.
+# A slash that starts a regex literal: after an operator, an opening bracket,
+# a keyword or at the start of a line, and not starting a comment
+JS_REGEX_LITERAL = (
+    r"(?m)(?:^|[=(,:\[!&|?{};+\-%<>~^]|\b(?:return|typeof|case|in|of|void|delete|throw|new|yield|await))"
+    r"\s*/(?![/*])"
+)
+
+COMMENT_SYNTAX = {
+    "Python": {"line": ["#"], "block": [], "strings": ['"', "'"],
+               "multiline": [['"""', '"""'], ["'''", "'''"]]},
+    "Julia": {"line": ["#"], "block": [["#=", "=#"]], "strings": [], "multiline": [['"""', '"""'], ['"', '"']]},
+    # Regex literals, which may hold quotes and comment markers
+    "JavaScript": {"line": ["//"], "block": [["/*", "*/"]], "strings": ['"', "'"], "multiline": [["`", "`", "${"]],
+                  "unscannable": JS_REGEX_LITERAL},
+    "Go": {"line": ["//"], "block": [["/*", "*/"]], "strings": ['"', "'"], "raw": [["`", "`"]]},
+    "Java": {"line": ["//"], "block": [["/*", "*/"]], "strings": ['"', "'"], "multiline": [['"""', '"""']]},
+    # Raw string literals take a custom delimiter
+    "C++": {"line": ["//"], "block": [["/*", "*/"]], "strings": ['"', "'"], "unscannable": r'R"'},
+    # Heredocs, %-literals and regex literals
+    "Ruby": {"line": ["#"], "block": [["=begin", "=end"]], "strings": ['"', "'"], "unscannable": r"^"},
+    "Swift": {"line": ["//"], "block": [["/*", "*/"]], "strings": ['"'], "multiline": [['"""', '"""']]},
+    # ' also starts lifetimes; raw strings take a custom delimiter
+    "Rust": {"line": ["//"], "block": [["/*", "*/"]], "strings": [], "multiline": [['"', '"']],
+             "unscannable": r'r#*"'},
+    # Verbatim strings have no escape sequences and raw strings a custom delimiter
+    "C#": {"line": ["//"], "block": [["/*", "*/"]], "strings": ['"', "'"], "unscannable": r'@"|"""'},
+    # Regex literals, which may hold quotes and comment markers
+    "TypeScript": {"line": ["//"], "block": [["/*", "*/"]], "strings": ['"', "'"], "multiline": [["`", "`", "${"]],
+                  "unscannable": JS_REGEX_LITERAL},
+    "R": {"line": ["#"], "block": [], "strings": [], "multiline": [['"', '"'], ["'", "'"]]},
+    # Heredocs and quote-like operators with custom delimiters
+    "Perl": {"line": ["#"], "block": [["=pod", "=cut"]], "strings": ['"', "'"], "unscannable": r"^"},
+    # Long brackets of a higher level
+    "Lua": {"line": ["--"], "block": [["--[[", "]]"]], "strings": ['"', "'"], "raw": [["[[", "]]"]],
+            "unscannable": r"\[=+\["},
+    # Heredocs and nowdocs
+    "PHP": {"line": ["//", "#"], "block": [["/*", "*/"]], "strings": [], "multiline": [['"', '"'], ["'", "'"]],
+            "unscannable": r"<<<"},
+    "Kotlin": {"line": ["//"], "block": [["/*", "*/"]], "strings": ['"', "'"], "raw": [['"""', '"""']]},
+    "SQL": {"line": ["--"], "block": [["/*", "*/"]], "strings": [], "raw": [["'", "'"], ['"', '"']]}
+}
+
+# Top-level declarations ("units"), declarations shared as types and import
+# lines of each language, matched at the start of a line. Python is split
+# with its ast module instead of these patterns.
+CODE_UNIT_SYNTAX = {
+    "Python": {
+        "units": [r"(async\s+)?def\s+\w+", r"class\s+\w+"],
+        "types": [r"class\s+\w+"],
+        "imports": [r"import\s+\S", r"from\s+\S+\s+import\s"]
+    },
+    "Julia": {
+        "units": [r"function\s+\S", r"(mutable\s+)?struct\s+\w+", r"module\s+\w+", r"macro\s+\w+", r"abstract\s+type\s"],
+        "types": [r"(mutable\s+)?struct\s+\w+", r"abstract\s+type\s"],
+        "imports": [r"(using|import)\s+\S"]
+    },
+    "JavaScript": {
+        "units": [
+            r"(export\s+(default\s+)?)?(async\s+)?function\b",
+            r"(export\s+(default\s+)?)?class\s+\w+",
+            r"(export\s+)?(const|let|var)\s+\w+\s*=\s*(async\s+)?(function\b|\([^)]*\)\s*=>|\w+\s*=>)"
+        ],
+        "types": [r"(export\s+(default\s+)?)?class\s+\w+"],
+        "imports": [r"import\s", r"(const|let|var)\s+.*=\s*require\("]
+    },
+    "TypeScript": {
+        "units": [
+            r"(export\s+(default\s+)?)?(async\s+)?function\b",
+            r"(export\s+(default\s+)?)?(abstract\s+)?class\s+\w+",
+            r"(export\s+)?(declare\s+)?(interface|type|enum|namespace)\s+\w+",
+            r"(export\s+)?(const|let|var)\s+\w+(\s*:[^=]+)?\s*=\s*(async\s+)?(function\b|\([^)]*\)[^=]*=>|\w+\s*=>)"
+        ],
+        "types": [r"(export\s+)?(declare\s+)?(interface|type|enum)\s+\w+"],
+        "imports": [r"import\s", r"(const|let|var)\s+.*=\s*require\("]
+    },
+    "Go": {
+        "units": [r"func\s", r"type\s+\w+", r"(var|const)\s*\($"],
+        "types": [r"type\s+\w+"],
+        "imports": [r"package\s+\w+", r"import\s"]
+    },
+    "Java": {
+        "units": [r"((public|protected|private|abstract|final|static|sealed)\s+)*(class|interface|enum|record|@interface)\s+\w+"],
+        "types": [r"((public|protected|private|abstract|final|static|sealed)\s+)*(interface|enum|record)\s+\w+"],
+        "imports": [r"package\s+[\w.]+", r"import\s"]
+    },
+    "C++": {
+        "units": [
+            r"(template\s*<.*>\s*)?(class|struct|union|namespace|enum(\s+class)?)\s+\w+[^;]*$",
+            r"(template\s*<.*>\s*)?[A-Za-z_][\w:<>,\s\*&]*[\s\*&]+[\w:~]+\s*\([^;]*$"
+        ],
+        "types": [r"(template\s*<.*>\s*)?(class|struct|union|enum(\s+class)?)\s+\w+"],
+        "imports": [r"#\s*include\b", r"using\s+namespace\s"]
+    },
+    "Ruby": {
+        "units": [r"def\s", r"class\s+\w+", r"module\s+\w+"],
+        "types": [r"Struct\b"],
+        "imports": [r"require(_relative)?\s"]
+    },
+    "Swift": {
+        "units": [r"((public|private|fileprivate|internal|open|final)\s+)*(func|class|struct|enum|protocol|extension|actor)\s+\w+"],
+        "types": [r"((public|private|fileprivate|internal|open)\s+)*(struct|enum|protocol)\s+\w+"],
+        "imports": [r"import\s"]
+    },
+    "Rust": {
+        "units": [r"(pub(\([\w:]+\))?\s+)?((async|const|unsafe|extern\s+\"C\")\s+)*(fn|struct|enum|trait|impl|mod|union|type|macro_rules!)\b"],
+        "types": [r"(pub(\([\w:]+\))?\s+)?(struct|enum|trait|type|union)\b"],
+        "imports": [r"(pub\s+)?use\s", r"extern\s+crate\s"]
+    },
+    "C#": {
+        "units": [r"((public|internal|private|protected|static|sealed|abstract|partial|readonly)\s+)*(class|struct|interface|enum|record|namespace)\s+\w+[^;]*$"],
+        "types": [r"((public|internal|private|protected|readonly)\s+)*(struct|interface|enum|record)\s+\w+"],
+        "imports": [r"using\s+[\w.]+\s*;", r"namespace\s+[\w.]+\s*;"]
+    },
+    "R": {
+        "units": [r"[\w.]+\s*(<-|=)\s*function\s*\(", r"setClass\s*\(", r"setRefClass\s*\("],
+        "types": [r"setClass\s*\(", r"setRefClass\s*\("],
+        "imports": [r"(library|require|source)\s*\("]
+    },
+    "Perl": {
+        "units": [r"sub\s+\w+", r"package\s+[\w:]+\s*(;|\{)"],
+        "types": [],
+        "imports": [r"use\s", r"require\s"]
+    },
+    "Lua": {
+        "units": [r"(local\s+)?function\s", r"(local\s+)?\w+(\.\w+)*\s*=\s*function\b"],
+        "types": [],
+        "imports": [r"(local\s+\w+\s*=\s*)?require\b"]
+    },
+    "PHP": {
+        "units": [r"((abstract|final|readonly)\s+)*(function|class|interface|trait|enum)\s+\w+"],
+        "types": [r"(interface|enum)\s+\w+"],
+        "imports": [r"<\?php", r"namespace\s", r"use\s", r"(require|include)(_once)?\b"]
+    },
+    "Kotlin": {
+        "units": [r"((public|private|internal|protected|data|sealed|abstract|open|enum|inline|value|annotation|suspend|tailrec|operator|infix)\s+)*(fun|class|object|interface)\b"],
+        "types": [r"((public|private|internal)\s+)?(data\s+class|sealed\s+(class|interface)|enum\s+class|interface|typealias)\b"],
+        "imports": [r"package\s", r"import\s"]
+    },
+    "SQL": {
+        "units": [r"(?i)(CREATE|ALTER|DROP|INSERT|UPDATE|DELETE|SELECT|WITH|MERGE|GRANT|BEGIN)\b"],
+        "types": [r"(?i)CREATE\s+(TABLE|TYPE|VIEW)\b"],
+        "imports": [r"(?i)USE\s"]
+    }
+}
+
 # Predefined code snippets for the UI
 PREDEFINED_SNIPPETS = {
     "Python Code Simple" : """ 
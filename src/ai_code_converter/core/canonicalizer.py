@@ -0,0 +1,227 @@
+"""Module for canonicalizing source code before fingerprinting."""
+
+import ast
+import hashlib
+import itertools
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.ai_code_converter.config import COMMENT_SYNTAX
+
+logger = logging.getLogger(__name__)
+
+_BLANK_LINES = re.compile(r'\n\s*\n+')
+_TRAILING_WHITESPACE = re.compile(r'[ \t\f\v]+\n')
+
+CODE, COMMENT, LITERAL = "code", "comment", "literal"
+
+
+class SourceCanonicalizer:
+    """Class for reducing source code to a canonical form.
+
+    Inputs that differ only in line endings, trailing whitespace and blank
+    lines outside string literals, or (optionally) in comments,
+    canonicalize to the same text, so they share a fingerprint and
+    therefore a conversion cache entry.
+    """
+
+    def __init__(self):
+        """Initialize the per-language canonicalizers."""
+        self.canonicalizers = {
+            "Python": self.canonicalize_python
+        }
+
+    def canonicalize(self, code: str, language: str, strip_comments: bool = False) -> str:
+        """Return the canonical form of code.
+
+        Args:
+            code: Source code
+            language: Language from SUPPORTED_LANGUAGES
+            strip_comments: Whether comments should be removed
+
+        Returns:
+            Canonicalized source code
+        """
+        code = code.replace('\r\n', '\n').replace('\r', '\n')
+        canonicalizer = self.canonicalizers.get(language, self.canonicalize_generic)
+        return canonicalizer(code, language, strip_comments)
+
+    def fingerprint(self, code: str, language: str, strip_comments: bool = False) -> str:
+        """Return a stable hash of the canonical form of code."""
+        canonical = self.canonicalize(code, language, strip_comments)
+        return hashlib.sha256(f"{language}\0{canonical}".encode("utf-8")).hexdigest()
+
+    def canonicalize_python(self, code: str, language: str, strip_comments: bool) -> str:
+        """Canonicalize Python with an AST round-trip when comments can be dropped."""
+        if not strip_comments:
+            return self.canonicalize_generic(code, language, strip_comments)
+        try:
+            return ast.unparse(ast.parse(code))
+        except (SyntaxError, ValueError) as e:
+            # Invalid or partial snippets still get the textual normalization
+            logger.debug(f"Python AST round-trip failed, using text normalization: {e}")
+            return self.canonicalize_generic(code, language, strip_comments)
+
+    def canonicalize_generic(self, code: str, language: str, strip_comments: bool) -> str:
+        """Normalize whitespace outside string literals and optionally strip comments using COMMENT_SYNTAX.
+
+        Whitespace inside literals is part of the program's behavior, so it
+        is kept. Code with literal syntax the scanner cannot follow is kept
+        as it is, since neither its literals nor its comments can be told
+        apart reliably.
+        """
+        syntax = COMMENT_SYNTAX.get(language, {})
+        segments = self.scan(code, syntax)
+        if syntax.get("unscannable"):
+            # Literal contents are left out, so a template holding "</li>" is no regex literal
+            outline = ''.join(text[:1] + text[-1:] if kind == LITERAL else text for kind, text in segments)
+            if re.search(syntax["unscannable"], outline):
+                return code
+        if strip_comments and language in COMMENT_SYNTAX:
+            segments = [(kind, text) for kind, text in segments if kind != COMMENT]
+
+        out = []
+        for is_literal, run in itertools.groupby(segments, key=lambda segment: segment[0] == LITERAL):
+            text = ''.join(text for _, text in run)
+            if not is_literal:
+                text = _BLANK_LINES.sub('\n', _TRAILING_WHITESPACE.sub('\n', text))
+            out.append(text)
+        canonical = ''.join(out)
+        if segments and segments[0][0] != LITERAL:
+            canonical = canonical.lstrip('\n')
+        if segments and segments[-1][0] != LITERAL:
+            canonical = canonical.rstrip()
+        return canonical
+
+    @staticmethod
+    def strip_comments(code: str, syntax: Dict[str, Any]) -> str:
+        """Remove comments from code while leaving string literals intact.
+
+        Args:
+            code: Source code with normalized line endings
+            syntax: Entry from COMMENT_SYNTAX
+
+        Returns:
+            Code without comments
+        """
+        return ''.join(text for kind, text in SourceCanonicalizer.scan(code, syntax) if kind != COMMENT)
+
+    @staticmethod
+    def scan(code: str, syntax: Dict[str, Any]) -> List[Tuple[str, str]]:
+        """Split code into code, comment and string literal segments.
+
+        Args:
+            code: Source code with normalized line endings
+            syntax: Entry from COMMENT_SYNTAX
+
+        Returns:
+            (kind, text) pairs, kind being CODE, COMMENT or LITERAL; their
+            texts joined give back code
+        """
+        line_markers = syntax.get("line", [])
+        block_markers = syntax.get("block", [])
+        quotes = syntax.get("strings", ['"', "'"])
+        # Longest openers first, so a triple quote is not read as an empty string
+        literals = sorted(
+            [(pair, True) for pair in syntax.get("multiline", [])] + [(pair, False) for pair in syntax.get("raw", [])],
+            key=lambda literal: -len(literal[0][0])
+        )
+        segments: List[Tuple[str, str]] = []
+        code_start = 0
+        i = 0
+        length = len(code)
+
+        def add(kind: str, end: int) -> None:
+            if code_start < i:
+                segments.append((CODE, code[code_start:i]))
+            segments.append((kind, code[i:end]))
+
+        while i < length:
+            char = code[i]
+
+            # Literal that may span lines: copy through to its closing delimiter
+            literal = next((literal for literal in literals if code.startswith(literal[0][0], i)), None)
+            if literal:
+                pair, escapes = literal
+                end = _literal_end(code, i + len(pair[0]), pair[1], escapes, pair[2] if len(pair) > 2 else None, syntax)
+                add(LITERAL, end)
+                i = code_start = end
+                continue
+
+            # String literal: copy through to the matching unescaped quote
+            if char in quotes:
+                end = i + 1
+                while end < length and code[end] != char:
+                    if code[end] == '\\':
+                        end += 1
+                    elif code[end] == '\n':
+                        break
+                    end += 1
+                add(LITERAL, end + 1)
+                i = code_start = end + 1
+                continue
+
+            # Block comment: skip to the closing marker
+            block = next((pair for pair in block_markers if code.startswith(pair[0], i)), None)
+            if block:
+                end = code.find(block[1], i + len(block[0]))
+                end = length if end == -1 else end + len(block[1])
+                add(COMMENT, end)
+                i = code_start = end
+                continue
+
+            # Line comment: skip to the end of the line
+            if any(code.startswith(marker, i) for marker in line_markers):
+                end = code.find('\n', i)
+                end = length if end == -1 else end
+                add(COMMENT, end)
+                i = code_start = end
+                continue
+
+            i += 1
+
+        if code_start < length:
+            segments.append((CODE, code[code_start:]))
+        return segments
+
+
+def _literal_end(code: str, i: int, close: str, escapes: bool, interpolation: Optional[str],
+                 syntax: Dict[str, Any]) -> int:
+    """Return the index just past the literal whose content starts at i."""
+    length = len(code)
+    while i < length:
+        if escapes and code[i] == '\\':
+            i += 2
+        elif code.startswith(close, i):
+            return i + len(close)
+        elif interpolation and code.startswith(interpolation, i):
+            i = _interpolation_end(code, i + len(interpolation), syntax)
+        else:
+            i += 1
+    return length
+
+
+def _interpolation_end(code: str, i: int, syntax: Dict[str, Any]) -> int:
+    """Return the index just past the brace closing interpolated code that starts at i."""
+    depth = 1
+    length = len(code)
+    nested = syntax.get("multiline", [])
+    while i < length:
+        char = code[i]
+        pair = next((pair for pair in nested if code.startswith(pair[0], i)), None)
+        if pair:
+            # A literal nested in the interpolated code, such as another template
+            i = _literal_end(code, i + len(pair[0]), pair[1], True, pair[2] if len(pair) > 2 else None, syntax)
+            continue
+        if char in syntax.get("strings", []):
+            i = _literal_end(code, i + 1, char, True, None, syntax)
+            continue
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return length
@@ -1,28 +1,88 @@
 """Module for executing code in different programming languages."""
 
-import contextlib
-import io
+import atexit
 import logging
 import os
 import re
+import shutil
 import subprocess
 import tempfile
+import threading
 import traceback
-import sys
-from typing import Optional, Dict, Any
+import zipfile
+from typing import Callable, Optional, Sequence
 from datetime import datetime
+from src.ai_code_converter.config import (
+    COMPILE_CACHE_ENABLED,
+    COMPILE_CACHE_MAX_BYTES,
+    COMPILE_CACHE_PATH,
+    JAVA_RUN_SERVICE_CDS_ARCHIVE,
+    JAVA_RUN_SERVICE_ENABLED,
+    JAVA_RUN_SERVICE_JVM_OPTIONS,
+    JAVA_RUN_SERVICE_SETTINGS,
+    JAVA_RUN_TIMEOUT,
+    KOTLIN_COMPILE_SERVICE_ENABLED,
+    KOTLIN_COMPILE_SERVICE_JVM_OPTIONS,
+    KOTLIN_COMPILE_SERVICE_SETTINGS,
+    KOTLIN_HOME,
+    NODE_WORKER_POOL_SETTINGS,
+    PYTHON_WORKER_POOL_SETTINGS
+)
+from src.ai_code_converter.core.compile_cache import CompileCache, toolchain_version
+from src.ai_code_converter.core.jvm_service import (
+    JVM_HELPER_DIR,
+    JVM_LOG_OPTIONS,
+    JvmService,
+    JvmServiceError,
+    cds_options
+)
+from src.ai_code_converter.core.node_worker_pool import NodeWorkerPool
+from src.ai_code_converter.core.python_worker_pool import PythonRunResult, PythonWorkerPool
 from src.ai_code_converter.utils.logger import setup_logger
 from pathlib import Path
 
 # Initialize logger for this module
 logger = setup_logger(__name__)
 
+
+def kotlin_home() -> Optional[str]:
+    """Kotlin compiler home: KOTLIN_HOME, or the installation kotlinc on the PATH belongs to."""
+    if KOTLIN_HOME:
+        return KOTLIN_HOME
+    kotlinc = shutil.which("kotlinc")
+    if kotlinc is None:
+        return None
+    # <home>/bin/kotlinc, usually reached through a symlink
+    return os.path.dirname(os.path.dirname(os.path.realpath(kotlinc)))
+
+
+def jar_main_class(jar_file: Path, default: str) -> str:
+    """Main class recorded in a jar's manifest, or default if there is none."""
+    with zipfile.ZipFile(jar_file) as jar:
+        try:
+            manifest = jar.read("META-INF/MANIFEST.MF").decode("utf-8")
+        except KeyError:
+            return default
+    for line in manifest.splitlines():
+        if line.startswith("Main-Class:"):
+            return line.split(":", 1)[1].strip()
+    return default
+
 class CodeExecutor:
     """Class for executing code in various programming languages."""
     
     def __init__(self):
         """Initialize the code executor."""
         logger.info("Initializing CodeExecutor")
+        self.python_pool = PythonWorkerPool(**PYTHON_WORKER_POOL_SETTINGS)
+        atexit.register(self.python_pool.close)
+        self.node_pool = NodeWorkerPool(**NODE_WORKER_POOL_SETTINGS)
+        atexit.register(self.node_pool.close)
+        self.compile_cache = CompileCache(COMPILE_CACHE_PATH, COMPILE_CACHE_MAX_BYTES, enabled=COMPILE_CACHE_ENABLED)
+        # Resident Kotlin compiler and Java runner, started by the first run of each language
+        self.kotlin_service: Optional[JvmService] = None
+        self.java_service: Optional[JvmService] = None
+        self._jvm_service_lock = threading.Lock()
         self.executors = {
             "Python": self.execute_python,
             "JavaScript": self.execute_javascript,
@@ -44,7 +104,7 @@ class CodeExecutor:
         }
         logger.info(f"Supported languages: {', '.join(self.executors.keys())}")
 
-    def execute(self, code: str, language: str) -> tuple[str, Optional[bytes]]:
+    def execute(self, code: str, language: str) -> tuple[str, Optional[str]]:
         """Execute code with detailed logging."""
         logger.info("="*50)
         logger.info(f"STARTING CODE EXECUTION: {language}")
@@ -66,20 +126,20 @@ class CodeExecutor:
             logger.info(f"Found executor for {language}, initiating execution")
             start_time = datetime.now()
             
-            output, binary = executor(code)
+            output, artifact = executor(code)
             
             execution_time = (datetime.now() - start_time).total_seconds()
             logger.info(f"Execution completed in {execution_time:.2f} seconds")
             logger.info(f"Output length: {len(output)} characters")
-            if binary:
-                logger.info(f"Binary size: {len(binary)} bytes")
+            if artifact:
+                logger.info(f"Compiled artifact: {artifact}")
             else:
                 logger.info("No binary output produced")
                 
             logger.debug(f"Full execution output:\n{output}")
             logger.info("="*50)
             
-            return f"{output}\nExecution completed in {execution_time:.2f} seconds", binary
+            return f"{output}\nExecution completed in {execution_time:.2f} seconds", artifact
             
         except Exception as e:
             logger.error(f"Error executing {language} code", exc_info=True)
@@ -88,109 +148,70 @@ class CodeExecutor:
             logger.info("="*50)
             return f"Error: {str(e)}", None
 
-    def execute_python(self, code: str) -> tuple[str, Optional[bytes]]:
-        """Execute Python code in a safe environment."""
+    def _compile(self, language: str, version_command: Sequence[str], flags: Sequence[str], code: str,
+                 build: Callable[[Path], None]) -> Path:
+        """Return the compile cache entry for code, building it on a miss.
+
+        Args:
+            language: Language of the code
+            version_command: Command printing the compiler version, part of the cache key
+            flags: Compiler flags, part of the cache key
+            code: Source code, part of the cache key
+            build: Writes the source into the given directory and compiles it there
+        """
+        key = CompileCache.make_key(language, toolchain_version(*version_command), flags, code)
+        entry, hit = self.compile_cache.fetch(key, build)
+        logger.info(f"{language} build {'reused from' if hit else 'stored in'} {entry}")
+        return entry
+
+    def execute_python(self, code: str) -> tuple[str, Optional[str]]:
+        """Execute Python code in a worker process of the Python pool."""
         logger.info("Python execution started")
-        logger.info(f"Python version: {sys.version}")
         logger.debug(f"Executing Python code:\n{code}")
         
-        output = io.StringIO()
-        stderr_capture = io.StringIO()
+        result = self.python_pool.run(code)
+        logger.info(f"Python worker finished in {result.duration:.4f} seconds")
         
-        try:
-            with contextlib.redirect_stdout(output), contextlib.redirect_stderr(stderr_capture):
-                try:
-                    # Log execution environment info
-                    logger.info("Creating namespace for execution")
-                    namespace: Dict[str, Any] = {"__name__": "__main__"}
-                    
-                    # Track execution start time
-                    exec_start = datetime.now()
-                    logger.info("Executing code in namespace")
-                    
-                    # Execute the code with shared namespace
-                    exec(code, namespace, namespace)
-                    
-                    # Track execution end time
-                    exec_time = (datetime.now() - exec_start).total_seconds()
-                    logger.info(f"Code executed successfully in {exec_time:.4f} seconds")
-                    
-                    # Get any stored output
-                    execution_output = output.getvalue()
-                    stderr_output = stderr_capture.getvalue()
-                    
-                    # Log namespace variables for debugging
-                    logger.debug(f"Namespace variables: {', '.join(k for k in namespace.keys() if not k.startswith('__'))}")
-                    
-                    # If there's a result variable, append it to output
-                    if '_result' in namespace:
-                        logger.info("Found '_result' variable in namespace")
-                        execution_output += str(namespace['_result'])
-                    
-                    # Log output details
-                    if execution_output:
-                        logger.info(f"Captured stdout output: {len(execution_output)} chars")
-                        logger.debug(f"Output: {execution_output}")
-                    else:
-                        logger.info("No stdout output produced")
-                        
-                    if stderr_output:
-                        logger.warning(f"Captured stderr output: {stderr_output}")
-                    
-                    # Log execution completion
-                    logger.info("Python execution completed successfully")
-                    return execution_output, None
-                    
-                except Exception as e:
-                    error_type = type(e).__name__
-                    error_msg = str(e)
-                    tb = traceback.format_exc()
-                    logger.error(f"Python execution error: {error_type}: {error_msg}")
-                    logger.error(f"Traceback: {tb}")
-                    
-                    # Get any output before the exception
-                    partial_output = output.getvalue()
-                    stderr_output = stderr_capture.getvalue()
-                    
-                    if partial_output:
-                        logger.info(f"Partial output before exception: {partial_output}")
-                    
-                    if stderr_output:
-                        logger.error(f"Stderr output: {stderr_output}")
-                        
-                    return f"Error: {error_type}: {error_msg}\n\n{tb}", None
-            
-        except Exception as e:
-            # This catches errors in the redirect_stdout/stderr context manager itself
-            logger.critical(f"Critical error in Python execution system: {str(e)}", exc_info=True)
-            return f"System Error: {str(e)}", None
-        finally:
-            output.close()
-            stderr_capture.close()
-            logger.info("Python execution resources cleaned up")
+        if result.stderr:
+            logger.warning(f"Captured stderr output: {result.stderr}")
+        
+        if result.timed_out:
+            logger.error(f"Python execution timed out after {self.python_pool.timeout} seconds")
+            return f"Error: Execution timed out after {self.python_pool.timeout:g} seconds", None
+        
+        if result.error:
+            logger.error(f"Python execution error: {result.error}")
+            logger.error(f"Traceback: {result.traceback}")
+            if result.stdout:
+                logger.info(f"Partial output before exception: {result.stdout}")
+            return f"Error: {result.error}\n\n{result.traceback}", None
+        
+        if result.stdout:
+            logger.info(f"Captured stdout output: {len(result.stdout)} chars")
+            logger.debug(f"Output: {result.stdout}")
+        else:
+            logger.info("No stdout output produced")
+        
+        logger.info("Python execution completed successfully")
+        return result.stdout, None
 
-    def execute_javascript(self, code: str) -> tuple[str, Optional[bytes]]:
-        """Execute JavaScript code using Node.js."""
-        with tempfile.NamedTemporaryFile(suffix='.js', mode='w', delete=False) as f:
-            f.write(code)
-            js_file = f.name
-            
-        try:
-            result = subprocess.run(
-                ["node", js_file],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            return result.stdout, None
-        except subprocess.CalledProcessError as e:
-            return f"Error: {e.stderr}", None
-        except Exception as e:
-            return f"Error: {str(e)}", None
-        finally:
-            os.unlink(js_file)
+    def execute_javascript(self, code: str) -> tuple[str, Optional[str]]:
+        """Execute JavaScript code in a worker process of the Node.js pool."""
+        return self._node_output(self.node_pool.run(code)), None
 
-    def execute_julia(self, code: str) -> tuple[str, Optional[bytes]]:
+    def _node_output(self, result: PythonRunResult) -> str:
+        """Format the result of a Node.js worker run like the output of node."""
+        logger.info(f"Node worker finished in {result.duration:.4f} seconds")
+        if result.timed_out:
+            logger.error(f"JavaScript execution timed out after {self.node_pool.timeout} seconds")
+            return f"Error: Execution timed out after {self.node_pool.timeout:g} seconds"
+        if result.error:
+            logger.error(f"JavaScript execution error: {result.error}")
+            # node prints the stack of an uncaught error after the program's own stderr
+            return f"Error: {result.stderr}{result.traceback or result.error}"
+        return result.stdout
+
+    def execute_julia(self, code: str) -> tuple[str, Optional[str]]:
         """Execute Julia code."""
         with tempfile.NamedTemporaryFile(suffix='.jl', mode='w', delete=False) as f:
             f.write(code)
@@ -211,153 +232,207 @@ class CodeExecutor:
         finally:
             os.unlink(jl_file)
 
-    def execute_cpp(self, code: str) -> tuple[str, Optional[bytes]]:
+    def execute_cpp(self, code: str) -> tuple[str, Optional[str]]:
         """Compile and execute C++ code."""
-        with tempfile.NamedTemporaryFile(suffix='.cpp', mode='w', delete=False) as f:
-            f.write(code)
-            cpp_file = f.name
-            
-        try:
-            # Compile
-            exe_file = cpp_file[:-4]  # Remove .cpp
-            if os.name == 'nt':  # Windows
-                exe_file += '.exe'
-                
-            compile_result = subprocess.run(
-                ["g++", cpp_file, "-o", exe_file],
+        exe_name = "main.exe" if os.name == 'nt' else "main"
+        flags: list[str] = []
+
+        def build(directory: Path) -> None:
+            source = directory / "main.cpp"
+            source.write_text(code)
+            subprocess.run(
+                ["g++", *flags, str(source), "-o", str(directory / exe_name)],
                 capture_output=True,
                 text=True,
                 check=True
             )
-            
+
+        try:
+            exe_file = self._compile("C++", ["g++", "--version"], flags, code, build) / exe_name
+
             # Execute
             run_result = subprocess.run(
-                [exe_file],
+                [str(exe_file)],
                 capture_output=True,
                 text=True,
                 check=True
             )
-            
-            # Read the compiled binary
-            with open(exe_file, 'rb') as f:
-                compiled_binary = f.read()
-            
-            return run_result.stdout, compiled_binary
+            return run_result.stdout, str(exe_file)
             
         except subprocess.CalledProcessError as e:
             return f"Error: {e.stderr}", None
         except Exception as e:
             return f"Error: {str(e)}", None
-        finally:
-            os.unlink(cpp_file)
-            if os.path.exists(exe_file):
-                os.unlink(exe_file)
 
-    def execute_java(self, code: str) -> tuple[str, Optional[bytes]]:
-        """Compile and execute Java code."""
+    def execute_java(self, code: str) -> tuple[str, Optional[str]]:
+        """Compile and execute Java code.
+
+        Code is compiled and run by the resident Java service when it is
+        available, and with javac and java otherwise.
+        """
         logger.info("Starting Java code execution")
         
-        # Create a temporary directory with proper permissions
-        with tempfile.TemporaryDirectory() as temp_dir:
-            try:
-                # Extract class name
-                class_match = re.search(r'public\s+class\s+(\w+)', code)
-                if not class_match:
-                    logger.error("Could not find public class name in Java code")
-                    return "Error: Could not find public class name", None
-                    
-                class_name = class_match.group(1)
-                temp_path = Path(temp_dir)
-                java_file = temp_path / f"{class_name}.java"
-                class_file = temp_path / f"{class_name}.class"
-                
-                # Write code to file
-                java_file.write_text(code)
-                logger.info(f"Wrote Java source to {java_file}")
-                
-                # Compile
-                logger.info("Compiling Java code")
-                compile_result = subprocess.run(
-                    ["javac", str(java_file)],
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                    cwd=temp_dir  # Set working directory to temp_dir
-                )
-                logger.info("Java compilation successful")
-                
-                # Verify class file exists
-                if not class_file.exists():
-                    logger.error(f"Class file {class_file} not found after compilation")
-                    return "Error: Compilation failed to produce class file", None
-                
-                # Read compiled bytecode
-                compiled_binary = class_file.read_bytes()
-                logger.info(f"Read compiled binary, size: {len(compiled_binary)} bytes")
-                
-                # Execute
-                logger.info("Executing Java code")
+        # Extract class name
+        class_match = re.search(r'public\s+class\s+(\w+)', code)
+        if not class_match:
+            logger.error("Could not find public class name in Java code")
+            return "Error: Could not find public class name", None
+            
+        class_name = class_match.group(1)
+
+        def build(directory: Path) -> None:
+            logger.info("Compiling Java code")
+            self._compile_java(class_name, code, directory)
+            # Verify class file exists
+            if not (directory / f"{class_name}.class").exists():
+                raise RuntimeError("Compilation failed to produce class file")
+            logger.info("Java compilation successful")
+
+        try:
+            class_dir = self._compile("Java", ["javac", "-version"], [], code, build)
+            class_file = str(class_dir / f"{class_name}.class")
+
+            logger.info("Executing Java code")
+            result = self._run_on_java_service("Java", [str(class_dir)], class_name)
+            if result is not None:
+                output, succeeded = result
+                return output, class_file if succeeded else None
+
+            # Run in an empty directory, so files the program writes stay out of the cache
+            with tempfile.TemporaryDirectory() as temp_dir:
                 run_result = subprocess.run(
-                    ["java", class_name],
+                    ["java", "-cp", str(class_dir), class_name],
                     capture_output=True,
                     text=True,
                     check=True,
-                    cwd=temp_dir  # Set working directory to temp_dir
+                    cwd=temp_dir
                 )
-                logger.info("Java execution successful")
-                
-                # Return both output and compiled binary
-                return run_result.stdout, compiled_binary
-                
-            except subprocess.CalledProcessError as e:
-                logger.error(f"Java compilation/execution error: {e.stderr}")
-                return f"Error: {e.stderr}", None
-            except Exception as e:
-                logger.error(f"Unexpected error in Java execution: {str(e)}", exc_info=True)
-                return f"Error: {str(e)}", None
-
-    def execute_go(self, code: str) -> tuple[str, Optional[bytes]]:
-        """Execute Go code."""
-        with tempfile.NamedTemporaryFile(suffix='.go', mode='w', delete=False) as f:
-            f.write(code)
-            go_file = f.name
+            logger.info("Java execution successful")
             
-        try:
-            # Compile first
-            exe_file = go_file[:-3]  # Remove .go
-            if os.name == 'nt':
-                exe_file += '.exe'
+            # Return both output and the compiled class
+            return run_result.stdout, class_file
             
-            compile_result = subprocess.run(
-                ["go", "build", "-o", exe_file, go_file],
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Java compilation/execution error: {e.stderr}")
+            return f"Error: {e.stderr}", None
+        except Exception as e:
+            logger.error(f"Unexpected error in Java execution: {str(e)}", exc_info=True)
+            return f"Error: {str(e)}", None
+
+    def _compile_java(self, class_name: str, code: str, directory: Path) -> None:
+        """Compile into directory with the resident Java service, or with javac if it is unavailable.
+
+        Raises:
+            subprocess.CalledProcessError: If compilation fails, with the compiler messages as stderr
+        """
+        service = self._java_run_service()
+        if service is not None:
+            try:
+                status, fields = service.request("compile", class_name, code, str(directory))
+            except JvmServiceError as e:
+                logger.warning(f"{e}; compiling with javac instead")
+            else:
+                if status != "ok":
+                    raise subprocess.CalledProcessError(1, ["javac", f"{class_name}.java"], output="", stderr=fields[0])
+                return
+        java_file = directory / f"{class_name}.java"
+        java_file.write_text(code)
+        subprocess.run(
+            ["javac", str(java_file)],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=directory
+        )
+
+    def _run_on_java_service(self, language: str, classpath: Sequence[str], class_name: str) -> Optional[tuple[str, bool]]:
+        """Run a compiled program on the resident Java service.
+
+        Returns:
+            The output, or an error message, and whether the run succeeded;
+            None if the service is unavailable and the program must be run with java
+        """
+        service = self._java_run_service()
+        if service is None:
+            return None
+        try:
+            status, fields = service.request(
+                "run", classpath[0], class_name, str(int(JAVA_RUN_TIMEOUT * 1000)), *classpath[1:],
+                timeout=JAVA_RUN_TIMEOUT + service.timeout
+            )
+        except JvmServiceError as e:
+            logger.warning(f"{e}; running with java instead")
+            return None
+        if status == "timeout":
+            return f"Error: Execution timed out after {JAVA_RUN_TIMEOUT:g} seconds", False
+        if status != "ok":
+            return f"Error: {fields[0]}", False
+        stdout, stderr, exit_code = fields
+        if exit_code != "0":
+            logger.error(f"{language} execution error: {stderr}")
+            return f"Error: {stderr}", False
+        logger.info(f"{language} execution successful")
+        return stdout, True
+
+    def _java_run_service(self) -> Optional[JvmService]:
+        """The resident Java service, created on first use; None when disabled."""
+        if not JAVA_RUN_SERVICE_ENABLED:
+            return None
+        with self._jvm_service_lock:
+            if self.java_service is None:
+                command = [
+                    "java",
+                    *JVM_LOG_OPTIONS,
+                    *JAVA_RUN_SERVICE_JVM_OPTIONS,
+                    # Lets the service turn System.exit() in a program into the end of that run
+                    "-Djava.security.manager=allow",
+                    os.path.join(JVM_HELPER_DIR, "JavaRunService.java")
+                ]
+                command[1:1] = cds_options(JAVA_RUN_SERVICE_CDS_ARCHIVE, command)
+                self.java_service = JvmService(
+                    "Java run service",
+                    command,
+                    # Files written by programs go to a scratch directory, removed with the process
+                    scratch_prefix="java-run-",
+                    **JAVA_RUN_SERVICE_SETTINGS
+                )
+                atexit.register(self.java_service.close)
+            return self.java_service
+
+    def execute_go(self, code: str) -> tuple[str, Optional[str]]:
+        """Execute Go code."""
+        exe_name = "main.exe" if os.name == 'nt' else "main"
+        flags: list[str] = []
+
+        def build(directory: Path) -> None:
+            source = directory / "main.go"
+            source.write_text(code)
+            subprocess.run(
+                ["go", "build", *flags, "-o", str(directory / exe_name), str(source)],
                 capture_output=True,
                 text=True,
                 check=True
             )
-            
-            # Read compiled binary
-            with open(exe_file, 'rb') as f:
-                compiled_binary = f.read()
+
+        try:
+            # Compile first
+            exe_file = self._compile("Go", ["go", "version"], flags, code, build) / exe_name
             
             # Execute
             run_result = subprocess.run(
-                [exe_file],
+                [str(exe_file)],
                 capture_output=True,
                 text=True,
                 check=True
             )
-            return run_result.stdout, compiled_binary
+            return run_result.stdout, str(exe_file)
             
         except subprocess.CalledProcessError as e:
             return f"Error: {e.stderr}", None
         except Exception as e:
             return f"Error: {str(e)}", None
-        finally:
-            os.unlink(go_file)
-            if os.path.exists(exe_file):
-                os.unlink(exe_file)
-                
-    def execute_perl(self, code: str) -> tuple[str, Optional[bytes]]:
+
+    def execute_perl(self, code: str) -> tuple[str, Optional[str]]:
         """Execute Perl code."""
         with tempfile.NamedTemporaryFile(suffix='.pl', mode='w', delete=False) as f:
             f.write(code)
@@ -378,7 +453,7 @@ class CodeExecutor:
         finally:
             os.unlink(pl_file)
             
-    def execute_lua(self, code: str) -> tuple[str, Optional[bytes]]:
+    def execute_lua(self, code: str) -> tuple[str, Optional[str]]:
         """Execute Lua code."""
         with tempfile.NamedTemporaryFile(suffix='.lua', mode='w', delete=False) as f:
             f.write(code)
@@ -399,7 +474,7 @@ class CodeExecutor:
         finally:
             os.unlink(lua_file)
             
-    def execute_php(self, code: str) -> tuple[str, Optional[bytes]]:
+    def execute_php(self, code: str) -> tuple[str, Optional[str]]:
         """Execute PHP code."""
         with tempfile.NamedTemporaryFile(suffix='.php', mode='w', delete=False) as f:
             f.write(code)
@@ -420,50 +495,92 @@ class CodeExecutor:
         finally:
             os.unlink(php_file)
             
-    def execute_kotlin(self, code: str) -> tuple[str, Optional[bytes]]:
-        """Compile and execute Kotlin code."""
-        with tempfile.NamedTemporaryFile(suffix='.kt', mode='w', delete=False) as f:
-            f.write(code)
-            kt_file = f.name
-            
+    def execute_kotlin(self, code: str) -> tuple[str, Optional[str]]:
+        """Compile and execute Kotlin code.
+
+        Code is compiled to a jar without the Kotlin runtime, by the
+        resident compiler when it is available, and run against the
+        installation's kotlin-stdlib.jar, on the resident Java service
+        when it is available.
+        """
+        home = kotlin_home()
+        if home is None:
+            return "Error: kotlinc not found; install Kotlin or set KOTLIN_HOME", None
+        flags: list[str] = []
+
+        def build(directory: Path) -> None:
+            source = directory / "main.kt"
+            source.write_text(code)
+            self._compile_kotlin([str(source), *flags, "-d", str(directory / "main.jar")], home)
+
         try:
-            # Extract main class name (best effort)
-            class_match = re.search(r'class\s+(\w+)', code)
-            class_name = class_match.group(1) if class_match else "MainKt"
-            
             # Compile
-            jar_file = kt_file[:-3] + ".jar"
-            compile_result = subprocess.run(
-                ["kotlinc", kt_file, "-include-runtime", "-d", jar_file],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
-            # Read compiled bytecode
-            with open(jar_file, 'rb') as f:
-                compiled_binary = f.read()
+            jar_file = self._compile("Kotlin", ["kotlinc", "-version"], flags, code, build) / "main.jar"
+            classpath = [str(jar_file), os.path.join(home, "lib", "kotlin-stdlib.jar")]
+            main_class = jar_main_class(jar_file, "MainKt")
             
             # Execute
+            result = self._run_on_java_service("Kotlin", classpath, main_class)
+            if result is not None:
+                output, succeeded = result
+                return output, str(jar_file) if succeeded else None
             run_result = subprocess.run(
-                ["java", "-jar", jar_file],
+                ["java", "-cp", os.pathsep.join(classpath), main_class],
                 capture_output=True,
                 text=True,
                 check=True
             )
             
-            return run_result.stdout, compiled_binary
+            return run_result.stdout, str(jar_file)
         except subprocess.CalledProcessError as e:
             return f"Error: {e.stderr}", None
         except Exception as e:
             return f"Error: {str(e)}", None
-        finally:
-            os.unlink(kt_file)
-            jar_file = kt_file[:-3] + ".jar"
-            if os.path.exists(jar_file):
-                os.unlink(jar_file)
+
+    def _compile_kotlin(self, args: list[str], home: str) -> None:
+        """Compile with the resident Kotlin compiler, or with kotlinc if it is unavailable.
+
+        Raises:
+            subprocess.CalledProcessError: If compilation fails, with the compiler messages as stderr
+        """
+        service = self._kotlin_compile_service(home)
+        if service is not None:
+            try:
+                status, fields = service.request("compile", *args, "-kotlin-home", home)
+            except JvmServiceError as e:
+                logger.warning(f"{e}; compiling with kotlinc instead")
+            else:
+                if status != "ok":
+                    raise subprocess.CalledProcessError(1, ["kotlinc", *args], output="", stderr=fields[0])
+                return
+        subprocess.run(
+            ["kotlinc", *args],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+
+    def _kotlin_compile_service(self, home: str) -> Optional[JvmService]:
+        """The resident Kotlin compiler, created on first use; None when disabled."""
+        if not KOTLIN_COMPILE_SERVICE_ENABLED:
+            return None
+        with self._jvm_service_lock:
+            if self.kotlin_service is None:
+                self.kotlin_service = JvmService(
+                    "Kotlin compile service",
+                    [
+                        "java",
+                        *JVM_LOG_OPTIONS,
+                        *KOTLIN_COMPILE_SERVICE_JVM_OPTIONS,
+                        "-cp", os.path.join(home, "lib", "*"),
+                        os.path.join(JVM_HELPER_DIR, "KotlinCompileService.java")
+                    ],
+                    **KOTLIN_COMPILE_SERVICE_SETTINGS
+                )
+                atexit.register(self.kotlin_service.close)
+            return self.kotlin_service
                 
-    def execute_sql(self, code: str) -> tuple[str, Optional[bytes]]:
+    def execute_sql(self, code: str) -> tuple[str, Optional[str]]:
         """Execute SQL code using SQLite."""
         # Create a temporary database file
         db_file = tempfile.NamedTemporaryFile(suffix='.db', delete=False).name
@@ -515,7 +632,7 @@ class CodeExecutor:
             if os.path.exists(db_file):
                 os.unlink(db_file)
             
-    def execute_r(self, code: str) -> tuple[str, Optional[bytes]]:
+    def execute_r(self, code: str) -> tuple[str, Optional[str]]:
         """Execute R code."""
         with tempfile.NamedTemporaryFile(suffix='.R', mode='w', delete=False) as f:
             f.write(code)
@@ -536,7 +653,7 @@ class CodeExecutor:
         finally:
             os.unlink(r_file)
             
-    def execute_ruby(self, code: str) -> tuple[str, Optional[bytes]]:
+    def execute_ruby(self, code: str) -> tuple[str, Optional[str]]:
         """Execute Ruby code."""
         with tempfile.NamedTemporaryFile(suffix='.rb', mode='w', delete=False) as f:
             f.write(code)
@@ -557,83 +674,83 @@ class CodeExecutor:
         finally:
             os.unlink(rb_file)
             
-    def execute_swift(self, code: str) -> tuple[str, Optional[bytes]]:
-        """Execute Swift code."""
-        with tempfile.NamedTemporaryFile(suffix='.swift', mode='w', delete=False) as f:
-            f.write(code)
-            swift_file = f.name
-            
+    def execute_swift(self, code: str) -> tuple[str, Optional[str]]:
+        """Compile and execute Swift code."""
+        flags: list[str] = []
+
+        def build(directory: Path) -> None:
+            source = directory / "main.swift"
+            source.write_text(code)
+            subprocess.run(
+                ["swiftc", *flags, str(source), "-o", str(directory / "main")],
+                capture_output=True,
+                text=True,
+                check=True
+            )
+
         try:
+            exe_file = self._compile("Swift", ["swiftc", "--version"], flags, code, build) / "main"
             result = subprocess.run(
-                ["swift", swift_file],
+                [str(exe_file)],
                 capture_output=True,
                 text=True,
                 check=True
             )
-            return result.stdout, None
+            return result.stdout, str(exe_file)
         except subprocess.CalledProcessError as e:
             return f"Error: {e.stderr}", None
         except Exception as e:
             return f"Error: {str(e)}", None
-        finally:
-            os.unlink(swift_file)
             
-    def execute_rust(self, code: str) -> tuple[str, Optional[bytes]]:
+    def execute_rust(self, code: str) -> tuple[str, Optional[str]]:
         """Compile and execute Rust code."""
-        # Create a temporary directory for Rust project
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Create main.rs file
-            main_rs = os.path.join(temp_dir, "main.rs")
-            with open(main_rs, 'w') as f:
-                f.write(code)
-                
-            try:
-                # Compile
-                exe_file = os.path.join(temp_dir, "rustapp")
-                compile_result = subprocess.run(
-                    ["rustc", main_rs, "-o", exe_file],
-                    capture_output=True,
-                    text=True,
-                    check=True
-                )
-                
-                # Read compiled binary
-                with open(exe_file, 'rb') as f:
-                    compiled_binary = f.read()
-                
-                # Execute
-                run_result = subprocess.run(
-                    [exe_file],
-                    capture_output=True,
-                    text=True,
-                    check=True
-                )
-                
-                return run_result.stdout, compiled_binary
-            except subprocess.CalledProcessError as e:
-                return f"Error: {e.stderr}", None
-            except Exception as e:
-                return f"Error: {str(e)}", None
-                
-    def execute_csharp(self, code: str) -> tuple[str, Optional[bytes]]:
-        """Compile and execute C# code."""
-        with tempfile.NamedTemporaryFile(suffix='.cs', mode='w', delete=False) as f:
-            f.write(code)
-            cs_file = f.name
-            
+        flags: list[str] = []
+
+        def build(directory: Path) -> None:
+            main_rs = directory / "main.rs"
+            main_rs.write_text(code)
+            subprocess.run(
+                ["rustc", *flags, str(main_rs), "-o", str(directory / "rustapp")],
+                capture_output=True,
+                text=True,
+                check=True
+            )
+
         try:
-            # Compile to executable
-            exe_file = cs_file[:-3] + ".exe"
-            compile_result = subprocess.run(
-                ["mono-csc", cs_file, "-out:" + exe_file],
+            # Compile
+            exe_file = self._compile("Rust", ["rustc", "--version"], flags, code, build) / "rustapp"
+            
+            # Execute
+            run_result = subprocess.run(
+                [str(exe_file)],
                 capture_output=True,
                 text=True,
                 check=True
             )
             
-            # Read compiled binary
-            with open(exe_file, 'rb') as f:
-                compiled_binary = f.read()
+            return run_result.stdout, str(exe_file)
+        except subprocess.CalledProcessError as e:
+            return f"Error: {e.stderr}", None
+        except Exception as e:
+            return f"Error: {str(e)}", None
+                
+    def execute_csharp(self, code: str) -> tuple[str, Optional[str]]:
+        """Compile and execute C# code."""
+        flags: list[str] = []
+
+        def build(directory: Path) -> None:
+            source = directory / "main.cs"
+            source.write_text(code)
+            subprocess.run(
+                ["mono-csc", *flags, str(source), "-out:" + str(directory / "main.exe")],
+                capture_output=True,
+                text=True,
+                check=True
+            )
+
+        try:
+            # Compile to executable
+            exe_file = str(self._compile("C#", ["mono", "--version"], flags, code, build) / "main.exe")
             
             # Execute
             if os.name == 'nt':  # Windows
@@ -651,48 +768,33 @@ class CodeExecutor:
                     check=True
                 )
                 
-            return run_result.stdout, compiled_binary
+            return run_result.stdout, exe_file
         except subprocess.CalledProcessError as e:
             return f"Error: {e.stderr}", None
         except Exception as e:
             return f"Error: {str(e)}", None
-        finally:
-            os.unlink(cs_file)
-            exe_file = cs_file[:-3] + ".exe"
-            if os.path.exists(exe_file):
-                os.unlink(exe_file)
                 
-    def execute_typescript(self, code: str) -> tuple[str, Optional[bytes]]:
+    def execute_typescript(self, code: str) -> tuple[str, Optional[str]]:
         """Compile and execute TypeScript code."""
-        with tempfile.NamedTemporaryFile(suffix='.ts', mode='w', delete=False) as f:
-            f.write(code)
-            ts_file = f.name
-            
-        try:
-            # Compile TypeScript to JavaScript
-            js_file = ts_file[:-3] + ".js"
-            compile_result = subprocess.run(
-                ["tsc", ts_file, "--outFile", js_file],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
-            # Execute the compiled JavaScript
-            run_result = subprocess.run(
-                ["node", js_file],
+        flags: list[str] = []
+
+        def build(directory: Path) -> None:
+            source = directory / "main.ts"
+            source.write_text(code)
+            subprocess.run(
+                ["tsc", *flags, str(source), "--outFile", str(directory / "main.js")],
                 capture_output=True,
                 text=True,
                 check=True
             )
+
+        try:
+            # Compile TypeScript to JavaScript
+            js_file = self._compile("TypeScript", ["tsc", "--version"], flags, code, build) / "main.js"
             
-            return run_result.stdout, None
+            # Execute the compiled JavaScript in the Node.js pool
+            return self._node_output(self.node_pool.run(js_file.read_text())), None
         except subprocess.CalledProcessError as e:
             return f"Error: {e.stderr}", None
         except Exception as e:
             return f"Error: {str(e)}", None
-        finally:
-            os.unlink(ts_file)
-            js_file = ts_file[:-3] + ".js"
-            if os.path.exists(js_file):
-                os.unlink(js_file)
\ No newline at end of file
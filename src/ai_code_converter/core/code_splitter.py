@@ -0,0 +1,242 @@
+"""Module for splitting large source files into independently convertible parts."""
+
+import ast
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Pattern
+
+from src.ai_code_converter.config import CODE_UNIT_SYNTAX, COMMENT_SYNTAX
+
+logger = logging.getLogger(__name__)
+
+# Lines directly above a declaration that belong to it besides comments:
+# decorators/annotations, Rust and C# attributes, C++ template headers
+_ATTACHED_PREFIXES = ("@", "#[", "[", "template", "*", "/**", "*/")
+
+
+@dataclass(frozen=True)
+class CodeUnit:
+    """A top-level declaration with the comments and decorators above it."""
+    signature: str
+    text: str
+    start_line: int
+    is_type: bool = False
+
+    @property
+    def line_count(self) -> int:
+        return self.text.count('\n') + 1
+
+
+@dataclass
+class SplitSource:
+    """A source file split into a header and parts of whole units.
+
+    The header holds everything above the first unit (imports, constants,
+    module docs) and is converted with the first part.
+    """
+    header: str
+    imports: List[str]
+    parts: List[List[CodeUnit]] = field(default_factory=list)
+    context_type_lines: int = 20
+
+    @property
+    def units(self) -> List[CodeUnit]:
+        return [unit for part in self.parts for unit in part]
+
+    def part_text(self, index: int) -> str:
+        """Source of one part; the first part starts with the header."""
+        texts = [unit.text for unit in self.parts[index]]
+        if index == 0 and self.header.strip():
+            texts.insert(0, self.header)
+        return "\n\n".join(texts)
+
+    def context(self, index: int) -> str:
+        """Imports, types and signatures from outside a part, for its prompt.
+
+        Short type declarations are shared in full so that fields and
+        members can be used; everything else is reduced to its signature.
+        """
+        lines = [] if index == 0 else list(self.imports)
+        for position, part in enumerate(self.parts):
+            if position == index:
+                continue
+            for unit in part:
+                if unit.is_type and unit.line_count <= self.context_type_lines:
+                    lines.append(unit.text)
+                else:
+                    lines.append(unit.signature)
+        return "\n".join(lines)
+
+
+class CodeSplitter:
+    """Class for splitting source code at top-level declarations.
+
+    Declarations are found with the ``ast`` module for Python and with the
+    start-of-line patterns of ``CODE_UNIT_SYNTAX`` for other languages, so
+    only unindented declarations start a unit. Consecutive units are packed
+    into parts of up to ``max_chunk_lines`` lines; a larger unit is a part
+    of its own.
+    """
+
+    def __init__(self, max_chunk_lines: int = 150, context_type_lines: int = 20):
+        """Initialize the splitter and compile the per-language patterns."""
+        self.max_chunk_lines = max_chunk_lines
+        self.context_type_lines = context_type_lines
+        self.patterns: Dict[str, Dict[str, List[Pattern]]] = {
+            language: {kind: [re.compile(pattern) for pattern in patterns] for kind, patterns in syntax.items()}
+            for language, syntax in CODE_UNIT_SYNTAX.items()
+        }
+        self.boundary_finders = {
+            "Python": self.python_boundaries
+        }
+
+    def split(self, code: str, language: str) -> SplitSource:
+        """Split code into a header and parts of whole top-level units.
+
+        Args:
+            code: Source code
+            language: Language from SUPPORTED_LANGUAGES
+
+        Returns:
+            The split source; it has at most one part when code has no
+            recognisable top-level declarations
+        """
+        lines = code.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+        finder = self.boundary_finders.get(language, self.pattern_boundaries)
+        starts = [self._attach_leading_lines(lines, start, language) for start in finder(lines, language)]
+        starts = sorted(set(starts))
+
+        if not starts:
+            return SplitSource(header="", imports=[], parts=[[CodeUnit("", code.strip('\n'), 1)]] if code.strip() else [])
+
+        header = '\n'.join(lines[:starts[0]]).strip('\n')
+        units = []
+        for start, end in zip(starts, starts[1:] + [len(lines)]):
+            text = '\n'.join(lines[start:end]).strip('\n')
+            if text:
+                signature = self._signature(lines, start, end, language)
+                units.append(CodeUnit(signature, text, start + 1, self._matches(signature, language, "types")))
+
+        split = SplitSource(
+            header=header,
+            imports=[line for line in header.split('\n') if self.is_import(line, language)],
+            parts=self._pack(units),
+            context_type_lines=self.context_type_lines
+        )
+        logger.debug(f"Split {len(lines)} lines of {language} into {len(units)} units and {len(split.parts)} parts")
+        return split
+
+    def python_boundaries(self, lines: List[str], language: str) -> List[int]:
+        """Start lines (0-based) of Python's top-level functions and classes, decorators included."""
+        try:
+            tree = ast.parse('\n'.join(lines))
+        except (SyntaxError, ValueError) as e:
+            # Invalid or partial files still get the pattern-based split
+            logger.debug(f"Python parse failed, splitting with patterns: {e}")
+            return self.pattern_boundaries(lines, language)
+        return [
+            min([node.lineno] + [decorator.lineno for decorator in node.decorator_list]) - 1
+            for node in tree.body
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+        ]
+
+    def pattern_boundaries(self, lines: List[str], language: str) -> List[int]:
+        """Start lines (0-based) of unindented declarations matching the language's unit patterns."""
+        return [
+            index for index, line in enumerate(lines)
+            if line[:1].strip() and self._matches(line, language, "units")
+        ]
+
+    def is_import(self, line: str, language: str) -> bool:
+        """Whether a line is a top-level import, include or package declaration."""
+        return bool(line[:1].strip()) and self._matches(line.rstrip(), language, "imports")
+
+    def stitch(self, parts: List[str], language: str) -> str:
+        """Join converted parts in order with their imports gathered in one place.
+
+        Import lines repeated by several parts are kept once, and imports
+        first needed by a later part are moved to where the first part's
+        imports are. Grouped imports (Go's ``import (...)``) are flattened
+        into one import per line.
+        """
+        imports: List[str] = []
+        bodies: List[List[str]] = []
+        anchor: Optional[int] = None
+        for index, part in enumerate(parts):
+            body: List[str] = []
+            lines = iter(part.strip('\n').split('\n'))
+            for line in lines:
+                if not self.is_import(line, language):
+                    body.append(line)
+                    continue
+                if index == 0 and anchor is None:
+                    anchor = len(body)
+                for statement in self._import_statements(line, lines):
+                    if statement.strip() not in (existing.strip() for existing in imports):
+                        imports.append(statement)
+            bodies.append(body)
+
+        if imports and bodies:
+            if anchor is None:
+                bodies[0] = imports + [""] + bodies[0]
+            else:
+                bodies[0] = bodies[0][:anchor] + imports + bodies[0][anchor:]
+
+        separator = '\n\n\n' if language == "Python" else '\n\n'
+        texts = ('\n'.join(body).strip('\n') for body in bodies)
+        return separator.join(text for text in texts if text.strip()) + '\n'
+
+    @staticmethod
+    def _import_statements(line: str, lines) -> List[str]:
+        """Single-line import statements for an import line, consuming the rest of a grouped import."""
+        if not line.rstrip().endswith('('):
+            return [line.strip()]
+        keyword = line.rstrip()[:-1].strip()
+        statements = []
+        for entry in lines:
+            entry = entry.strip()
+            if entry == ')':
+                break
+            if entry and not entry.startswith(('//', '#')):
+                statements.append(f"{keyword} {entry.rstrip(',')}")
+        return statements
+
+    def _pack(self, units: List[CodeUnit]) -> List[List[CodeUnit]]:
+        parts: List[List[CodeUnit]] = []
+        size = 0
+        for unit in units:
+            if parts and size + unit.line_count <= self.max_chunk_lines:
+                parts[-1].append(unit)
+                size += unit.line_count
+            else:
+                parts.append([unit])
+                size = unit.line_count
+        return parts
+
+    def _attach_leading_lines(self, lines: List[str], start: int, language: str) -> int:
+        """Move a unit's start up over the comments and decorators directly above it."""
+        markers = tuple(COMMENT_SYNTAX.get(language, {}).get("line", [])) + _ATTACHED_PREFIXES
+        block_starts = tuple(pair[0] for pair in COMMENT_SYNTAX.get(language, {}).get("block", []))
+        while start > 0:
+            previous = lines[start - 1].strip()
+            if not previous or not previous.startswith(markers + block_starts):
+                break
+            if self.is_import(lines[start - 1], language):
+                break
+            start -= 1
+        return start
+
+    def _signature(self, lines: List[str], start: int, end: int, language: str) -> str:
+        """The declaration line of a unit, skipping the comments and decorators above it."""
+        for line in lines[start:end]:
+            if line[:1].strip() and self._matches(line, language, "units"):
+                return line.rstrip().rstrip('{').rstrip()
+        for line in lines[start:end]:
+            stripped = line.strip()
+            if stripped and not stripped.startswith(_ATTACHED_PREFIXES):
+                return line.rstrip()
+        return lines[start].rstrip()
+
+    def _matches(self, line: str, language: str, kind: str) -> bool:
+        return any(pattern.match(line) for pattern in self.patterns.get(language, {}).get(kind, []))
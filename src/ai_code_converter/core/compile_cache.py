@@ -0,0 +1,177 @@
+"""Module for caching compiled artifacts of executed code on disk."""
+
+import functools
+import hashlib
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=None)
+def toolchain_version(*command: str) -> str:
+    """Return the first line a toolchain prints for its version command.
+
+    The result is remembered for the life of the process. Missing tools
+    report ``"unavailable"`` so the compile step itself reports the error.
+    """
+    try:
+        result = subprocess.run(list(command), capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logger.warning(f"Could not get toolchain version from {' '.join(command)}: {e}")
+        return "unavailable"
+    # Some tools (javac, kotlinc) print their version to stderr
+    for line in (result.stdout + "\n" + result.stderr).splitlines():
+        if line.strip():
+            return line.strip()
+    return "unknown"
+
+
+class CompileCache:
+    """Content-addressed, size-bounded store of compiled artifacts.
+
+    Each entry is a directory named after a hash of the language, the
+    toolchain version, the compiler flags and the source code. Entries are
+    built in a scratch directory and renamed into place, so a half-written
+    entry is never visible. When the entries together exceed ``max_bytes``
+    the least recently used ones are removed; an entry's last use is its
+    directory's modification time, so the order survives restarts.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 512 * 1024 * 1024, enabled: bool = True):
+        """Initialize the cache.
+
+        Args:
+            directory: Directory holding one subdirectory per entry
+            max_bytes: Total size above which old entries are evicted
+            enabled: When False every lookup misses and entries are rebuilt
+        """
+        # Absolute, so artifacts can be run and copied from any working directory
+        self.directory = Path(directory).resolve()
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # key -> (size in bytes, last use)
+        self._entries: Dict[str, Tuple[int, float]] = {}
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for path in self.directory.iterdir():
+            if path.name.startswith("."):
+                # Scratch directory of a build that never finished
+                shutil.rmtree(path, ignore_errors=True)
+            elif path.is_dir():
+                self._entries[path.name] = (_directory_size(path), path.stat().st_mtime)
+        logger.info(f"Compile cache opened at {self.directory} with {len(self._entries)} entries")
+
+    @staticmethod
+    def make_key(language: str, toolchain: str, flags: Sequence[str], code: str) -> str:
+        """Build the cache key for source code compiled with a toolchain and flags."""
+        digest = hashlib.sha256()
+        for part in (language, toolchain, *flags):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        digest.update(b"\0")
+        digest.update(code.encode("utf-8"))
+        return digest.hexdigest()
+
+    def fetch(self, key: str, build: Callable[[Path], None]) -> Tuple[Path, bool]:
+        """Return the entry directory for key, building it on a miss.
+
+        Args:
+            key: Cache key from ``make_key``
+            build: Called with an empty directory to compile into; any
+                exception it raises is passed on and nothing is stored
+
+        Returns:
+            The entry directory and whether it was a cache hit
+        """
+        entry = self.directory / key
+        if self.enabled and self._touch(key):
+            logger.info(f"Compile cache hit: {key[:12]}")
+            return entry, True
+
+        with self._lock:
+            self.misses += 1
+        scratch = Path(tempfile.mkdtemp(prefix=".build-", dir=self.directory))
+        try:
+            start = time.monotonic()
+            build(scratch)
+            logger.info(f"Compiled {key[:12]} in {time.monotonic() - start:.2f}s")
+            size = _directory_size(scratch)
+            with self._lock:
+                if entry.exists():
+                    # Built concurrently by another run, or rebuilt with the cache disabled
+                    shutil.rmtree(entry, ignore_errors=True)
+                os.replace(scratch, entry)
+                now = time.time()
+                os.utime(entry, (now, now))
+                self._entries[key] = (size, now)
+                self._evict(keep=key)
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+        return entry, False
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            for key in list(self._entries):
+                shutil.rmtree(self.directory / key, ignore_errors=True)
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters and the store's size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": sum(size for size, _ in self._entries.values())
+            }
+
+    def _touch(self, key: str) -> bool:
+        """Mark an existing entry as just used; False if there is none."""
+        with self._lock:
+            entry = self._entries.get(key)
+            path = self.directory / key
+            if entry is None or not path.is_dir():
+                self._entries.pop(key, None)
+                return False
+            now = time.time()
+            os.utime(path, (now, now))
+            self._entries[key] = (entry[0], now)
+            self.hits += 1
+            return True
+
+    def _evict(self, keep: str) -> None:
+        """Remove least recently used entries until the store fits in max_bytes."""
+        total = sum(size for size, _ in self._entries.values())
+        by_age: List[str] = sorted(self._entries, key=lambda key: self._entries[key][1])
+        for key in by_age:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                # The entry just built is about to be run
+                continue
+            total -= self._entries.pop(key)[0]
+            shutil.rmtree(self.directory / key, ignore_errors=True)
+            self.evictions += 1
+            logger.info(f"Evicted compile cache entry {key[:12]}")
+
+
+def _directory_size(path: Path) -> int:
+    """Total size of the files below path."""
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
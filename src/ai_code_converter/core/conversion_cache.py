@@ -0,0 +1,210 @@
+"""Module for caching conversion results across requests and restarts."""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ConversionCache:
+    """Two-tier cache of converted code.
+
+    An in-memory LRU sits in front of an on-disk SQLite store. Entries are
+    keyed by a hash of the rendered prompt, the provider model id and the
+    temperature, and expire after ``max_age`` seconds.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str],
+        memory_entries: int = 256,
+        max_entries: int = 5000,
+        max_age: float = 7 * 24 * 3600,
+        enabled: bool = True,
+        touch_interval: float = 60.0
+    ):
+        """Initialize the cache.
+
+        Args:
+            path: SQLite database file, or None for a memory-only cache
+            memory_entries: Maximum number of entries kept in the LRU tier
+            max_entries: Maximum number of entries kept on disk
+            max_age: Maximum entry age in seconds
+            enabled: When False every lookup misses and nothing is stored
+            touch_interval: Seconds between writes of the access times of
+                memory-tier hits to disk; they are also written before every
+                disk eviction
+        """
+        self.enabled = enabled
+        self.memory_entries = memory_entries
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.touch_interval = touch_interval
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        # Access times of memory-tier hits not yet written to disk
+        self._touched: Dict[str, float] = {}
+        self._last_touch_flush = time.time()
+        self.hits = 0
+        self.memory_hits = 0
+        self.misses = 0
+
+        if path and enabled:
+            try:
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS conversions ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                    "created REAL NOT NULL, accessed REAL NOT NULL)"
+                )
+                self._db.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON conversions (accessed)")
+                self._db.commit()
+                logger.info(f"Conversion cache opened at {path}")
+            except sqlite3.Error as e:
+                logger.error(f"Could not open conversion cache at {path}, using memory only: {e}")
+                self._db = None
+
+    @staticmethod
+    def make_key(prompt: str, model_id: str, temperature: float) -> str:
+        """Build the cache key for a rendered prompt sent to a model."""
+        digest = hashlib.sha256()
+        digest.update(model_id.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(f"{float(temperature):.3f}".encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(prompt.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached conversion for key, or None on a miss."""
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created = entry
+                if now - created <= self.max_age:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    self.memory_hits += 1
+                    self._touch(key, now)
+                    return value
+                del self._memory[key]
+
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT value, created FROM conversions WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row is not None:
+                        value, created = row
+                        if now - created <= self.max_age:
+                            self._db.execute(
+                                "UPDATE conversions SET accessed = ? WHERE key = ?", (now, key)
+                            )
+                            self._db.commit()
+                            self._remember(key, value, created)
+                            self.hits += 1
+                            return value
+                        self._db.execute("DELETE FROM conversions WHERE key = ?", (key,))
+                        self._db.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"Conversion cache read failed: {e}")
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        """Store a conversion result."""
+        if not self.enabled or not value:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            if self._db is None:
+                return
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO conversions (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                    (key, value, now, now)
+                )
+                self._flush_touched(now)
+                self._evict_disk(now)
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Conversion cache write failed: {e}")
+
+    def clear(self) -> None:
+        """Remove every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM conversions")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters and tier sizes."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            disk_entries = 0
+            if self._db is not None:
+                disk_entries = self._db.execute("SELECT COUNT(*) FROM conversions").fetchone()[0]
+            return {
+                "enabled": self.enabled,
+                "hits": self.hits,
+                "memory_hits": self.memory_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries
+            }
+
+    def _remember(self, key: str, value: str, created: float) -> None:
+        """Insert into the LRU tier, evicting the least recently used entries."""
+        self._memory[key] = (value, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _touch(self, key: str, now: float) -> None:
+        """Record a memory-tier hit, so disk eviction sees the entry as recently used."""
+        if self._db is None:
+            return
+        self._touched[key] = now
+        if now - self._last_touch_flush >= self.touch_interval:
+            try:
+                self._flush_touched(now)
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Conversion cache write failed: {e}")
+
+    def _flush_touched(self, now: float) -> None:
+        """Write the access times of memory-tier hits to disk."""
+        if self._touched:
+            self._db.executemany(
+                "UPDATE conversions SET accessed = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._touched.items()]
+            )
+            self._touched.clear()
+        self._last_touch_flush = now
+
+    def _evict_disk(self, now: float) -> None:
+        """Drop expired entries and trim the store to max_entries."""
+        self._db.execute("DELETE FROM conversions WHERE created < ?", (now - self.max_age,))
+        self._db.execute(
+            "DELETE FROM conversions WHERE key IN ("
+            "SELECT key FROM conversions ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
@@ -0,0 +1,132 @@
+"""Module for stripping Markdown code fences from streamed model responses."""
+
+import logging
+import re
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+FENCE = "```"
+
+# A line with its newline, or the incomplete last line of a fragment
+_SEGMENT = re.compile(r"[^\n]*\n|[^\n]+")
+
+# Introductory sentences models put above unfenced code ("Here is the converted code:")
+_CHATTER = re.compile(
+    r"^(here\s+is|here's|below\s+is|sure|certainly)\b.*[:.!]$",
+    re.IGNORECASE
+)
+
+
+class FenceStripper:
+    """Incrementally turn a fenced model response into plain code.
+
+    Feed the response text as it arrives; ``feed`` returns the code that
+    is known to be final. The first fence opens the code, and whatever
+    prose came before it is dropped. Until a fence arrives, text is held
+    back, since it may be such prose; a response without any fence is
+    returned by ``finish``, less blank and chatter lines at its start.
+    Inside the code, a line is held back only while it could still be the
+    closing fence; other text is passed through immediately. Trailing
+    whitespace is held until more code follows, so the output matches a
+    stripped response.
+
+    Only a bare fence (no language tag) closes the code. A fence with a
+    language tag inside the code opens a nested example, such as one in a
+    docstring, which is kept along with the bare fence that ends it. Once
+    the fence that closes the code arrives, ``closed`` is set and the rest
+    of the response (usually explanations) is ignored, so the caller can
+    stop reading the stream.
+    """
+
+    def __init__(self):
+        """Initialize the stripper for a new response."""
+        self.closed = False
+        self._opened = False
+        self._held: List[str] = []
+        self._nested = 0
+        self._line = ""
+        self._line_emitted = False
+        self._pending_whitespace = ""
+
+    def feed(self, text: str) -> str:
+        """Consume a fragment of the response and return the code it completes."""
+        out: List[str] = []
+        if self.closed:
+            return ""
+        for segment in _SEGMENT.findall(text):
+            if self.closed:
+                break
+            if self._line_emitted:
+                # The start of this line was already passed through as code
+                self._emit(segment, out)
+                self._line_emitted = not segment.endswith("\n")
+                continue
+            self._line += segment
+            if self._line.endswith("\n"):
+                line, self._line = self._line, ""
+                self._process_line(line, out)
+            elif not self._undecided(self._line):
+                self._emit(self._line, out)
+                self._line = ""
+                self._line_emitted = True
+        return "".join(out)
+
+    def finish(self) -> str:
+        """Flush a held final line at the end of the response."""
+        out: List[str] = []
+        if self._line and not self.closed:
+            self._process_line(self._line, out)
+        if not self._opened:
+            # No fence at all: the response is the code, after any chatter
+            lines = self._held
+            while lines and (not lines[0].strip() or _CHATTER.match(lines[0].strip())):
+                lines = lines[1:]
+            for line in lines:
+                self._emit(line, out)
+        self._held = []
+        self._line = ""
+        self._pending_whitespace = ""
+        return "".join(out)
+
+    def _undecided(self, partial: str) -> bool:
+        """Whether an incomplete line may still turn out to be a fence or prose."""
+        if not self._opened:
+            return True
+        stripped = partial.lstrip()
+        return stripped.startswith(FENCE) or FENCE.startswith(stripped)
+
+    def _process_line(self, line: str, out: List[str]) -> None:
+        stripped = line.strip()
+        is_fence = stripped.startswith(FENCE)
+        if not self._opened:
+            if is_fence:
+                # The opening fence (with or without a language tag) and the prose before it are dropped
+                self._opened = True
+                self._held = []
+            else:
+                self._held.append(line)
+            return
+        if is_fence and stripped.strip("`"):
+            # A fenced example inside the code, e.g. in a docstring
+            self._nested += 1
+        elif is_fence and self._nested:
+            self._nested -= 1
+        elif is_fence:
+            self.closed = True
+            self._pending_whitespace = ""
+            return
+        self._emit(line, out)
+
+    def _emit(self, text: str, out: List[str]) -> None:
+        text = self._pending_whitespace + text
+        body = text.rstrip()
+        self._pending_whitespace = text[len(body):]
+        if body:
+            out.append(body)
+
+
+def strip_code_fences(response: str) -> str:
+    """Strip the prose and code fences around the code of a complete response."""
+    stripper = FenceStripper()
+    return stripper.feed(response) + stripper.finish()
@@ -83,7 +83,7 @@ Note: The class name in the Java file must be 'Main' for these instructions.
 """
         return readme
 
-    def create_compilation_zip(self, code: str, language: str, compiled_code: Optional[bytes] = None) -> Tuple[Optional[str], Optional[str]]:
+    def create_compilation_zip(self, code: str, language: str, compiled_file: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
         """Create a zip file containing source, compiled files, and README."""
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -97,15 +97,15 @@ Note: The class name in the Java file must be 'Main' for these instructions.
                 # Write source code with standardized names
                 if language == "C++":
                     source_file = temp_dir_path / "main.cpp"
-                    compiled_file = temp_dir_path / ("main.exe" if os.name == 'nt' else "main")
+                    compiled_target = temp_dir_path / ("main.exe" if os.name == 'nt' else "main")
                     files_included.extend(["main.cpp", "main.exe" if os.name == 'nt' else "main"])
                 elif language == "Java":
                     source_file = temp_dir_path / "Main.java"
-                    compiled_file = temp_dir_path / "Main.class"
+                    compiled_target = temp_dir_path / "Main.class"
                     files_included.extend(["Main.java", "Main.class"])
                 elif language == "Go":
                     source_file = temp_dir_path / "main.go"
-                    compiled_file = temp_dir_path / ("main.exe" if os.name == 'nt' else "main")
+                    compiled_target = temp_dir_path / ("main.exe" if os.name == 'nt' else "main")
                     files_included.extend(["main.go", "main.exe" if os.name == 'nt' else "main"])
                 else:
                     return None, None
@@ -114,13 +114,12 @@ Note: The class name in the Java file must be 'Main' for these instructions.
                 source_file.write_text(code)
                 
                 # Write compiled code if available
-                if compiled_code:
-                    logger.info(f"Writing compiled binary: {compiled_file}")
+                if compiled_file:
+                    logger.info(f"Copying compiled binary {compiled_file} to {compiled_target}")
                     try:
-                        # Ensure the file is writable
-                        compiled_file.parent.mkdir(parents=True, exist_ok=True)
-                        compiled_file.write_bytes(compiled_code)
-                        logger.info(f"Successfully wrote compiled binary: {compiled_file}")
+                        # Copied from the compile cache, keeping the executable bit
+                        shutil.copy(compiled_file, compiled_target)
+                        logger.info(f"Successfully wrote compiled binary: {compiled_target}")
                     except Exception as e:
                         logger.error(f"Error writing compiled binary: {e}", exc_info=True)
                 else:
@@ -163,7 +162,7 @@ Note: The class name in the Java file must be 'Main' for these instructions.
             logger.error(f"Error creating compilation zip: {str(e)}", exc_info=True)
             return None, None
 
-    def prepare_download(self, code: str, language: str, compiled_code: Optional[bytes] = None) -> Tuple[Optional[str], Optional[str]]:
+    def prepare_download(self, code: str, language: str, compiled_file: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
         """Prepare code for download with consistent naming."""
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -173,11 +172,11 @@ Note: The class name in the Java file must be 'Main' for these instructions.
             # For compiled languages, create a zip with source and instructions
             if language in ["C++", "Java", "Go"]:
                 logger.info(f"Creating compilation zip for {language}")
-                # Pass compiled_code directly as bytes
+                # The compiled artifact is read from the compile cache
                 return self.create_compilation_zip(
                     code=code,
                     language=language,
-                    compiled_code=compiled_code if isinstance(compiled_code, bytes) else None
+                    compiled_file=compiled_file
                 )
             
             # For interpreted languages, create a single file with timestamp
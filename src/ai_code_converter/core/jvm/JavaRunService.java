@@ -0,0 +1,339 @@
+import java.io.BufferedReader;
+import java.io.ByteArrayInputStream;
+import java.io.ByteArrayOutputStream;
+import java.io.FileDescriptor;
+import java.io.FileOutputStream;
+import java.io.IOException;
+import java.io.InputStream;
+import java.io.InputStreamReader;
+import java.io.PrintStream;
+import java.io.PrintWriter;
+import java.io.StringWriter;
+import java.lang.reflect.InvocationTargetException;
+import java.lang.reflect.Method;
+import java.lang.reflect.Modifier;
+import java.net.URI;
+import java.net.URL;
+import java.net.URLClassLoader;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.nio.file.Paths;
+import java.security.Permission;
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.Base64;
+import java.util.Comparator;
+import java.util.List;
+import java.util.stream.Stream;
+import javax.tools.JavaCompiler;
+import javax.tools.JavaFileObject;
+import javax.tools.SimpleJavaFileObject;
+import javax.tools.StandardJavaFileManager;
+import javax.tools.StandardLocation;
+import javax.tools.ToolProvider;
+
+/**
+ * Resident Java compiler and runner used by the code converter (see jvm_service.py).
+ *
+ * Start with {@code java -Djava.security.manager=allow JavaRunService.java}.
+ * Sources are compiled in memory with javax.tools; every run loads the
+ * program in its own class loader and threads, with System.out, System.err
+ * and System.in replaced for the duration of the run. System.exit() in the
+ * program ends the run, not the service. When threads of a run cannot be
+ * stopped, the service answers and then halts, and is restarted by its
+ * client.
+ *
+ * Requests:
+ *   ping                         -> ok
+ *   compile CLASS SOURCE DIR     -> ok MESSAGES | error MESSAGES
+ *   run DIR CLASS TIMEOUT_MILLIS [PATH...]
+ *                                -> ok STDOUT STDERR EXIT_CODE | timeout STDOUT STDERR | error MESSAGE
+ *
+ * DIR is a class directory or jar; further PATHs, such as kotlin-stdlib.jar,
+ * are added to the program's class path.
+ *
+ * With {@code --train} the service compiles and runs a sample program and
+ * exits; run it with -XX:ArchiveClassesAtExit to build a class data sharing
+ * archive for later starts.
+ */
+public class JavaRunService {
+
+    /** Thrown in place of System.exit() by threads of a run. */
+    static final class ExitTrap extends SecurityException {
+        final int status;
+
+        ExitTrap(int status) {
+            super("System.exit(" + status + ")");
+            this.status = status;
+        }
+    }
+
+    /** Threads of one run; records System.exit() and the exit code. */
+    static final class RunGroup extends ThreadGroup {
+        volatile Thread mainThread;
+        volatile boolean exitCalled;
+        volatile int exitCode;
+
+        RunGroup() {
+            super("run");
+        }
+
+        void exited(int status) {
+            exitCode = status;
+            exitCalled = true;
+        }
+
+        @Override
+        public void uncaughtException(Thread thread, Throwable e) {
+            if (e instanceof ExitTrap) {
+                exited(((ExitTrap) e).status);
+                return;
+            }
+            if (thread == mainThread && !exitCalled) {
+                exitCode = 1;
+            }
+            // Prints the stack trace to System.err, as the java launcher does
+            super.uncaughtException(thread, e);
+        }
+    }
+
+    private static final long STOP_GRACE_MILLIS = 500;
+
+    private static PrintStream responses;
+    private static JavaCompiler compiler;
+    private static StandardJavaFileManager fileManager;
+
+    public static void main(String[] args) throws Exception {
+        responses = new PrintStream(new FileOutputStream(FileDescriptor.out), true, "UTF-8");
+        // Nothing but responses may reach the protocol stream
+        System.setOut(System.err);
+        installExitTrap();
+
+        if (args.length > 0 && args[0].equals("--train")) {
+            train();
+            return;
+        }
+
+        BufferedReader requests = new BufferedReader(new InputStreamReader(System.in, StandardCharsets.UTF_8));
+        String line;
+        while ((line = requests.readLine()) != null) {
+            String[] fields = line.split("\t", -1);
+            String[] values = Arrays.stream(fields, 1, fields.length)
+                .map(JavaRunService::decode)
+                .toArray(String[]::new);
+            try {
+                switch (fields[0]) {
+                    case "ping":
+                        respond("ok");
+                        break;
+                    case "compile":
+                        respond(compile(values[0], values[1], Paths.get(values[2])));
+                        break;
+                    case "run":
+                        List<Path> classPath = new ArrayList<>();
+                        classPath.add(Paths.get(values[0]));
+                        for (int i = 3; i < values.length; i++) {
+                            classPath.add(Paths.get(values[i]));
+                        }
+                        run(classPath, values[1], Long.parseLong(values[2]));
+                        break;
+                    default:
+                        respond("error", "Unknown command: " + fields[0]);
+                }
+            } catch (Exception e) {
+                StringWriter trace = new StringWriter();
+                e.printStackTrace(new PrintWriter(trace));
+                respond("error", trace.toString());
+            }
+        }
+    }
+
+    static String[] compile(String className, String source, Path outputDir) throws IOException {
+        if (compiler == null) {
+            compiler = ToolProvider.getSystemJavaCompiler();
+            if (compiler == null) {
+                return new String[] {"error", "No Java compiler available; a JDK is required"};
+            }
+            // Kept open, so the platform class index is read only once
+            fileManager = compiler.getStandardFileManager(null, null, StandardCharsets.UTF_8);
+        }
+        fileManager.setLocation(StandardLocation.CLASS_OUTPUT, List.of(outputDir.toFile()));
+        JavaFileObject unit = new SimpleJavaFileObject(
+                URI.create("string:///" + className + ".java"), JavaFileObject.Kind.SOURCE) {
+            @Override
+            public CharSequence getCharContent(boolean ignoreEncodingErrors) {
+                return source;
+            }
+        };
+        StringWriter messages = new StringWriter();
+        boolean ok = compiler.getTask(messages, fileManager, null, List.of("-proc:none"), null, List.of(unit)).call();
+        return new String[] {ok ? "ok" : "error", messages.toString()};
+    }
+
+    static void run(List<Path> classPath, String className, long timeoutMillis) throws Exception {
+        ByteArrayOutputStream stdout = new ByteArrayOutputStream();
+        ByteArrayOutputStream stderr = new ByteArrayOutputStream();
+        RunGroup group = new RunGroup();
+        boolean finished;
+        boolean stopped;
+
+        URL[] urls = new URL[classPath.size()];
+        for (int i = 0; i < urls.length; i++) {
+            urls[i] = classPath.get(i).toUri().toURL();
+        }
+
+        try (URLClassLoader loader = new URLClassLoader(urls, ClassLoader.getPlatformClassLoader())) {
+            Method main = Class.forName(className, false, loader).getMethod("main", String[].class);
+            if (!Modifier.isStatic(main.getModifiers())) {
+                respond("error", "main method of " + className + " is not static");
+                return;
+            }
+            Thread thread = new Thread(group, () -> {
+                try {
+                    main.invoke(null, (Object) new String[0]);
+                } catch (InvocationTargetException e) {
+                    Throwable cause = e.getCause();
+                    if (cause instanceof ExitTrap) {
+                        group.exited(((ExitTrap) cause).status);
+                    } else {
+                        group.uncaughtException(Thread.currentThread(), cause);
+                    }
+                } catch (IllegalAccessException e) {
+                    group.uncaughtException(Thread.currentThread(), e);
+                }
+            }, "main");
+            thread.setContextClassLoader(loader);
+            group.mainThread = thread;
+
+            PrintStream out = System.out;
+            PrintStream err = System.err;
+            InputStream in = System.in;
+            System.setOut(new PrintStream(stdout, true, "UTF-8"));
+            System.setErr(new PrintStream(stderr, true, "UTF-8"));
+            System.setIn(new ByteArrayInputStream(new byte[0]));
+            try {
+                thread.start();
+                finished = awaitThreads(group, System.nanoTime() + timeoutMillis * 1_000_000L);
+                // Threads left behind by System.exit(), daemons or a timeout
+                group.interrupt();
+                stopped = awaitAll(group, System.nanoTime() + STOP_GRACE_MILLIS * 1_000_000L);
+            } finally {
+                System.out.flush();
+                System.err.flush();
+                System.setOut(out);
+                System.setErr(err);
+                System.setIn(in);
+            }
+        }
+
+        String output = stdout.toString("UTF-8");
+        String errors = stderr.toString("UTF-8");
+        if (finished) {
+            respond("ok", output, errors, String.valueOf(group.exitCode));
+        } else {
+            respond("timeout", output, errors);
+        }
+        if (!stopped) {
+            // A thread ignores interrupts; only a new process is clean again
+            Runtime.getRuntime().halt(3);
+        }
+    }
+
+    /** Wait until every non-daemon thread of the group ended or System.exit() was called. */
+    private static boolean awaitThreads(RunGroup group, long deadline) throws InterruptedException {
+        while (!group.exitCalled) {
+            Thread live = firstLive(group, false);
+            if (live == null) {
+                return true;
+            }
+            long remaining = (deadline - System.nanoTime()) / 1_000_000L;
+            if (remaining <= 0) {
+                return false;
+            }
+            // Wake up regularly to notice System.exit() from another thread
+            live.join(Math.max(1, Math.min(remaining, 50)));
+        }
+        return true;
+    }
+
+    /** Wait until every thread of the group, daemons included, ended. */
+    private static boolean awaitAll(ThreadGroup group, long deadline) throws InterruptedException {
+        Thread live;
+        while ((live = firstLive(group, true)) != null) {
+            long remaining = (deadline - System.nanoTime()) / 1_000_000L;
+            if (remaining <= 0) {
+                return false;
+            }
+            live.join(Math.max(1, remaining));
+        }
+        return true;
+    }
+
+    private static Thread firstLive(ThreadGroup group, boolean includeDaemons) {
+        Thread[] threads = new Thread[group.activeCount() + 8];
+        int count = group.enumerate(threads);
+        for (int i = 0; i < count; i++) {
+            if (threads[i].isAlive() && (includeDaemons || !threads[i].isDaemon())) {
+                return threads[i];
+            }
+        }
+        return null;
+    }
+
+    @SuppressWarnings("removal")
+    private static void installExitTrap() {
+        try {
+            System.setSecurityManager(new SecurityManager() {
+                @Override
+                public void checkPermission(Permission permission) {
+                }
+
+                @Override
+                public void checkPermission(Permission permission, Object context) {
+                }
+
+                @Override
+                public void checkExit(int status) {
+                    for (ThreadGroup g = Thread.currentThread().getThreadGroup(); g != null; g = g.getParent()) {
+                        if (g instanceof RunGroup) {
+                            throw new ExitTrap(status);
+                        }
+                    }
+                }
+            });
+        } catch (UnsupportedOperationException e) {
+            // No security manager on this JDK: System.exit() ends the service, which is then restarted
+        }
+    }
+
+    private static void train() throws Exception {
+        Path dir = Files.createTempDirectory("java-run-service");
+        try {
+            // Training has no client; its responses go to stderr
+            responses = System.err;
+            compile("Main", "public class Main { public static void main(String[] args) { System.out.println(\"ready\"); } }", dir);
+            run(List.of(dir), "Main", 10_000);
+        } finally {
+            try (Stream<Path> paths = Files.walk(dir)) {
+                paths.sorted(Comparator.reverseOrder()).forEach(path -> path.toFile().delete());
+            }
+        }
+    }
+
+    private static void respond(String... fields) {
+        StringBuilder line = new StringBuilder(fields[0]);
+        for (int i = 1; i < fields.length; i++) {
+            line.append('\t').append(encode(fields[i]));
+        }
+        responses.println(line);
+    }
+
+    private static String decode(String field) {
+        return new String(Base64.getDecoder().decode(field), StandardCharsets.UTF_8);
+    }
+
+    private static String encode(String value) {
+        return Base64.getEncoder().encodeToString(value.getBytes(StandardCharsets.UTF_8));
+    }
+}
@@ -0,0 +1,69 @@
+import java.io.BufferedReader;
+import java.io.ByteArrayOutputStream;
+import java.io.FileDescriptor;
+import java.io.FileOutputStream;
+import java.io.InputStreamReader;
+import java.io.PrintStream;
+import java.lang.reflect.Method;
+import java.nio.charset.StandardCharsets;
+import java.util.Arrays;
+import java.util.Base64;
+
+/**
+ * Resident Kotlin compiler used by the code converter (see jvm_service.py).
+ *
+ * Start with the Kotlin compiler's lib directory on the class path:
+ * {@code java -cp "$KOTLIN_HOME/lib/*" KotlinCompileService.java}. The
+ * compiler stays loaded and JIT-compiled between requests.
+ *
+ * Requests:
+ *   ping                 -> ok
+ *   compile ARG...       -> ok MESSAGES | error MESSAGES
+ * where ARG... are kotlinc command line arguments.
+ */
+public class KotlinCompileService {
+
+    public static void main(String[] args) throws Exception {
+        BufferedReader requests = new BufferedReader(new InputStreamReader(System.in, StandardCharsets.UTF_8));
+        PrintStream responses = new PrintStream(new FileOutputStream(FileDescriptor.out), true, "UTF-8");
+        // Whatever the compiler prints itself must not reach the protocol stream
+        System.setOut(System.err);
+
+        Class<?> compilerClass = Class.forName("org.jetbrains.kotlin.cli.jvm.K2JVMCompiler");
+        Method exec = compilerClass.getMethod("exec", PrintStream.class, String[].class);
+
+        String line;
+        while ((line = requests.readLine()) != null) {
+            String[] fields = line.split("\t", -1);
+            String command = fields[0];
+            if (command.equals("ping")) {
+                responses.println("ok");
+            } else if (command.equals("compile")) {
+                String[] compilerArgs = Arrays.stream(fields, 1, fields.length)
+                    .map(KotlinCompileService::decode)
+                    .toArray(String[]::new);
+                ByteArrayOutputStream messages = new ByteArrayOutputStream();
+                String status;
+                try (PrintStream messageStream = new PrintStream(messages, true, "UTF-8")) {
+                    Object exitCode = exec.invoke(compilerClass.getDeclaredConstructor().newInstance(),
+                                                  messageStream, compilerArgs);
+                    status = exitCode.toString().equals("OK") ? "ok" : "error";
+                } catch (Throwable e) {
+                    e.printStackTrace(new PrintStream(messages, true, "UTF-8"));
+                    status = "error";
+                }
+                responses.println(status + "\t" + encode(messages.toString("UTF-8")));
+            } else {
+                responses.println("error\t" + encode("Unknown command: " + command));
+            }
+        }
+    }
+
+    private static String decode(String field) {
+        return new String(Base64.getDecoder().decode(field), StandardCharsets.UTF_8);
+    }
+
+    private static String encode(String value) {
+        return Base64.getEncoder().encodeToString(value.getBytes(StandardCharsets.UTF_8));
+    }
+}
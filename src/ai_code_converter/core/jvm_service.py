@@ -0,0 +1,250 @@
+"""Resident JVM helper processes for compiling and running JVM languages.
+
+Starting a JVM, and warming up a compiler inside it, costs seconds. A
+``JvmService`` keeps one helper process alive and sends it requests over a
+pipe instead. The helpers are single-file Java programs in the ``jvm``
+directory next to this module, launched with ``java <File>.java``.
+
+Each request and each response is one line of tab-separated fields. The
+first field is a plain command or status word, and every further field
+is base64 encoded UTF-8, so field values may contain tabs and newlines.
+Every helper answers ``ping`` with ``ok``.
+"""
+
+import base64
+import contextlib
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Directory with the helpers' Java sources
+JVM_HELPER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "jvm")
+
+# JVM log messages go to stdout by default, where they would corrupt the protocol
+JVM_LOG_OPTIONS = ["-Xlog:disable", "-Xlog:all=warning:stderr"]
+
+
+class JvmServiceError(RuntimeError):
+    """The helper process could not be started, died, or did not answer in time."""
+
+
+def encode_request(command: str, fields: Sequence[str]) -> bytes:
+    """Encode one request line."""
+    encoded = [base64.b64encode(field.encode("utf-8")).decode("ascii") for field in fields]
+    return "\t".join([command, *encoded]).encode("ascii") + b"\n"
+
+
+def decode_response(line: bytes) -> Tuple[str, List[str]]:
+    """Decode one response line into its status and fields."""
+    status, *fields = line.decode("ascii").rstrip("\r\n").split("\t")
+    return status, [base64.b64decode(field).decode("utf-8") for field in fields]
+
+
+def cds_options(archive: Optional[str], java_command: Sequence[str], timeout: float = 120.0) -> List[str]:
+    """JVM options that start a helper from a class data sharing archive.
+
+    The archive is a dynamic AppCDS archive of the classes a helper loads,
+    written by a training run of ``java_command`` with ``--train`` the
+    first time it is needed. Starting from it saves most of the class
+    loading of later JVM starts. Returns no options when ``archive`` is
+    None or the training run fails.
+    """
+    if not archive:
+        return []
+    # Helpers may run in another working directory
+    archive = os.path.abspath(archive)
+    if not os.path.exists(archive):
+        os.makedirs(os.path.dirname(archive), exist_ok=True)
+        java, *arguments = java_command
+        start = time.monotonic()
+        try:
+            subprocess.run(
+                [java, f"-XX:ArchiveClassesAtExit={archive}", *arguments, "--train"],
+                capture_output=True,
+                timeout=timeout,
+                check=True
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.warning(f"Could not build class data sharing archive {archive}: {e}")
+            return []
+        if not os.path.exists(archive):
+            logger.warning(f"The JVM did not write class data sharing archive {archive}")
+            return []
+        logger.info(f"Built class data sharing archive {archive} in {time.monotonic() - start:.2f}s")
+    return [f"-XX:SharedArchiveFile={archive}"]
+
+
+class JvmService:
+    """One resident helper process, started on demand and restarted when unhealthy.
+
+    Requests are answered one at a time. The process is started on the
+    first request and must answer a ``ping`` within ``startup_timeout``.
+    It is stopped, and started again on the next request, when it dies,
+    when a request exceeds its timeout, and after ``max_requests``
+    requests, which bounds what a long-lived compiler can leak.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        command: Sequence[str],
+        timeout: float = 60.0,
+        startup_timeout: float = 60.0,
+        max_requests: int = 200,
+        cwd: Optional[str] = None,
+        scratch_prefix: Optional[str] = None
+    ):
+        """Initialize the service; no process is started until needed (see ``warm_up``).
+
+        Args:
+            name: Name used in logs
+            command: Command line that starts the helper
+            timeout: Default seconds a request may take
+            startup_timeout: Seconds a new helper has to answer its first ping
+            max_requests: Requests after which the helper is restarted
+            cwd: Working directory of the helper
+            scratch_prefix: If set, each helper process instead works in a new
+                temporary directory with this prefix, removed when it stops
+        """
+        self.name = name
+        self.command = list(command)
+        self.timeout = timeout
+        self.startup_timeout = startup_timeout
+        self.max_requests = max_requests
+        self.cwd = cwd
+        self.scratch_prefix = scratch_prefix
+        self.starts = 0
+        self.restarts = 0
+        self._process: Optional[subprocess.Popen] = None
+        self._scratch_dir: Optional[str] = None
+        self._responses: "queue.Queue[Optional[bytes]]" = queue.Queue()
+        self._requests = 0
+        self._lock = threading.Lock()
+
+    def warm_up(self) -> None:
+        """Start the helper now so the first request does not wait for it."""
+        with self._lock:
+            self._ensure_started()
+
+    def request(self, command: str, *fields: str, timeout: Optional[float] = None) -> Tuple[str, List[str]]:
+        """Send a request and return the helper's status and fields.
+
+        Raises:
+            JvmServiceError: If the helper cannot be started, dies or times out
+        """
+        with self._lock:
+            self._ensure_started()
+            response = self._exchange(command, fields, self.timeout if timeout is None else timeout)
+            self._requests += 1
+            if self._requests >= self.max_requests:
+                self._stop(f"{self._requests} requests")
+            return response
+
+    def ping(self) -> bool:
+        """Health check: True if the helper is running and answers."""
+        with self._lock:
+            if not self._alive():
+                return False
+            try:
+                return self._exchange("ping", (), self.startup_timeout)[0] == "ok"
+            except JvmServiceError:
+                return False
+
+    def close(self) -> None:
+        """Stop the helper; the next request starts a new one."""
+        with self._lock:
+            self._stop(None)
+
+    def stats(self) -> Dict[str, object]:
+        """Process state for monitoring."""
+        return {
+            "name": self.name,
+            "running": self._alive(),
+            "starts": self.starts,
+            "restarts": self.restarts,
+            "requests": self._requests
+        }
+
+    def _alive(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def _ensure_started(self) -> None:
+        if self._alive():
+            return
+        if self._process is not None:
+            self._stop("exited unexpectedly")
+        start = time.monotonic()
+        cwd = self.cwd
+        if self.scratch_prefix is not None:
+            cwd = self._scratch_dir = tempfile.mkdtemp(prefix=self.scratch_prefix)
+        try:
+            self._process = subprocess.Popen(
+                self.command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                cwd=cwd
+            )
+        except OSError as e:
+            self._remove_scratch_dir()
+            raise JvmServiceError(f"Could not start the {self.name}: {e}") from e
+        self._responses = queue.Queue()
+        self._requests = 0
+        self.starts += 1
+        threading.Thread(target=self._read, args=(self._process, self._responses),
+                         name=f"{self.name}-reader", daemon=True).start()
+        status, _ = self._exchange("ping", (), self.startup_timeout)
+        if status != "ok":
+            self._stop("failed health check")
+            raise JvmServiceError(f"The {self.name} failed its health check")
+        logger.info(f"Started {self.name} (pid {self._process.pid}) in {time.monotonic() - start:.2f}s")
+
+    @staticmethod
+    def _read(process: subprocess.Popen, responses: "queue.Queue[Optional[bytes]]") -> None:
+        for line in process.stdout:
+            responses.put(line)
+        # End of output: the helper exited
+        responses.put(None)
+
+    def _exchange(self, command: str, fields: Sequence[str], timeout: float) -> Tuple[str, List[str]]:
+        try:
+            self._process.stdin.write(encode_request(command, fields))
+            self._process.stdin.flush()
+            line = self._responses.get(timeout=timeout)
+        except OSError:
+            line = None
+        except queue.Empty:
+            self._stop(f"no answer within {timeout:g}s")
+            raise JvmServiceError(f"The {self.name} did not answer within {timeout:g} seconds")
+        if line is None:
+            self._stop("exited unexpectedly")
+            raise JvmServiceError(f"The {self.name} exited unexpectedly")
+        return decode_response(line)
+
+    def _stop(self, reason: Optional[str]) -> None:
+        process, self._process = self._process, None
+        if process is None:
+            return
+        if reason is not None:
+            self.restarts += 1
+            logger.info(f"Stopping {self.name} (pid {process.pid}) after {reason}")
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+        for stream in (process.stdin, process.stdout):
+            with contextlib.suppress(OSError):
+                stream.close()
+        self._remove_scratch_dir()
+
+    def _remove_scratch_dir(self) -> None:
+        scratch_dir, self._scratch_dir = self._scratch_dir, None
+        if scratch_dir is not None:
+            shutil.rmtree(scratch_dir, ignore_errors=True)
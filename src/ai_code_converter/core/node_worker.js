@@ -0,0 +1,289 @@
+'use strict';
+// Worker process of NodeWorkerPool (node_worker_pool.py).
+//
+// Reads one JSON request per line from stdin and writes one JSON response
+// per line to stdout, in the protocol of the Python workers:
+//   {"code": "..."} -> {"stdout", "stderr", "error", "traceback", "peak_memory_mb"}
+// Every snippet runs as a CommonJS module in a fresh vm context. Its console
+// and process.stdout/stderr output is captured, and it sees an empty stdin,
+// so it can never read or corrupt the protocol streams. Changes a snippet
+// makes to process.env, other process properties, the working directory
+// and the require cache are undone when it ends. A snippet is done
+// when its code, its timers and any other pending I/O have finished, the
+// way node itself would exit. Wall-clock limits are enforced by the pool,
+// which replaces a worker that does not answer in time.
+//
+// Kept to syntax supported by Node.js 12.
+
+const path = require('path');
+const readline = require('readline');
+const { Readable } = require('stream');
+const util = require('util');
+const vm = require('vm');
+const { createRequire } = require('module');
+
+const WORKDIR = process.cwd();
+const FILENAME = path.join(WORKDIR, 'converted.js');
+
+const respond = process.stdout.write.bind(process.stdout);
+
+// State of the snippet being run, or null between runs
+let current = null;
+
+class ExitSignal {
+  constructor(code) {
+    this.code = code;
+  }
+}
+
+function capture(stream) {
+  return function write(chunk, encoding, callback) {
+    if (typeof encoding === 'function') {
+      callback = encoding;
+    }
+    if (current !== null && !current.done) {
+      current[stream] += typeof chunk === 'string' ? chunk : Buffer.from(chunk).toString('utf8');
+    }
+    if (typeof callback === 'function') {
+      process.nextTick(callback);
+    }
+    return true;
+  };
+}
+
+// Everything written to the real streams, by console or by modules, is captured
+process.stdout.write = capture('stdout');
+process.stderr.write = capture('stderr');
+
+process.on('uncaughtException', (error) => {
+  if (current !== null) {
+    fail(current, error);
+  }
+});
+process.on('unhandledRejection', (reason) => {
+  if (current !== null) {
+    fail(current, reason);
+  }
+});
+
+function activeResources() {
+  // Handles and requests other than timers, e.g. file system or network I/O
+  if (typeof process.getActiveResourcesInfo !== 'function') {
+    return 0;
+  }
+  return process.getActiveResourcesInfo().filter((name) => name !== 'Timeout' && name !== 'Immediate').length;
+}
+
+function createTimers(run) {
+  // Timers of the snippet are tracked, so the run ends when none is left
+  const schedule = (create, clear, repeat) => (callback, ...rest) => {
+    // Timeouts and intervals take a delay before their arguments, immediates do not
+    const timing = create === setImmediate ? [] : rest.slice(0, 1);
+    const args = create === setImmediate ? rest : rest.slice(1);
+    const handle = create(() => {
+      if (!repeat) {
+        run.pending.delete(handle);
+      }
+      invoke(run, callback, args);
+    }, ...timing);
+    run.pending.set(handle, clear);
+    return handle;
+  };
+  const cancel = (clear) => (handle) => {
+    run.pending.delete(handle);
+    clear(handle);
+  };
+  return {
+    setTimeout: schedule(setTimeout, clearTimeout, false),
+    setInterval: schedule(setInterval, clearInterval, true),
+    setImmediate: schedule(setImmediate, clearImmediate, false),
+    clearTimeout: cancel(clearTimeout),
+    clearInterval: cancel(clearInterval),
+    clearImmediate: cancel(clearImmediate)
+  };
+}
+
+function invoke(run, callback, args) {
+  if (run.done) {
+    return;
+  }
+  try {
+    callback(...args);
+  } catch (error) {
+    fail(run, error);
+    return;
+  }
+  checkIdle(run);
+}
+
+function createSandbox(run) {
+  const stdin = new Readable({
+    read() {
+      this.push(null);
+    }
+  });
+  const snippetProcess = new Proxy(process, {
+    get(target, property) {
+      if (property === 'stdin') {
+        return stdin;
+      }
+      if (property === 'exit') {
+        return (code) => {
+          throw new ExitSignal(code === undefined ? run.exitCode : code);
+        };
+      }
+      if (property === 'exitCode') {
+        return run.exitCode;
+      }
+      if (Object.prototype.hasOwnProperty.call(run.properties, property)) {
+        return run.properties[property];
+      }
+      return Reflect.get(target, property);
+    },
+    set(target, property, value) {
+      if (property === 'exitCode') {
+        run.exitCode = value;
+      } else {
+        // Kept with the run, so the next snippet sees the real process again
+        run.properties[property] = value;
+      }
+      return true;
+    }
+  });
+  const sandbox = Object.assign({
+    console,
+    process: snippetProcess,
+    Buffer,
+    URL,
+    URLSearchParams,
+    TextEncoder: util.TextEncoder,
+    TextDecoder: util.TextDecoder,
+    queueMicrotask
+  }, createTimers(run));
+  for (const name of ['AbortController', 'AbortSignal', 'structuredClone', 'performance', 'fetch']) {
+    if (typeof global[name] !== 'undefined') {
+      sandbox[name] = global[name];
+    }
+  }
+  sandbox.global = sandbox;
+  return vm.createContext(sandbox);
+}
+
+function cleanStack(error) {
+  const stack = String(error.stack || error);
+  // Only frames of the snippet itself; the rest belong to this worker or to node
+  return stack.split('\n').filter((line) => !/^\s+at /.test(line) || line.includes(FILENAME)).join('\n');
+}
+
+function fail(run, error) {
+  if (run.done) {
+    return;
+  }
+  if (error instanceof ExitSignal) {
+    run.exitCode = error.code;
+  } else if (error !== null && typeof error === 'object' && 'message' in error) {
+    // Errors of the snippet come from its own context, so instanceof Error does not apply
+    run.error = `${error.name || 'Error'}: ${error.message}`;
+    run.traceback = cleanStack(error);
+  } else {
+    run.error = `Uncaught ${util.inspect(error)}`;
+    run.traceback = '';
+  }
+  finish(run);
+}
+
+function checkIdle(run) {
+  setImmediate(() => {
+    if (run.done || run.pending.size > 0) {
+      // A pending timer checks again when it fires
+      return;
+    }
+    if (activeResources() > run.baseline) {
+      // Untracked I/O is still in flight
+      setTimeout(() => checkIdle(run), 5);
+      return;
+    }
+    finish(run);
+  });
+}
+
+function finish(run) {
+  if (run.done) {
+    return;
+  }
+  for (const [handle, clear] of run.pending) {
+    clear(handle);
+  }
+  run.pending.clear();
+  restoreWorker(run);
+  if (run.error === null && run.exitCode !== undefined && Number(run.exitCode) !== 0) {
+    run.error = `Process exited with code ${run.exitCode}`;
+  }
+  run.done = true;
+  run.resolve();
+}
+
+function restoreWorker(run) {
+  if (process.cwd() !== WORKDIR) {
+    process.chdir(WORKDIR);
+  }
+  // Modules loaded by the snippet are loaded afresh by the next one
+  for (const key of Object.keys(require.cache)) {
+    if (!run.modules.has(key)) {
+      delete require.cache[key];
+    }
+  }
+}
+
+function runSnippet(code) {
+  return new Promise((resolve) => {
+    const run = {
+      stdout: '',
+      stderr: '',
+      error: null,
+      traceback: '',
+      exitCode: undefined,
+      pending: new Map(),
+      baseline: activeResources(),
+      // Each snippet gets its own copy of the environment
+      properties: { env: Object.assign({}, process.env) },
+      modules: new Set(Object.keys(require.cache)),
+      done: false,
+      resolve
+    };
+    current = run;
+    try {
+      const context = createSandbox(run);
+      const module = { exports: {}, filename: FILENAME, id: '.', loaded: false };
+      const main = vm.compileFunction(code, ['exports', 'require', 'module', '__filename', '__dirname'], {
+        filename: FILENAME,
+        parsingContext: context
+      });
+      main.call(module.exports, module.exports, createRequire(FILENAME), module, FILENAME, path.dirname(FILENAME));
+    } catch (error) {
+      fail(run, error);
+      return;
+    }
+    checkIdle(run);
+  }).then(() => {
+    const run = current;
+    current = null;
+    return {
+      stdout: run.stdout,
+      stderr: run.stderr,
+      error: run.error,
+      traceback: run.traceback,
+      peak_memory_mb: process.resourceUsage().maxRSS / 1024
+    };
+  });
+}
+
+async function serve() {
+  const requests = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+  for await (const line of requests) {
+    const response = await runSnippet(JSON.parse(line).code);
+    respond(JSON.stringify(response) + '\n');
+  }
+}
+
+serve();
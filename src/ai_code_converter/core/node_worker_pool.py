@@ -0,0 +1,39 @@
+"""Pool of Node.js worker processes for running JavaScript snippets.
+
+Each worker runs ``node_worker.js`` next to this module and answers the
+same JSON-lines protocol as the Python workers, so the pool management of
+``PythonWorkerPool`` is reused unchanged: bounded concurrency, recycling
+after ``max_runs`` runs or ``max_memory_mb`` of memory, and replacement of
+workers that time out or die. Inside a worker every snippet gets a fresh
+``vm`` context with captured console output.
+"""
+
+import logging
+import os
+from typing import List
+
+from src.ai_code_converter.core.python_worker_pool import PythonWorkerPool
+
+logger = logging.getLogger(__name__)
+
+# Entry point of the worker processes
+NODE_WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "node_worker.js")
+
+
+class NodeWorkerPool(PythonWorkerPool):
+    """A bounded pool of reusable Node.js worker processes."""
+
+    kind = "Node"
+
+    def __init__(self, workers: int = 2, max_runs: int = 100, max_memory_mb: float = 512,
+                 timeout: float = 30.0, node: str = "node"):
+        """Initialize the pool; no process is started until needed (see ``warm_up``).
+
+        Args:
+            node: Node.js executable
+        """
+        super().__init__(workers=workers, max_runs=max_runs, max_memory_mb=max_memory_mb, timeout=timeout)
+        self.node = node
+
+    def _worker_command(self) -> List[str]:
+        return [self.node, NODE_WORKER_SCRIPT]
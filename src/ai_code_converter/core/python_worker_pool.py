@@ -0,0 +1,317 @@
+"""Pool of worker processes for running Python snippets in isolation.
+
+Each worker is a separate interpreter started with
+``python -m src.ai_code_converter.core.python_worker_pool``. Requests and
+responses are exchanged as JSON lines over the worker's stdin and stdout;
+the worker moves its own standard streams out of the way first, so output
+of the snippet can never corrupt the protocol. Every run gets a fresh
+``__main__`` namespace and its own captured stdout and stderr.
+
+Only the standard library may be imported here: the module is also the
+worker's entry point and should start quickly.
+"""
+
+import contextlib
+import io
+import json
+import logging
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Directory that contains the ``src`` package, so workers can import this module
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+
+@dataclass
+class PythonRunResult:
+    """Outcome of running one snippet in a worker."""
+    stdout: str = ""
+    stderr: str = ""
+    error: Optional[str] = None
+    traceback: str = ""
+    timed_out: bool = False
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.timed_out
+
+
+def run_snippet(code: str) -> Dict[str, Any]:
+    """Run code in a fresh namespace and return its output (worker side)."""
+    stdout, stderr = io.StringIO(), io.StringIO()
+    namespace: Dict[str, Any] = {"__name__": "__main__"}
+    response: Dict[str, Any] = {"error": None, "traceback": ""}
+    stdin = sys.stdin
+    try:
+        sys.stdin = io.StringIO("")
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            exec(compile(code, "<converted>", "exec"), namespace, namespace)
+        if "_result" in namespace:
+            stdout.write(str(namespace["_result"]))
+    except SystemExit:
+        # sys.exit() ends the snippet, not the worker
+        pass
+    except Exception as e:
+        response["error"] = f"{type(e).__name__}: {e}"
+        response["traceback"] = traceback.format_exc()
+    finally:
+        sys.stdin = stdin
+    response.update(stdout=stdout.getvalue(), stderr=stderr.getvalue(), peak_memory_mb=_peak_memory_mb())
+    return response
+
+
+def _peak_memory_mb() -> Optional[float]:
+    """Peak resident memory of this process, where the platform reports it."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def serve() -> None:
+    """Worker main loop: answer one JSON request per line until stdin closes."""
+    requests = os.fdopen(os.dup(0), "rb")
+    responses = os.fdopen(os.dup(1), "wb")
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        # Writes straight to the file descriptors (C extensions, child processes) go nowhere
+        os.dup2(devnull, fd)
+    for line in requests:
+        response = run_snippet(json.loads(line)["code"])
+        responses.write(json.dumps(response).encode("utf-8") + b"\n")
+        responses.flush()
+
+
+class _Worker:
+    """Parent-side handle of one worker process."""
+
+    def __init__(self, command: List[str], kind: str):
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [_PROJECT_ROOT, os.environ.get("PYTHONPATH")])))
+        self.process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=_PROJECT_ROOT,
+            env=env
+        )
+        self.runs = 0
+        self.peak_memory_mb: Optional[float] = None
+        self._responses: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        threading.Thread(target=self._read, name=f"{kind.lower()}-worker-{self.process.pid}", daemon=True).start()
+
+    def _read(self) -> None:
+        for line in self.process.stdout:
+            self._responses.put(json.loads(line))
+        # End of output: the worker exited
+        self._responses.put(None)
+
+    def run(self, code: str, timeout: Optional[float]) -> Optional[Dict[str, Any]]:
+        """Send a snippet and wait for its response; None if the worker died, queue.Empty on timeout."""
+        self.runs += 1
+        self.process.stdin.write(json.dumps({"code": code}).encode("utf-8") + b"\n")
+        self.process.stdin.flush()
+        response = self._responses.get(timeout=timeout)
+        if response is not None:
+            self.peak_memory_mb = response.get("peak_memory_mb")
+        return response
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def stop(self) -> None:
+        if self.alive():
+            self.process.kill()
+        self.process.wait()
+        for stream in (self.process.stdin, self.process.stdout):
+            with contextlib.suppress(OSError):
+                stream.close()
+
+
+class PythonWorkerPool:
+    """A bounded pool of reusable Python worker processes.
+
+    Up to ``workers`` snippets run at the same time, each in its own
+    process, so CPU-bound snippets use separate cores instead of holding
+    the server's GIL. Workers are started on demand and reused; one is
+    replaced after ``max_runs`` runs, when its peak memory passes
+    ``max_memory_mb``, when a run times out or when it dies.
+
+    Subclasses run other interpreters by overriding ``kind`` and
+    ``_worker_command``; their workers must speak the same protocol.
+    """
+
+    kind = "Python"
+
+    def __init__(self, workers: int = 2, max_runs: int = 50, max_memory_mb: float = 512, timeout: float = 30.0):
+        """Initialize the pool; no process is started until needed (see ``warm_up``)."""
+        self.size = max(1, workers)
+        self.max_runs = max_runs
+        self.max_memory_mb = max_memory_mb
+        self.timeout = timeout
+        self.started = 0
+        self.recycled = 0
+        self._idle: List[_Worker] = []
+        self._live = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def warm_up(self) -> None:
+        """Start every worker now so the first runs do not wait for an interpreter."""
+        with self._condition:
+            missing = self.size - self._live
+            self._live += missing
+        for _ in range(missing):
+            self._add_idle(self._spawn())
+
+    def run(self, code: str, timeout: Optional[float] = None) -> PythonRunResult:
+        """Run code in a worker, waiting for one to become free.
+
+        Args:
+            code: Python source to execute as ``__main__``
+            timeout: Seconds the snippet may run (defaults to the pool's timeout)
+        """
+        timeout = self.timeout if timeout is None else timeout
+        worker = self._acquire()
+        start = time.monotonic()
+        healthy = False
+        try:
+            try:
+                response = worker.run(code, timeout)
+            except OSError:
+                # The worker's stdin is gone: it died between runs
+                response = None
+            if response is None:
+                return PythonRunResult(error=f"WorkerError: the {self.kind} worker process exited unexpectedly",
+                                       duration=time.monotonic() - start)
+            healthy = True
+            return PythonRunResult(
+                stdout=response["stdout"],
+                stderr=response["stderr"],
+                error=response["error"],
+                traceback=response["traceback"],
+                duration=time.monotonic() - start
+            )
+        except queue.Empty:
+            logger.warning(f"{self.kind} snippet exceeded {timeout}s, stopping worker {worker.process.pid}")
+            return PythonRunResult(timed_out=True, duration=time.monotonic() - start)
+        finally:
+            self._release(worker, healthy)
+
+    def close(self) -> None:
+        """Stop every idle worker; busy workers are stopped when their run ends."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._live -= len(idle)
+            self._condition.notify_all()
+        for worker in idle:
+            worker.stop()
+
+    def stats(self) -> Dict[str, int]:
+        """Worker counts for monitoring."""
+        with self._condition:
+            return {
+                "size": self.size,
+                "live": self._live,
+                "idle": len(self._idle),
+                "started": self.started,
+                "recycled": self.recycled
+            }
+
+    def _acquire(self) -> _Worker:
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError(f"{self.kind} worker pool is closed")
+                while self._idle:
+                    worker = self._idle.pop()
+                    if worker.alive():
+                        return worker
+                    self._live -= 1
+                    worker.stop()
+                if self._live < self.size:
+                    self._live += 1
+                    break
+                self._condition.wait()
+        try:
+            return self._spawn()
+        except BaseException:
+            with self._condition:
+                self._live -= 1
+                self._condition.notify()
+            raise
+
+    def _release(self, worker: _Worker, healthy: bool) -> None:
+        reason = None
+        if not healthy or not worker.alive():
+            reason = "failed run"
+        elif worker.runs >= self.max_runs:
+            reason = f"{worker.runs} runs"
+        elif worker.peak_memory_mb is not None and worker.peak_memory_mb > self.max_memory_mb:
+            reason = f"peak memory {worker.peak_memory_mb:.0f} MB"
+
+        if reason is None and not self._closed:
+            self._add_idle(worker)
+            return
+
+        worker.stop()
+        with self._condition:
+            self._live -= 1
+            self._condition.notify()
+        if reason is None:
+            return
+        self.recycled += 1
+        logger.info(f"Recycling {self.kind} worker {worker.process.pid} after {reason}")
+        # Keep the pool warm: start the replacement before anyone has to wait for it
+        threading.Thread(target=self._replace, name=f"{self.kind.lower()}-worker-replace", daemon=True).start()
+
+    def _replace(self) -> None:
+        with self._condition:
+            if self._closed or self._live >= self.size:
+                return
+            self._live += 1
+        try:
+            worker = self._spawn()
+        except Exception:
+            logger.error(f"Could not start a replacement {self.kind} worker", exc_info=True)
+            with self._condition:
+                self._live -= 1
+            return
+        self._add_idle(worker)
+
+    def _add_idle(self, worker: _Worker) -> None:
+        with self._condition:
+            if not self._closed:
+                self._idle.append(worker)
+                self._condition.notify()
+                return
+            self._live -= 1
+        worker.stop()
+
+    def _worker_command(self) -> List[str]:
+        """Command line that starts one worker."""
+        return [sys.executable, "-u", "-m", __name__]
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker(self._worker_command(), self.kind)
+        self.started += 1
+        logger.debug(f"Started {self.kind} worker {worker.process.pid}")
+        return worker
+
+
+if __name__ == "__main__":
+    serve()
@@ -3,9 +3,13 @@
 import os
 import sys
 import traceback
+from importlib.metadata import PackageNotFoundError, version
 from src.ai_code_converter.app import CodeConverterApp
 from src.ai_code_converter.utils.logger import setup_logger
 
+# Distributions the application needs at runtime
+REQUIRED_PACKAGES = ("gradio", "openai", "anthropic", "google-generativeai")
+
 def main():
     """Initialize and run the application."""
     # Initialize logger
@@ -22,27 +26,19 @@ def main():
         logger.info(f"Current directory: {os.getcwd()}")
         logger.info(f"Script path: {__file__}")
         
-        # Log package dependencies
-        try:
-            logger.info("Checking for required packages...")
-            import gradio
-            logger.info(f"Gradio version: {gradio.__version__}")
-            
+        # Log package dependencies from their metadata; importing the provider
+        # SDKs here would defeat their lazy loading
+        logger.info("Checking for required packages...")
+        missing = []
+        for package in REQUIRED_PACKAGES:
             try:
-                import google.generativeai as genai
-                logger.info(f"Google Generative AI package found")
-            except ImportError:
-                logger.error("Missing required package: google.generativeai")
-                logger.info("To install: pip install google-generativeai")
-                raise ImportError("Missing required package: google.generativeai. Please install with: pip install google-generativeai")
-                
-            # Check other critical dependencies
-            import anthropic
-            logger.info(f"Anthropic package found")
-            
-        except ImportError as e:
-            logger.error(f"Missing required package: {str(e)}")
-            raise
+                logger.info(f"{package} version: {version(package)}")
+            except PackageNotFoundError:
+                logger.error(f"Missing required package: {package}")
+                logger.info(f"To install: pip install {package}")
+                missing.append(package)
+        if missing:
+            raise ImportError(f"Missing required packages: {', '.join(missing)}. Please install with: pip install {' '.join(missing)}")
         
         logger.info("Initializing application components")
         app = CodeConverterApp()
@@ -1,283 +1,321 @@
 """Module for handling AI model streaming responses."""
 
 import logging
-import time
-from typing import Generator, Any, Callable, TypeVar, cast
-from anthropic import Anthropic, AnthropicError, APIError, RateLimitError, AuthenticationError
-import google.generativeai as genai
-from openai import OpenAI
+from typing import TYPE_CHECKING, Generator, Any, Optional
 
 from src.ai_code_converter.config import (
     OPENAI_MODEL,
     CLAUDE_MODEL,
+    DEFAULT_TEMPERATURE,
     DEEPSEEK_MODEL,
     GEMINI_MODEL,
-    GROQ_MODEL
+    GROQ_MODEL,
+    PROVIDER_RATE_LIMITS,
+    RETRY_POLICY_SETTINGS,
+    PROMPT_CACHING_ENABLED
 )
+from src.ai_code_converter.models.circuit_breaker import CircuitBreakerRegistry
+from src.ai_code_converter.models.continuation import (
+    chat_messages,
+    claude_messages,
+    claude_system,
+    gemini_contents,
+)
+from src.ai_code_converter.models.rate_limiter import RateLimiterRegistry, estimate_request_tokens
+from src.ai_code_converter.models.retry_policy import FATAL, RetryPolicy, classify_error
+from src.ai_code_converter.models.stream_events import (
+    FinishReason,
+    StreamError,
+    StreamEvent,
+    TextDelta,
+    Usage,
+)
+from src.ai_code_converter.models.stream_guard import StreamGuard
+
+if TYPE_CHECKING:
+    # The SDKs are only needed for annotations; clients are built lazily elsewhere
+    import google.generativeai as genai
+    from anthropic import Anthropic
+    from openai import OpenAI
 
 logger = logging.getLogger(__name__)
 
-# Type variable for generic retry function
-T = TypeVar('T')
+# Provider-specific stop reasons mapped onto the OpenAI vocabulary
+FINISH_REASON_ALIASES = {
+    "end_turn": "stop",
+    "stop_sequence": "stop",
+    "max_tokens": "length",
+    "safety": "content_filter",
+    "recitation": "content_filter",
+}
 
-def retry_with_exponential_backoff(
-    max_retries: int = 5,
-    initial_delay: float = 1.0,
-    exponential_base: float = 2.0,
-    jitter: bool = True,
-    retryable_exceptions: tuple = (Exception,),
-    retryable_return: Callable[[Any], bool] = None,
-) -> Callable:
-    """Retry decorator with exponential backoff
-    
-    Args:
-        max_retries: Maximum number of retries
-        initial_delay: Initial delay in seconds
-        exponential_base: Base for exponential calculation
-        jitter: Add random jitter to delay
-        retryable_exceptions: Exceptions that trigger retry
-        retryable_return: Function that takes the return value and returns
-            True if it should be retried
-    
-    Returns:
-        Decorator function
-    """
-    def decorator(func: Callable) -> Callable:
-        def wrapper(*args: Any, **kwargs: Any) -> Any:
-            # Initialize variables
-            num_retries = 0
-            delay = initial_delay
-            
-            # Loop until max retries reached
-            while True:
-                try:
-                    response = func(*args, **kwargs)
-                    
-                    # Check if we should retry based on response value
-                    if retryable_return and num_retries < max_retries:
-                        try:
-                            if retryable_return(response):
-                                num_retries += 1
-                                logger.warning(
-                                    f"Retrying {func.__name__} due to response condition "
-                                    f"(attempt {num_retries} of {max_retries})"
-                                )
-                                time.sleep(delay)
-                                delay = calculate_next_delay(delay, exponential_base, jitter)
-                                continue
-                        except Exception as e:
-                            # If retryable_return itself fails, log and continue
-                            logger.warning(f"Error in retry condition: {e}")
-                    
-                    return response
-                    
-                except retryable_exceptions as e:
-                    # Check if we've exceeded max retries
-                    if num_retries >= max_retries:
-                        logger.error(
-                            f"Maximum retries ({max_retries}) exceeded for {func.__name__}: {str(e)}"
-                        )
-                        raise
-                    
-                    # Handle specific error types with custom messages
-                    if hasattr(e, 'error') and isinstance(e.error, dict) and e.error.get('type') == 'overloaded_error':
-                        logger.warning(
-                            f"Service overloaded, retrying {func.__name__} "
-                            f"(attempt {num_retries + 1} of {max_retries})"
-                        )
-                    else:
-                        logger.warning(
-                            f"Exception in {func.__name__}, retrying "
-                            f"(attempt {num_retries + 1} of {max_retries}): {str(e)}"
-                        )
-                    
-                    # Increment retry count and delay
-                    num_retries += 1
-                    time.sleep(delay)
-                    delay = calculate_next_delay(delay, exponential_base, jitter)
-        
-        return cast(Callable, wrapper)
-    return decorator
+def normalize_finish_reason(reason: Any) -> str:
+    """Map a provider finish reason (string or enum) onto a common vocabulary."""
+    name = getattr(reason, "name", reason)
+    name = str(name).lower()
+    return FINISH_REASON_ALIASES.get(name, name)
 
 
-def calculate_next_delay(current_delay: float, exponential_base: float, jitter: bool) -> float:
-    """Calculate the next delay time using exponential backoff and optional jitter"""
-    import random
-    delay = current_delay * exponential_base
-    # Add jitter - random value between -0.2 and +0.2 of the delay
-    if jitter:
-        delay = delay * (1 + random.uniform(-0.2, 0.2))
-    return delay
+def openai_chunk_events(chunk: Any) -> Generator[StreamEvent, None, None]:
+    """Translate an OpenAI-compatible stream chunk into stream events."""
+    if chunk.choices:
+        choice = chunk.choices[0]
+        fragment = choice.delta.content if choice.delta else None
+        if fragment:
+            yield TextDelta(fragment)
+        if choice.finish_reason:
+            yield FinishReason(normalize_finish_reason(choice.finish_reason))
+    usage = getattr(chunk, "usage", None)
+    if usage:
+        # OpenAI reports cached prompt tokens in the details, DeepSeek as cache hits
+        details = getattr(usage, "prompt_tokens_details", None)
+        cache_read = getattr(details, "cached_tokens", None) or getattr(usage, "prompt_cache_hit_tokens", None)
+        yield Usage(usage.prompt_tokens or 0, usage.completion_tokens or 0, cache_read or 0)
+
+
+def claude_usage(usage: Any) -> Usage:
+    """Usage event from a Claude message's usage, including prompt cache reads and writes."""
+    return Usage(
+        usage.input_tokens or 0,
+        usage.output_tokens or 0,
+        getattr(usage, "cache_read_input_tokens", None) or 0,
+        getattr(usage, "cache_creation_input_tokens", None) or 0
+    )
+
+
+def gemini_chunk_events(chunk: Any) -> Generator[StreamEvent, None, None]:
+    """Translate a Gemini stream chunk into stream events."""
+    try:
+        text = chunk.text
+    except ValueError:
+        # Chunks without text parts (e.g. the final finish chunk) raise here
+        text = ""
+    if text:
+        yield TextDelta(text)
+    candidates = getattr(chunk, "candidates", None)
+    finish_reason = candidates[0].finish_reason if candidates else None
+    if finish_reason:
+        yield FinishReason(normalize_finish_reason(finish_reason))
+        metadata = getattr(chunk, "usage_metadata", None)
+        if metadata:
+            yield Usage(
+                metadata.prompt_token_count or 0,
+                metadata.candidates_token_count or 0,
+                getattr(metadata, "cached_content_token_count", None) or 0
+            )
+
+
+def provider_error(provider: str, error: Exception) -> StreamError:
+    """Stream event for an exception raised by a provider's API."""
+    return StreamError(provider, f"Error with {provider} API: {str(error)}", fatal=classify_error(error) == FATAL)
+
+
+def circuit_open_message(model: str) -> str:
+    """Error shown when a provider is skipped because its circuit breaker is open."""
+    return f"Error with {model} API: provider temporarily unavailable (circuit breaker open)"
 
 
 class AIModelStreamer:
     """Class for handling streaming responses from various AI models."""
     
-    def __init__(self, openai_client: OpenAI, claude_client: Anthropic,
-                 deepseek_client: OpenAI, groq_client: OpenAI, gemini_model: genai.GenerativeModel):
-        """Initialize with AI model clients."""
+    def __init__(self, openai_client: "OpenAI", claude_client: "Anthropic",
+                 deepseek_client: "OpenAI", groq_client: "OpenAI", gemini_model: "genai.GenerativeModel",
+                 breakers: Optional[CircuitBreakerRegistry] = None,
+                 limiters: Optional[RateLimiterRegistry] = None,
+                 retry_policy: Optional[RetryPolicy] = None):
+        """Initialize with AI model clients and the resilience components shared between streamers."""
+        self.breakers = breakers or CircuitBreakerRegistry()
+        self.limiters = limiters or RateLimiterRegistry(PROVIDER_RATE_LIMITS)
+        self.retry_policy = retry_policy or RetryPolicy(**RETRY_POLICY_SETTINGS)
         self.openai = openai_client
         self.claude = claude_client
         self.deepseek = deepseek_client
         self.groq = groq_client
         self.gemini = gemini_model
-        self.max_retries = 5
+        self.streams = {
+            "GPT": self.stream_gpt,
+            "Claude": self.stream_claude,
+            "Gemini": self.stream_gemini,
+            "DeepSeek": self.stream_deepseek,
+            "GROQ": self.stream_groq
+        }
 
-    @retry_with_exponential_backoff(
-        max_retries=5, 
-        initial_delay=1.0, 
-        retryable_exceptions=(Exception,)
-    )
-    def _call_gpt_api(self, prompt: str):
-        """Call the GPT API with retry logic"""
-        messages = [{"role": "user", "content": prompt}]
-        return self.openai.chat.completions.create(
-            model=OPENAI_MODEL,
-            messages=messages,
-            stream=True
-        )
+    def stream(
+        self,
+        model: str,
+        prompt: str,
+        temperature: float = DEFAULT_TEMPERATURE
+    ) -> Generator[StreamEvent, None, None]:
+        """Stream delta events from the named model behind its circuit breaker."""
+        if model not in self.streams:
+            raise ValueError(f"Unsupported model: {model}")
+        return self._guarded_stream(model, prompt, temperature)
+
+    def _guarded_stream(self, model: str, prompt: str, temperature: float) -> Generator[StreamEvent, None, None]:
+        """Stream the model's response behind its breaker, resuming it when it is cut short."""
+        guard = StreamGuard(model, prompt, self.breakers, self.limiters, self.retry_policy)
+        if not guard.admit():
+            yield StreamError(model, circuit_open_message(model))
+            return
+        
+        try:
+            while True:
+                for event in self.streams[model](prompt, guard.prefix, temperature):
+                    yield from guard.feed(event)
+                yield from guard.end_attempt()
+                if not guard.resuming:
+                    break
+            guard.complete()
+        except GeneratorExit:
+            guard.abandon()
+            raise
+        finally:
+            guard.finish()
+
+    def _call_gpt_api(self, prompt: str, prefix: Optional[str] = None, temperature: float = DEFAULT_TEMPERATURE):
+        """Send a streaming request to the GPT API"""
+        limiter = self.limiters.get("GPT")
+        limiter.acquire(estimate_request_tokens(prompt))
+        messages = chat_messages(prompt, prefix)
+        with limiter.observe_errors():
+            raw = self.openai.chat.completions.with_raw_response.create(
+                model=OPENAI_MODEL,
+                messages=messages,
+                stream=True,
+                stream_options={"include_usage": True},
+                temperature=temperature
+            )
+        limiter.update_from_headers(raw.headers)
+        return raw.parse()
 
-    def stream_gpt(self, prompt: str) -> Generator[str, None, None]:
-        """Stream responses from GPT model."""
+    def stream_gpt(
+        self,
+        prompt: str,
+        prefix: Optional[str] = None,
+        temperature: float = DEFAULT_TEMPERATURE
+    ) -> Generator[StreamEvent, None, None]:
+        """Stream delta events from GPT model."""
         try:
-            stream = self._call_gpt_api(prompt)
-            
-            response = ""
-            for chunk in stream:
-                fragment = chunk.choices[0].delta.content or ""
-                response += fragment
-                yield response
+            for chunk in self.retry_policy.stream("GPT", self._call_gpt_api, prompt, prefix, temperature):
+                yield from openai_chunk_events(chunk)
                 
         except Exception as e:
             logger.error(f"GPT API error: {str(e)}", exc_info=True)
-            yield f"Error with GPT API: {str(e)}"
+            yield provider_error("GPT", e)
 
-    @retry_with_exponential_backoff(
-        max_retries=5, 
-        initial_delay=1.0, 
-        exponential_base=2.0,
-        retryable_exceptions=(Exception,)
-    )
-    def _call_claude_api(self, prompt: str):
-        """Call the Claude API with retry logic"""
+    def _call_claude_api(self, prompt: str, prefix: Optional[str] = None, temperature: float = DEFAULT_TEMPERATURE):
+        """Open a Claude message stream (the request is sent on enter)"""
         return self.claude.messages.stream(
             model=CLAUDE_MODEL,
             max_tokens=4000,
-            messages=[{"role": "user", "content": prompt}]
+            temperature=temperature,
+            messages=claude_messages(prompt, prefix),
+            **claude_system(prompt, PROMPT_CACHING_ENABLED)
         )
-    
-    def stream_claude(self, prompt: str) -> Generator[str, None, None]:
-        """Stream responses from Claude model with retry for overloaded errors."""
-        retry_count = 0
-        max_retries = self.max_retries
-        delay = 1.0
+
+    def _claude_events(
+        self,
+        prompt: str,
+        prefix: Optional[str] = None,
+        temperature: float = DEFAULT_TEMPERATURE
+    ) -> Generator[StreamEvent, None, None]:
+        """Send one Claude request and yield its events."""
+        limiter = self.limiters.get("Claude")
+        limiter.acquire(estimate_request_tokens(prompt))
         
-        while True:
-            try:
-                result = self._call_claude_api(prompt)
-                
-                response = ""
-                with result as stream:
-                    for text in stream.text_stream:
-                        response += text
-                        yield response
-                
-                # If we get here, we succeeded, so break out of retry loop
-                break
-                    
-            except (AnthropicError, APIError) as e:
-                # Special handling for overloaded_error
-                if hasattr(e, 'error') and getattr(e, 'error', {}).get('type') == 'overloaded_error':
-                    if retry_count < max_retries:
-                        retry_count += 1
-                        wait_time = delay * (2 ** (retry_count - 1))  # Exponential backoff
-                        logger.warning(f"Claude API overloaded, retrying in {wait_time:.2f}s (attempt {retry_count}/{max_retries})")
-                        time.sleep(wait_time)
-                        continue
-                
-                # If reached maximum retries or not an overloaded error
-                logger.error(f"Claude API error: {str(e)}", exc_info=True)
-                yield f"Error with Claude API: {str(e)}"
-                break
+        with limiter.observe_errors(), self._call_claude_api(prompt, prefix, temperature) as stream:
+            limiter.update_from_headers(stream.response.headers)
+            for text in stream.text_stream:
+                yield TextDelta(text)
+            final_message = stream.get_final_message()
+        
+        yield claude_usage(final_message.usage)
+        if final_message.stop_reason:
+            yield FinishReason(normalize_finish_reason(final_message.stop_reason))
+    
+    def stream_claude(
+        self,
+        prompt: str,
+        prefix: Optional[str] = None,
+        temperature: float = DEFAULT_TEMPERATURE
+    ) -> Generator[StreamEvent, None, None]:
+        """Stream delta events from Claude model."""
+        try:
+            yield from self.retry_policy.stream("Claude", self._claude_events, prompt, prefix, temperature)
                 
-            except Exception as e:
-                logger.error(f"Claude API error: {str(e)}", exc_info=True)
-                yield f"Error with Claude API: {str(e)}"
-                break
+        except Exception as e:
+            logger.error(f"Claude API error: {str(e)}", exc_info=True)
+            yield provider_error("Claude", e)
 
-    @retry_with_exponential_backoff(
-        max_retries=5, 
-        initial_delay=1.0, 
-        retryable_exceptions=(Exception,)
-    )
-    def _call_deepseek_api(self, prompt: str):
-        """Call the DeepSeek API with retry logic"""
-        messages = [{"role": "user", "content": prompt}]
-        return self.deepseek.chat.completions.create(
-            model=DEEPSEEK_MODEL,
-            messages=messages,
-            stream=True,
-            temperature=0.7,
-            max_tokens=4000
-        )
+    def _call_deepseek_api(self, prompt: str, prefix: Optional[str] = None, temperature: float = DEFAULT_TEMPERATURE):
+        """Send a streaming request to the DeepSeek API"""
+        limiter = self.limiters.get("DeepSeek")
+        limiter.acquire(estimate_request_tokens(prompt))
+        messages = chat_messages(prompt, prefix)
+        with limiter.observe_errors():
+            raw = self.deepseek.chat.completions.with_raw_response.create(
+                model=DEEPSEEK_MODEL,
+                messages=messages,
+                stream=True,
+                temperature=temperature,
+                max_tokens=4000
+            )
+        limiter.update_from_headers(raw.headers)
+        return raw.parse()
 
-    def stream_deepseek(self, prompt: str) -> Generator[str, None, None]:
-        """Stream responses from DeepSeek model."""
+    def stream_deepseek(
+        self,
+        prompt: str,
+        prefix: Optional[str] = None,
+        temperature: float = DEFAULT_TEMPERATURE
+    ) -> Generator[StreamEvent, None, None]:
+        """Stream delta events from DeepSeek model."""
         try:
-            stream = self._call_deepseek_api(prompt)
-            
-            reply = ""
-            for chunk in stream:
-                fragment = chunk.choices[0].delta.content or ""
-                reply += fragment
-                yield reply
+            for chunk in self.retry_policy.stream("DeepSeek", self._call_deepseek_api, prompt, prefix, temperature):
+                yield from openai_chunk_events(chunk)
                 
         except Exception as e:
             logger.error(f"DeepSeek API error: {str(e)}", exc_info=True)
-            yield f"Error with DeepSeek API: {str(e)}"
+            yield provider_error("DeepSeek", e)
 
-    @retry_with_exponential_backoff(
-        max_retries=5, 
-        initial_delay=1.0, 
-        retryable_exceptions=(Exception,)
-    )
-    def _call_groq_api(self, prompt: str):
-        """Call the GROQ API with retry logic"""
-        messages = [{"role": "user", "content": prompt}]
-        return self.groq.chat.completions.create(
-            model=GROQ_MODEL,
-            messages=messages,
-            stream=True,
-            temperature=0.7,
-            max_tokens=4000
-        )
+    def _call_groq_api(self, prompt: str, prefix: Optional[str] = None, temperature: float = DEFAULT_TEMPERATURE):
+        """Send a streaming request to the GROQ API"""
+        limiter = self.limiters.get("GROQ")
+        limiter.acquire(estimate_request_tokens(prompt))
+        messages = chat_messages(prompt, prefix)
+        with limiter.observe_errors():
+            raw = self.groq.chat.completions.with_raw_response.create(
+                model=GROQ_MODEL,
+                messages=messages,
+                stream=True,
+                temperature=temperature,
+                max_tokens=4000
+            )
+        limiter.update_from_headers(raw.headers)
+        return raw.parse()
 
-    def stream_groq(self, prompt: str) -> Generator[str, None, None]:
-        """Stream responses from GROQ model."""
+    def stream_groq(
+        self,
+        prompt: str,
+        prefix: Optional[str] = None,
+        temperature: float = DEFAULT_TEMPERATURE
+    ) -> Generator[StreamEvent, None, None]:
+        """Stream delta events from GROQ model."""
         try:
-            stream = self._call_groq_api(prompt)
-            
-            reply = ""
-            for chunk in stream:
-                fragment = chunk.choices[0].delta.content or ""
-                reply += fragment
-                yield reply
+            for chunk in self.retry_policy.stream("GROQ", self._call_groq_api, prompt, prefix, temperature):
+                yield from openai_chunk_events(chunk)
                 
         except Exception as e:
             logger.error(f"GROQ API error: {str(e)}", exc_info=True)
-            yield f"Error with GROQ API: {str(e)}"
+            yield provider_error("GROQ", e)
 
-    @retry_with_exponential_backoff(
-        max_retries=5, 
-        initial_delay=1.0, 
-        retryable_exceptions=(Exception,)
-    )
-    def _call_gemini_api(self, prompt: str):
-        """Call the Gemini API with retry logic"""
+    def _call_gemini_api(self, prompt: str, prefix: Optional[str] = None, temperature: float = DEFAULT_TEMPERATURE):
+        """Send a streaming request to the Gemini API"""
+        self.limiters.get("Gemini").acquire(estimate_request_tokens(prompt))
         return self.gemini.generate_content(
-            prompt,
+            gemini_contents(prompt, prefix),
             generation_config={
-                "temperature": 0.7,
+                "temperature": temperature,
                 "top_p": 1,
                 "top_k": 1,
                 "max_output_tokens": 4000,
@@ -285,17 +323,17 @@ class AIModelStreamer:
             stream=True
         )
 
-    def stream_gemini(self, prompt: str) -> Generator[str, None, None]:
-        """Stream responses from Gemini model."""
+    def stream_gemini(
+        self,
+        prompt: str,
+        prefix: Optional[str] = None,
+        temperature: float = DEFAULT_TEMPERATURE
+    ) -> Generator[StreamEvent, None, None]:
+        """Stream delta events from Gemini model."""
         try:
-            response = self._call_gemini_api(prompt)
-            
-            reply = ""
-            for chunk in response:
-                if chunk.text:
-                    reply += chunk.text
-                    yield reply
+            for chunk in self.retry_policy.stream("Gemini", self._call_gemini_api, prompt, prefix, temperature):
+                yield from gemini_chunk_events(chunk)
                     
         except Exception as e:
             logger.error(f"Gemini API error: {str(e)}", exc_info=True)
-            yield f"Error with Gemini API: {str(e)}" 
\ No newline at end of file
+            yield provider_error("Gemini", e)
@@ -0,0 +1,295 @@
+"""Module for handling AI model streaming responses with asyncio."""
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, AsyncGenerator, Optional
+
+from src.ai_code_converter.config import (
+    OPENAI_MODEL,
+    CLAUDE_MODEL,
+    DEFAULT_TEMPERATURE,
+    DEEPSEEK_MODEL,
+    GROQ_MODEL,
+    PROVIDER_RATE_LIMITS,
+    RETRY_POLICY_SETTINGS,
+    PROMPT_CACHING_ENABLED
+)
+from src.ai_code_converter.models.ai_streaming import (
+    circuit_open_message,
+    claude_usage,
+    gemini_chunk_events,
+    normalize_finish_reason,
+    openai_chunk_events,
+    provider_error,
+)
+from src.ai_code_converter.models.circuit_breaker import CircuitBreakerRegistry
+from src.ai_code_converter.models.continuation import (
+    chat_messages,
+    claude_messages,
+    claude_system,
+    gemini_contents,
+)
+from src.ai_code_converter.models.rate_limiter import RateLimiterRegistry, estimate_request_tokens
+from src.ai_code_converter.models.retry_policy import RetryPolicy
+from src.ai_code_converter.models.stream_events import (
+    FinishReason,
+    StreamError,
+    StreamEvent,
+    TextDelta,
+)
+from src.ai_code_converter.models.stream_guard import StreamGuard
+
+if TYPE_CHECKING:
+    # The SDKs are only needed for annotations; clients are built lazily elsewhere
+    import google.generativeai as genai
+    from anthropic import AsyncAnthropic
+    from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncAIModelStreamer:
+    """Asyncio counterpart of ``AIModelStreamer`` built on the async SDK clients.
+
+    Every ``stream_*`` method is an async generator of stream events, so
+    many conversions can be in flight on a single event loop.
+    """
+
+    def __init__(self, openai_client: "AsyncOpenAI", claude_client: "AsyncAnthropic",
+                 deepseek_client: "AsyncOpenAI", groq_client: "AsyncOpenAI", gemini_model: "genai.GenerativeModel",
+                 breakers: Optional[CircuitBreakerRegistry] = None,
+                 limiters: Optional[RateLimiterRegistry] = None,
+                 retry_policy: Optional[RetryPolicy] = None):
+        """Initialize with async AI model clients and the resilience components shared between streamers."""
+        self.breakers = breakers or CircuitBreakerRegistry()
+        self.limiters = limiters or RateLimiterRegistry(PROVIDER_RATE_LIMITS)
+        self.retry_policy = retry_policy or RetryPolicy(**RETRY_POLICY_SETTINGS)
+        self.openai = openai_client
+        self.claude = claude_client
+        self.deepseek = deepseek_client
+        self.groq = groq_client
+        self.gemini = gemini_model
+        self.streams = {
+            "GPT": self.stream_gpt,
+            "Claude": self.stream_claude,
+            "Gemini": self.stream_gemini,
+            "DeepSeek": self.stream_deepseek,
+            "GROQ": self.stream_groq
+        }
+
+    def stream(
+        self,
+        model: str,
+        prompt: str,
+        temperature: float = DEFAULT_TEMPERATURE
+    ) -> AsyncGenerator[StreamEvent, None]:
+        """Stream delta events from the named model behind its circuit breaker."""
+        if model not in self.streams:
+            raise ValueError(f"Unsupported model: {model}")
+        return self._guarded_stream(model, prompt, temperature)
+
+    async def _guarded_stream(self, model: str, prompt: str, temperature: float) -> AsyncGenerator[StreamEvent, None]:
+        """Stream the model's response behind its breaker, resuming it when it is cut short."""
+        guard = StreamGuard(model, prompt, self.breakers, self.limiters, self.retry_policy)
+        if not guard.admit():
+            yield StreamError(model, circuit_open_message(model))
+            return
+
+        try:
+            while True:
+                async for event in self.streams[model](prompt, guard.prefix, temperature):
+                    for forwarded in guard.feed(event):
+                        yield forwarded
+                for forwarded in guard.end_attempt():
+                    yield forwarded
+                if not guard.resuming:
+                    break
+            guard.complete()
+        except (GeneratorExit, asyncio.CancelledError):
+            # Also cancelled when every subscriber of a shared stream left
+            guard.abandon()
+            raise
+        finally:
+            guard.finish()
+
+    async def _call_gpt_api(self, prompt: str, prefix: Optional[str] = None, temperature: float = DEFAULT_TEMPERATURE):
+        """Send a streaming request to the GPT API"""
+        limiter = self.limiters.get("GPT")
+        await limiter.acquire_async(estimate_request_tokens(prompt))
+        messages = chat_messages(prompt, prefix)
+        with limiter.observe_errors():
+            raw = await self.openai.chat.completions.with_raw_response.create(
+                model=OPENAI_MODEL,
+                messages=messages,
+                stream=True,
+                stream_options={"include_usage": True},
+                temperature=temperature
+            )
+        limiter.update_from_headers(raw.headers)
+        return raw.parse()
+
+    async def stream_gpt(
+        self,
+        prompt: str,
+        prefix: Optional[str] = None,
+        temperature: float = DEFAULT_TEMPERATURE
+    ) -> AsyncGenerator[StreamEvent, None]:
+        """Stream delta events from GPT model."""
+        try:
+            async for chunk in self.retry_policy.stream_async("GPT", self._call_gpt_api, prompt, prefix, temperature):
+                for event in openai_chunk_events(chunk):
+                    yield event
+
+        except Exception as e:
+            logger.error(f"GPT API error: {str(e)}", exc_info=True)
+            yield provider_error("GPT", e)
+
+    def _call_claude_api(self, prompt: str, prefix: Optional[str] = None, temperature: float = DEFAULT_TEMPERATURE):
+        """Open a Claude message stream (the request is sent on enter)"""
+        return self.claude.messages.stream(
+            model=CLAUDE_MODEL,
+            max_tokens=4000,
+            temperature=temperature,
+            messages=claude_messages(prompt, prefix),
+            **claude_system(prompt, PROMPT_CACHING_ENABLED)
+        )
+
+    async def _claude_events(
+        self,
+        prompt: str,
+        prefix: Optional[str] = None,
+        temperature: float = DEFAULT_TEMPERATURE
+    ) -> AsyncGenerator[StreamEvent, None]:
+        """Send one Claude request and yield its events."""
+        limiter = self.limiters.get("Claude")
+        await limiter.acquire_async(estimate_request_tokens(prompt))
+
+        with limiter.observe_errors():
+            async with self._call_claude_api(prompt, prefix, temperature) as stream:
+                limiter.update_from_headers(stream.response.headers)
+                async for text in stream.text_stream:
+                    yield TextDelta(text)
+                final_message = await stream.get_final_message()
+
+        yield claude_usage(final_message.usage)
+        if final_message.stop_reason:
+            yield FinishReason(normalize_finish_reason(final_message.stop_reason))
+
+    async def stream_claude(
+        self,
+        prompt: str,
+        prefix: Optional[str] = None,
+        temperature: float = DEFAULT_TEMPERATURE
+    ) -> AsyncGenerator[StreamEvent, None]:
+        """Stream delta events from Claude model."""
+        try:
+            async for event in self.retry_policy.stream_async("Claude", self._claude_events, prompt, prefix, temperature):
+                yield event
+
+        except Exception as e:
+            logger.error(f"Claude API error: {str(e)}", exc_info=True)
+            yield provider_error("Claude", e)
+
+    async def _call_deepseek_api(
+        self,
+        prompt: str,
+        prefix: Optional[str] = None,
+        temperature: float = DEFAULT_TEMPERATURE
+    ):
+        """Send a streaming request to the DeepSeek API"""
+        limiter = self.limiters.get("DeepSeek")
+        await limiter.acquire_async(estimate_request_tokens(prompt))
+        messages = chat_messages(prompt, prefix)
+        with limiter.observe_errors():
+            raw = await self.deepseek.chat.completions.with_raw_response.create(
+                model=DEEPSEEK_MODEL,
+                messages=messages,
+                stream=True,
+                temperature=temperature,
+                max_tokens=4000
+            )
+        limiter.update_from_headers(raw.headers)
+        return raw.parse()
+
+    async def stream_deepseek(
+        self,
+        prompt: str,
+        prefix: Optional[str] = None,
+        temperature: float = DEFAULT_TEMPERATURE
+    ) -> AsyncGenerator[StreamEvent, None]:
+        """Stream delta events from DeepSeek model."""
+        try:
+            async for chunk in self.retry_policy.stream_async("DeepSeek", self._call_deepseek_api, prompt, prefix, temperature):
+                for event in openai_chunk_events(chunk):
+                    yield event
+
+        except Exception as e:
+            logger.error(f"DeepSeek API error: {str(e)}", exc_info=True)
+            yield provider_error("DeepSeek", e)
+
+    async def _call_groq_api(self, prompt: str, prefix: Optional[str] = None, temperature: float = DEFAULT_TEMPERATURE):
+        """Send a streaming request to the GROQ API"""
+        limiter = self.limiters.get("GROQ")
+        await limiter.acquire_async(estimate_request_tokens(prompt))
+        messages = chat_messages(prompt, prefix)
+        with limiter.observe_errors():
+            raw = await self.groq.chat.completions.with_raw_response.create(
+                model=GROQ_MODEL,
+                messages=messages,
+                stream=True,
+                temperature=temperature,
+                max_tokens=4000
+            )
+        limiter.update_from_headers(raw.headers)
+        return raw.parse()
+
+    async def stream_groq(
+        self,
+        prompt: str,
+        prefix: Optional[str] = None,
+        temperature: float = DEFAULT_TEMPERATURE
+    ) -> AsyncGenerator[StreamEvent, None]:
+        """Stream delta events from GROQ model."""
+        try:
+            async for chunk in self.retry_policy.stream_async("GROQ", self._call_groq_api, prompt, prefix, temperature):
+                for event in openai_chunk_events(chunk):
+                    yield event
+
+        except Exception as e:
+            logger.error(f"GROQ API error: {str(e)}", exc_info=True)
+            yield provider_error("GROQ", e)
+
+    async def _call_gemini_api(
+        self,
+        prompt: str,
+        prefix: Optional[str] = None,
+        temperature: float = DEFAULT_TEMPERATURE
+    ):
+        """Send a streaming request to the Gemini API"""
+        await self.limiters.get("Gemini").acquire_async(estimate_request_tokens(prompt))
+        return await self.gemini.generate_content_async(
+            gemini_contents(prompt, prefix),
+            generation_config={
+                "temperature": temperature,
+                "top_p": 1,
+                "top_k": 1,
+                "max_output_tokens": 4000,
+            },
+            stream=True
+        )
+
+    async def stream_gemini(
+        self,
+        prompt: str,
+        prefix: Optional[str] = None,
+        temperature: float = DEFAULT_TEMPERATURE
+    ) -> AsyncGenerator[StreamEvent, None]:
+        """Stream delta events from Gemini model."""
+        try:
+            async for chunk in self.retry_policy.stream_async("Gemini", self._call_gemini_api, prompt, prefix, temperature):
+                for event in gemini_chunk_events(chunk):
+                    yield event
+
+        except Exception as e:
+            logger.error(f"Gemini API error: {str(e)}", exc_info=True)
+            yield provider_error("Gemini", e)
@@ -0,0 +1,333 @@
+"""Module for recording provider HTTP streams to cassettes and replaying them.
+
+A cassette holds the raw response bytes of every provider call together
+with the chunk boundaries and the time between chunks. The recorder and
+replayer are httpx transports, so a replayed stream goes through the same
+SDK clients and ``stream_*`` code paths as a live one. Gemini does not use
+httpx and is neither recorded nor replayed.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Response headers that describe the original transfer rather than the content
+_DROPPED_HEADERS = {"content-length", "content-encoding", "transfer-encoding", "connection", "date", "set-cookie"}
+
+
+def request_key(method: str, url: str, body: bytes) -> str:
+    """Identify a request by method, path and (canonicalised JSON) body."""
+    try:
+        body = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode()
+    except ValueError:
+        pass
+    digest = hashlib.sha256(f"{method} {urlsplit(url).path}\n".encode() + body)
+    return digest.hexdigest()[:32]
+
+
+@dataclass
+class Interaction:
+    """One recorded request and its streamed response."""
+    method: str
+    url: str
+    key: str
+    model: Optional[str]
+    status: int
+    headers: List[Tuple[str, str]]
+    # (seconds since the previous chunk, or since the request for the first one, data)
+    chunks: List[Tuple[float, bytes]] = field(default_factory=list)
+    text: str = ""
+
+    @property
+    def path(self) -> str:
+        return urlsplit(self.url).path
+
+    @property
+    def duration(self) -> float:
+        """Seconds from sending the request to the last chunk."""
+        return sum(delay for delay, _ in self.chunks)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialise for a cassette line; chunk bytes are stored as text."""
+        return {
+            "method": self.method,
+            "url": self.url,
+            "key": self.key,
+            "model": self.model,
+            "status": self.status,
+            "headers": [list(header) for header in self.headers],
+            "chunks": [[round(delay, 4), data.decode("utf-8", "surrogateescape")] for delay, data in self.chunks],
+            "text": self.text
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Interaction":
+        return cls(
+            method=data["method"],
+            url=data["url"],
+            key=data["key"],
+            model=data.get("model"),
+            status=data["status"],
+            headers=[tuple(header) for header in data["headers"]],
+            chunks=[(delay, text.encode("utf-8", "surrogateescape")) for delay, text in data["chunks"]],
+            text=data.get("text", "")
+        )
+
+
+def stream_text(data: bytes) -> str:
+    """Text generated in an OpenAI or Anthropic server-sent event stream."""
+    parts = []
+    for line in data.decode("utf-8", "replace").splitlines():
+        if not line.startswith("data:"):
+            continue
+        try:
+            event = json.loads(line[5:].strip())
+        except ValueError:
+            continue
+        if not isinstance(event, dict):
+            continue
+        if event.get("type") == "content_block_delta":
+            parts.append(event.get("delta", {}).get("text") or "")
+        for choice in event.get("choices") or []:
+            parts.append((choice.get("delta") or {}).get("content") or "")
+    return "".join(parts)
+
+
+class Cassette:
+    """Recorded interactions, optionally backed by a JSON-lines file.
+
+    Files ending in ``.gz`` are gzip-compressed. Each recorded interaction
+    is appended to the file as soon as its stream ends, so a session that
+    is interrupted keeps everything recorded so far.
+    """
+
+    def __init__(self, path: Optional[str] = None, interactions: Optional[List[Interaction]] = None):
+        """Initialize with the file new recordings are appended to."""
+        self.path = path
+        self.interactions: List[Interaction] = list(interactions or [])
+        self._lock = threading.Lock()
+        self._played: Dict[Tuple[str, ...], int] = {}
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        """Read a cassette file; recordings are appended back to the same file."""
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            interactions = [Interaction.from_dict(json.loads(line)) for line in f if line.strip()]
+        logger.info(f"Loaded {len(interactions)} recorded interactions from {path}")
+        return cls(path, interactions)
+
+    def add(self, interaction: Interaction) -> None:
+        """Record an interaction and append it to the cassette file."""
+        with self._lock:
+            self.interactions.append(interaction)
+            if self.path:
+                opener = gzip.open if self.path.endswith(".gz") else open
+                with opener(self.path, "at", encoding="utf-8") as f:
+                    f.write(json.dumps(interaction.to_dict(), separators=(",", ":")) + "\n")
+
+    def find(self, method: str, url: str, key: str, model: Optional[str], strict: bool = True) -> Optional[Interaction]:
+        """Return the recording for a request.
+
+        Requests recorded more than once are played back in turn. Unless
+        strict, a request that was never recorded gets the next recording
+        for the same endpoint and model, so different prompts can be
+        replayed against a session.
+        """
+        path = urlsplit(url).path
+        with self._lock:
+            candidates = [i for i in self.interactions if i.method == method and i.key == key]
+            slot: Tuple[str, ...] = ("key", key)
+            if not candidates and not strict:
+                candidates = [i for i in self.interactions if i.method == method and i.path == path and i.model == model]
+                slot = ("endpoint", path, model or "")
+            if not candidates:
+                return None
+            played = self._played.get(slot, 0)
+            self._played[slot] = played + 1
+            return candidates[played % len(candidates)]
+
+
+def _request_model(body: bytes) -> Optional[str]:
+    try:
+        model = json.loads(body).get("model")
+    except (ValueError, AttributeError):
+        return None
+    return model if isinstance(model, str) else None
+
+
+class _RecordingStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """Pass a response body through while timing each chunk."""
+
+    def __init__(self, stream, interaction: Interaction, cassette: Cassette, start: float, clock):
+        self._stream = stream
+        self._interaction = interaction
+        self._cassette = cassette
+        self._last = start
+        self._clock = clock
+        self._finished = False
+
+    def _record(self, chunk: bytes) -> None:
+        now = self._clock()
+        self._interaction.chunks.append((now - self._last, bytes(chunk)))
+        self._last = now
+
+    def _finish(self) -> None:
+        if self._finished:
+            return
+        self._finished = True
+        self._interaction.text = stream_text(b"".join(data for _, data in self._interaction.chunks))
+        self._cassette.add(self._interaction)
+
+    def __iter__(self):
+        for chunk in self._stream:
+            self._record(chunk)
+            yield chunk
+        self._finish()
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            self._record(chunk)
+            yield chunk
+        self._finish()
+
+    def close(self) -> None:
+        self._stream.close()
+        self._finish()
+
+    async def aclose(self) -> None:
+        await self._stream.aclose()
+        self._finish()
+
+
+class RecordingTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Wrap a sync or async httpx transport and record every response to a cassette."""
+
+    def __init__(self, inner, cassette: Cassette, clock=time.monotonic):
+        """Initialize with the transport that really sends the requests."""
+        self.inner = inner
+        self.cassette = cassette
+        self._clock = clock
+
+    def _prepare(self, request: httpx.Request) -> Optional[Interaction]:
+        if request.method == "HEAD":
+            # Connection warm-ups carry no response worth replaying
+            return None
+        # Record the body as the client will read it, not compressed
+        request.headers["Accept-Encoding"] = "identity"
+        body = request.read()
+        return Interaction(
+            method=request.method,
+            url=str(request.url),
+            key=request_key(request.method, str(request.url), body),
+            model=_request_model(body),
+            status=0,
+            headers=[]
+        )
+
+    def _wrap(self, response: httpx.Response, interaction: Interaction, start: float) -> httpx.Response:
+        interaction.status = response.status_code
+        interaction.headers = [
+            (name, value) for name, value in response.headers.items()
+            if name.lower() not in _DROPPED_HEADERS
+        ]
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_RecordingStream(response.stream, interaction, self.cassette, start, self._clock),
+            extensions=response.extensions
+        )
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        interaction = self._prepare(request)
+        start = self._clock()
+        response = self.inner.handle_request(request)
+        return response if interaction is None else self._wrap(response, interaction, start)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        interaction = self._prepare(request)
+        start = self._clock()
+        response = await self.inner.handle_async_request(request)
+        return response if interaction is None else self._wrap(response, interaction, start)
+
+    def close(self) -> None:
+        self.inner.close()
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+
+class _ReplayStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """Yield recorded chunks, waiting the recorded delays divided by speed."""
+
+    def __init__(self, chunks: List[Tuple[float, bytes]], speed: float, sleep):
+        self._chunks = chunks
+        self._speed = speed
+        self._sleep = sleep
+
+    def _delays(self):
+        for delay, data in self._chunks:
+            yield (delay / self._speed if self._speed > 0 else 0.0), data
+
+    def __iter__(self):
+        for delay, data in self._delays():
+            if delay:
+                self._sleep(delay)
+            yield data
+
+    async def __aiter__(self):
+        for delay, data in self._delays():
+            if delay:
+                await asyncio.sleep(delay)
+            yield data
+
+
+class ReplayTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Answer requests from a cassette instead of the network.
+
+    A ``speed`` of 1 replays with the recorded timing, larger values
+    compress it proportionally and 0 replays without any delay. Requests
+    with no recording get a 404 ``not_found_error``, which the retry
+    policy treats as fatal.
+    """
+
+    def __init__(self, cassette: Cassette, speed: float = 1.0, strict: bool = True, sleep=time.sleep):
+        """Initialize with the cassette to play and its timing."""
+        self.cassette = cassette
+        self.speed = speed
+        self.strict = strict
+        self._sleep = sleep
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "HEAD":
+            return httpx.Response(200, request=request)
+        body = request.read()
+        url = str(request.url)
+        interaction = self.cassette.find(
+            request.method, url, request_key(request.method, url, body), _request_model(body), self.strict
+        )
+        if interaction is None:
+            logger.error(f"No recorded response for {request.method} {url}")
+            return httpx.Response(404, json={"error": {
+                "type": "not_found_error",
+                "message": f"No recorded response for {request.method} {urlsplit(url).path}"
+            }})
+        return httpx.Response(
+            status_code=interaction.status,
+            headers=interaction.headers,
+            stream=_ReplayStream(interaction.chunks, self.speed, self._sleep)
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return self.handle_request(request)
@@ -0,0 +1,183 @@
+"""Module for per-provider circuit breakers."""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Track recent outcomes for one provider and stop calling it when unhealthy.
+
+    The breaker opens when, over the last ``window`` seconds and at least
+    ``min_requests`` calls, the error rate reaches ``error_rate`` or the
+    share of calls slower than ``slow_call_threshold`` reaches
+    ``slow_call_rate``. After ``cooldown`` seconds it lets
+    ``half_open_max_calls`` probe requests through; a successful probe
+    closes it again, a failed one re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: float = 60.0,
+        min_requests: int = 5,
+        error_rate: float = 0.5,
+        slow_call_threshold: float = 30.0,
+        slow_call_rate: float = 0.8,
+        cooldown: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock=time.monotonic
+    ):
+        """Initialize a closed breaker."""
+        self.name = name
+        self.window = window
+        self.min_requests = min_requests
+        self.error_rate = error_rate
+        self.slow_call_threshold = slow_call_threshold
+        self.slow_call_rate = slow_call_rate
+        self.cooldown = cooldown
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._outcomes: Deque[Tuple[float, bool, float]] = deque()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the cooldown passed."""
+        with self._lock:
+            return self._current_state()
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent to the provider now."""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self, latency: float) -> None:
+        """Record a successful call and its latency in seconds."""
+        with self._lock:
+            if self._current_state() == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+                self._outcomes.clear()
+                self._transition(CLOSED)
+            self._record(True, latency)
+
+    def record_failure(self, latency: float = 0.0, fatal: bool = False) -> None:
+        """Record a failed call; fatal failures open the breaker immediately."""
+        with self._lock:
+            if self._current_state() == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+                self._open()
+                return
+            self._record(False, latency)
+            if fatal:
+                self._open()
+
+    def release(self) -> None:
+        """Forget a call that ended without an outcome (e.g. the client went away)."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the breaker state and recent statistics for monitoring."""
+        with self._lock:
+            state = self._current_state()
+            self._prune()
+            total = len(self._outcomes)
+            failures = sum(1 for _, ok, _ in self._outcomes if not ok)
+            slow = sum(1 for _, _, latency in self._outcomes if latency > self.slow_call_threshold)
+            return {
+                "state": state,
+                "recent_requests": total,
+                "error_rate": failures / total if total else 0.0,
+                "slow_call_rate": slow / total if total else 0.0,
+                "rejected": self.rejected,
+                "open_for": max(0.0, self._clock() - self._opened_at) if state != CLOSED else 0.0
+            }
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.cooldown:
+            self._probes = 0
+            self._transition(HALF_OPEN)
+        return self._state
+
+    def _record(self, ok: bool, latency: float) -> None:
+        self._outcomes.append((self._clock(), ok, latency))
+        self._prune()
+        if self._state != CLOSED:
+            return
+        total = len(self._outcomes)
+        if total < self.min_requests:
+            return
+        failures = sum(1 for _, success, _ in self._outcomes if not success)
+        slow = sum(1 for _, _, duration in self._outcomes if duration > self.slow_call_threshold)
+        if failures / total >= self.error_rate or slow / total >= self.slow_call_rate:
+            self._open()
+
+    def _prune(self) -> None:
+        cutoff = self._clock() - self.window
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            self._outcomes.popleft()
+
+    def _open(self) -> None:
+        self._opened_at = self._clock()
+        self._transition(OPEN)
+
+    def _transition(self, state: str) -> None:
+        if state != self._state:
+            log = logger.warning if state == OPEN else logger.info
+            log(f"Circuit breaker for {self.name}: {self._state} -> {state}")
+            self._state = state
+
+
+class CircuitBreakerRegistry:
+    """Process-wide set of circuit breakers, one per provider."""
+
+    def __init__(self, **settings: Any):
+        """Initialize the registry; settings are passed to every breaker."""
+        self.settings = settings
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, provider: str) -> CircuitBreaker:
+        """Return the breaker for provider, creating it on first use."""
+        with self._lock:
+            breaker = self._breakers.get(provider)
+            if breaker is None:
+                breaker = CircuitBreaker(provider, **self.settings)
+                self._breakers[provider] = breaker
+            return breaker
+
+    def states(self) -> Dict[str, Dict[str, Any]]:
+        """Return a monitoring snapshot of every breaker."""
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.name: breaker.snapshot() for breaker in breakers}
+
+    def pick_healthy(self, preferred: str, candidates: Iterable[str]) -> Optional[str]:
+        """Return preferred if its breaker is not open, else the first candidate that is."""
+        if self.get(preferred).state != OPEN:
+            return preferred
+        for candidate in candidates:
+            if candidate != preferred and self.get(candidate).state != OPEN:
+                return candidate
+        return None
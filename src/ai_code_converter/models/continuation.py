@@ -0,0 +1,200 @@
+"""Module for resuming truncated or interrupted model responses."""
+
+import logging
+from typing import Iterator, List, Optional
+
+from src.ai_code_converter.models.prompts import ConversionPrompt, system_blocks
+from src.ai_code_converter.models.stream_events import FinishReason, StreamError, StreamEvent, TextDelta
+
+logger = logging.getLogger(__name__)
+
+# Instruction appended after the partial answer for providers without prefill
+CONTINUE_INSTRUCTION = (
+    "Continue exactly where your previous answer stopped. "
+    "Do not repeat any earlier text and do not add any commentary."
+)
+
+# Shortest repeated text treated as overlap (shorter matches are likely coincidental)
+MIN_OVERLAP = 20
+# Longest stretch of already received text a continuation may repeat
+MAX_OVERLAP = 1000
+
+
+def chat_messages(prompt: str, prefix: Optional[str] = None) -> List[dict]:
+    """OpenAI-style messages for a request, continuing after prefix if given.
+
+    The shared parts of a ``ConversionPrompt`` lead as the system message,
+    so automatic prefix caching (OpenAI, DeepSeek) can reuse them.
+    """
+    if isinstance(prompt, ConversionPrompt):
+        messages = [
+            {"role": "system", "content": prompt.instructions},
+            {"role": "user", "content": prompt.request}
+        ]
+    else:
+        messages = [{"role": "user", "content": prompt}]
+    if prefix:
+        messages.append({"role": "assistant", "content": prefix})
+        messages.append({"role": "user", "content": CONTINUE_INSTRUCTION})
+    return messages
+
+
+def claude_messages(prompt: str, prefix: Optional[str] = None) -> List[dict]:
+    """Claude messages for a request, prefilling the answer with prefix if given.
+
+    Claude rejects a final assistant turn ending in whitespace, so the
+    trailing whitespace is left for the stitcher to reconcile. The shared
+    parts of a ``ConversionPrompt`` are sent separately, see ``claude_system``.
+    """
+    content = prompt.request if isinstance(prompt, ConversionPrompt) else prompt
+    messages = [{"role": "user", "content": content}]
+    if prefix and prefix.rstrip():
+        messages.append({"role": "assistant", "content": prefix.rstrip()})
+    return messages
+
+
+def claude_system(prompt: str, cache_control: bool = True) -> dict:
+    """Extra Claude request arguments carrying a ``ConversionPrompt``'s shared parts.
+
+    The parts become system blocks with cache breakpoints, so requests that
+    share them read them from Anthropic's prompt cache.
+    """
+    if not isinstance(prompt, ConversionPrompt):
+        return {}
+    return {"system": system_blocks(prompt, cache_control)}
+
+
+def gemini_contents(prompt: str, prefix: Optional[str] = None):
+    """Gemini request contents, continuing after prefix if given."""
+    if not prefix:
+        return prompt
+    return [
+        {"role": "user", "parts": [prompt]},
+        {"role": "model", "parts": [prefix]},
+        {"role": "user", "parts": [CONTINUE_INSTRUCTION]}
+    ]
+
+
+def overlap_length(text: str, head: str) -> int:
+    """Number of leading characters of head that repeat the end of text.
+
+    Whitespace the provider re-emits after a prefilled answer is always
+    dropped; other repeated text only counts when it is at least
+    ``MIN_OVERLAP`` characters long.
+    """
+    trailing = text[len(text.rstrip()):]
+    skipped = len(trailing) if trailing and head.startswith(trailing) else 0
+    rest = head[skipped:]
+    tail = text[-MAX_OVERLAP:]
+    for size in range(min(len(rest), len(tail)), MIN_OVERLAP - 1, -1):
+        if tail.endswith(rest[:size]):
+            return skipped + size
+    return skipped
+
+
+class ContinuationStitcher:
+    """Stitch the attempts of a resumed response into one seamless stream.
+
+    Feed it every event of the current attempt. A ``length`` finish or an
+    error after some text was received is held back; at the end of the
+    attempt the stitcher decides whether to request a continuation of
+    ``prefix``. The start of each continuation is buffered until any text
+    it repeats from the received prefix can be dropped.
+    """
+
+    def __init__(self, model: str, max_continuations: int = 3, budget=None):
+        """Initialize the stitcher.
+
+        Args:
+            model: Model name used in log messages
+            max_continuations: Continuation requests allowed per response
+            budget: ``RetryBudget`` charged when resuming a broken stream
+        """
+        self.model = model
+        self.max_continuations = max_continuations
+        self.budget = budget
+        self.continuations = 0
+        self.resuming = False
+        self._parts: List[str] = []
+        self._text: Optional[str] = None
+        self._head: Optional[str] = None
+        self._pending: Optional[StreamEvent] = None
+
+    @property
+    def text(self) -> str:
+        """Text forwarded so far."""
+        if self._text is None:
+            self._text = "".join(self._parts)
+            self._parts = [self._text] if self._text else []
+        return self._text
+
+    @property
+    def prefix(self) -> Optional[str]:
+        """Partial answer to continue from, or None for the first attempt."""
+        return self.text if self.continuations else None
+
+    def feed(self, event: StreamEvent) -> Iterator[StreamEvent]:
+        """Record an event of the current attempt and yield what can be forwarded."""
+        if isinstance(event, TextDelta):
+            if self._head is None:
+                yield from self._forward(event.text)
+            else:
+                self._head += event.text
+                yield from self._resolve_head(final=False)
+            return
+
+        yield from self._resolve_head(final=True)
+        if isinstance(event, FinishReason) and event.reason == "length":
+            self._pending = event
+        elif isinstance(event, StreamError) and self.text:
+            self._pending = event
+        else:
+            yield event
+
+    def end_attempt(self) -> Iterator[StreamEvent]:
+        """Finish the current attempt; sets ``resuming`` if another one is needed."""
+        yield from self._resolve_head(final=True)
+        pending, self._pending = self._pending, None
+        self.resuming = False
+        if pending is None:
+            return
+
+        broken = isinstance(pending, StreamError)
+        if self.continuations >= self.max_continuations:
+            logger.warning(f"{self.model} response still incomplete after {self.continuations} continuations")
+        elif broken and self.budget is not None and not self.budget.try_spend():
+            logger.warning(f"Retry budget exhausted, not resuming {self.model} stream")
+        else:
+            self.continuations += 1
+            self.resuming = True
+            self._head = ""
+            reason = "broke off" if broken else "hit the output token limit"
+            logger.info(
+                f"{self.model} response {reason} after {len(self.text)} characters, "
+                f"requesting continuation {self.continuations}/{self.max_continuations}"
+            )
+            return
+        yield pending
+
+    def _forward(self, text: str) -> Iterator[StreamEvent]:
+        if text:
+            self._parts.append(text)
+            self._text = None
+            yield TextDelta(text)
+
+    def _resolve_head(self, final: bool) -> Iterator[StreamEvent]:
+        """Drop repeated text from a buffered continuation start once it is known."""
+        head = self._head
+        if head is None:
+            return
+        if not final:
+            text = self.text
+            trailing = text[len(text.rstrip()):]
+            rest = head[len(trailing):] if head.startswith(trailing) else head
+            if len(head) < len(trailing) + MIN_OVERLAP:
+                return
+            if len(rest) < MAX_OVERLAP and rest[:MIN_OVERLAP] in text[-MAX_OVERLAP:]:
+                # The continuation may still be repeating received text
+                return
+        self._head = None
+        yield from self._forward(head[overlap_length(self.text, head):])
@@ -0,0 +1,168 @@
+"""Module for hedging slow model requests against a backup provider."""
+
+import asyncio
+import logging
+from typing import AsyncGenerator, Dict, List, Optional
+
+from src.ai_code_converter.config import DEFAULT_TEMPERATURE
+from src.ai_code_converter.models.stream_events import HedgeOutcome, StreamError, StreamEvent
+
+logger = logging.getLogger(__name__)
+
+
+class _Leg:
+    """One provider stream taking part in a hedged request."""
+
+    def __init__(self, model: str):
+        self.model = model
+        self.events: List[StreamEvent] = []
+        self.done = False
+        self.changed = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the stream finished without an error."""
+        return self.done and not any(isinstance(event, StreamError) for event in self.events)
+
+    def publish(self, event: Optional[StreamEvent] = None) -> None:
+        """Append an event (if any) and wake the consumer."""
+        if event is not None:
+            self.events.append(event)
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+    async def started(self) -> None:
+        """Wait until the stream has produced its first event or finished."""
+        while not self.events and not self.done:
+            await self.changed.wait()
+
+
+class HedgedStreamer:
+    """Race a backup model when the primary is slow to produce its first token.
+
+    If the primary streams its first event within its threshold, events are
+    passed through live. Otherwise the same prompt is sent to the backup
+    model; whichever stream finishes cleanly first is replayed and the other
+    is cancelled. A ``HedgeOutcome`` event records the winner.
+    """
+
+    def __init__(
+        self,
+        streamer,
+        backups: Dict[str, str],
+        thresholds: Dict[str, float],
+        enabled: bool = True,
+        default_threshold: float = 5.0
+    ):
+        """Initialize the hedging layer.
+
+        Args:
+            streamer: ``AsyncAIModelStreamer`` used for both legs
+            backups: Backup model for each primary model
+            thresholds: Seconds to wait for the primary's first token
+            enabled: When False requests go straight to the primary
+            default_threshold: Threshold for models missing from thresholds
+        """
+        self.streamer = streamer
+        self.backups = backups
+        self.thresholds = thresholds
+        self.enabled = enabled
+        self.default_threshold = default_threshold
+        self.hedged_requests = 0
+        self.wins: Dict[str, int] = {}
+
+    @property
+    def streams(self) -> Dict:
+        """Streams supported by the wrapped streamer."""
+        return self.streamer.streams
+
+    async def stream(
+        self,
+        model: str,
+        prompt: str,
+        temperature: float = DEFAULT_TEMPERATURE
+    ) -> AsyncGenerator[StreamEvent, None]:
+        """Stream events for model, hedging against its backup when it stalls."""
+        backup = self.backups.get(model)
+        if not self.enabled or not backup or backup == model or backup not in self.streams:
+            async for event in self.streamer.stream(model, prompt, temperature):
+                yield event
+            return
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        threshold = self.thresholds.get(model, self.default_threshold)
+        legs = [self._start(model, prompt, temperature)]
+        try:
+            try:
+                await asyncio.wait_for(legs[0].started(), timeout=threshold)
+                stalled = False
+            except asyncio.TimeoutError:
+                stalled = True
+
+            if not stalled and not (legs[0].done and not legs[0].ok):
+                # Primary answered in time: pass its events through live
+                primary = legs[0]
+                index = 0
+                while True:
+                    while index < len(primary.events):
+                        yield primary.events[index]
+                        index += 1
+                    if primary.done:
+                        break
+                    await primary.changed.wait()
+                yield self._outcome(model, model, False, loop.time() - start)
+                return
+
+            logger.warning(
+                f"{model} produced no first token within {threshold:.1f}s, hedging with {backup}"
+            )
+            self.hedged_requests += 1
+            legs.append(self._start(backup, prompt, temperature))
+            winner = await self._race(legs)
+            for event in winner.events:
+                yield event
+            yield self._outcome(winner.model, model, True, loop.time() - start)
+        finally:
+            for leg in legs:
+                if not leg.done:
+                    leg.task.cancel()
+
+    def _start(self, model: str, prompt: str, temperature: float) -> _Leg:
+        """Start pumping a provider stream into a new leg."""
+        leg = _Leg(model)
+        leg.task = asyncio.create_task(self._pump(leg, prompt, temperature))
+        return leg
+
+    async def _pump(self, leg: _Leg, prompt: str, temperature: float) -> None:
+        """Collect a provider stream's events into its leg."""
+        try:
+            async for event in self.streamer.stream(leg.model, prompt, temperature):
+                leg.publish(event)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            leg.publish(StreamError(leg.model, f"Error with {leg.model} API: {str(e)}"))
+        finally:
+            leg.done = True
+            leg.publish()
+
+    async def _race(self, legs: List[_Leg]) -> _Leg:
+        """Return the first leg to finish cleanly (or the primary if all fail)."""
+        while True:
+            for leg in legs:
+                if leg.ok:
+                    return leg
+            pending = [leg.task for leg in legs if not leg.done]
+            if not pending:
+                return legs[0]
+            await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+    def _outcome(self, winner: str, primary: str, hedged: bool, elapsed: float) -> HedgeOutcome:
+        """Record and log which model won a request."""
+        self.wins[winner] = self.wins.get(winner, 0) + 1
+        logger.info(
+            f"Hedge outcome: winner={winner} primary={primary} hedged={hedged} elapsed={elapsed:.2f}s"
+        )
+        return HedgeOutcome(winner, primary, hedged, elapsed)
@@ -0,0 +1,74 @@
+"""Conversion prompts split into parts that providers can cache.
+
+Providers cache the longest previously seen prefix of a request, so a
+prompt is built from the most widely shared part to the least: a static
+system part that is identical for every request, a part that only depends
+on the language pair and documentation settings, and the request itself.
+"""
+
+import logging
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from jinja2 import Template
+
+logger = logging.getLogger(__name__)
+
+# Template blocks in prompt order
+PROMPT_BLOCKS = ("system", "language", "request")
+
+# Anthropic cache breakpoint; the prefix up to a marked block is cached for ~5 minutes
+EPHEMERAL_CACHE_CONTROL = {"type": "ephemeral"}
+
+
+class ConversionPrompt(str):
+    """A prompt that remembers its cacheable parts.
+
+    The string value is the whole prompt, so token estimates, cache keys
+    and request keys treat it like any other prompt; the message builders
+    use the parts to send the shared ones as a cacheable system prompt.
+    """
+
+    system: str
+    language: str
+    request: str
+
+    def __new__(cls, system: str, language: str, request: str) -> "ConversionPrompt":
+        prompt = super().__new__(cls, "\n\n".join(part for part in (system, language, request) if part))
+        prompt.system = system
+        prompt.language = language
+        prompt.request = request
+        return prompt
+
+    def __reduce__(self):
+        return (ConversionPrompt, (self.system, self.language, self.request))
+
+    @property
+    def instructions(self) -> str:
+        """System prompt: the static part followed by the language part."""
+        return "\n\n".join(part for part in (self.system, self.language) if part)
+
+
+def render_prompt(template: "Template", **variables: Any) -> ConversionPrompt:
+    """Render each block of the conversion template into a ``ConversionPrompt``."""
+    context = template.new_context(variables)
+    system, language, request = (
+        "".join(template.blocks[name](context)).strip() for name in PROMPT_BLOCKS
+    )
+    return ConversionPrompt(system, language, request)
+
+
+def system_blocks(prompt: ConversionPrompt, cache_control: bool = True) -> List[dict]:
+    """Claude system prompt blocks with a cache breakpoint after each shared part.
+
+    The first breakpoint caches the static part for every request and the
+    second one the language part for requests with the same settings.
+    """
+    blocks = []
+    for text in (prompt.system, prompt.language):
+        if text:
+            block = {"type": "text", "text": text}
+            if cache_control:
+                block["cache_control"] = dict(EPHEMERAL_CACHE_CONTROL)
+            blocks.append(block)
+    return blocks
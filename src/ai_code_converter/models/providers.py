@@ -0,0 +1,68 @@
+"""Module for building provider SDK clients on first use.
+
+The provider SDKs are slow to import, so nothing here imports them at
+module level: each client is built, and its SDK imported, the first time a
+conversion actually uses that provider.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LazyClient:
+    """Stand-in for an SDK client that builds the real one on first attribute access."""
+
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        """Initialize with a display name and a zero-argument factory."""
+        self._name = name
+        self._factory = factory
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the real client has been built."""
+        return self._client is not None
+
+    def get(self) -> Any:
+        """Return the real client, building it if needed."""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    start = time.perf_counter()
+                    self._client = self._factory()
+                    logger.info(f"Initialized {self._name} client in {(time.perf_counter() - start) * 1000:.0f}ms")
+        return self._client
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self.get(), attribute)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<LazyClient {self._name} ({state})>"
+
+
+def build_openai_client(base_url: str, http_client, api_key: Optional[str] = None, use_async: bool = False):
+    """Build an OpenAI-compatible client (OpenAI, DeepSeek, GROQ)."""
+    from openai import AsyncOpenAI, OpenAI
+    client_class = AsyncOpenAI if use_async else OpenAI
+    # Retries are owned by the streamers' RetryPolicy, not the SDK
+    return client_class(base_url=base_url, api_key=api_key, http_client=http_client, max_retries=0)
+
+
+def build_claude_client(base_url: str, http_client, use_async: bool = False):
+    """Build an Anthropic client."""
+    from anthropic import Anthropic, AsyncAnthropic
+    client_class = AsyncAnthropic if use_async else Anthropic
+    return client_class(base_url=base_url, http_client=http_client, max_retries=0)
+
+
+def build_gemini_model(model_name: str, api_key: str):
+    """Configure the Gemini SDK and build a generative model."""
+    import google.generativeai as genai
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(model_name)
@@ -0,0 +1,231 @@
+"""Module for client-side rate limiting of provider requests."""
+
+import asyncio
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+# Rough output size assumed for a conversion until the real usage is known
+DEFAULT_OUTPUT_TOKEN_ESTIMATE = 1000
+
+# Header names used by OpenAI-compatible providers and by Anthropic
+_REQUEST_LIMIT_HEADERS = ("x-ratelimit-limit-requests", "anthropic-ratelimit-requests-limit")
+_REQUEST_REMAINING_HEADERS = ("x-ratelimit-remaining-requests", "anthropic-ratelimit-requests-remaining")
+_TOKEN_LIMIT_HEADERS = ("x-ratelimit-limit-tokens", "anthropic-ratelimit-tokens-limit")
+_TOKEN_REMAINING_HEADERS = ("x-ratelimit-remaining-tokens", "anthropic-ratelimit-tokens-remaining")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of text (about four characters per token)."""
+    return max(1, len(text) // 4)
+
+
+def estimate_request_tokens(prompt: str) -> int:
+    """Estimate the tokens a conversion request will consume (prompt plus output)."""
+    return estimate_tokens(prompt) + DEFAULT_OUTPUT_TOKEN_ESTIMATE
+
+
+class _Bucket:
+    """Token bucket refilled continuously at ``capacity`` units per minute.
+
+    The level may go negative: a reservation always succeeds immediately and
+    returns how long the caller has to wait, so callers are served in the
+    order they arrived.
+    """
+
+    def __init__(self, capacity: float, now: float):
+        self.capacity = float(capacity)
+        self.level = float(capacity)
+        self.updated = now
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / 60.0
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        self.refill(now)
+        self.level -= min(amount, self.capacity)
+        return 0.0 if self.level >= 0 else -self.level / self.rate
+
+
+class ProviderRateLimiter:
+    """Budget requests per minute and tokens per minute for one provider.
+
+    Callers reserve capacity before sending a request and sleep for the
+    returned delay, so bursts are spread out in arrival order instead of
+    all hitting the provider and retrying together. Budgets are corrected
+    from the provider's rate-limit headers when they are available.
+    """
+
+    def __init__(self, name: str, requests_per_minute: float, tokens_per_minute: float, clock=time.monotonic):
+        """Initialize full buckets for the provider."""
+        self.name = name
+        self._clock = clock
+        self._lock = threading.Lock()
+        now = clock()
+        self._requests = _Bucket(requests_per_minute, now)
+        self._tokens = _Bucket(tokens_per_minute, now)
+        self._blocked_until = 0.0
+        self.total_wait = 0.0
+        self.throttled = 0
+
+    def reserve(self, tokens: int) -> float:
+        """Reserve one request and tokens; return the seconds to wait before sending."""
+        with self._lock:
+            now = self._clock()
+            delay = max(
+                self._requests.reserve(1, now),
+                self._tokens.reserve(tokens, now),
+                self._blocked_until - now
+            )
+            if delay > 0:
+                self.throttled += 1
+                self.total_wait += delay
+            return delay
+
+    def acquire(self, tokens: int) -> float:
+        """Reserve capacity and block the calling thread until it is available."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            logger.info(f"Rate limiting {self.name}: waiting {delay:.2f}s")
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, tokens: int) -> float:
+        """Reserve capacity and wait on the event loop until it is available."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            logger.info(f"Rate limiting {self.name}: waiting {delay:.2f}s")
+            await asyncio.sleep(delay)
+        return delay
+
+    def settle(self, estimated: int, actual: int) -> None:
+        """Return (or charge) the difference between estimated and actual token usage."""
+        with self._lock:
+            self._tokens.refill(self._clock())
+            self._tokens.level = min(self._tokens.capacity, self._tokens.level + estimated - actual)
+
+    def block_for(self, seconds: float) -> None:
+        """Hold back every request for the given number of seconds."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+        logger.warning(f"Rate limited by {self.name}, pausing requests for {seconds:.2f}s")
+
+    def update_from_headers(self, headers: Optional[Mapping[str, str]]) -> None:
+        """Adjust budgets from ``x-ratelimit-*`` / ``anthropic-ratelimit-*`` / ``retry-after`` headers."""
+        if not headers:
+            return
+
+        retry_after = parse_retry_after(headers)
+        if retry_after is not None:
+            self.block_for(retry_after)
+
+        with self._lock:
+            now = self._clock()
+            for bucket, limit_names, remaining_names in (
+                (self._requests, _REQUEST_LIMIT_HEADERS, _REQUEST_REMAINING_HEADERS),
+                (self._tokens, _TOKEN_LIMIT_HEADERS, _TOKEN_REMAINING_HEADERS)
+            ):
+                bucket.refill(now)
+                limit = _header_number(headers, limit_names)
+                if limit:
+                    bucket.capacity = limit
+                remaining = _header_number(headers, remaining_names)
+                if remaining is not None:
+                    # The provider is authoritative, but never hand back capacity
+                    # already reserved by requests still waiting locally
+                    bucket.level = min(bucket.level, remaining)
+
+    @contextmanager
+    def observe_errors(self) -> Iterator[None]:
+        """Update budgets from the headers of a failed request before re-raising."""
+        try:
+            yield
+        except Exception as e:
+            response = getattr(e, "response", None)
+            self.update_from_headers(getattr(response, "headers", None))
+            raise
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current budgets for monitoring."""
+        with self._lock:
+            now = self._clock()
+            self._requests.refill(now)
+            self._tokens.refill(now)
+            return {
+                "requests_per_minute": self._requests.capacity,
+                "requests_available": self._requests.level,
+                "tokens_per_minute": self._tokens.capacity,
+                "tokens_available": self._tokens.level,
+                "blocked_for": max(0.0, self._blocked_until - now),
+                "throttled": self.throttled,
+                "total_wait": self.total_wait
+            }
+
+
+class RateLimiterRegistry:
+    """Process-wide set of rate limiters, one per provider."""
+
+    def __init__(self, limits: Dict[str, Dict[str, float]], default: Optional[Dict[str, float]] = None):
+        """Initialize with per-provider ``requests_per_minute``/``tokens_per_minute`` limits."""
+        self.limits = limits
+        self.default = default or {"requests_per_minute": 60, "tokens_per_minute": 100000}
+        self._limiters: Dict[str, ProviderRateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def get(self, provider: str) -> ProviderRateLimiter:
+        """Return the limiter for provider, creating it on first use."""
+        with self._lock:
+            limiter = self._limiters.get(provider)
+            if limiter is None:
+                limits = self.limits.get(provider, self.default)
+                limiter = ProviderRateLimiter(
+                    provider,
+                    limits["requests_per_minute"],
+                    limits["tokens_per_minute"]
+                )
+                self._limiters[provider] = limiter
+            return limiter
+
+    def states(self) -> Dict[str, Dict[str, Any]]:
+        """Return a monitoring snapshot of every limiter."""
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return {limiter.name: limiter.snapshot() for limiter in limiters}
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Return the retry delay in seconds from ``retry-after-ms`` or ``retry-after``."""
+    value = headers.get("retry-after-ms")
+    if value is not None:
+        try:
+            return float(value) / 1000.0
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if value is not None:
+        try:
+            return float(value)
+        except ValueError:
+            # HTTP-date values are rare for these APIs; ignore them
+            return None
+    return None
+
+
+def _header_number(headers: Mapping[str, str], names) -> Optional[float]:
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            try:
+                return float(value)
+            except ValueError:
+                return None
+    return None
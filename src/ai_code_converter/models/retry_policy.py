@@ -0,0 +1,290 @@
+"""Module for the retry policy shared by every provider call."""
+
+import asyncio
+import inspect
+import logging
+import random
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, Optional, Tuple
+
+from src.ai_code_converter.models.rate_limiter import parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE = "retryable"
+RATE_LIMITED = "rate_limited"
+FATAL = "fatal"
+
+# HTTP statuses worth another attempt besides 5xx (529 is Anthropic's "overloaded")
+_RETRYABLE_STATUSES = {408, 409, 529}
+
+# Error types/codes reported in provider error bodies
+_RETRYABLE_ERROR_TYPES = {"overloaded_error", "api_error", "server_error"}
+_RATE_LIMIT_ERROR_TYPES = {"rate_limit_error", "rate_limit_exceeded"}
+_FATAL_ERROR_TYPES = {
+    "authentication_error",
+    "permission_error",
+    "invalid_request_error",
+    "not_found_error",
+    "insufficient_quota",
+    "invalid_api_key"
+}
+
+# Connection error classes of the HTTP stack and SDKs, looked up by module so
+# that classifying an error never imports an SDK that was not used
+_CONNECTION_ERROR_NAMES = (
+    ("httpx", "TransportError"),
+    ("openai", "APIConnectionError"),
+    ("anthropic", "APIConnectionError")
+)
+
+
+def classify_error(error: BaseException) -> str:
+    """Classify a provider error as ``RETRYABLE``, ``RATE_LIMITED`` or ``FATAL``.
+
+    The error body is checked first because Anthropic reports overload and
+    rate-limit errors inside an otherwise successful (HTTP 200) stream.
+    Unknown errors are fatal so that bugs are not retried.
+    """
+    error_types = _error_types(error)
+    if error_types & _FATAL_ERROR_TYPES:
+        return FATAL
+    if error_types & _RATE_LIMIT_ERROR_TYPES:
+        return RATE_LIMITED
+    if error_types & _RETRYABLE_ERROR_TYPES:
+        return RETRYABLE
+
+    status = _status_code(error)
+    if status is not None:
+        if status == 429:
+            return RATE_LIMITED
+        if status >= 500 or status in _RETRYABLE_STATUSES:
+            return RETRYABLE
+        return FATAL
+
+    if isinstance(error, _connection_errors()):
+        return RETRYABLE
+    return FATAL
+
+
+def _connection_errors() -> Tuple[type, ...]:
+    """Connection error classes of the builtins and of every loaded HTTP library."""
+    classes = [ConnectionError, TimeoutError]
+    for module_name, class_name in _CONNECTION_ERROR_NAMES:
+        module = sys.modules.get(module_name)
+        if module is not None:
+            classes.append(getattr(module, class_name))
+    return tuple(classes)
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    """HTTP status of an OpenAI/Anthropic (``status_code``) or Google (``code``) error."""
+    for attribute in ("status_code", "code"):
+        value = getattr(error, attribute, None)
+        if isinstance(value, int) and not isinstance(value, bool) and 100 <= value < 600:
+            return value
+    return None
+
+
+def _error_types(error: BaseException) -> set:
+    """Error ``type`` and ``code`` values from the provider's error body."""
+    body = getattr(error, "body", None)
+    if not isinstance(body, dict):
+        return set()
+    inner = body.get("error", body)
+    if not isinstance(inner, dict):
+        return set()
+    return {value for value in (inner.get("type"), inner.get("code")) if isinstance(value, str)}
+
+
+class RetryBudget:
+    """Cap retries at a fraction of recent traffic across the whole process.
+
+    Within the last ``window`` seconds, at most ``min_retries`` plus
+    ``ratio`` times the number of requests may be retried, so an outage
+    cannot multiply the load sent to a struggling provider.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 3, window: float = 60.0, clock=time.monotonic):
+        """Initialize an empty budget."""
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._requests: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+        self.exhausted = 0
+
+    def record_request(self) -> None:
+        """Count a new (first-attempt) request."""
+        with self._lock:
+            self._requests.append(self._clock())
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget; return False if it is exhausted."""
+        with self._lock:
+            self._prune()
+            if len(self._retries) >= self.min_retries + self.ratio * len(self._requests):
+                self.exhausted += 1
+                return False
+            self._retries.append(self._clock())
+            return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return recent traffic and retry counts for monitoring."""
+        with self._lock:
+            self._prune()
+            return {
+                "requests": len(self._requests),
+                "retries": len(self._retries),
+                "exhausted": self.exhausted
+            }
+
+    def _prune(self) -> None:
+        cutoff = self._clock() - self.window
+        for timestamps in (self._requests, self._retries):
+            while timestamps and timestamps[0] < cutoff:
+                timestamps.popleft()
+
+
+class RetryPolicy:
+    """Decide whether, and after how long, a failed provider call is retried.
+
+    Retryable errors back off exponentially with full jitter, rate-limited
+    errors wait for the provider's ``retry-after`` and fatal errors are
+    never retried. A retry is also abandoned when it would overrun the
+    request's ``deadline`` or the shared ``RetryBudget`` is exhausted.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        initial_delay: float = 1.0,
+        max_delay: float = 20.0,
+        multiplier: float = 2.0,
+        deadline: float = 60.0,
+        jitter: bool = True,
+        budget: Optional[RetryBudget] = None,
+        clock=time.monotonic,
+        sleep=time.sleep
+    ):
+        """Initialize the policy.
+
+        Args:
+            max_attempts: Attempts per request, including the first one
+            initial_delay: Backoff ceiling for the first retry in seconds
+            max_delay: Largest backoff ceiling in seconds
+            multiplier: Growth factor of the backoff ceiling
+            deadline: Seconds after the first attempt past which no retry starts
+            jitter: Draw each delay uniformly between zero and the ceiling
+            budget: Retry budget shared with other policies
+            clock: Monotonic clock used for the deadline
+            sleep: Blocking sleep used by ``stream``
+        """
+        self.max_attempts = max_attempts
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.deadline = deadline
+        self.jitter = jitter
+        self.budget = budget or RetryBudget()
+        self._clock = clock
+        self._sleep = sleep
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number ``attempt + 1``."""
+        ceiling = min(self.max_delay, self.initial_delay * self.multiplier ** attempt)
+        return random.uniform(0, ceiling) if self.jitter else ceiling
+
+    def next_delay(self, provider: str, error: BaseException, attempt: int, elapsed: float) -> Optional[float]:
+        """Return the delay before retrying after ``error``, or None to give up.
+
+        Args:
+            provider: Provider name used in log messages
+            error: Exception raised by the failed attempt
+            attempt: Number of retries already made
+            elapsed: Seconds since the first attempt started
+        """
+        kind = classify_error(error)
+        if kind == FATAL:
+            return None
+        if attempt + 1 >= self.max_attempts:
+            logger.error(f"{provider} failed after {attempt + 1} attempts: {str(error)}")
+            return None
+
+        delay = self.backoff(attempt)
+        if kind == RATE_LIMITED:
+            response = getattr(error, "response", None)
+            retry_after = parse_retry_after(getattr(response, "headers", None) or {})
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+
+        if elapsed + delay > self.deadline:
+            logger.error(f"{provider} retry would exceed the {self.deadline:.0f}s deadline: {str(error)}")
+            return None
+        if not self.budget.try_spend():
+            logger.error(f"Retry budget exhausted, not retrying {provider}: {str(error)}")
+            return None
+
+        logger.warning(
+            f"{provider} {kind.replace('_', '-')} error, retrying in {delay:.2f}s "
+            f"(attempt {attempt + 2} of {self.max_attempts}): {str(error)}"
+        )
+        return delay
+
+    def stream(self, provider: str, open_stream: Callable[..., Any], *args: Any) -> Iterator[Any]:
+        """Yield the items of ``open_stream(*args)``, reopening it on failure.
+
+        A stream is only retried while it has not produced anything, so
+        callers never see duplicated output.
+        """
+        self.budget.record_request()
+        start = self._clock()
+        attempt = 0
+        while True:
+            started = False
+            try:
+                for item in open_stream(*args):
+                    started = True
+                    yield item
+                return
+            except Exception as e:
+                if started:
+                    raise
+                delay = self.next_delay(provider, e, attempt, self._clock() - start)
+                if delay is None:
+                    raise
+            attempt += 1
+            self._sleep(delay)
+
+    async def stream_async(self, provider: str, open_stream: Callable[..., Any], *args: Any) -> AsyncIterator[Any]:
+        """Async counterpart of ``stream``; waits on the event loop between attempts.
+
+        ``open_stream`` may be an async generator function or a coroutine
+        function returning an async iterable.
+        """
+        self.budget.record_request()
+        start = self._clock()
+        attempt = 0
+        while True:
+            started = False
+            try:
+                items = open_stream(*args)
+                if inspect.isawaitable(items):
+                    items = await items
+                async for item in items:
+                    started = True
+                    yield item
+                return
+            except Exception as e:
+                if started:
+                    raise
+                delay = self.next_delay(provider, e, attempt, self._clock() - start)
+                if delay is None:
+                    raise
+            attempt += 1
+            await asyncio.sleep(delay)
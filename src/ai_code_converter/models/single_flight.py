@@ -0,0 +1,124 @@
+"""Module for sharing one upstream model stream between identical requests."""
+
+import asyncio
+import hashlib
+import logging
+from typing import AsyncGenerator, Dict, List, Optional
+
+from src.ai_code_converter.config import DEFAULT_TEMPERATURE
+from src.ai_code_converter.models.stream_events import StreamError, StreamEvent
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    """An in-progress upstream stream and the events it has produced so far."""
+
+    def __init__(self):
+        self.events: List[StreamEvent] = []
+        self.done = False
+        self.subscribers = 0
+        self.changed = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    def publish(self, event: Optional[StreamEvent] = None) -> None:
+        """Append an event (if any) and wake every waiting subscriber."""
+        if event is not None:
+            self.events.append(event)
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+
+class SingleFlightStreamer:
+    """Deduplicate identical concurrent requests in front of an async streamer.
+
+    The first request for a key opens the upstream stream; later requests
+    for the same key attach as subscribers, replay the buffered prefix and
+    then receive live events. The upstream stream is cancelled once every
+    subscriber has gone away.
+    """
+
+    def __init__(self, streamer):
+        """Initialize with the ``AsyncAIModelStreamer`` to protect."""
+        self.streamer = streamer
+        self._flights: Dict[str, _Flight] = {}
+        self.upstream_calls = 0
+        self.shared_calls = 0
+
+    @property
+    def streams(self) -> Dict:
+        """Streams supported by the wrapped streamer."""
+        return self.streamer.streams
+
+    @staticmethod
+    def make_key(model: str, prompt: str, temperature: float = DEFAULT_TEMPERATURE) -> str:
+        """Fingerprint a request for deduplication."""
+        return hashlib.sha256(f"{model}\0{float(temperature):.3f}\0{prompt}".encode("utf-8")).hexdigest()
+
+    def in_flight(self) -> int:
+        """Number of upstream streams currently open."""
+        return len(self._flights)
+
+    async def stream(
+        self,
+        model: str,
+        prompt: str,
+        key: Optional[str] = None,
+        temperature: float = DEFAULT_TEMPERATURE
+    ) -> AsyncGenerator[StreamEvent, None]:
+        """Stream events for model/prompt, sharing the upstream stream when possible.
+
+        Args:
+            model: Model name from MODELS
+            prompt: Prompt to send
+            key: Optional request fingerprint (e.g. the conversion cache key);
+                defaults to a hash of model, prompt and temperature
+            temperature: Sampling temperature
+        """
+        flight_key = f"{model}\0{key}" if key else self.make_key(model, prompt, temperature)
+        flight = self._flights.get(flight_key)
+        if flight is None:
+            flight = _Flight()
+            self._flights[flight_key] = flight
+            flight.task = asyncio.create_task(self._run(flight_key, flight, model, prompt, temperature))
+            self.upstream_calls += 1
+        else:
+            self.shared_calls += 1
+            logger.info(f"Attaching to in-flight {model} stream ({len(flight.events)} events buffered)")
+
+        flight.subscribers += 1
+        try:
+            index = 0
+            while True:
+                while index < len(flight.events):
+                    yield flight.events[index]
+                    index += 1
+                if flight.done:
+                    break
+                await flight.changed.wait()
+        finally:
+            flight.subscribers -= 1
+            if flight.subscribers == 0 and not flight.done:
+                logger.info(f"All subscribers left, cancelling upstream {model} stream")
+                flight.task.cancel()
+                self._forget(flight_key, flight)
+
+    async def _run(self, flight_key: str, flight: _Flight, model: str, prompt: str, temperature: float) -> None:
+        """Pump the upstream stream into the flight buffer."""
+        try:
+            async for event in self.streamer.stream(model, prompt, temperature):
+                flight.publish(event)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"{model} upstream stream failed: {str(e)}", exc_info=True)
+            flight.publish(StreamError(model, f"Error with {model} API: {str(e)}"))
+        finally:
+            flight.done = True
+            self._forget(flight_key, flight)
+            flight.publish()
+
+    def _forget(self, flight_key: str, flight: _Flight) -> None:
+        """Stop routing new requests to a finished or abandoned flight."""
+        if self._flights.get(flight_key) is flight:
+            del self._flights[flight_key]
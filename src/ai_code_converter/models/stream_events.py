@@ -0,0 +1,126 @@
+"""Typed events emitted by the AI model streamers.
+
+Streamers yield small delta events instead of re-yielding the accumulated
+response, so consumers only pay for the bytes that actually arrived. Callers
+that need the full text feed the events into a ``StreamAccumulator``.
+"""
+
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Union
+
+
+@dataclass(frozen=True)
+class TextDelta:
+    """A fragment of newly generated text."""
+    text: str
+
+
+@dataclass(frozen=True)
+class Usage:
+    """Token accounting reported by the provider for the whole response.
+
+    ``cache_read_tokens`` are prompt tokens served from the provider's
+    prompt cache and ``cache_write_tokens`` prompt tokens written to it.
+    """
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+
+
+@dataclass(frozen=True)
+class FinishReason:
+    """Normalized reason the provider stopped generating ("stop", "length", ...)."""
+    reason: str
+
+
+@dataclass(frozen=True)
+class StreamError:
+    """Error that terminated a provider stream.
+
+    Fatal errors (authentication, configuration) open the provider's
+    circuit breaker at once.
+    """
+    provider: str
+    message: str
+    fatal: bool = False
+
+
+@dataclass(frozen=True)
+class HedgeOutcome:
+    """Which model produced the response of a hedged request."""
+    winner: str
+    primary: str
+    hedged: bool
+    elapsed: float
+
+
+StreamEvent = Union[TextDelta, Usage, FinishReason, StreamError, HedgeOutcome]
+
+
+class StreamAccumulator:
+    """Collect stream events into a single response.
+
+    Text fragments are kept in a list and joined once, on first access to
+    ``text``, instead of being concatenated on every delta.
+    """
+
+    def __init__(self):
+        """Initialize an empty accumulator."""
+        self._parts: List[str] = []
+        self._text: Optional[str] = None
+        self.usage: Optional[Usage] = None
+        self.finish_reason: Optional[str] = None
+        self.error: Optional[StreamError] = None
+        self.hedge: Optional[HedgeOutcome] = None
+        self.delta_count = 0
+
+    def add(self, event: StreamEvent) -> None:
+        """Record a single stream event."""
+        if isinstance(event, TextDelta):
+            if event.text:
+                self._parts.append(event.text)
+                self._text = None
+                self.delta_count += 1
+        elif isinstance(event, Usage):
+            # Continued responses report usage once per request
+            if self.usage is None:
+                self.usage = event
+            else:
+                self.usage = Usage(
+                    self.usage.input_tokens + event.input_tokens,
+                    self.usage.output_tokens + event.output_tokens,
+                    self.usage.cache_read_tokens + event.cache_read_tokens,
+                    self.usage.cache_write_tokens + event.cache_write_tokens
+                )
+        elif isinstance(event, FinishReason):
+            self.finish_reason = event.reason
+        elif isinstance(event, StreamError):
+            self.error = event
+        elif isinstance(event, HedgeOutcome):
+            self.hedge = event
+
+    def extend(self, events: Iterable[StreamEvent]) -> "StreamAccumulator":
+        """Record every event from an iterable and return self."""
+        for event in events:
+            self.add(event)
+        return self
+
+    @property
+    def text(self) -> str:
+        """Full text received so far."""
+        if self._text is None:
+            self._text = "".join(self._parts)
+            # Collapse the parts so repeated reads stay cheap
+            self._parts = [self._text] if self._text else []
+        return self._text
+
+    @property
+    def truncated(self) -> bool:
+        """Whether the provider stopped because it hit the output token limit."""
+        return self.finish_reason == "length"
+
+
+def accumulate(events: Iterable[StreamEvent]) -> StreamAccumulator:
+    """Consume a stream of events and return the populated accumulator."""
+    return StreamAccumulator().extend(events)
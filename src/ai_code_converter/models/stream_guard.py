@@ -0,0 +1,117 @@
+"""Module for the resilience bookkeeping shared by the sync and async streamers."""
+
+import logging
+import time
+from typing import Iterator, List, Optional
+
+from src.ai_code_converter.config import MAX_CONTINUATIONS
+from src.ai_code_converter.models.circuit_breaker import CircuitBreakerRegistry
+from src.ai_code_converter.models.continuation import ContinuationStitcher
+from src.ai_code_converter.models.rate_limiter import RateLimiterRegistry, estimate_request_tokens, estimate_tokens
+from src.ai_code_converter.models.retry_policy import RetryPolicy
+from src.ai_code_converter.models.stream_events import StreamError, StreamEvent, TextDelta, Usage
+
+logger = logging.getLogger(__name__)
+
+
+class StreamGuard:
+    """Circuit breaker, rate limiter and continuation state of one provider stream.
+
+    The streamers only iterate: they ask ``admit`` before the first
+    request, pass every provider event through ``feed``, call
+    ``end_attempt`` after each attempt and request another one while
+    ``resuming`` is set. When the stream ends they call ``complete``, when
+    the consumer stops reading ``abandon``, and in any case ``finish``,
+    which records the outcome with the breaker.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        prompt: str,
+        breakers: CircuitBreakerRegistry,
+        limiters: RateLimiterRegistry,
+        retry_policy: RetryPolicy
+    ):
+        """Initialize the guard for one request with the streamer's resilience components."""
+        self.model = model
+        self.prompt = prompt
+        self.breaker = breakers.get(model)
+        self.limiter = limiters.get(model)
+        self.stitcher = ContinuationStitcher(model, MAX_CONTINUATIONS, retry_policy.budget)
+        self._start = time.monotonic()
+        self._first_event_latency: Optional[float] = None
+        self._error: Optional[StreamError] = None
+        self._completed = False
+        self._settled = False
+        self._output: List[str] = []
+
+    @property
+    def prefix(self) -> Optional[str]:
+        """Partial answer the next attempt continues from."""
+        return self.stitcher.prefix
+
+    @property
+    def resuming(self) -> bool:
+        """Whether another attempt is needed to complete the response."""
+        return self.stitcher.resuming
+
+    def admit(self) -> bool:
+        """Return True if the breaker lets the request through."""
+        if self.breaker.allow_request():
+            return True
+        logger.warning(f"Circuit open for {self.model}, failing fast")
+        return False
+
+    def feed(self, event: StreamEvent) -> Iterator[StreamEvent]:
+        """Pass a provider event through the stitcher and yield what can be forwarded."""
+        for forwarded in self.stitcher.feed(event):
+            self._observe(forwarded)
+            yield forwarded
+
+    def end_attempt(self) -> Iterator[StreamEvent]:
+        """Finish the current attempt; sets ``resuming`` if another one is needed."""
+        for forwarded in self.stitcher.end_attempt():
+            self._observe(forwarded)
+            yield forwarded
+
+    def complete(self) -> None:
+        """Record that the stream ended on its own."""
+        self._completed = True
+
+    def abandon(self) -> None:
+        """Record that the consumer stopped reading, e.g. at the closing code fence.
+
+        Once text has arrived without an error that is a successful
+        response, not an abandoned one; usage that was never reported is
+        settled from an estimate of the text received.
+        """
+        self._completed = bool(self._output) and self._error is None
+        if self._completed and not self._settled:
+            self.limiter.settle(
+                estimate_request_tokens(self.prompt),
+                estimate_tokens(self.prompt) + estimate_tokens("".join(self._output))
+            )
+
+    def finish(self) -> None:
+        """Record the outcome with the breaker, or release the call if there is none."""
+        latency = self._first_event_latency
+        if latency is None:
+            latency = time.monotonic() - self._start
+        if self._error is not None:
+            self.breaker.record_failure(latency, fatal=self._error.fatal)
+        elif self._completed:
+            self.breaker.record_success(latency)
+        else:
+            self.breaker.release()
+
+    def _observe(self, event: StreamEvent) -> None:
+        if self._first_event_latency is None:
+            self._first_event_latency = time.monotonic() - self._start
+        if isinstance(event, StreamError):
+            self._error = event
+        elif isinstance(event, TextDelta):
+            self._output.append(event.text)
+        elif isinstance(event, Usage):
+            self.limiter.settle(estimate_request_tokens(self.prompt), event.input_tokens + event.output_tokens)
+            self._settled = True
@@ -0,0 +1,223 @@
+"""Module for the pooled HTTP transport shared by the provider SDK clients."""
+
+import importlib.util
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# httpx only negotiates HTTP/2 when the optional h2 package is installed
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class _HostPool:
+    """Sync and async clients for one upstream host plus their request counters."""
+
+    def __init__(self, host: str):
+        self.host = host
+        self.client: Optional[httpx.Client] = None
+        self.async_client: Optional[httpx.AsyncClient] = None
+        self.requests = 0
+        self.http_versions: Dict[str, int] = {}
+        self.warm_up_time: Optional[float] = None
+
+
+class HttpTransportPool:
+    """One pooled, keep-alive httpx client per upstream host.
+
+    Provider SDK clients are handed these clients as ``http_client`` so that
+    every request to a host reuses warm TLS connections, whichever SDK
+    client sends it. Clients are created lazily, one sync and one async
+    per host.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 120.0,
+        connect_timeout: float = 10.0,
+        read_timeout: float = 600.0,
+        http2: bool = True,
+        wrap_transport: Optional[Callable[[Any], Any]] = None
+    ):
+        """Initialize the pool settings.
+
+        Args:
+            max_connections: Connections per host and client
+            max_keepalive_connections: Idle connections kept open per host and client
+            keepalive_expiry: Seconds an idle connection is kept open
+            connect_timeout: Seconds allowed for connecting (including TLS)
+            read_timeout: Seconds allowed between bytes of a response
+            http2: Negotiate HTTP/2 when the host supports it and h2 is installed
+            wrap_transport: Called with each new pooled httpx transport and
+                returns the transport the client uses instead (e.g. a recorder)
+        """
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.http2 = http2 and HTTP2_AVAILABLE
+        if http2 and not HTTP2_AVAILABLE:
+            logger.info("h2 is not installed, provider connections will use HTTP/1.1")
+        self.wrap_transport = wrap_transport
+        self._hosts: Dict[str, _HostPool] = {}
+        self._lock = threading.Lock()
+
+    def client(self, base_url: str) -> httpx.Client:
+        """Return the shared sync client for the host of base_url."""
+        pool = self._pool(base_url)
+        with self._lock:
+            if pool.client is None:
+                pool.client = httpx.Client(
+                    limits=self.limits,
+                    timeout=self.timeout,
+                    http2=self.http2,
+                    transport=self._transport(httpx.HTTPTransport),
+                    event_hooks={
+                        "request": [lambda request: self._on_request(pool)],
+                        "response": [lambda response: self._on_response(pool, response)]
+                    }
+                )
+            return pool.client
+
+    def async_client(self, base_url: str) -> httpx.AsyncClient:
+        """Return the shared async client for the host of base_url."""
+        pool = self._pool(base_url)
+
+        async def on_request(request: httpx.Request) -> None:
+            self._on_request(pool)
+
+        async def on_response(response: httpx.Response) -> None:
+            self._on_response(pool, response)
+
+        with self._lock:
+            if pool.async_client is None:
+                pool.async_client = httpx.AsyncClient(
+                    limits=self.limits,
+                    timeout=self.timeout,
+                    http2=self.http2,
+                    transport=self._transport(httpx.AsyncHTTPTransport),
+                    event_hooks={"request": [on_request], "response": [on_response]}
+                )
+            return pool.async_client
+
+    def warm_up(self, base_urls: Iterable[str], timeout: float = 5.0) -> Dict[str, Optional[float]]:
+        """Open a connection to every host in parallel so first requests skip the handshake.
+
+        Returns the seconds each warm-up took, or None for hosts that could
+        not be reached.
+        """
+        urls = list(base_urls)
+        if not urls:
+            return {}
+        with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+            results = list(executor.map(lambda url: self._warm_up_host(url, timeout), urls))
+        return {_host(url): elapsed for url, elapsed in zip(urls, results)}
+
+    async def warm_up_async(self, base_urls: Iterable[str], timeout: float = 5.0) -> None:
+        """Open a connection to every host without one in the async pools.
+
+        Async connections belong to the event loop that opened them, so this
+        has to run on the loop that serves conversions.
+        """
+        for url in base_urls:
+            client = self.async_client(url)
+            if _pool_connections(client):
+                continue
+            try:
+                await client.head(url, timeout=timeout)
+            except httpx.HTTPError as e:
+                logger.warning(f"Could not warm up connection to {_host(url)}: {str(e)}")
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return request counts and connection pool utilisation per host."""
+        with self._lock:
+            pools = list(self._hosts.values())
+        stats = {}
+        for pool in pools:
+            connections = [
+                connection
+                for client in (pool.client, pool.async_client) if client is not None
+                for connection in _pool_connections(client)
+            ]
+            idle = sum(1 for connection in connections if connection.is_idle())
+            clients = sum(1 for client in (pool.client, pool.async_client) if client is not None)
+            capacity = self.limits.max_connections * clients
+            stats[pool.host] = {
+                "requests": pool.requests,
+                "http_versions": dict(pool.http_versions),
+                "connections": len(connections),
+                "idle_connections": idle,
+                "utilisation": (len(connections) - idle) / capacity if capacity else 0.0,
+                "warm_up_time": pool.warm_up_time
+            }
+        return stats
+
+    def close(self) -> None:
+        """Close the sync clients (async clients are closed with their event loop)."""
+        with self._lock:
+            for pool in self._hosts.values():
+                if pool.client is not None:
+                    pool.client.close()
+                    pool.client = None
+
+    def _transport(self, transport_class) -> Optional[Any]:
+        """Pooled transport passed through wrap_transport, or None for the client default."""
+        if self.wrap_transport is None:
+            return None
+        return self.wrap_transport(transport_class(limits=self.limits, http2=self.http2))
+
+    def _pool(self, base_url: str) -> _HostPool:
+        host = _host(base_url)
+        with self._lock:
+            pool = self._hosts.get(host)
+            if pool is None:
+                pool = _HostPool(host)
+                self._hosts[host] = pool
+            return pool
+
+    def _warm_up_host(self, url: str, timeout: float) -> Optional[float]:
+        start = time.monotonic()
+        try:
+            # Any response will do: the point is the TCP and TLS handshake
+            self.client(url).head(url, timeout=timeout)
+        except httpx.HTTPError as e:
+            logger.warning(f"Could not warm up connection to {_host(url)}: {str(e)}")
+            return None
+        elapsed = time.monotonic() - start
+        self._pool(url).warm_up_time = elapsed
+        logger.info(f"Warmed up connection to {_host(url)} in {elapsed * 1000:.0f}ms")
+        return elapsed
+
+    def _on_request(self, pool: _HostPool) -> None:
+        with self._lock:
+            pool.requests += 1
+
+    def _on_response(self, pool: _HostPool, response: httpx.Response) -> None:
+        with self._lock:
+            version = response.http_version
+            pool.http_versions[version] = pool.http_versions.get(version, 0) + 1
+
+
+def _host(url: str) -> str:
+    """Scheme, host and port identifying the connection pool for a URL."""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _pool_connections(client) -> list:
+    """Connections currently held by a client's connection pool."""
+    transport = getattr(client, "_transport", None)
+    # Look through wrapping transports such as the cassette recorder
+    transport = getattr(transport, "inner", transport)
+    pool = getattr(transport, "_pool", None)
+    return list(getattr(pool, "connections", []))
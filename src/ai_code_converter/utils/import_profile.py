@@ -0,0 +1,102 @@
+"""Import-time profiling for startup performance.
+
+Runs ``python -X importtime`` in a fresh interpreter and reports the
+modules that are most expensive to import. Use it from the command line::
+
+    python -m src.ai_code_converter.utils.import_profile [module] [--top N]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import List, Optional
+
+# Project root, so that ``src.ai_code_converter`` imports resolve in the child
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    """Time spent importing one module, in seconds."""
+    module: str
+    self_time: float
+    cumulative: float
+    depth: int
+
+
+def parse_importtime(output: str) -> List[ImportTiming]:
+    """Parse the stderr of ``python -X importtime`` into timings."""
+    timings = []
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            timings.append(ImportTiming(
+                module=module,
+                self_time=int(self_us) / 1e6,
+                cumulative=int(cumulative_us) / 1e6,
+                depth=(len(indent) - 1) // 2
+            ))
+    return timings
+
+
+def profile_imports(module: str, python: Optional[str] = None) -> List[ImportTiming]:
+    """Import module in a fresh interpreter and return the timing of every import.
+
+    Raises:
+        RuntimeError: If the module fails to import
+    """
+    result = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def import_time(module: str, python: Optional[str] = None) -> float:
+    """Seconds a fresh interpreter needs to import module, including its dependencies.
+
+    Parent packages are imported first and reported separately, so their
+    time is added in; interpreter startup (``site`` etc.) is not.
+    """
+    timings = profile_imports(module, python)
+    return sum(
+        timing.cumulative
+        for timing in timings
+        if timing.depth == 0 and (timing.module == module or module.startswith(timing.module + "."))
+    )
+
+
+def format_report(timings: List[ImportTiming], top: int = 25) -> str:
+    """Format the most expensive imports, by cumulative time, as a table."""
+    total = sum(timing.cumulative for timing in timings if timing.depth == 0)
+    rows = sorted(timings, key=lambda timing: timing.cumulative, reverse=True)[:top]
+    lines = [f"Total import time: {total * 1000:.0f}ms", f"{'cumulative':>12} {'self':>10}  module"]
+    for timing in rows:
+        lines.append(
+            f"{timing.cumulative * 1000:>10.1f}ms {timing.self_time * 1000:>8.1f}ms  "
+            f"{'  ' * timing.depth}{timing.module}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Print an import-time report for a module."""
+    parser = argparse.ArgumentParser(description="Report the import cost of each module")
+    parser.add_argument("module", nargs="?", default="src.ai_code_converter.app", help="Module to import")
+    parser.add_argument("--top", type=int, default=25, help="Number of modules to list")
+    args = parser.parse_args(argv)
+    print(format_report(profile_imports(args.module), args.top))
+
+
+if __name__ == "__main__":
+    main()
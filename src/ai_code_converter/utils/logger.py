@@ -1,5 +1,6 @@
 """Logging configuration for the CodeXchange AI."""
 
+import inspect
 import json
 import logging
 import logging.handlers
@@ -38,41 +39,56 @@ class JSONFormatter(logging.Formatter):
         return json.dumps(log_data)
 
 def log_execution_time(logger: logging.Logger) -> Callable:
-    """Decorator to log function execution time."""
+    """Decorator to log function execution time (supports coroutine functions)."""
     def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            start_time = time.time()
-            
-            # Log function entry
+        def log_entry(args, kwargs) -> float:
             logger.debug(
                 "Function Entry | %s | Args: %s | Kwargs: %s",
                 func.__name__,
                 [str(arg) for arg in args],
                 {k: str(v) for k, v in kwargs.items() if not any(sensitive in k.lower() for sensitive in ('password', 'key', 'token', 'secret'))}
             )
+            return time.time()
+        
+        def log_exit(start_time: float) -> None:
+            logger.debug(
+                "Function Exit | %s | Duration: %.4fs",
+                func.__name__,
+                time.time() - start_time
+            )
+        
+        def log_error(start_time: float, e: Exception) -> None:
+            logger.error(
+                "Function Error | %s | Duration: %.4fs | Error: %s",
+                func.__name__,
+                time.time() - start_time,
+                str(e),
+                exc_info=True
+            )
+        
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start_time = log_entry(args, kwargs)
+                try:
+                    result = await func(*args, **kwargs)
+                    log_exit(start_time)
+                    return result
+                except Exception as e:
+                    log_error(start_time, e)
+                    raise
             
+            return async_wrapper
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start_time = log_entry(args, kwargs)
             try:
                 result = func(*args, **kwargs)
-                duration = time.time() - start_time
-                
-                # Log function exit
-                logger.debug(
-                    "Function Exit | %s | Duration: %.4fs",
-                    func.__name__,
-                    duration
-                )
+                log_exit(start_time)
                 return result
-                
             except Exception as e:
-                duration = time.time() - start_time
-                logger.error(
-                    "Function Error | %s | Duration: %.4fs | Error: %s",
-                    func.__name__,
-                    duration,
-                    str(e),
-                    exc_info=True
-                )
+                log_error(start_time, e)
                 raise
                 
         return wrapper
@@ -0,0 +1,389 @@
+"""Local stand-in for the OpenAI and Anthropic streaming APIs.
+
+The server speaks the OpenAI chat-completions SSE protocol
+(``POST /v1/chat/completions``) and the Anthropic messages streaming
+protocol (``POST /v1/messages``), with configurable latency, throughput,
+canned replies and injected failures. Point the app at it with
+``MOCK_LLM_URL`` to benchmark the conversion pipeline offline::
+
+    python -m src.ai_code_converter.utils.mock_llm_server --port 8765 --ttft 0.5 --tps 60
+    MOCK_LLM_URL=http://127.0.0.1:8765 python run.py
+"""
+
+import argparse
+import json
+import logging
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+OK = "ok"
+RATE_LIMITED = "429"
+OVERLOADED = "529"
+DROP = "drop"
+ERROR_KINDS = (RATE_LIMITED, OVERLOADED, DROP)
+
+DEFAULT_REPLY = "```python\nprint(\"Hello from the mock LLM server\")\n```\n"
+
+_TOKEN = re.compile(r"\s+|\S+\s*")
+
+
+@dataclass
+class MockSettings:
+    """Behaviour of the mock server.
+
+    Attributes:
+        ttft: Seconds before the first token is sent
+        tokens_per_second: Streaming rate after the first token (0 for no delay)
+        replies: Canned replies keyed by a substring of the prompt (first match wins)
+        default_reply: Reply for prompts matching no key
+        error_rate: Probability that a request fails with one of error_kinds
+        error_kinds: Failures to inject: "429", "529" or "drop" (connection lost mid-stream)
+        error_sequence: Outcomes forced for the first requests, e.g. ["429", "ok"]
+        retry_after: Seconds advertised in the retry-after header of 429 responses
+        seed: Seed for the error injection random generator
+    """
+    ttft: float = 0.2
+    tokens_per_second: float = 100.0
+    replies: Dict[str, str] = field(default_factory=dict)
+    default_reply: str = DEFAULT_REPLY
+    error_rate: float = 0.0
+    error_kinds: Tuple[str, ...] = ERROR_KINDS
+    error_sequence: List[str] = field(default_factory=list)
+    retry_after: float = 1.0
+    seed: Optional[int] = None
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into word-sized tokens that concatenate back to the text."""
+    return _TOKEN.findall(text)
+
+
+class MockLLMServer:
+    """Threaded HTTP server hosting the mock provider APIs."""
+
+    def __init__(self, settings: Optional[MockSettings] = None, host: str = "127.0.0.1", port: int = 0):
+        """Initialize the server; port 0 picks a free port."""
+        self.settings = settings or MockSettings()
+        self._random = random.Random(self.settings.seed)
+        self._lock = threading.Lock()
+        self._sequence = list(self.settings.error_sequence)
+        self.requests = 0
+        self.outcomes: Dict[str, int] = {}
+        self._server = ThreadingHTTPServer((host, port), _handler_for(self))
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server (append ``/v1`` for OpenAI-compatible clients)."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockLLMServer":
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-llm-server", daemon=True)
+        self._thread.start()
+        logger.info(f"Mock LLM server listening on {self.url}")
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def serve_forever(self) -> None:
+        """Serve requests on the calling thread until interrupted."""
+        self._server.serve_forever()
+
+    def __enter__(self) -> "MockLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def next_outcome(self) -> str:
+        """Decide whether the next request succeeds or which failure it gets."""
+        with self._lock:
+            self.requests += 1
+            if self._sequence:
+                outcome = self._sequence.pop(0)
+            elif self.settings.error_kinds and self._random.random() < self.settings.error_rate:
+                outcome = self._random.choice(self.settings.error_kinds)
+            else:
+                outcome = OK
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+            return outcome
+
+    def reply_for(self, prompt: str, prefix: str = "") -> str:
+        """Canned reply for prompt, minus any part already given as prefix."""
+        reply = self.settings.default_reply
+        for key, text in self.settings.replies.items():
+            if key in prompt:
+                reply = text
+                break
+        if prefix and reply.startswith(prefix.rstrip()):
+            return reply[len(prefix.rstrip()):]
+        return reply
+
+
+def _handler_for(server: MockLLMServer):
+    """Build a request handler class bound to server."""
+
+    class Handler(_MockHandler):
+        mock = server
+
+    return Handler
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    mock: MockLLMServer
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(format % args)
+
+    def do_HEAD(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        path = self.path.rstrip("/")
+        try:
+            if path.endswith("/chat/completions"):
+                self._chat_completions(body)
+            elif path.endswith("/messages"):
+                self._messages(body)
+            else:
+                self._send_json(404, {"error": {"type": "not_found_error", "message": f"Unknown path {self.path}"}})
+        except (BrokenPipeError, ConnectionResetError):
+            # Clients may stop reading early, e.g. once the code block is complete
+            logger.debug(f"Client closed the connection during {self.path}")
+            self.close_connection = True
+
+    def _chat_completions(self, body: Dict[str, Any]) -> None:
+        """OpenAI-compatible chat completions."""
+        messages = body.get("messages", [])
+        prompt = _first_user_text(messages)
+        prefix = messages[-2]["content"] if len(messages) >= 3 and messages[-2].get("role") == "assistant" else ""
+        tokens, truncated = self._tokens(prompt, prefix, body.get("max_completion_tokens") or body.get("max_tokens"))
+        outcome = self.mock.next_outcome()
+        if self._send_failure(outcome, openai=True):
+            return
+
+        model = body.get("model", "mock")
+        finish_reason = "length" if truncated else "stop"
+        usage = {
+            "prompt_tokens": len(prompt) // 4,
+            "completion_tokens": len(tokens),
+            "total_tokens": len(prompt) // 4 + len(tokens)
+        }
+        if not body.get("stream"):
+            self._pace(tokens)
+            self._send_json(200, {
+                "id": "chatcmpl-mock",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "".join(tokens)},
+                    "finish_reason": finish_reason
+                }],
+                "usage": usage
+            })
+            return
+
+        def chunk(delta: Dict[str, Any], finish: Optional[str] = None) -> Dict[str, Any]:
+            return {
+                "id": "chatcmpl-mock",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}]
+            }
+
+        self._start_stream()
+        self._event(chunk({"role": "assistant", "content": ""}))
+        if not self._stream_tokens(tokens, outcome, lambda token: self._event(chunk({"content": token}))):
+            return
+        self._event(chunk({}, finish_reason))
+        if (body.get("stream_options") or {}).get("include_usage"):
+            self._event({"id": "chatcmpl-mock", "object": "chat.completion.chunk", "created": int(time.time()),
+                         "model": model, "choices": [], "usage": usage})
+        self._write(b"data: [DONE]\n\n")
+        self._end_stream()
+
+    def _messages(self, body: Dict[str, Any]) -> None:
+        """Anthropic messages (streaming only, as used by the app)."""
+        messages = body.get("messages", [])
+        prompt = _first_user_text(messages)
+        prefix = _text(messages[-1]) if messages and messages[-1].get("role") == "assistant" else ""
+        tokens, truncated = self._tokens(prompt, prefix, body.get("max_tokens"))
+        outcome = self.mock.next_outcome()
+        if self._send_failure(outcome, openai=False):
+            return
+
+        input_tokens = len(prompt) // 4
+        self._start_stream()
+        self._event({"type": "message_start", "message": {
+            "id": "msg_mock", "type": "message", "role": "assistant", "model": body.get("model", "mock"),
+            "content": [], "stop_reason": None, "stop_sequence": None,
+            "usage": {"input_tokens": input_tokens, "output_tokens": 1}
+        }}, "message_start")
+        self._event({"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}},
+                    "content_block_start")
+        sent = self._stream_tokens(tokens, outcome, lambda token: self._event(
+            {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": token}},
+            "content_block_delta"
+        ))
+        if not sent:
+            return
+        self._event({"type": "content_block_stop", "index": 0}, "content_block_stop")
+        self._event({
+            "type": "message_delta",
+            "delta": {"stop_reason": "max_tokens" if truncated else "end_turn", "stop_sequence": None},
+            "usage": {"output_tokens": len(tokens)}
+        }, "message_delta")
+        self._event({"type": "message_stop"}, "message_stop")
+        self._end_stream()
+
+    def _tokens(self, prompt: str, prefix: str, max_tokens: Optional[int]) -> Tuple[List[str], bool]:
+        tokens = tokenize(self.mock.reply_for(prompt, prefix))
+        if max_tokens and len(tokens) > max_tokens:
+            return tokens[:max_tokens], True
+        return tokens, False
+
+    def _send_failure(self, outcome: str, openai: bool) -> bool:
+        """Send an injected error response; return True if one was sent."""
+        if outcome == RATE_LIMITED:
+            error_type = "rate_limit_exceeded" if openai else "rate_limit_error"
+            self._send_json(429, {"type": "error", "error": {"type": error_type, "message": "Mock rate limit"}},
+                            {"retry-after": f"{self.mock.settings.retry_after:g}"})
+            return True
+        if outcome == OVERLOADED:
+            self._send_json(529, {"type": "error", "error": {"type": "overloaded_error", "message": "Mock overload"}})
+            return True
+        return False
+
+    def _stream_tokens(self, tokens: List[str], outcome: str, send) -> bool:
+        """Send tokens at the configured pace; return False if the connection was dropped."""
+        drop_at = len(tokens) // 2 if outcome == DROP else None
+        for index, token in enumerate(tokens):
+            if index == drop_at:
+                # Lose the connection without terminating the stream
+                self.close_connection = True
+                self.connection.shutdown(2)
+                return False
+            self._sleep_before(index)
+            send(token)
+        if drop_at is not None:
+            self.close_connection = True
+            self.connection.shutdown(2)
+            return False
+        return True
+
+    def _pace(self, tokens: List[str]) -> None:
+        for index in range(len(tokens)):
+            self._sleep_before(index)
+
+    def _sleep_before(self, index: int) -> None:
+        settings = self.mock.settings
+        if index == 0:
+            time.sleep(settings.ttft)
+        elif settings.tokens_per_second > 0:
+            time.sleep(1.0 / settings.tokens_per_second)
+
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _start_stream(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _event(self, payload: Dict[str, Any], name: Optional[str] = None) -> None:
+        event = f"event: {name}\n" if name else ""
+        self._write(f"{event}data: {json.dumps(payload)}\n\n".encode())
+
+    def _write(self, data: bytes) -> None:
+        """Write one chunk of a chunked response."""
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _end_stream(self) -> None:
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+def _text(message: Dict[str, Any]) -> str:
+    """Text of a chat message whose content is a string or a list of blocks."""
+    content = message.get("content", "")
+    if isinstance(content, str):
+        return content
+    return "".join(block.get("text", "") for block in content if isinstance(block, dict))
+
+
+def _first_user_text(messages: List[Dict[str, Any]]) -> str:
+    for message in messages:
+        if message.get("role") == "user":
+            return _text(message)
+    return ""
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the mock server from the command line."""
+    parser = argparse.ArgumentParser(description="Mock OpenAI/Anthropic streaming server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--ttft", type=float, default=0.2, help="Seconds to first token")
+    parser.add_argument("--tps", type=float, default=100.0, help="Tokens per second (0 for no delay)")
+    parser.add_argument("--replies", help="JSON file mapping prompt substrings to replies")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of an injected failure")
+    parser.add_argument("--errors", default=",".join(ERROR_KINDS), help="Failures to inject: 429,529,drop")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="retry-after seconds for 429s")
+    parser.add_argument("--seed", type=int, help="Seed for error injection")
+    args = parser.parse_args(argv)
+
+    replies = {}
+    if args.replies:
+        with open(args.replies, "r", encoding="utf-8") as f:
+            replies = json.load(f)
+
+    logging.basicConfig(level=logging.INFO)
+    server = MockLLMServer(MockSettings(
+        ttft=args.ttft,
+        tokens_per_second=args.tps,
+        replies=replies,
+        error_rate=args.error_rate,
+        error_kinds=tuple(kind for kind in args.errors.split(",") if kind),
+        retry_after=args.retry_after,
+        seed=args.seed
+    ), args.host, args.port)
+    logger.info(f"Mock LLM server listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
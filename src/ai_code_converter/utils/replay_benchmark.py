@@ -0,0 +1,115 @@
+"""Regression benchmark of the conversion pipeline on recorded provider streams.
+
+Replays a cassette through ``_stream_model_response``, ``_clean_response``
+and ``prepare_download`` and reports how long each stage takes, so changes
+to the pipeline can be compared run to run without calling the providers::
+
+    python -m src.ai_code_converter.utils.replay_benchmark cassettes/session.jsonl.gz [--speed 0] [--repeat 5]
+
+Record a cassette first by running the app with ``CASSETTE_MODE=record``.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+
+
+@dataclass(frozen=True)
+class StageTimings:
+    """Seconds spent in each pipeline stage for one conversion."""
+    model: str
+    stream: float
+    clean: float
+    download: float
+    output_chars: int
+
+    @property
+    def total(self) -> float:
+        return self.stream + self.clean + self.download
+
+
+def _no_progress(*args, **kwargs) -> None:
+    pass
+
+
+def run_benchmark(app, models: List[str], repeat: int = 3, language: str = "Python") -> List[StageTimings]:
+    """Convert ``repeat`` times with every model and time each pipeline stage.
+
+    The app's provider clients should be replaying a cassette; the prompt is
+    a placeholder because replay falls back to recordings of the same model.
+    """
+    results = []
+    for model in models:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            accumulator = app._stream_model_response(model, f"Replay benchmark ({model})", _no_progress)
+            streamed = time.perf_counter()
+            cleaned = app._clean_response(accumulator.text)
+            clean_end = time.perf_counter()
+            path, _ = app.file_handler.prepare_download(cleaned, language)
+            download_end = time.perf_counter()
+            if path and os.path.exists(path):
+                os.remove(path)
+            results.append(StageTimings(
+                model=model,
+                stream=streamed - start,
+                clean=clean_end - streamed,
+                download=download_end - clean_end,
+                output_chars=len(cleaned)
+            ))
+    return results
+
+
+def format_report(results: List[StageTimings]) -> str:
+    """Median stage timings per model, as a table."""
+    lines = [f"{'model':<10} {'runs':>4} {'stream':>10} {'clean':>10} {'download':>10} {'total':>10}"]
+    for model in dict.fromkeys(result.model for result in results):
+        runs = [result for result in results if result.model == model]
+        medians = [
+            statistics.median(getattr(run, stage) for run in runs) * 1000
+            for stage in ("stream", "clean", "download", "total")
+        ]
+        lines.append(f"{model:<10} {len(runs):>4} " + " ".join(f"{value:>8.1f}ms" for value in medians))
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Replay a cassette through the conversion pipeline and print stage timings."""
+    parser = argparse.ArgumentParser(description="Benchmark the conversion pipeline on a recorded cassette")
+    parser.add_argument("cassette", help="Cassette recorded with CASSETTE_MODE=record")
+    parser.add_argument("--speed", type=float, default=0.0, help="Replay speed: 1 is real time, 0 removes delays")
+    parser.add_argument("--repeat", type=int, default=3, help="Conversions per model")
+    parser.add_argument("--language", default="Python", help="Target language of the downloads")
+    parser.add_argument("--output", help="Write every run's timings to this JSON file")
+    args = parser.parse_args(argv)
+
+    # Configuration is read at import, so the replay settings go in first
+    os.environ.update({
+        "CASSETTE_MODE": "replay",
+        "CASSETTE_PATH": args.cassette,
+        "CASSETTE_REPLAY_SPEED": str(args.speed),
+        "CASSETTE_STRICT": "false",
+        "HTTP_WARMUP_ENABLED": "false"
+    })
+    from src.ai_code_converter.app import CodeConverterApp
+    from src.ai_code_converter.config import MODEL_IDS
+
+    app = CodeConverterApp()
+    names = {model_id: name for name, model_id in MODEL_IDS.items()}
+    models = [names[model_id] for model_id in dict.fromkeys(
+        interaction.model for interaction in app.cassette.interactions
+    ) if model_id in names]
+
+    results = run_benchmark(app, models, args.repeat, args.language)
+    print(format_report(results))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump([dict(asdict(result), total=result.total) for result in results], f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Rate limiting for progressive UI updates."""
+
+import asyncio
+import logging
+from typing import AsyncIterator
+
+logger = logging.getLogger(__name__)
+
+
+class UpdateThrottle:
+    """Coalesce frequent change notifications into a bounded update rate.
+
+    Producers call ``notify`` whenever the shown value changed (e.g. on
+    every streamed token); the consumer iterates ``ticks`` and re-renders
+    once per tick. Changes arriving faster than ``rate`` per second are
+    merged into the next tick, so the UI never falls behind the stream.
+    """
+
+    def __init__(self, rate: float = 15.0):
+        """Initialize with the maximum number of updates per second (0 for no limit)."""
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.notifications = 0
+        self.ticks_sent = 0
+        self._changed = asyncio.Event()
+
+    def notify(self) -> None:
+        """Record that the value changed."""
+        self.notifications += 1
+        self._changed.set()
+
+    async def ticks(self, until: "asyncio.Future") -> AsyncIterator[None]:
+        """Yield once per batch of changes until ``until`` is done.
+
+        The final value is left to the caller, which has it once ``until``
+        completes; changes still pending at that point are not ticked.
+        """
+        loop = asyncio.get_running_loop()
+        last_tick = None
+        while not until.done():
+            if not self._changed.is_set():
+                waiter = asyncio.ensure_future(self._changed.wait())
+                try:
+                    await asyncio.wait({waiter, until}, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    waiter.cancel()
+                if until.done():
+                    return
+            if last_tick is not None:
+                delay = last_tick + self.interval - loop.time()
+                if delay > 0:
+                    # Let more changes pile up until the next update is due
+                    await asyncio.wait({until}, timeout=delay)
+                    if until.done():
+                        return
+            self._changed.clear()
+            last_tick = loop.time()
+            self.ticks_sent += 1
+            yield
@@ -0,0 +1,127 @@
+"""Tests for the asyncio streaming engine."""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ai_code_converter.models.async_streaming import AsyncAIModelStreamer
+from src.ai_code_converter.models.rate_limiter import RateLimiterRegistry
+from src.ai_code_converter.models.retry_policy import RetryPolicy
+from src.ai_code_converter.models.stream_events import accumulate
+
+UNLIMITED = RateLimiterRegistry({}, default={"requests_per_minute": 1e6, "tokens_per_minute": 1e9})
+
+
+class FakeAsyncStream:
+    """Async iterator over pre-built OpenAI-shaped chunks."""
+
+    def __init__(self, fragments):
+        self.chunks = [
+            SimpleNamespace(
+                choices=[SimpleNamespace(delta=SimpleNamespace(content=text), finish_reason=None)],
+                usage=None
+            )
+            for text in fragments
+        ]
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for chunk in self.chunks:
+            await asyncio.sleep(0)
+            yield chunk
+
+
+class FakeAsyncOpenAI:
+    """Minimal stand-in for ``AsyncOpenAI`` that streams fixed fragments."""
+
+    def __init__(self, fragments, failures=0):
+        self.fragments = fragments
+        self.failures = failures
+        self.calls = 0
+        self.requests = []
+        self.headers = {}
+        self.chat = SimpleNamespace(completions=SimpleNamespace(
+            create=self._create,
+            with_raw_response=SimpleNamespace(create=self._create_raw)
+        ))
+
+    async def _create(self, **kwargs):
+        self.calls += 1
+        self.requests.append(kwargs)
+        if self.calls <= self.failures:
+            raise ConnectionError("connection reset")
+        return FakeAsyncStream(self.fragments)
+
+    async def _create_raw(self, **kwargs):
+        stream = await self._create(**kwargs)
+        return SimpleNamespace(headers=self.headers, parse=lambda: stream)
+
+
+def _collect(agen):
+    async def run():
+        return [event async for event in agen]
+    return asyncio.run(run())
+
+
+def test_stream_gpt_yields_deltas():
+    """Test that the async GPT stream yields text deltas."""
+    client = FakeAsyncOpenAI(["fn ", "main", "() {}"])
+    streamer = AsyncAIModelStreamer(client, None, client, client, None)
+
+    events = _collect(streamer.stream("GPT", "prompt"))
+    assert accumulate(events).text == "fn main() {}"
+
+
+def test_concurrent_streams_share_event_loop():
+    """Test that several conversions can run concurrently on one loop."""
+    client = FakeAsyncOpenAI(["a", "b", "c"])
+    streamer = AsyncAIModelStreamer(client, None, client, client, None, limiters=UNLIMITED)
+
+    async def convert():
+        return accumulate([event async for event in streamer.stream("GROQ", "p")]).text
+
+    async def run_all():
+        return await asyncio.gather(*(convert() for _ in range(50)))
+
+    assert asyncio.run(run_all()) == ["abc"] * 50
+    assert client.calls == 50
+
+
+def test_rate_limit_headers_update_limiter():
+    """Test that rate-limit headers on the raw response adjust the provider budget."""
+    client = FakeAsyncOpenAI(["x"])
+    client.headers = {"x-ratelimit-limit-requests": "10", "x-ratelimit-remaining-requests": "3"}
+    streamer = AsyncAIModelStreamer(client, None, client, client, None)
+
+    _collect(streamer.stream("GPT", "prompt"))
+    snapshot = streamer.limiters.get("GPT").snapshot()
+    assert snapshot["requests_per_minute"] == 10
+    assert snapshot["requests_available"] < 4
+
+
+def test_connection_errors_are_retried_before_first_chunk():
+    """Test that the async streams retry failed requests through the retry policy."""
+    client = FakeAsyncOpenAI(["ok"], failures=2)
+    policy = RetryPolicy(max_attempts=3, initial_delay=0.0, jitter=False)
+    streamer = AsyncAIModelStreamer(client, None, client, client, None, retry_policy=policy)
+
+    events = _collect(streamer.stream("DeepSeek", "prompt"))
+    assert accumulate(events).text == "ok"
+    assert client.calls == 3
+
+
+def test_temperature_is_sent_to_the_provider():
+    """Test that the requested temperature reaches every OpenAI-compatible request."""
+    client = FakeAsyncOpenAI(["x"])
+    streamer = AsyncAIModelStreamer(client, None, client, client, None, limiters=UNLIMITED)
+
+    for model in ("GPT", "DeepSeek", "GROQ"):
+        _collect(streamer.stream(model, "prompt", 0.2))
+    _collect(streamer.stream("GPT", "prompt"))
+    assert [request["temperature"] for request in client.requests] == [0.2, 0.2, 0.2, 0.7]
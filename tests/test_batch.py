@@ -0,0 +1,118 @@
+"""Tests for batch conversion of many files."""
+
+import json
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ai_code_converter.batch import BatchConverter, find_sources
+from src.ai_code_converter.models.stream_events import Usage
+
+
+class FakeApp:
+    """Stand-in for CodeConverterApp.convert that records calls and concurrency."""
+
+    def __init__(self, delay=0.0, fail=()):
+        self.delay = delay
+        self.fail = set(fail)
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def convert(self, code, lang_in, lang_out, model, temp, document_enabled, document_style):
+        with self._lock:
+            self.calls.append(code)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        if code in self.fail:
+            return SimpleNamespace(output="Error with GPT API: boom", status="error", model=model, usage=None)
+        return SimpleNamespace(
+            output=f"// {lang_out}\n{code}", status="converted", model=model, usage=Usage(len(code), 7)
+        )
+
+
+def _write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def _tree(tmp_path):
+    source = tmp_path / "src"
+    _write(str(source / "a.py"), "print('a')\n")
+    _write(str(source / "pkg" / "b.py"), "print('b')\n")
+    _write(str(source / "notes.txt"), "not code\n")
+    return str(source)
+
+
+def test_find_sources_by_directory_and_glob(tmp_path):
+    """Test that directories are searched by extension and globs recurse."""
+    source = _tree(tmp_path)
+    assert [os.path.relpath(path, source) for path in find_sources(source, "Python")] == ["a.py", os.path.join("pkg", "b.py")]
+    assert len(find_sources(os.path.join(source, "**", "*.py"), "Python")) == 2
+
+
+def test_batch_writes_outputs_and_manifest(tmp_path):
+    """Test that results mirror the source tree and the manifest records each file."""
+    source, output = _tree(tmp_path), str(tmp_path / "out")
+    results = BatchConverter(FakeApp(), max_workers=2).run(source, "Python", "JavaScript", "GPT", output)
+
+    assert [(result.source, result.status) for result in results] == [
+        ("a.py", "converted"), (os.path.join("pkg", "b.py"), "converted")
+    ]
+    with open(os.path.join(output, "pkg", "b.js")) as f:
+        assert f.read() == "// JavaScript\nprint('b')\n"
+    with open(os.path.join(output, "manifest.json")) as f:
+        manifest = json.load(f)
+    assert manifest["target_language"] == "JavaScript"
+    entry = manifest["files"]["a.py"]
+    assert entry["output"] == "a.js"
+    assert entry["input_tokens"] == len("print('a')\n")
+    assert entry["output_tokens"] == 7
+    assert entry["latency"] >= 0
+
+
+def test_batch_resumes_from_manifest(tmp_path):
+    """Test that unchanged files are skipped and changed or failed files are converted again."""
+    source, output = _tree(tmp_path), str(tmp_path / "out")
+    first = FakeApp(fail=["print('b')\n"])
+    results = BatchConverter(first, max_workers=2).run(source, "Python", "JavaScript", "GPT", output)
+    assert [result.status for result in results] == ["converted", "error"]
+    assert results[1].error == "Error with GPT API: boom"
+
+    _write(os.path.join(source, "a.py"), "print('A')\n")
+    _write(os.path.join(source, "c.py"), "print('c')\n")
+    second = FakeApp()
+    BatchConverter(second, max_workers=2).run(source, "Python", "JavaScript", "GPT", output)
+    assert sorted(second.calls) == ["print('A')\n", "print('b')\n", "print('c')\n"]
+
+    third = FakeApp()
+    results = BatchConverter(third, max_workers=2).run(source, "Python", "JavaScript", "GPT", output)
+    assert third.calls == []
+    assert {result.status for result in results} == {"skipped"}
+
+    # A different target language cannot reuse the results
+    fourth = FakeApp()
+    BatchConverter(fourth, max_workers=2).run(source, "Python", "Go", "GPT", output)
+    assert len(fourth.calls) == 3
+
+
+def test_batch_concurrency_is_bounded(tmp_path):
+    """Test that no more than max_workers files are converted at once."""
+    source = tmp_path / "many"
+    for index in range(8):
+        _write(str(source / f"f{index}.py"), f"print({index})\n")
+    app = FakeApp(delay=0.05)
+    start = time.monotonic()
+    BatchConverter(app, max_workers=3).run(str(source), "Python", "JavaScript", "GPT", str(tmp_path / "out"))
+    assert app.max_active == 3
+    assert time.monotonic() - start < 8 * 0.05
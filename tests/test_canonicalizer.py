@@ -0,0 +1,107 @@
+"""Tests for source canonicalization and fingerprinting."""
+
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ai_code_converter.config import COMMENT_SYNTAX, SUPPORTED_LANGUAGES
+from src.ai_code_converter.core.canonicalizer import SourceCanonicalizer
+
+
+def test_comment_syntax_covers_supported_languages():
+    """Test that every supported language has comment syntax configured."""
+    for language in SUPPORTED_LANGUAGES:
+        assert language in COMMENT_SYNTAX, f"{language} missing from comment syntax"
+
+
+def test_whitespace_and_line_endings():
+    """Test that whitespace-only differences share a fingerprint."""
+    canonicalizer = SourceCanonicalizer()
+    a = "int main() {\n    return 0;\n}\n"
+    b = "\r\nint main() {   \r\n\r\n\r\n    return 0;\r\n}\r\n\r\n"
+    assert canonicalizer.fingerprint(a, "C++") == canonicalizer.fingerprint(b, "C++")
+    assert canonicalizer.fingerprint(a, "C++") != canonicalizer.fingerprint(a, "Java")
+
+
+def test_comments_kept_unless_stripped():
+    """Test that comments only stop mattering when stripping is requested."""
+    canonicalizer = SourceCanonicalizer()
+    a = "// add numbers\nlet x = 1 + 2; /* sum */\n"
+    b = "let x = 1 + 2;\n"
+    assert canonicalizer.fingerprint(a, "JavaScript") != canonicalizer.fingerprint(b, "JavaScript")
+    assert (canonicalizer.fingerprint(a, "JavaScript", strip_comments=True)
+            == canonicalizer.fingerprint(b, "JavaScript", strip_comments=True))
+
+
+def test_comment_markers_inside_strings_survive():
+    """Test that comment markers inside string literals are not stripped."""
+    canonicalizer = SourceCanonicalizer()
+    code = 'const url = "http://example.com"; // home\nconst s = \'/* x */\';'
+    assert canonicalizer.canonicalize(code, "JavaScript", strip_comments=True) == (
+        'const url = "http://example.com";\nconst s = \'/* x */\';'
+    )
+
+
+def test_lua_block_comments():
+    """Test that Lua block comments are removed before line comments."""
+    canonicalizer = SourceCanonicalizer()
+    code = "--[[ header\nblock ]]\nlocal x = 1 -- one\n"
+    assert canonicalizer.canonicalize(code, "Lua", strip_comments=True) == "local x = 1"
+
+
+def test_python_ast_round_trip():
+    """Test that Python formatting and comments are normalized through the AST."""
+    canonicalizer = SourceCanonicalizer()
+    a = "def f(a,b):\n    # add\n    return a+b\n"
+    b = "def f(a, b):\n\n    return (a + b)  # sum\n"
+    assert (canonicalizer.fingerprint(a, "Python", strip_comments=True)
+            == canonicalizer.fingerprint(b, "Python", strip_comments=True))
+
+    # Invalid Python falls back to text normalization
+    assert canonicalizer.canonicalize("def f(:\n  pass  # x\n", "Python", strip_comments=True) == "def f(:\n  pass"
+
+
+def test_whitespace_inside_multiline_literals_is_kept():
+    """Test that programs differing only inside string literals get different fingerprints."""
+    canonicalizer = SourceCanonicalizer()
+    cases = {
+        "Python": ('print("""a  \n\n\nb""")  \n\n\nprint(1)\n', 'print("""a\n\nb""")\nprint(1)\n'),
+        "JavaScript": ('console.log(`a  \n\n\nb`);\n', 'console.log(`a\nb`);\n'),
+        "Go": ('fmt.Println(`a  \n\n\nb`)\n', 'fmt.Println(`a\nb`)\n'),
+        "Java": ('String s = """\n    a  \n\n\n    b""";\n', 'String s = """\n    a\n    b""";\n'),
+        "Kotlin": ('val s = """a\\  \n\n\nb"""\n', 'val s = """a\\\nb"""\n'),
+        "SQL": ("SELECT 'a  \n\n\nb';\n", "SELECT 'a\nb';\n"),
+        "C++": ('auto s = R"x(a  \n\n\nb)x";\n', 'auto s = R"x(a\nb)x";\n'),
+        "Ruby": ("puts <<~TEXT\n  a  \n\n\n  b\nTEXT\n", "puts <<~TEXT\n  a\n  b\nTEXT\n"),
+    }
+    for language, (a, b) in cases.items():
+        assert canonicalizer.fingerprint(a, language) != canonicalizer.fingerprint(b, language), language
+
+    # Whitespace outside the literal is still normalized
+    assert canonicalizer.canonicalize('x = """a  \n\nb"""   \n\n\ny = 1  \n', "Python") == 'x = """a  \n\nb"""\ny = 1'
+
+
+def test_nested_template_literals():
+    """Test that a template nested in an interpolation does not end the outer template."""
+    canonicalizer = SourceCanonicalizer()
+    code = "const s = `${items.map((i) => `<li>${i}</li>`).join('')}\n\n\n  end`;  \n\n\nf();\n"
+    assert canonicalizer.canonicalize(code, "JavaScript") == (
+        "const s = `${items.map((i) => `<li>${i}</li>`).join('')}\n\n\n  end`;\nf();"
+    )
+
+
+def test_regex_literals_do_not_hide_code():
+    """Test that comment markers and quotes in JavaScript regex literals do not merge programs."""
+    canonicalizer = SourceCanonicalizer()
+    for language in ("JavaScript", "TypeScript"):
+        a = "const parts = url.split(/[//]+/); run(parts, 1)"
+        b = "const parts = url.split(/[//]+/); run(parts, 2)"
+        assert (canonicalizer.fingerprint(a, language, strip_comments=True)
+                != canonicalizer.fingerprint(b, language, strip_comments=True))
+        a = "const s = t.replace(/'/g, '');  \n\n\nlog(`a  \n\nb`);"
+        b = "const s = t.replace(/'/g, '');\nlog(`a\nb`);"
+        assert canonicalizer.fingerprint(a, language) != canonicalizer.fingerprint(b, language)
+    # Division is not a regex literal
+    assert canonicalizer.canonicalize("const x = a / b;  \n\n\nf(x / 2);", "JavaScript") == "const x = a / b;\nf(x / 2);"
@@ -0,0 +1,133 @@
+"""Tests for recording provider streams to cassettes and replaying them."""
+
+import asyncio
+import os
+import sys
+
+import httpx
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ai_code_converter.models.ai_streaming import AIModelStreamer
+from src.ai_code_converter.models.async_streaming import AsyncAIModelStreamer
+from src.ai_code_converter.models.cassette import Cassette, RecordingTransport, ReplayTransport, stream_text
+from src.ai_code_converter.models.providers import build_claude_client, build_openai_client
+from src.ai_code_converter.models.retry_policy import RetryPolicy
+from src.ai_code_converter.models.stream_events import accumulate
+from src.ai_code_converter.utils.mock_llm_server import MockLLMServer, MockSettings
+
+REPLY = "```cpp\n#include <iostream>\nint main() {\n    std::cout << 42 << std::endl;\n}\n```\n"
+
+
+def _policy():
+    return RetryPolicy(initial_delay=0.0, jitter=False)
+
+
+def _sync_streamer(url, transport):
+    os.environ.setdefault("ANTHROPIC_API_KEY", "test")
+    client = build_openai_client(url + "/v1", httpx.Client(transport=transport), api_key="test")
+    claude = build_claude_client(url, httpx.Client(transport=transport))
+    return AIModelStreamer(client, claude, client, client, None, retry_policy=_policy())
+
+
+def _async_streamer(url, transport):
+    os.environ.setdefault("ANTHROPIC_API_KEY", "test")
+    client = build_openai_client(url + "/v1", httpx.AsyncClient(transport=transport), api_key="test", use_async=True)
+    claude = build_claude_client(url, httpx.AsyncClient(transport=transport), use_async=True)
+    return AsyncAIModelStreamer(client, claude, client, client, None, retry_policy=_policy())
+
+
+def _record(path, prompts, replies=None, tokens_per_second=500):
+    """Record a sync conversion for every (model, prompt) pair against the mock server."""
+    settings = MockSettings(ttft=0.05, tokens_per_second=tokens_per_second, replies=replies or {"convert": REPLY})
+    cassette = Cassette(path)
+    with MockLLMServer(settings) as server:
+        streamer = _sync_streamer(server.url, RecordingTransport(httpx.HTTPTransport(), cassette))
+        texts = [accumulate(streamer.stream(model, prompt)).text for model, prompt in prompts]
+    return server.url, texts
+
+
+def test_record_then_replay_through_sdks(tmp_path):
+    """Test that replayed GPT and Claude streams match the recording without a server."""
+    path = str(tmp_path / "session.jsonl.gz")
+    url, texts = _record(path, [("GPT", "convert"), ("Claude", "convert")])
+    assert texts == [REPLY, REPLY]
+
+    cassette = Cassette.load(path)
+    assert [interaction.text for interaction in cassette.interactions] == [REPLY, REPLY]
+    assert all(len(interaction.chunks) > 1 for interaction in cassette.interactions)
+
+    # The mock server is gone, so these can only come from the cassette
+    streamer = _sync_streamer(url, ReplayTransport(cassette, speed=0))
+    assert accumulate(streamer.stream("GPT", "convert")).text == REPLY
+    claude = accumulate(streamer.stream("Claude", "convert"))
+    assert claude.text == REPLY
+    assert claude.finish_reason == "stop"
+
+
+def test_async_replay(tmp_path):
+    """Test that the async streamer replays the same recording."""
+    path = str(tmp_path / "session.jsonl")
+    url, _ = _record(path, [("GROQ", "convert")])
+
+    async def run():
+        streamer = _async_streamer(url, ReplayTransport(Cassette.load(path), speed=0))
+        return [event async for event in streamer.stream("GROQ", "convert")]
+
+    assert accumulate(asyncio.run(run())).text == REPLY
+
+
+def test_continuations_are_replayed(tmp_path):
+    """Test that a truncated stream and its continuation request replay in order."""
+    long_reply = "".join(f"line{i}\n" for i in range(4100))
+    path = str(tmp_path / "long.jsonl")
+    url, texts = _record(path, [("DeepSeek", "convert")], replies={"convert": long_reply}, tokens_per_second=0)
+    assert texts == [long_reply]
+    cassette = Cassette.load(path)
+    assert len(cassette.interactions) == 2
+
+    streamer = _sync_streamer(url, ReplayTransport(cassette, speed=0))
+    assert accumulate(streamer.stream("DeepSeek", "convert")).text == long_reply
+
+
+def test_replay_timing_is_scaled(tmp_path):
+    """Test that replay waits the recorded delays divided by the speed."""
+    path = str(tmp_path / "session.jsonl")
+    url, _ = _record(path, [("GPT", "convert")])
+    recorded = Cassette.load(path).interactions[0]
+    assert recorded.duration >= 0.05
+
+    for speed in (1.0, 4.0, 0):
+        delays = []
+        streamer = _sync_streamer(url, ReplayTransport(Cassette.load(path), speed=speed, sleep=delays.append))
+        assert accumulate(streamer.stream("GPT", "convert")).text == REPLY
+        expected = recorded.duration / speed if speed else 0.0
+        assert abs(sum(delays) - expected) < 0.01
+
+
+def test_unrecorded_requests(tmp_path):
+    """Test strict replay misses fail fast and lenient replay reuses the model's recording."""
+    path = str(tmp_path / "session.jsonl")
+    url, _ = _record(path, [("GPT", "convert")])
+
+    strict = ReplayTransport(Cassette.load(path), speed=0, strict=True)
+    acc = accumulate(_sync_streamer(url, strict).stream("GPT", "a different prompt"))
+    assert acc.error is not None
+    assert "No recorded response" in acc.error.message
+
+    lenient = ReplayTransport(Cassette.load(path), speed=0, strict=False)
+    assert accumulate(_sync_streamer(url, lenient).stream("GPT", "a different prompt")).text == REPLY
+    other_model = accumulate(_sync_streamer(url, lenient).stream("Claude", "convert"))
+    assert other_model.error is not None
+
+
+def test_stream_text_parses_both_protocols():
+    """Test final-text extraction from OpenAI and Anthropic event streams."""
+    openai = b'data: {"choices":[{"delta":{"content":"a"}}]}\n\ndata: {"choices":[{"delta":{"content":"b"}}]}\n\ndata: [DONE]\n\n'
+    anthropic = (
+        b'event: content_block_delta\ndata: {"type":"content_block_delta","delta":{"type":"text_delta","text":"c"}}\n\n'
+        b'event: message_stop\ndata: {"type":"message_stop"}\n\n'
+    )
+    assert stream_text(openai) == "ab"
+    assert stream_text(anthropic) == "c"
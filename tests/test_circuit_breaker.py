@@ -0,0 +1,199 @@
+"""Tests for the per-provider circuit breakers."""
+
+import asyncio
+import os
+import sys
+from contextlib import aclosing, closing
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ai_code_converter.models.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+)
+from src.ai_code_converter.models.ai_streaming import AIModelStreamer
+from src.ai_code_converter.models.async_streaming import AsyncAIModelStreamer
+from src.ai_code_converter.models.single_flight import SingleFlightStreamer
+from src.ai_code_converter.models.stream_events import TextDelta
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_opens_on_error_rate_and_fails_fast():
+    """Test that the breaker opens once the error rate crosses the threshold."""
+    breaker = CircuitBreaker("GPT", min_requests=4, error_rate=0.5, clock=FakeClock())
+    breaker.record_success(1.0)
+    breaker.record_success(1.0)
+    breaker.record_failure(1.0)
+    assert breaker.state == CLOSED
+
+    breaker.record_failure(1.0)
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+    assert breaker.snapshot()["rejected"] == 1
+
+
+def test_opens_on_slow_calls():
+    """Test that consistently slow calls open the breaker."""
+    breaker = CircuitBreaker("GROQ", min_requests=2, slow_call_threshold=5.0, slow_call_rate=1.0,
+                             clock=FakeClock())
+    breaker.record_success(10.0)
+    breaker.record_success(12.0)
+    assert breaker.state == OPEN
+
+
+def test_half_open_probe_closes_or_reopens():
+    """Test the half-open probe after the cooldown."""
+    clock = FakeClock()
+    breaker = CircuitBreaker("Claude", cooldown=30.0, clock=clock)
+    breaker.record_failure(fatal=True)
+    assert breaker.state == OPEN
+
+    clock.now = 31.0
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # only one probe at a time
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    clock.now = 62.0
+    assert breaker.allow_request()
+    breaker.record_success(1.0)
+    assert breaker.state == CLOSED
+
+
+def test_old_outcomes_leave_the_window():
+    """Test that failures outside the window do not count."""
+    clock = FakeClock()
+    breaker = CircuitBreaker("Gemini", window=10.0, min_requests=2, clock=clock)
+    breaker.record_failure()
+    clock.now = 20.0
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_registry_picks_healthy_model():
+    """Test rerouting away from providers with open breakers."""
+    registry = CircuitBreakerRegistry()
+    assert registry.pick_healthy("GPT", ["GPT", "Claude"]) == "GPT"
+
+    registry.get("GPT").record_failure(fatal=True)
+    assert registry.pick_healthy("GPT", ["GPT", "Claude"]) == "Claude"
+
+    registry.get("Claude").record_failure(fatal=True)
+    assert registry.pick_healthy("GPT", ["GPT", "Claude"]) is None
+    assert registry.states()["GPT"]["state"] == OPEN
+
+
+def _stop_at_first_text(stream):
+    """Read a guarded stream up to its first text delta, then close it."""
+    with closing(stream) as events:
+        for event in events:
+            if isinstance(event, TextDelta):
+                return event
+
+
+def test_streams_stopped_early_count_as_successes():
+    """Test that closing a stream after its text arrived records a success and settles usage."""
+    clock = FakeClock()
+    streamer = AIModelStreamer(None, None, None, None, None, breakers=CircuitBreakerRegistry(clock=clock))
+
+    def stream(prompt, prefix=None, temperature=None):
+        yield TextDelta("```python\nprint(1)\n```\n")
+        yield TextDelta("This program prints 1.")
+
+    settled = []
+    streamer.streams["GPT"] = stream
+    streamer.limiters.get("GPT").settle = lambda estimated, actual: settled.append((estimated, actual))
+    breaker = streamer.breakers.get("GPT")
+    for _ in range(50):
+        _stop_at_first_text(streamer.stream("GPT", "prompt"))
+    assert breaker.snapshot()["recent_requests"] == 50
+    assert breaker.snapshot()["error_rate"] == 0.0
+    assert len(settled) == 50 and all(actual < estimated for estimated, actual in settled)
+
+    # A half-open probe that is stopped early closes the breaker
+    breaker.record_failure(fatal=True)
+    clock.now = breaker.cooldown
+    assert breaker.state == HALF_OPEN
+    _stop_at_first_text(streamer.stream("GPT", "prompt"))
+    assert breaker.state == CLOSED
+
+    # Closed before any text arrived, the call has no outcome
+    with closing(streamer.stream("GPT", "prompt")):
+        pass
+    assert breaker.snapshot()["recent_requests"] == 1
+
+
+def test_shared_async_streams_stopped_early_count_as_successes():
+    """Test that a single-flight upstream cancelled after its text arrived records a success."""
+    streamer = AsyncAIModelStreamer(None, None, None, None, None)
+
+    async def stream(prompt, prefix=None, temperature=None):
+        yield TextDelta("```python\nprint(1)\n```\n")
+        await asyncio.sleep(10)
+        yield TextDelta("This program prints 1.")
+
+    streamer.streams["GPT"] = stream
+    shared = SingleFlightStreamer(streamer)
+
+    async def run():
+        async with aclosing(shared.stream("GPT", "prompt")) as events:
+            async for event in events:
+                break
+        # Let the cancelled upstream task finish
+        await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+    assert streamer.breakers.get("GPT").snapshot()["recent_requests"] == 1
+
+
+class AuthError(Exception):
+    """Provider error with the status of a revoked API key."""
+    status_code = 401
+
+
+def _failing_client():
+    """OpenAI-shaped client whose requests are rejected as unauthorized."""
+    def create(**kwargs):
+        raise AuthError("invalid api key")
+
+    async def create_async(**kwargs):
+        raise AuthError("invalid api key")
+
+    def client(create):
+        return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(
+            with_raw_response=SimpleNamespace(create=create)
+        )))
+
+    return client(create), client(create_async)
+
+
+def test_fatal_provider_errors_open_the_breaker_at_once():
+    """Test that an authentication error from a provider opens its breaker after one request."""
+    client, async_client = _failing_client()
+    streamer = AIModelStreamer(client, None, None, None, None)
+    events = list(streamer.stream("GPT", "prompt"))
+    assert events[-1].fatal
+    assert streamer.breakers.get("GPT").state == OPEN
+
+    async_streamer = AsyncAIModelStreamer(async_client, None, None, None, None)
+
+    async def run():
+        return [event async for event in async_streamer.stream("GPT", "prompt")]
+
+    assert asyncio.run(run())[-1].fatal
+    assert async_streamer.breakers.get("GPT").state == OPEN
@@ -0,0 +1,148 @@
+"""Tests for splitting large source files into convertible parts."""
+
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ai_code_converter.core.code_splitter import CodeSplitter
+
+PYTHON_SOURCE = '''"""Geometry helpers."""
+import math
+from dataclasses import dataclass
+
+SCALE = 2
+
+
+@dataclass
+class Point:
+    x: float
+    y: float
+
+
+# Distance between two points
+def distance(a: Point, b: Point) -> float:
+    return math.hypot(a.x - b.x, a.y - b.y)
+
+
+def scaled(p: Point) -> Point:
+    def inner(v):
+        return v * SCALE
+    return Point(inner(p.x), inner(p.y))
+
+
+if __name__ == "__main__":
+    print(distance(Point(0, 0), Point(3, 4)))
+'''
+
+GO_SOURCE = '''package main
+
+import (
+\t"fmt"
+\t"math"
+)
+
+// Point is a point in the plane.
+type Point struct {
+\tX, Y float64
+}
+
+func distance(a, b Point) float64 {
+\treturn math.Hypot(a.X-b.X, a.Y-b.Y)
+}
+
+func main() {
+\tfmt.Println(distance(Point{0, 0}, Point{3, 4}))
+}
+'''
+
+
+def test_python_split_at_top_level_units():
+    """Test that Python splits at top-level defs and classes with their decorators and comments."""
+    split = CodeSplitter(max_chunk_lines=1).split(PYTHON_SOURCE, "Python")
+    units = split.units
+    assert [unit.signature for unit in units] == [
+        "class Point:",
+        "def distance(a: Point, b: Point) -> float:",
+        "def scaled(p: Point) -> Point:"
+    ]
+    assert units[0].text.startswith("@dataclass")
+    assert units[0].is_type
+    assert units[1].text.startswith("# Distance between two points")
+    # Nested functions and the trailing main block stay inside their unit
+    assert "def inner" in units[2].text
+    assert units[2].text.endswith("print(distance(Point(0, 0), Point(3, 4)))")
+    assert split.imports == ["import math", "from dataclasses import dataclass"]
+    assert split.part_text(0).startswith('"""Geometry helpers."""')
+
+
+def test_parts_are_packed_and_reassemble_the_source():
+    """Test that small units share a part and every line of the source is kept."""
+    splitter = CodeSplitter(max_chunk_lines=12)
+    split = splitter.split(PYTHON_SOURCE, "Python")
+    assert [len(part) for part in split.parts] == [2, 1]
+    joined = "\n\n".join(split.part_text(index) for index in range(len(split.parts)))
+    assert [line for line in joined.split("\n") if line.strip()] == [
+        line for line in PYTHON_SOURCE.split("\n") if line.strip()
+    ]
+
+
+def test_context_carries_imports_types_and_other_signatures():
+    """Test that each part's context describes the rest of the file but not itself."""
+    split = CodeSplitter(max_chunk_lines=1).split(PYTHON_SOURCE, "Python")
+    context = split.context(2)
+    assert "import math" in context
+    assert "@dataclass\nclass Point:\n    x: float" in context
+    assert "def distance(a: Point, b: Point) -> float:" in context
+    assert "def scaled" not in context
+    # The first part already contains the imports
+    assert "import math" not in split.context(0)
+
+
+def test_pattern_split_for_go():
+    """Test the pattern-based split of a language without a parser."""
+    split = CodeSplitter(max_chunk_lines=1).split(GO_SOURCE, "Go")
+    assert [unit.signature for unit in split.units] == [
+        "type Point struct",
+        "func distance(a, b Point) float64",
+        "func main()"
+    ]
+    assert split.units[0].text.startswith("// Point is a point in the plane.")
+    assert split.units[0].is_type
+    assert split.header.startswith("package main")
+
+
+def test_unsplittable_source_is_one_part():
+    """Test that code without top-level declarations is not split."""
+    split = CodeSplitter().split("x = 1\nprint(x)\n", "Python")
+    assert len(split.parts) == 1
+    assert CodeSplitter().split("", "Python").parts == []
+
+
+def test_stitch_deduplicates_and_hoists_imports():
+    """Test that imports from every part end up once, where the first part has them."""
+    parts = [
+        'package main\n\nimport (\n\t"fmt"\n\t"math"\n)\n\ntype Point struct{ X, Y float64 }',
+        'import "math"\n\nfunc distance(a, b Point) float64 { return math.Hypot(a.X-b.X, a.Y-b.Y) }',
+        'import (\n\t"fmt"\n\t"strings"\n)\n\nfunc main() { fmt.Println(strings.ToUpper("x")) }'
+    ]
+    stitched = CodeSplitter().stitch(parts, "Go")
+    assert stitched.split("\n")[:5] == [
+        "package main",
+        'import "fmt"',
+        'import "math"',
+        'import "strings"',
+        ""
+    ]
+    assert stitched.count('"math"') == 1
+    assert stitched.index("type Point") < stitched.index("func distance") < stitched.index("func main")
+
+
+def test_stitch_keeps_nested_imports_in_place():
+    """Test that indented imports inside a function are not hoisted."""
+    parts = ['"""Doc."""\nimport os\n\n\ndef a():\n    import json\n    return json', 'import os\nimport sys\n\n\ndef b():\n    return sys']
+    stitched = CodeSplitter().stitch(parts, "Python")
+    assert stitched.startswith('"""Doc."""\nimport os\nimport sys\n\n\ndef a():\n    import json')
+    assert stitched.count("import os") == 1
+    assert "\n\n\ndef b():" in stitched
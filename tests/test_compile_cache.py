@@ -0,0 +1,104 @@
+"""Tests for the compiled artifact cache."""
+
+import os
+import shutil
+import sys
+import zipfile
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ai_code_converter.core.code_execution import CodeExecutor
+from src.ai_code_converter.core.compile_cache import CompileCache
+from src.ai_code_converter.core.file_utils import FileHandler
+
+
+def _writer(data: bytes, builds: list):
+    def build(directory):
+        builds.append(directory)
+        (directory / "artifact").write_bytes(data)
+    return build
+
+
+def test_key_depends_on_every_input():
+    """Test that the key changes with language, toolchain, flags and source."""
+    key = CompileCache.make_key("C++", "g++ 12.2", ["-O2"], "int main() {}")
+    assert key == CompileCache.make_key("C++", "g++ 12.2", ["-O2"], "int main() {}")
+    assert key != CompileCache.make_key("C++", "g++ 13.1", ["-O2"], "int main() {}")
+    assert key != CompileCache.make_key("C++", "g++ 12.2", [], "int main() {}")
+    assert key != CompileCache.make_key("Go", "g++ 12.2", ["-O2"], "int main() {}")
+    assert key != CompileCache.make_key("C++", "g++ 12.2", ["-O2"], "int main() { }")
+
+
+def test_hits_skip_the_build_and_survive_a_restart(tmp_path):
+    """Test that an entry is built once and reused, also by a new instance."""
+    builds = []
+    cache = CompileCache(str(tmp_path))
+    entry, hit = cache.fetch("a", _writer(b"one", builds))
+    assert not hit and (entry / "artifact").read_bytes() == b"one"
+    assert cache.fetch("a", _writer(b"two", builds)) == (entry, True)
+    assert len(builds) == 1
+
+    reopened = CompileCache(str(tmp_path))
+    assert reopened.fetch("a", _writer(b"two", builds)) == (entry, True)
+    assert reopened.stats()["bytes"] == 3
+
+    disabled = CompileCache(str(tmp_path), enabled=False)
+    entry, hit = disabled.fetch("a", _writer(b"two", builds))
+    assert not hit and (entry / "artifact").read_bytes() == b"two"
+
+
+def test_failed_builds_are_not_stored(tmp_path):
+    """Test that a build error is passed on and leaves nothing behind."""
+    cache = CompileCache(str(tmp_path))
+
+    def broken(directory):
+        (directory / "partial").write_bytes(b"x")
+        raise RuntimeError("compile error")
+
+    with pytest.raises(RuntimeError):
+        cache.fetch("a", broken)
+    assert list(tmp_path.iterdir()) == []
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entries_are_evicted_by_size(tmp_path):
+    """Test that eviction keeps the total size under max_bytes, oldest use first."""
+    builds = []
+    cache = CompileCache(str(tmp_path), max_bytes=250)
+    cache.fetch("a", _writer(b"a" * 100, builds))
+    cache.fetch("b", _writer(b"b" * 100, builds))
+    cache.fetch("a", _writer(b"a" * 100, builds))  # "b" is now the least recently used
+    cache.fetch("c", _writer(b"c" * 100, builds))
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["a", "c"]
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] == 200
+
+    # An entry larger than the limit is still kept until the next build
+    entry, _ = cache.fetch("d", _writer(b"d" * 300, builds))
+    assert [path.name for path in tmp_path.iterdir()] == ["d"]
+    assert entry.exists()
+
+
+@pytest.mark.skipif(shutil.which("g++") is None, reason="g++ is not installed")
+def test_cpp_runs_from_the_cache_and_feeds_the_download(tmp_path, monkeypatch):
+    """Test that a second run reuses the build and the zip contains the cached binary."""
+    monkeypatch.chdir(tmp_path)
+    executor = CodeExecutor()
+    executor.compile_cache = CompileCache(str(tmp_path / "compiled"))
+    code = '#include <iostream>\nint main() { std::cout << "hi" << std::endl; }\n'
+    try:
+        first, artifact = executor.execute_cpp(code)
+        second, cached = executor.execute_cpp(code)
+        assert first == second == "hi\n"
+        assert cached == artifact
+        assert executor.compile_cache.stats()["hits"] == 1
+
+        zip_path, _ = FileHandler().prepare_download(code, "C++", compiled_file=artifact)
+        with zipfile.ZipFile(zip_path) as zf:
+            assert zf.read("main") == open(artifact, "rb").read()
+    finally:
+        executor.python_pool.close()
@@ -0,0 +1,145 @@
+"""Tests for resuming truncated or interrupted responses."""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ai_code_converter.models.async_streaming import AsyncAIModelStreamer
+from src.ai_code_converter.models.continuation import (
+    ContinuationStitcher,
+    chat_messages,
+    claude_messages,
+    overlap_length,
+)
+from src.ai_code_converter.models.retry_policy import RetryBudget
+from src.ai_code_converter.models.stream_events import (
+    FinishReason,
+    StreamError,
+    TextDelta,
+    Usage,
+    accumulate,
+)
+
+
+def _run(stitcher, attempts):
+    """Feed a list of attempts (lists of events) through the stitcher."""
+    events = []
+    for attempt in attempts:
+        for event in attempt:
+            events.extend(stitcher.feed(event))
+        events.extend(stitcher.end_attempt())
+        if not stitcher.resuming:
+            break
+    return events
+
+
+def test_length_finish_is_continued_and_stitched():
+    """Test that a truncated answer is continued and the repeated line dropped."""
+    first = "fn main() {\n    let answer = compute_answer(42);\n    println!"
+    second = "    let answer = compute_answer(42);\n    println!(\"{}\", answer);\n}\n"
+    stitcher = ContinuationStitcher("GPT", max_continuations=2)
+
+    events = _run(stitcher, [
+        [TextDelta(first), FinishReason("length"), Usage(100, 50)],
+        [TextDelta(second[:10]), TextDelta(second[10:]), FinishReason("stop"), Usage(150, 20)]
+    ])
+    acc = accumulate(events)
+    assert acc.text == "fn main() {\n    let answer = compute_answer(42);\n    println!(\"{}\", answer);\n}\n"
+    assert acc.finish_reason == "stop"
+    assert acc.usage == Usage(250, 70)
+    assert stitcher.continuations == 1
+
+
+def test_prefill_whitespace_is_not_duplicated():
+    """Test that whitespace stripped from a Claude prefill is not emitted twice."""
+    assert overlap_length("int x = 1;\n", "\nint y = 2;") == 1
+    assert overlap_length("return x;", "}") == 0
+    assert overlap_length("int main() {", "{") == 0
+    assert claude_messages("p", "code\n  ")[-1] == {"role": "assistant", "content": "code"}
+    assert chat_messages("p", "code")[1] == {"role": "assistant", "content": "code"}
+
+
+def test_broken_stream_resumes_from_prefix():
+    """Test that an error after partial output requests a continuation."""
+    stitcher = ContinuationStitcher("Claude", max_continuations=1, budget=RetryBudget())
+    prefixes = []
+
+    events = []
+    for attempt in (
+        [TextDelta("print('a')\n"), StreamError("Claude", "connection reset")],
+        [TextDelta("print('b')\n"), FinishReason("stop")]
+    ):
+        prefixes.append(stitcher.prefix)
+        for event in attempt:
+            events.extend(stitcher.feed(event))
+        events.extend(stitcher.end_attempt())
+
+    assert prefixes == [None, "print('a')\n"]
+    acc = accumulate(events)
+    assert acc.text == "print('a')\nprint('b')\n"
+    assert acc.error is None
+
+
+def test_gives_up_after_max_continuations():
+    """Test that the held-back finish reason is emitted once continuations run out."""
+    stitcher = ContinuationStitcher("GPT", max_continuations=1)
+    events = _run(stitcher, [
+        [TextDelta("a" * 30), FinishReason("length")],
+        [TextDelta("b" * 30), FinishReason("length")],
+        [TextDelta("never requested")]
+    ])
+    acc = accumulate(events)
+    assert acc.text == "a" * 30 + "b" * 30
+    assert acc.truncated
+
+
+def test_errors_before_any_output_are_not_continued():
+    """Test that an error with no received text is passed straight through."""
+    stitcher = ContinuationStitcher("GPT")
+    events = _run(stitcher, [[StreamError("GPT", "bad key")]])
+    assert events == [StreamError("GPT", "bad key")]
+    assert not stitcher.resuming
+
+
+class _ScriptedOpenAI:
+    """OpenAI stand-in returning one scripted response per request."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(
+            with_raw_response=SimpleNamespace(create=self._create)
+        ))
+
+    async def _create(self, **kwargs):
+        self.requests.append(kwargs["messages"])
+        text, finish_reason = self.responses.pop(0)
+        chunks = [
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text), finish_reason=None)], usage=None),
+            SimpleNamespace(choices=[SimpleNamespace(delta=None, finish_reason=finish_reason)], usage=None)
+        ]
+
+        async def iterate():
+            for chunk in chunks:
+                yield chunk
+
+        return SimpleNamespace(headers={}, parse=lambda: iterate())
+
+
+def test_streamer_sends_prefix_in_continuation_request():
+    """Test that the async streamer continues a truncated response end to end."""
+    client = _ScriptedOpenAI([("public class A {\n", "length"), ("}\n", "stop")])
+    streamer = AsyncAIModelStreamer(client, None, client, client, None)
+
+    async def run():
+        return [event async for event in streamer.stream("GROQ", "convert")]
+
+    acc = accumulate(asyncio.run(run()))
+    assert acc.text == "public class A {\n}\n"
+    assert not acc.truncated
+    assert len(client.requests) == 2
+    assert client.requests[1][1] == {"role": "assistant", "content": "public class A {\n"}
@@ -0,0 +1,88 @@
+"""Tests for the conversion result cache."""
+
+import os
+import sys
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ai_code_converter.core.conversion_cache import ConversionCache
+
+
+def test_key_depends_on_model_and_temperature():
+    """Test that the key changes with prompt, model id and temperature."""
+    key = ConversionCache.make_key("prompt", "gpt-4o-mini", 0.7)
+    assert key == ConversionCache.make_key("prompt", "gpt-4o-mini", 0.7)
+    assert key != ConversionCache.make_key("prompt", "gpt-4o-mini", 0.2)
+    assert key != ConversionCache.make_key("prompt", "deepseek-chat", 0.7)
+    assert key != ConversionCache.make_key("prompt2", "gpt-4o-mini", 0.7)
+
+
+def test_hits_and_misses(tmp_path):
+    """Test hit/miss counting across the memory and disk tiers."""
+    cache = ConversionCache(str(tmp_path / "cache.sqlite"), memory_entries=1)
+    assert cache.get("a") is None
+    cache.set("a", "converted a")
+    cache.set("b", "converted b")  # pushes "a" out of the LRU tier
+
+    assert cache.get("b") == "converted b"
+    assert cache.get("a") == "converted a"
+
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["memory_hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["disk_entries"] == 2
+
+
+def test_persists_across_instances(tmp_path):
+    """Test that the SQLite tier survives a restart."""
+    path = str(tmp_path / "cache.sqlite")
+    ConversionCache(path).set("key", "value")
+    assert ConversionCache(path).get("key") == "value"
+
+
+def test_size_and_age_eviction(tmp_path):
+    """Test that entries are evicted by count and by age."""
+    cache = ConversionCache(str(tmp_path / "cache.sqlite"), memory_entries=1, max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.set(key, key.upper())
+    assert cache.stats()["disk_entries"] == 2
+    assert cache.get("a") is None
+
+    cache.max_age = 0.01
+    time.sleep(0.02)
+    assert cache.get("c") is None
+
+
+def test_memory_hits_count_as_disk_accesses(tmp_path):
+    """Test that entries read from the memory tier are not the first evicted from disk."""
+    path = str(tmp_path / "cache.sqlite")
+    cache = ConversionCache(path, max_entries=2)
+    cache.set("a", "A")
+    time.sleep(0.01)
+    cache.set("b", "B")
+    time.sleep(0.01)
+    assert cache.get("a") == "A"  # memory hit
+    cache.set("c", "C")  # evicts the least recently used entry on disk
+
+    reopened = ConversionCache(path)
+    assert reopened.get("a") == "A"
+    assert reopened.get("b") is None
+
+    # With no interval every memory hit is written at once
+    cache = ConversionCache(str(tmp_path / "touch.sqlite"), touch_interval=0)
+    cache.set("a", "A")
+    time.sleep(0.01)
+    assert cache.get("a") == "A"
+    created, accessed = cache._db.execute("SELECT created, accessed FROM conversions").fetchone()
+    assert accessed > created
+
+
+def test_bypass_switch(tmp_path):
+    """Test that a disabled cache never stores or returns entries."""
+    cache = ConversionCache(str(tmp_path / "cache.sqlite"), enabled=False)
+    cache.set("key", "value")
+    assert cache.get("key") is None
+    assert not (tmp_path / "cache.sqlite").exists()
@@ -0,0 +1,89 @@
+"""Tests for converting one source into several target languages at once."""
+
+import asyncio
+import os
+import sys
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ai_code_converter.app import CodeConverterApp
+
+DELAYS = {"Go": 0.2, "Rust": 0.05, "Java": 0.1}
+
+
+def _app():
+    """App without providers or UI whose conversions just take a per-target time."""
+    app = CodeConverterApp.__new__(CodeConverterApp)
+    app.calls = []
+
+    async def convert(code, lang_in, lang_out, model, temp, document_enabled=True, document_style="Standard",
+                      on_code=None):
+        app.calls.append((lang_out, document_style))
+        for word in (lang_out, " version", " of"):
+            if on_code is not None:
+                on_code(word)
+            await asyncio.sleep(DELAYS[lang_out] / 3)
+        return f"{lang_out} version of {code}"
+
+    app._convert_code_async = convert
+    return app
+
+
+def test_targets_convert_concurrently_and_finish_in_order_of_completion():
+    """Test that fan-out takes about as long as the slowest target."""
+    app = _app()
+
+    async def run():
+        return [result async for result in app.convert_many("x = 1", "Python", ["Go", "Rust", "Java"], "GPT", 0.5)]
+
+    start = time.monotonic()
+    results = asyncio.run(run())
+    elapsed = time.monotonic() - start
+
+    assert [target for target, _ in results] == ["Rust", "Java", "Go"]
+    assert dict(results)["Go"] == "Go version of x = 1"
+    assert elapsed < sum(DELAYS.values())
+    assert {style for _, style in app.calls} == {"standard"}
+
+
+def test_fan_out_panels_show_selected_targets_only():
+    """Test that the UI handler reveals one panel per target and fills it in."""
+    app = _app()
+    panels = {lang: object() for lang in ("Python", "Go", "Rust", "Java")}
+
+    async def run():
+        return [
+            update async for update in app._stream_fan_out(
+                panels, "x = 1", "Python", ["Python", "Go", "Rust"], "GPT", 0.5, True, False
+            )
+        ]
+
+    updates = asyncio.run(run())
+    assert {lang for lang, panel in panels.items() if updates[0][panel]["visible"]} == {"Go", "Rust"}
+    finished = [
+        lang for update in updates[1:] for lang, panel in panels.items()
+        if update.get(panel, {}).get("label") == lang
+    ]
+    assert finished == ["Rust", "Go"]
+    assert all(panels["Java"] not in update and panels["Python"] not in update for update in updates[1:])
+    assert updates[-1][panels["Go"]]["value"] == "Go version of x = 1"
+
+
+def test_fan_out_panels_stream_partial_code():
+    """Test that each panel shows its target's code while it is still being generated."""
+    app = _app()
+    panels = {lang: object() for lang in ("Python", "Go", "Rust")}
+
+    async def run():
+        return [
+            update async for update in app._stream_fan_out(
+                panels, "x = 1", "Python", ["Go", "Rust"], "GPT", 0.5, True, False
+            )
+        ]
+
+    updates = asyncio.run(run())
+    partial_go = [update[panels["Go"]]["value"] for update in updates[1:-1] if panels["Go"] in update]
+    assert partial_go and all("Go version of x = 1".startswith(value) for value in partial_go)
+    assert updates[-1][panels["Go"]] == {"__type__": "update", "value": "Go version of x = 1", "label": "Go"}
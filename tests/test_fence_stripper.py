@@ -0,0 +1,123 @@
+"""Tests for stripping code fences from streamed responses."""
+
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ai_code_converter.app import CodeConverterApp
+from src.ai_code_converter.core.fence_stripper import FenceStripper, strip_code_fences
+from src.ai_code_converter.models.stream_events import TextDelta, Usage
+
+RESPONSE = (
+    "Here is the converted code:\n\n"
+    "```go\n"
+    "package main\n\n"
+    "func main() {\n"
+    "\tprintln(\"```\")   \n"
+    "}\n"
+    "```\n\n"
+    "This program prints three backticks.\n"
+)
+CODE = "package main\n\nfunc main() {\n\tprintln(\"```\")   \n}"
+
+
+def _stream(text, size):
+    """Feed text in fragments of the given size, stopping at the closing fence."""
+    stripper = FenceStripper()
+    pieces = []
+    for start in range(0, len(text), size):
+        pieces.append(stripper.feed(text[start:start + size]))
+        if stripper.closed:
+            break
+    pieces.append(stripper.finish())
+    return stripper, pieces
+
+
+def test_chatter_fences_and_trailing_text_are_stripped():
+    """Test that only the code between the fences is kept."""
+    assert strip_code_fences(RESPONSE) == CODE
+    assert strip_code_fences("```python\nx = 1\n") == "x = 1"
+    # Unfenced responses only lose surrounding whitespace
+    assert strip_code_fences("\n\nsure = True\nprint(sure)\n\n") == "sure = True\nprint(sure)"
+
+
+def test_any_prose_before_the_opening_fence_is_dropped():
+    """Test that intros of any shape are dropped, and the first fence opens the code."""
+    intros = [
+        "I've converted the code to Rust:",
+        "Converted code:",
+        "Okay, here is the Rust version:",
+        "Here is the converted code",
+        "Sure! Below is the equivalent program.\nIt uses iterators instead of loops.",
+    ]
+    for intro in intros:
+        response = f"{intro}\n\n```rust\nfn main() {{\n    println!(\"hi\");\n}}\n```\nDone.\n"
+        assert strip_code_fences(response) == 'fn main() {\n    println!("hi");\n}'
+        for size in (1, 4, len(response)):
+            stripper, pieces = _stream(response, size)
+            assert "".join(pieces) == 'fn main() {\n    println!("hi");\n}'
+            assert stripper.closed
+
+
+def test_unfenced_responses_are_returned_at_the_end():
+    """Test that a response without fences is held back, then returned without its chatter line."""
+    stripper = FenceStripper()
+    assert stripper.feed("Here is the converted code:\nx = 1\n") == ""
+    assert stripper.feed("print(x)\n") == ""
+    assert stripper.finish() == "x = 1\nprint(x)"
+    assert not stripper.closed
+
+
+def test_fenced_examples_inside_the_code_are_kept():
+    """Test that a fenced example in a docstring does not close the code."""
+    code = '"""\n    add(a, b)\n\n```julia\nadd(1,2)\n```\n"""\nadd(a,b)=a+b'
+    response = f"```julia\n{code}\n```\nThe docstring shows an example.\n"
+    assert strip_code_fences(response) == code
+    for size in (1, 3, len(response)):
+        stripper, pieces = _stream(response, size)
+        assert "".join(pieces) == code
+        assert stripper.closed
+
+
+def test_output_is_the_same_for_any_fragmentation():
+    """Test that fragment boundaries never change the stripped code."""
+    for size in (1, 2, 3, 5, 8, 13, len(RESPONSE)):
+        stripper, pieces = _stream(RESPONSE, size)
+        assert "".join(pieces) == CODE
+        assert stripper.closed
+
+
+def test_code_is_emitted_progressively():
+    """Test that code lines are passed on before the response is complete."""
+    stripper = FenceStripper()
+    assert stripper.feed("Converted:\n```go\npack") == "pack"
+    # Trailing whitespace waits for the code that follows it
+    assert stripper.feed("age main\n\nfunc ") == "age main\n\nfunc"
+    # A line that may be the closing fence is held back
+    assert stripper.feed("main() {}\n``") == " main() {}"
+    assert stripper.feed("`\nExplanation") == ""
+    assert stripper.closed
+
+
+def test_stream_stops_at_the_closing_fence():
+    """Test that the app stops reading a provider stream once the code is complete."""
+    app = CodeConverterApp.__new__(CodeConverterApp)
+    read = []
+
+    def stream(model, prompt, temperature=None):
+        for event in [TextDelta("```python\nprint(1)\n"), TextDelta("```\nThis prints 1."), Usage(10, 5)]:
+            read.append(event)
+            yield event
+
+    class Streamer:
+        streams = {"GPT": None}
+
+    Streamer.stream = staticmethod(stream)
+    app.model_streamer = Streamer()
+    accumulator = app._stream_model_response("GPT", "prompt", lambda *args, **kwargs: None)
+
+    assert len(read) == 2
+    assert accumulator.finish_reason == "stop"
+    assert app._clean_response(accumulator.text) == "print(1)"
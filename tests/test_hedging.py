@@ -0,0 +1,86 @@
+"""Tests for hedged requests across providers."""
+
+import asyncio
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ai_code_converter.models.hedging import HedgedStreamer
+from src.ai_code_converter.models.stream_events import StreamError, TextDelta, accumulate
+
+
+class ScriptedStreamer:
+    """Async streamer whose per-model behaviour is scripted as (delay, fragments, error)."""
+
+    def __init__(self, scripts):
+        self.scripts = scripts
+        self.streams = {model: None for model in scripts}
+        self.cancelled = []
+
+    async def stream(self, model, prompt, temperature=None):
+        delay, fragments, error = self.scripts[model]
+        try:
+            await asyncio.sleep(delay)
+            if error:
+                yield StreamError(model, error)
+                return
+            for fragment in fragments:
+                yield TextDelta(fragment)
+                await asyncio.sleep(0.001)
+        except asyncio.CancelledError:
+            self.cancelled.append(model)
+            raise
+
+
+def _run(hedger, model="GPT"):
+    async def collect():
+        return accumulate([event async for event in hedger.stream(model, "prompt")])
+    return asyncio.run(collect())
+
+
+def test_fast_primary_is_not_hedged():
+    """Test that a primary answering within the threshold streams through."""
+    upstream = ScriptedStreamer({"GPT": (0.0, ["a", "b"], None), "Claude": (0.0, ["z"], None)})
+    hedger = HedgedStreamer(upstream, {"GPT": "Claude"}, {"GPT": 0.2})
+
+    result = _run(hedger)
+    assert result.text == "ab"
+    assert result.hedge.winner == "GPT"
+    assert not result.hedge.hedged
+    assert hedger.hedged_requests == 0
+
+
+def test_stalled_primary_loses_to_backup():
+    """Test that a stalled primary is hedged and the faster backup wins."""
+    upstream = ScriptedStreamer({"GPT": (1.0, ["slow"], None), "Claude": (0.0, ["fast"], None)})
+    hedger = HedgedStreamer(upstream, {"GPT": "Claude"}, {"GPT": 0.05})
+
+    result = _run(hedger)
+    assert result.text == "fast"
+    assert result.hedge.winner == "Claude"
+    assert result.hedge.hedged
+    assert upstream.cancelled == ["GPT"]
+    assert hedger.wins == {"Claude": 1}
+
+
+def test_failing_backup_does_not_win():
+    """Test that a backup error lets the slower primary win."""
+    upstream = ScriptedStreamer({"GPT": (0.1, ["ok"], None), "Claude": (0.0, [], "overloaded")})
+    hedger = HedgedStreamer(upstream, {"GPT": "Claude"}, {"GPT": 0.02})
+
+    result = _run(hedger)
+    assert result.text == "ok"
+    assert result.error is None
+    assert result.hedge.winner == "GPT"
+
+
+def test_disabled_hedging_passes_through():
+    """Test that disabled hedging never contacts the backup."""
+    upstream = ScriptedStreamer({"GPT": (0.05, ["a"], None), "Claude": (0.0, ["z"], None)})
+    hedger = HedgedStreamer(upstream, {"GPT": "Claude"}, {"GPT": 0.01}, enabled=False)
+
+    result = _run(hedger)
+    assert result.text == "a"
+    assert result.hedge is None
@@ -0,0 +1,202 @@
+"""Tests for resident JVM helper processes, using a Python stand-in for the helper."""
+
+import os
+import subprocess
+import sys
+import zipfile
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ai_code_converter.core import code_execution
+from src.ai_code_converter.core.code_execution import CodeExecutor, jar_main_class
+from src.ai_code_converter.core.compile_cache import CompileCache
+from src.ai_code_converter.core.jvm_service import JvmService, JvmServiceError, cds_options, decode_response, encode_request
+
+# Speaks the helper protocol: echoes fields back, sleeps or exits on request
+HELPER = r"""
+import base64, sys, time, zipfile
+for line in sys.stdin:
+    command, *fields = line.rstrip("\n").split("\t")
+    fields = [base64.b64decode(f).decode() for f in fields]
+    if command == "sleep":
+        time.sleep(float(fields[0]))
+    if command == "exit":
+        sys.exit(1)
+    if command == "compile" and fields[0].endswith(".kt"):
+        # Kotlin: kotlinc arguments; writes an empty jar for -d JAR
+        if "bad" not in fields[0] and "-d" in fields:
+            zipfile.ZipFile(fields[fields.index("-d") + 1], "w").close()
+        reply = ["error" if "bad" in fields[0] else "ok", "messages for " + fields[0]]
+    elif command == "compile":
+        # Java: CLASS SOURCE DIR
+        if "bad" not in fields[1]:
+            open(fields[2] + "/" + fields[0] + ".class", "w").write(fields[1])
+        reply = ["error" if "bad" in fields[1] else "ok", "messages for " + fields[0]]
+    elif command == "run" and fields[0].endswith(".jar"):
+        # Kotlin: JAR CLASS TIMEOUT_MILLIS, then the rest of the class path
+        reply = ["ok", "ran " + fields[1] + " with " + " ".join(f.split("/")[-1] for f in fields[3:]), "", "0"]
+    elif command == "run":
+        source = open(fields[0] + "/" + fields[1] + ".class").read()
+        if "loop" in source:
+            reply = ["timeout", "partial", ""]
+        else:
+            reply = ["ok", "ran " + fields[1] + "\n", "exit" if "exit" in source else "", "3" if "exit" in source else "0"]
+    else:
+        reply = ["ok", *fields]
+    print("\t".join([reply[0]] + [base64.b64encode(f.encode()).decode() for f in reply[1:]]), flush=True)
+"""
+
+
+def _service(**settings):
+    return JvmService("test helper", [sys.executable, "-c", HELPER], **settings)
+
+
+def test_protocol_round_trip():
+    """Test that fields with tabs and newlines survive encoding."""
+    line = encode_request("run", ["a\tb\nc", ""])
+    assert line.count(b"\t") == 2 and line.endswith(b"\n")
+    status, fields = decode_response(line)
+    assert (status, fields) == ("run", ["a\tb\nc", ""])
+
+
+def test_requests_reuse_one_process_until_max_requests():
+    """Test that the helper is started once, then restarted after max_requests."""
+    service = _service(max_requests=3)
+    try:
+        assert service.request("echo", "x\ty") == ("ok", ["x\ty"])
+        assert service.ping()
+        service.request("echo")
+        assert service.stats()["starts"] == 1
+        service.request("echo")
+        assert not service.ping()  # stopped after the third request
+        service.request("echo")
+        assert service.stats()["starts"] == 2
+    finally:
+        service.close()
+
+
+def test_timeouts_and_crashes_restart_the_helper():
+    """Test that a hung or dead helper raises and is replaced on the next request."""
+    service = _service(timeout=0.5)
+    try:
+        with pytest.raises(JvmServiceError, match="did not answer"):
+            service.request("sleep", "5")
+        assert service.request("echo", "after timeout") == ("ok", ["after timeout"])
+        with pytest.raises(JvmServiceError, match="exited unexpectedly"):
+            service.request("exit")
+        assert service.request("echo", "after crash") == ("ok", ["after crash"])
+        assert service.stats()["starts"] == 3
+    finally:
+        service.close()
+
+
+def test_scratch_directory_is_removed_with_the_helper():
+    """Test that each helper process gets its own scratch directory, removed when it stops."""
+    service = _service(scratch_prefix="jvm-test-")
+    service.warm_up()
+    first = service._scratch_dir
+    assert os.path.basename(first).startswith("jvm-test-") and os.path.isdir(first)
+    with pytest.raises(JvmServiceError):
+        service.request("exit")
+    assert not os.path.exists(first)
+    service.warm_up()
+    second = service._scratch_dir
+    assert second != first and os.path.isdir(second)
+    service.close()
+    assert not os.path.exists(second)
+
+
+def test_missing_java_is_reported():
+    """Test that a helper that cannot be started raises JvmServiceError."""
+    service = JvmService("missing helper", ["/nonexistent/java"])
+    with pytest.raises(JvmServiceError, match="Could not start"):
+        service.request("ping")
+
+
+def test_kotlin_compiles_through_the_service(monkeypatch, tmp_path):
+    """Test that compile errors from the service surface as CalledProcessError."""
+    monkeypatch.setattr(code_execution, "KOTLIN_COMPILE_SERVICE_ENABLED", True)
+    executor = CodeExecutor()
+    executor.kotlin_service = _service()
+    try:
+        executor._compile_kotlin(["good.kt"], str(tmp_path))
+        with pytest.raises(subprocess.CalledProcessError) as error:
+            executor._compile_kotlin(["bad.kt"], str(tmp_path))
+        assert error.value.stderr == "messages for bad.kt"
+        assert executor.kotlin_service.stats()["requests"] == 2
+    finally:
+        executor.kotlin_service.close()
+        executor.python_pool.close()
+
+
+def test_java_compiles_and_runs_through_the_service(monkeypatch, tmp_path):
+    """Test the Java service path: cached compile, run output, exit codes and timeouts."""
+    monkeypatch.setattr(code_execution, "JAVA_RUN_SERVICE_ENABLED", True)
+    executor = CodeExecutor()
+    executor.compile_cache = CompileCache(str(tmp_path))
+    executor.java_service = _service()
+    try:
+        output, class_file = executor.execute_java("public class Hello {}")
+        assert output == "ran Hello\n"
+        assert class_file == str(tmp_path / CompileCache.make_key(
+            "Java", code_execution.toolchain_version("javac", "-version"), [], "public class Hello {}") / "Hello.class")
+        executor.execute_java("public class Hello {}")
+        assert executor.compile_cache.stats()["hits"] == 1
+        # Cache hits skip the compile request
+        assert executor.java_service.stats()["requests"] == 3
+
+        assert executor.execute_java("public class Bad { bad }") == ("Error: messages for Bad", None)
+        assert executor.execute_java("public class Quits { exit }") == ("Error: exit", None)
+        assert executor.execute_java("public class Spins { loop }")[0].startswith("Error: Execution timed out")
+    finally:
+        executor.java_service.close()
+        executor.python_pool.close()
+
+
+def test_kotlin_runs_through_the_java_service(monkeypatch, tmp_path):
+    """Test that Kotlin programs run on the resident Java service with kotlin-stdlib on the class path."""
+    monkeypatch.setattr(code_execution, "KOTLIN_COMPILE_SERVICE_ENABLED", True)
+    monkeypatch.setattr(code_execution, "JAVA_RUN_SERVICE_ENABLED", True)
+    monkeypatch.setattr(code_execution, "KOTLIN_HOME", str(tmp_path / "kotlin"))
+    executor = CodeExecutor()
+    executor.compile_cache = CompileCache(str(tmp_path / "cache"))
+    executor.kotlin_service = _service()
+    executor.java_service = _service()
+    try:
+        output, jar_file = executor.execute_kotlin('fun main() { println("hi") }')
+        assert output == "ran MainKt with kotlin-stdlib.jar"
+        assert jar_file.endswith("main.jar")
+        assert executor.java_service.stats()["requests"] == 1
+    finally:
+        executor.kotlin_service.close()
+        executor.java_service.close()
+        executor.python_pool.close()
+
+
+def test_cds_archive_is_built_once(tmp_path):
+    """Test that the training run writes the archive and later calls reuse it."""
+    archive = tmp_path / "jvm" / "service.jsa"
+    # Stands in for java: writes the file named by -XX:ArchiveClassesAtExit
+    java = tmp_path / "java"
+    java.write_text('#!/bin/sh\necho cds > "${1#*=}"\n')
+    java.chmod(0o755)
+    trainer = [str(java), "Service.java"]
+    assert cds_options(str(archive), trainer) == [f"-XX:SharedArchiveFile={archive}"]
+    assert archive.read_text() == "cds\n"
+    assert cds_options(str(archive), ["/nonexistent/java"]) == [f"-XX:SharedArchiveFile={archive}"]
+    assert cds_options(str(tmp_path / "other.jsa"), ["/nonexistent/java"]) == []
+    assert cds_options("", trainer) == []
+
+
+def test_jar_main_class(tmp_path):
+    """Test reading the main class from a jar manifest."""
+    jar_file = tmp_path / "main.jar"
+    with zipfile.ZipFile(jar_file, "w") as jar:
+        jar.writestr("META-INF/MANIFEST.MF", "Manifest-Version: 1.0\r\nMain-Class: AppKt\r\n")
+    assert jar_main_class(jar_file, "MainKt") == "AppKt"
+    with zipfile.ZipFile(jar_file, "w") as jar:
+        jar.writestr("AppKt.class", b"")
+    assert jar_main_class(jar_file, "MainKt") == "MainKt"
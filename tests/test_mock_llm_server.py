@@ -0,0 +1,92 @@
+"""Tests for the mock LLM server, driven through the real SDK clients."""
+
+import asyncio
+import os
+import sys
+
+import httpx
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ai_code_converter.models.ai_streaming import AIModelStreamer
+from src.ai_code_converter.models.async_streaming import AsyncAIModelStreamer
+from src.ai_code_converter.models.providers import build_claude_client, build_openai_client
+from src.ai_code_converter.models.retry_policy import RetryPolicy
+from src.ai_code_converter.models.stream_events import accumulate
+from src.ai_code_converter.utils.mock_llm_server import MockLLMServer, MockSettings, tokenize
+
+REPLY = "```java\npublic class Main {\n    public static void main(String[] args) {\n        System.out.println(42);\n    }\n}\n```\n"
+
+
+def _settings(**kwargs):
+    settings = {"ttft": 0.0, "tokens_per_second": 0, "replies": {"convert": REPLY}, "retry_after": 0}
+    settings.update(kwargs)
+    return MockSettings(**settings)
+
+
+def _policy():
+    return RetryPolicy(initial_delay=0.0, jitter=False)
+
+
+def _sync_streamer(url):
+    client = build_openai_client(url + "/v1", httpx.Client(), api_key="test")
+    claude = build_claude_client(url, httpx.Client())
+    return AIModelStreamer(client, claude, client, client, None, retry_policy=_policy())
+
+
+def _async_streamer(url):
+    client = build_openai_client(url + "/v1", httpx.AsyncClient(), api_key="test", use_async=True)
+    claude = build_claude_client(url, httpx.AsyncClient(), use_async=True)
+    return AsyncAIModelStreamer(client, claude, client, client, None, retry_policy=_policy())
+
+
+def test_tokenize_round_trips():
+    """Test that tokens concatenate back to the reply."""
+    assert "".join(tokenize(REPLY)) == REPLY
+    assert tokenize("  a b\n") == ["  ", "a ", "b\n"]
+
+
+def test_openai_protocol_streams_canned_reply():
+    """Test a GPT conversion against the OpenAI-compatible endpoint."""
+    with MockLLMServer(_settings()) as server:
+        acc = accumulate(_sync_streamer(server.url).stream("GPT", "Please convert this"))
+    assert acc.text == REPLY
+    assert acc.finish_reason == "stop"
+    assert acc.usage.output_tokens == len(tokenize(REPLY))
+
+
+def test_anthropic_protocol_streams_canned_reply():
+    """Test a Claude conversion against the Anthropic messages endpoint."""
+    os.environ.setdefault("ANTHROPIC_API_KEY", "test")
+
+    async def run():
+        return [event async for event in _async_streamer(server.url).stream("Claude", "convert")]
+
+    with MockLLMServer(_settings()) as server:
+        acc = accumulate(asyncio.run(run()))
+    assert acc.text == REPLY
+    assert acc.finish_reason == "stop"
+
+
+def test_injected_failures_are_retried_and_resumed():
+    """Test that 429/529 responses are retried and a dropped stream is continued."""
+    os.environ.setdefault("ANTHROPIC_API_KEY", "test")
+    with MockLLMServer(_settings(error_sequence=["429", "529", "ok", "drop", "ok"])) as server:
+        streamer = _sync_streamer(server.url)
+        first = accumulate(streamer.stream("GROQ", "convert"))
+        second = accumulate(streamer.stream("Claude", "convert"))
+        assert server.outcomes == {"429": 1, "529": 1, "ok": 2, "drop": 1}
+    assert first.text == REPLY
+    assert second.text == REPLY
+    assert second.error is None
+
+
+def test_length_limit_triggers_continuation():
+    """Test that a reply longer than max_tokens is truncated and then continued."""
+    long_reply = "".join(f"line{i}\n" for i in range(4100))
+    with MockLLMServer(_settings(replies={"convert": long_reply})) as server:
+        acc = accumulate(_sync_streamer(server.url).stream("DeepSeek", "convert"))
+        assert server.requests == 2
+    assert acc.text == long_reply
+    assert not acc.truncated
@@ -0,0 +1,135 @@
+"""Tests for running JavaScript snippets in Node.js worker processes."""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ai_code_converter.core.code_execution import CodeExecutor
+from src.ai_code_converter.core.node_worker_pool import NodeWorkerPool
+
+
+def test_runs_are_isolated_and_capture_their_own_output():
+    """Test that each run gets a fresh context with separate output."""
+    pool = NodeWorkerPool(workers=1)
+    try:
+        first = pool.run("var x = 41;\nglobalThis.y = 1;\nconsole.log('out', x + 1);\nconsole.error('err');")
+        assert first.ok
+        assert first.stdout == "out 42\n"
+        assert first.stderr == "err\n"
+
+        second = pool.run("console.log(typeof x, typeof y);")
+        assert second.stdout == "undefined undefined\n"
+
+        third = pool.run("undefinedFunction();")
+        assert third.error == "ReferenceError: undefinedFunction is not defined"
+        assert "converted.js" in third.traceback
+        # All runs used the same worker
+        assert pool.stats()["started"] == 1
+    finally:
+        pool.close()
+
+
+def test_process_changes_are_undone_between_runs(tmp_path):
+    """Test that env, process properties, the working directory and loaded modules do not leak into the next run."""
+    counter = tmp_path / "counter.js"
+    counter.write_text("module.exports = { n: 0 };\n")
+    pool = NodeWorkerPool(workers=1)
+    try:
+        first = pool.run(
+            "process.env.LEAK = 'yes';\n"
+            "process.leak = 1;\n"
+            f"process.chdir({str(tmp_path)!r});\n"
+            f"require({str(counter)!r}).n += 1;\n"
+            f"console.log(process.env.LEAK, process.leak, process.cwd() === {str(tmp_path)!r}, require({str(counter)!r}).n);"
+        )
+        assert first.stdout == "yes 1 true 1\n"
+
+        second = pool.run(
+            "console.log(process.env.LEAK, typeof process.leak, process.cwd() === "
+            f"{os.getcwd()!r}, require({str(counter)!r}).n);"
+        )
+        assert second.stdout == "undefined undefined true 0\n"
+        assert pool.stats()["started"] == 1
+    finally:
+        pool.close()
+
+
+def test_runs_wait_for_timers_and_promises():
+    """Test that a run ends only after its timers and async code have finished."""
+    pool = NodeWorkerPool(workers=1)
+    try:
+        result = pool.run(
+            "setTimeout(() => console.log('timer'), 50);\n"
+            "let n = 0;\n"
+            "const id = setInterval(() => { if (++n === 3) { clearInterval(id); console.log('interval'); } }, 10);\n"
+            "(async () => { await new Promise((resolve) => setTimeout(resolve, 20)); console.log('async'); })();\n"
+            "console.log('sync');"
+        )
+        assert result.ok
+        assert result.stdout.split() == ["sync", "async", "interval", "timer"]
+
+        rejected = pool.run("Promise.reject(new TypeError('nope'));")
+        assert rejected.error == "TypeError: nope"
+    finally:
+        pool.close()
+
+
+def test_exit_ends_the_run_not_the_worker():
+    """Test that process.exit() and process.exitCode behave as under node."""
+    pool = NodeWorkerPool(workers=1)
+    try:
+        assert pool.run("console.log('bye'); process.exit(0); console.log('never');").stdout == "bye\n"
+        assert pool.run("process.exit(2);").error == "Process exited with code 2"
+        assert pool.run("process.exitCode = 5;").error == "Process exited with code 5"
+        assert pool.run("console.log('alive');").stdout == "alive\n"
+        assert pool.stats()["started"] == 1
+    finally:
+        pool.close()
+
+
+def test_concurrent_runs_do_not_interleave():
+    """Test that parallel snippets each get only their own output."""
+    pool = NodeWorkerPool(workers=3)
+    code = "let i = 0;\nconst id = setInterval(() => {{ console.log({name!r}, i); if (++i === 5) clearInterval(id); }}, 20);"
+    try:
+        pool.warm_up()
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            results = list(executor.map(lambda name: pool.run(code.format(name=name)), ["a", "b", "c"]))
+        for name, result in zip("abc", results):
+            assert result.stdout == "".join(f"{name} {i}\n" for i in range(5))
+    finally:
+        pool.close()
+
+
+def test_timeouts_and_recycling_replace_workers():
+    """Test that a runaway snippet is stopped and workers are replaced after max_runs."""
+    pool = NodeWorkerPool(workers=1, max_runs=2, timeout=0.5)
+    try:
+        result = pool.run("while (true) {}")
+        assert result.timed_out and not result.ok
+        assert pool.run("console.log('again');").stdout == "again\n"
+        pool.run("console.log(1);")
+        deadline = time.monotonic() + 10
+        while pool.stats()["recycled"] < 2 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert pool.stats()["recycled"] == 2
+        assert pool.run("console.log(2);").stdout == "2\n"
+    finally:
+        pool.close()
+
+
+def test_executor_formats_worker_results():
+    """Test the output of CodeExecutor.execute_javascript for success and failure."""
+    executor = CodeExecutor()
+    try:
+        output, binary = executor.execute_javascript("console.log([1, 2, 3].reduce((a, b) => a + b));")
+        assert (output, binary) == ("6\n", None)
+        output, _ = executor.execute_javascript("console.log('before');\nthrow new Error('boom');")
+        assert output.startswith("Error: Error: boom")
+    finally:
+        executor.node_pool.close()
+        executor.python_pool.close()
@@ -0,0 +1,68 @@
+"""Tests for streaming partial conversions to the UI."""
+
+import asyncio
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ai_code_converter.app import CodeConverterApp
+from src.ai_code_converter.utils.update_throttle import UpdateThrottle
+
+
+def test_throttle_coalesces_changes():
+    """Test that a burst of changes produces a bounded number of ticks."""
+    async def run():
+        throttle = UpdateThrottle(rate=20)
+
+        async def produce():
+            for _ in range(200):
+                throttle.notify()
+                await asyncio.sleep(0.001)
+
+        producer = asyncio.ensure_future(produce())
+        ticks = [_ async for _ in throttle.ticks(producer)]
+        return throttle, len(ticks)
+
+    throttle, ticks = asyncio.run(run())
+    assert throttle.notifications == 200
+    assert 1 <= ticks <= 10
+    # No changes, no ticks
+    assert asyncio.run(_ticks_without_changes()) == 0
+
+
+async def _ticks_without_changes():
+    throttle = UpdateThrottle(rate=0)
+    return len([_ async for _ in throttle.ticks(asyncio.ensure_future(asyncio.sleep(0.05)))])
+
+
+class _Files:
+    def prepare_download(self, code, language):
+        return None, None
+
+
+def test_partial_code_is_shown_before_the_conversion_finishes():
+    """Test that the handler yields growing partial code and then the final result."""
+    app = CodeConverterApp.__new__(CodeConverterApp)
+    app.file_handler = _Files()
+
+    async def convert(code, lang_in, lang_out, model, temp, document_enabled=True, document_style="Standard", on_code=None):
+        for line in ("package main\n", "\n", "func main() {}\n"):
+            on_code(line)
+            await asyncio.sleep(0.05)
+        return "package main\n\nfunc main() {} // final"
+
+    app._convert_code_async = convert
+
+    async def run():
+        return [
+            code for code, _ in [
+                update async for update in app._stream_converted_code("x = 1", "Python", "Go", "GPT", 0.5, True)
+            ]
+        ]
+
+    updates = [update["value"] for update in asyncio.run(run())]
+    assert updates[0] == "package main\n"
+    assert updates[-2] == "package main\n\nfunc main() {}\n"
+    assert updates[-1] == "package main\n\nfunc main() {} // final"
@@ -0,0 +1,81 @@
+"""Tests for cache-friendly conversion prompts."""
+
+import os
+import sys
+from types import SimpleNamespace
+
+from jinja2 import Template
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ai_code_converter.models.ai_streaming import claude_usage, openai_chunk_events
+from src.ai_code_converter.models.continuation import chat_messages, claude_messages, claude_system
+from src.ai_code_converter.models.prompts import render_prompt
+from src.ai_code_converter.models.stream_events import Usage, accumulate
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), '..', 'src', 'ai_code_converter', 'template.j2')
+
+
+def _prompt(lang_out="Go", code="print(1)", **variables):
+    with open(TEMPLATE_PATH) as f:
+        template = Template(f.read())
+    return render_prompt(
+        template, source_language="Python", target_language=lang_out, input_code=code,
+        doc_enabled=False, doc_style="standard", **variables
+    )
+
+
+def test_static_part_is_shared_by_every_request():
+    """Test that only the language and request parts depend on the request."""
+    go, rust = _prompt("Go"), _prompt("Rust", code="x = 2")
+    assert go.system == rust.system
+    assert "Python" not in go.language.split("**Go**")[1]
+    assert "**Go**" in go.language and "**Rust**" in rust.language
+    assert "print(1)" in go.request and "print(1)" not in go.instructions
+    assert _prompt("Go", code="y = 3").instructions == go.instructions
+    # The whole prompt is still the prompt text used for keys and estimates
+    assert str(go).startswith(go.system) and str(go).endswith(go.request)
+
+
+def test_large_file_context_stays_in_the_request_part():
+    """Test that per-part context does not break the shared prefix."""
+    part = _prompt(part_index=2, part_count=3, context_header="def helper(x):")
+    assert part.instructions == _prompt().instructions
+    assert "part 2 of 3" in part.request and "def helper(x):" in part.request
+
+
+def test_messages_lead_with_the_cacheable_parts():
+    """Test the message layout sent to OpenAI-compatible providers and Claude."""
+    prompt = _prompt()
+    messages = chat_messages(prompt, "partial")
+    assert messages[0] == {"role": "system", "content": prompt.instructions}
+    assert messages[1] == {"role": "user", "content": prompt.request}
+    assert [message["role"] for message in messages[2:]] == ["assistant", "user"]
+
+    assert claude_messages(prompt) == [{"role": "user", "content": prompt.request}]
+    system = claude_system(prompt)["system"]
+    assert [block["text"] for block in system] == [prompt.system, prompt.language]
+    assert all(block["cache_control"] == {"type": "ephemeral"} for block in system)
+    assert "cache_control" not in claude_system(prompt, cache_control=False)["system"][0]
+
+    # Plain prompts are sent as a single user message
+    assert chat_messages("hello") == [{"role": "user", "content": "hello"}]
+    assert claude_system("hello") == {}
+
+
+def test_cache_token_counts_are_reported_and_summed():
+    """Test that cache reads from every provider format end up in the usage."""
+    openai_usage = SimpleNamespace(
+        prompt_tokens=2000, completion_tokens=10, prompt_tokens_details=SimpleNamespace(cached_tokens=1536)
+    )
+    deepseek_usage = SimpleNamespace(prompt_tokens=2000, completion_tokens=10, prompt_cache_hit_tokens=1024)
+    chunk = lambda usage: SimpleNamespace(choices=[], usage=usage)
+    assert list(openai_chunk_events(chunk(openai_usage))) == [Usage(2000, 10, 1536)]
+    assert list(openai_chunk_events(chunk(deepseek_usage))) == [Usage(2000, 10, 1024)]
+
+    claude = claude_usage(SimpleNamespace(
+        input_tokens=40, output_tokens=5, cache_read_input_tokens=1500, cache_creation_input_tokens=300
+    ))
+    assert claude == Usage(40, 5, 1500, 300)
+    assert accumulate([claude, Usage(10, 5, 100)]).usage == Usage(50, 10, 1600, 300)
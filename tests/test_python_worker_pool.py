@@ -0,0 +1,76 @@
+"""Tests for running Python snippets in worker processes."""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ai_code_converter.core.code_execution import CodeExecutor
+from src.ai_code_converter.core.python_worker_pool import PythonWorkerPool
+
+
+def test_runs_are_isolated_and_capture_their_own_output():
+    """Test that each run starts from a fresh namespace with separate output."""
+    pool = PythonWorkerPool(workers=1)
+    try:
+        first = pool.run("import sys\nx = 41\nprint('out')\nprint('err', file=sys.stderr)\n_result = x + 1")
+        assert first.ok
+        assert first.stdout == "out\n42"
+        assert first.stderr == "err\n"
+
+        second = pool.run("print(x)")
+        assert second.error == "NameError: name 'x' is not defined"
+        assert "Traceback" in second.traceback
+        # Both runs used the same worker
+        assert pool.stats()["started"] == 1
+    finally:
+        pool.close()
+
+
+def test_concurrent_runs_do_not_interleave():
+    """Test that parallel snippets each get only their own output."""
+    pool = PythonWorkerPool(workers=3)
+    code = "import time\nfor i in range(5):\n    print({name!r}, i)\n    time.sleep(0.05)"
+    try:
+        pool.warm_up()
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            results = list(executor.map(lambda name: pool.run(code.format(name=name)), ["a", "b", "c"]))
+        elapsed = time.monotonic() - start
+        for name, result in zip("abc", results):
+            assert result.stdout == "".join(f"{name} {i}\n" for i in range(5))
+        assert elapsed < 3 * 5 * 0.05
+    finally:
+        pool.close()
+
+
+def test_timeouts_and_recycling_replace_workers():
+    """Test that a runaway snippet is stopped and workers are replaced after max_runs."""
+    pool = PythonWorkerPool(workers=1, max_runs=2, timeout=0.5)
+    try:
+        result = pool.run("while True:\n    pass")
+        assert result.timed_out and not result.ok
+        assert pool.run("print('again')").stdout == "again\n"
+        pool.run("sys_exit = __import__('sys').exit\nsys_exit(3)")
+        deadline = time.monotonic() + 10
+        while pool.stats()["recycled"] < 2 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert pool.stats()["recycled"] == 2
+        assert pool.run("print(1)").stdout == "1\n"
+    finally:
+        pool.close()
+
+
+def test_executor_formats_worker_results():
+    """Test the output of CodeExecutor.execute_python for success and failure."""
+    executor = CodeExecutor()
+    try:
+        output, binary = executor.execute_python("print(sum(range(4)))")
+        assert (output, binary) == ("6\n", None)
+        output, _ = executor.execute_python("1 / 0")
+        assert output.startswith("Error: ZeroDivisionError: division by zero")
+    finally:
+        executor.python_pool.close()
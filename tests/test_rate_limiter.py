@@ -0,0 +1,99 @@
+"""Tests for the per-provider rate limiter."""
+
+import os
+import sys
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ai_code_converter.models.rate_limiter import (
+    ProviderRateLimiter,
+    RateLimiterRegistry,
+    parse_retry_after,
+)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_burst_is_spread_in_arrival_order():
+    """Test that requests beyond the budget get increasing delays instead of failing."""
+    clock = FakeClock()
+    limiter = ProviderRateLimiter("GPT", requests_per_minute=60, tokens_per_minute=1e9, clock=clock)
+
+    delays = [limiter.reserve(10) for _ in range(63)]
+    assert delays[:60] == [0.0] * 60
+    assert delays[60:] == [1.0, 2.0, 3.0]
+    assert limiter.throttled == 3
+
+
+def test_token_budget_refills_over_time():
+    """Test that the token bucket refills continuously."""
+    clock = FakeClock()
+    limiter = ProviderRateLimiter("Claude", requests_per_minute=1000, tokens_per_minute=600, clock=clock)
+
+    assert limiter.reserve(600) == 0.0
+    assert limiter.reserve(60) == 6.0
+    clock.now = 60.0
+    assert limiter.reserve(60) == 0.0
+
+
+def test_settle_returns_unused_tokens():
+    """Test that over-estimated requests give their unused tokens back."""
+    clock = FakeClock()
+    limiter = ProviderRateLimiter("Claude", requests_per_minute=1000, tokens_per_minute=1000, clock=clock)
+
+    limiter.reserve(1000)
+    limiter.settle(estimated=1000, actual=400)
+    assert limiter.snapshot()["tokens_available"] == 600
+
+
+def test_headers_correct_budget_and_retry_after_blocks():
+    """Test that provider headers replace the configured budget and retry-after pauses requests."""
+    clock = FakeClock()
+    limiter = ProviderRateLimiter("GROQ", requests_per_minute=30, tokens_per_minute=1e6, clock=clock)
+
+    limiter.update_from_headers({
+        "x-ratelimit-limit-requests": "120",
+        "x-ratelimit-remaining-requests": "0",
+        "retry-after": "5"
+    })
+    snapshot = limiter.snapshot()
+    assert snapshot["requests_per_minute"] == 120
+    assert snapshot["blocked_for"] == 5.0
+    assert limiter.reserve(1) == 5.0
+
+
+def test_observe_errors_reads_headers_from_failed_response():
+    """Test that a 429 response's retry-after header is honoured."""
+    clock = FakeClock()
+    limiter = ProviderRateLimiter("GPT", requests_per_minute=500, tokens_per_minute=1e6, clock=clock)
+
+    error = RuntimeError("rate limited")
+    error.response = SimpleNamespace(headers={"retry-after-ms": "2500"})
+    try:
+        with limiter.observe_errors():
+            raise error
+    except RuntimeError:
+        pass
+    assert limiter.reserve(1) == 2.5
+
+
+def test_registry_and_retry_after_parsing():
+    """Test registry defaults and retry-after parsing."""
+    registry = RateLimiterRegistry({"GPT": {"requests_per_minute": 5, "tokens_per_minute": 100}})
+    assert registry.get("GPT") is registry.get("GPT")
+    assert registry.get("Other").snapshot()["requests_per_minute"] == 60
+    assert set(registry.states()) == {"GPT", "Other"}
+
+    assert parse_retry_after({"retry-after": "3"}) == 3.0
+    assert parse_retry_after({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}) is None
+    assert parse_retry_after({}) is None
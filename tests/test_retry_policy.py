@@ -0,0 +1,161 @@
+"""Tests for the retry policy engine."""
+
+import asyncio
+import os
+import sys
+
+import anthropic
+import httpx
+import openai
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ai_code_converter.models.retry_policy import (
+    FATAL,
+    RATE_LIMITED,
+    RETRYABLE,
+    RetryBudget,
+    RetryPolicy,
+    classify_error,
+)
+
+
+def _response(status, headers=None):
+    return httpx.Response(status, headers=headers, request=httpx.Request("POST", "https://api.example.com"))
+
+
+def _policy(**kwargs):
+    settings = {"initial_delay": 0.0, "jitter": False, "sleep": lambda seconds: None}
+    settings.update(kwargs)
+    return RetryPolicy(**settings)
+
+
+def test_classify_provider_errors():
+    """Test that errors are classified as retryable, rate-limited or fatal."""
+    overloaded = anthropic.APIStatusError(
+        "overloaded",
+        response=_response(200),
+        body={"type": "error", "error": {"type": "overloaded_error", "message": "Overloaded"}}
+    )
+    quota = openai.RateLimitError(
+        "quota", response=_response(429), body={"code": "insufficient_quota", "type": "insufficient_quota"}
+    )
+
+    assert classify_error(overloaded) == RETRYABLE
+    assert classify_error(openai.InternalServerError("boom", response=_response(502), body=None)) == RETRYABLE
+    assert classify_error(openai.APIConnectionError(request=httpx.Request("POST", "https://x"))) == RETRYABLE
+    assert classify_error(ConnectionResetError()) == RETRYABLE
+    assert classify_error(openai.RateLimitError("slow down", response=_response(429), body=None)) == RATE_LIMITED
+    assert classify_error(quota) == FATAL
+    assert classify_error(anthropic.AuthenticationError("bad key", response=_response(401), body=None)) == FATAL
+    assert classify_error(openai.BadRequestError("bad", response=_response(400), body=None)) == FATAL
+    assert classify_error(ValueError("bug")) == FATAL
+
+
+def test_stream_retries_only_before_first_item():
+    """Test that a stream is reopened on early failures but not after it produced output."""
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("reset")
+        yield "a"
+        yield "b"
+
+    assert list(_policy().stream("GPT", flaky)) == ["a", "b"]
+    assert len(attempts) == 3
+
+    attempts.clear()
+
+    def broken_mid_stream():
+        attempts.append(1)
+        yield "a"
+        raise ConnectionError("reset")
+
+    items = []
+    try:
+        for item in _policy().stream("GPT", broken_mid_stream):
+            items.append(item)
+    except ConnectionError:
+        pass
+    assert items == ["a"]
+    assert len(attempts) == 1
+
+
+def test_fatal_errors_and_max_attempts_stop_retrying():
+    """Test that fatal errors fail immediately and retryable ones stop at max_attempts."""
+    calls = []
+
+    def unauthorized():
+        calls.append(1)
+        raise anthropic.AuthenticationError("bad key", response=_response(401), body=None)
+        yield
+
+    try:
+        list(_policy().stream("Claude", unauthorized))
+    except anthropic.AuthenticationError:
+        pass
+    assert len(calls) == 1
+
+    calls.clear()
+
+    def unavailable():
+        calls.append(1)
+        raise ConnectionError("down")
+        yield
+
+    try:
+        list(_policy(max_attempts=3).stream("Claude", unavailable))
+    except ConnectionError:
+        pass
+    assert len(calls) == 3
+
+
+def test_rate_limited_waits_for_retry_after():
+    """Test that rate-limited retries wait at least the provider's retry-after."""
+    policy = _policy()
+    error = openai.RateLimitError("slow down", response=_response(429, {"retry-after": "7"}), body=None)
+    assert policy.next_delay("GPT", error, attempt=0, elapsed=0.0) == 7.0
+
+
+def test_deadline_prevents_late_retries():
+    """Test that no retry starts once it would overrun the deadline."""
+    policy = _policy(initial_delay=5.0, deadline=10.0)
+    assert policy.next_delay("GPT", ConnectionError(), attempt=0, elapsed=4.0) == 5.0
+    assert policy.next_delay("GPT", ConnectionError(), attempt=0, elapsed=6.0) is None
+
+
+def test_retry_budget_caps_retries_to_share_of_traffic():
+    """Test that retries are limited to a fraction of recent requests."""
+    now = [0.0]
+    budget = RetryBudget(ratio=0.5, min_retries=1, window=10.0, clock=lambda: now[0])
+    for _ in range(4):
+        budget.record_request()
+
+    assert [budget.try_spend() for _ in range(4)] == [True, True, True, False]
+    assert budget.snapshot()["exhausted"] == 1
+
+    now[0] = 11.0
+    assert budget.try_spend()
+
+
+def test_stream_async_retries_with_coroutine_factory():
+    """Test that the async stream retries a coroutine returning an async iterable."""
+    attempts = []
+
+    async def items():
+        yield "x"
+
+    async def open_stream():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise openai.InternalServerError("boom", response=_response(503), body=None)
+        return items()
+
+    async def run():
+        return [item async for item in _policy().stream_async("GROQ", open_stream)]
+
+    assert asyncio.run(run()) == ["x"]
+    assert len(attempts) == 2
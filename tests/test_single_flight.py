@@ -0,0 +1,80 @@
+"""Tests for single-flight deduplication of model streams."""
+
+import asyncio
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ai_code_converter.models.single_flight import SingleFlightStreamer
+from src.ai_code_converter.models.stream_events import TextDelta, accumulate
+
+
+class SlowStreamer:
+    """Async streamer that emits one fragment per gate release."""
+
+    def __init__(self, fragments):
+        self.fragments = fragments
+        self.calls = 0
+        self.cancelled = False
+        self.streams = {"GPT": None}
+
+    async def stream(self, model, prompt, temperature=None):
+        self.calls += 1
+        try:
+            for fragment in self.fragments:
+                await asyncio.sleep(0.01)
+                yield TextDelta(fragment)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+
+async def _collect(streamer, key="k"):
+    return accumulate([event async for event in streamer.stream("GPT", "prompt", key=key)]).text
+
+
+def test_identical_requests_share_upstream():
+    """Test that concurrent identical requests make one upstream call."""
+    upstream = SlowStreamer(["a", "b", "c", "d"])
+    streamer = SingleFlightStreamer(upstream)
+
+    async def run():
+        first = asyncio.create_task(_collect(streamer))
+        await asyncio.sleep(0.025)  # join late, after part of the stream was produced
+        second = asyncio.create_task(_collect(streamer))
+        return await asyncio.gather(first, second)
+
+    assert asyncio.run(run()) == ["abcd", "abcd"]
+    assert upstream.calls == 1
+    assert streamer.shared_calls == 1
+    assert streamer.in_flight() == 0
+
+
+def test_different_keys_do_not_share():
+    """Test that different request keys open separate upstream streams."""
+    upstream = SlowStreamer(["x"])
+    streamer = SingleFlightStreamer(upstream)
+
+    async def run():
+        return await asyncio.gather(_collect(streamer, "k1"), _collect(streamer, "k2"))
+
+    assert asyncio.run(run()) == ["x", "x"]
+    assert upstream.calls == 2
+
+
+def test_upstream_cancelled_when_all_subscribers_leave():
+    """Test that abandoning every subscriber cancels the upstream stream."""
+    upstream = SlowStreamer(["a", "b", "c", "d"])
+    streamer = SingleFlightStreamer(upstream)
+
+    async def run():
+        agen = streamer.stream("GPT", "prompt", key="k")
+        await agen.__anext__()
+        await agen.aclose()
+        await asyncio.sleep(0.02)
+
+    asyncio.run(run())
+    assert upstream.cancelled
+    assert streamer.in_flight() == 0
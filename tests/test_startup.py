@@ -0,0 +1,79 @@
+"""Tests for startup cost: lazy provider clients and import-time budgets."""
+
+import os
+import subprocess
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ai_code_converter.config import STARTUP_IMPORT_BUDGETS
+from src.ai_code_converter.models.providers import LazyClient
+from src.ai_code_converter.utils.import_profile import (
+    PROJECT_ROOT,
+    format_report,
+    import_time,
+    parse_importtime,
+)
+
+PROVIDER_SDKS = ("openai", "anthropic", "google.generativeai")
+
+
+def test_app_import_does_not_load_provider_sdks():
+    """Test that importing the app leaves the provider SDKs unimported."""
+    code = (
+        "import sys, src.ai_code_converter.app; "
+        f"print('LOADED:' + ','.join(m for m in {PROVIDER_SDKS!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+    assert "LOADED:\n" in result.stdout
+
+
+def _best_import_time(module, budget, attempts=3):
+    """Fastest of up to attempts fresh imports, stopping at the first within budget."""
+    elapsed = import_time(module)
+    for _ in range(attempts - 1):
+        if elapsed < budget:
+            break
+        # A single slow run is usually a busy machine, not a regression
+        elapsed = min(elapsed, import_time(module))
+    return elapsed
+
+
+def test_imports_within_budget():
+    """Test that the app and the streaming modules import within their startup budgets."""
+    assert "src.ai_code_converter.app" in STARTUP_IMPORT_BUDGETS
+    for module, budget in STARTUP_IMPORT_BUDGETS.items():
+        elapsed = _best_import_time(module, budget)
+        assert elapsed < budget, f"{module} took {elapsed:.3f}s to import (budget {budget}s)"
+
+
+def test_lazy_client_builds_on_first_use():
+    """Test that a lazy client only calls its factory when first used, and once."""
+    built = []
+
+    def factory():
+        built.append(1)
+        return type("Client", (), {"chat": "completions"})()
+
+    client = LazyClient("GPT", factory)
+    assert not client.loaded and built == []
+    assert client.chat == "completions"
+    assert client.chat == "completions"
+    assert client.loaded and built == [1]
+
+
+def test_parse_importtime_report():
+    """Test parsing and formatting of ``-X importtime`` output."""
+    output = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       100 |        100 |     json.decoder\n"
+        "import time:       400 |        500 |   json\n"
+        "import time:      1000 |       1500 | src.app\n"
+    )
+    timings = parse_importtime(output)
+    assert [(t.module, t.depth) for t in timings] == [("json.decoder", 2), ("json", 1), ("src.app", 0)]
+    assert timings[-1].cumulative == 0.0015
+    assert format_report(timings).startswith("Total import time: 2ms")
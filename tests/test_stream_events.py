@@ -0,0 +1,90 @@
+"""Tests for the delta-based streaming protocol."""
+
+import os
+import sys
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ai_code_converter.models.stream_events import (
+    FinishReason,
+    StreamAccumulator,
+    StreamError,
+    TextDelta,
+    Usage,
+    accumulate,
+)
+from src.ai_code_converter.models.ai_streaming import (
+    normalize_finish_reason,
+    openai_chunk_events,
+)
+
+
+def _openai_chunk(content=None, finish_reason=None, usage=None, empty=False):
+    """Build an object shaped like an OpenAI streaming chunk."""
+    choices = [] if empty else [
+        SimpleNamespace(delta=SimpleNamespace(content=content), finish_reason=finish_reason)
+    ]
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+def test_accumulator_joins_deltas():
+    """Test that text deltas are joined into the full response."""
+    acc = accumulate([TextDelta("def "), TextDelta("main"), TextDelta("():")])
+    assert acc.text == "def main():"
+    assert acc.delta_count == 3
+
+    # Adding after a read keeps the previously joined prefix
+    acc.add(TextDelta(" pass"))
+    assert acc.text == "def main(): pass"
+
+
+def test_accumulator_records_metadata():
+    """Test that usage, finish reason and errors are tracked separately from text."""
+    acc = accumulate([
+        TextDelta("x = 1"),
+        Usage(input_tokens=10, output_tokens=4),
+        FinishReason("length"),
+    ])
+    assert acc.text == "x = 1"
+    assert acc.usage.output_tokens == 4
+    assert acc.truncated
+    assert acc.error is None
+
+    acc.add(StreamError("GPT", "Error with GPT API: boom"))
+    assert acc.error.message == "Error with GPT API: boom"
+
+
+def test_empty_accumulator():
+    """Test that an empty stream produces empty text."""
+    acc = StreamAccumulator()
+    assert acc.text == ""
+    assert not acc.truncated
+
+
+def test_openai_chunk_events():
+    """Test translation of OpenAI-compatible chunks into events."""
+    events = []
+    for chunk in [
+        _openai_chunk(content="print"),
+        _openai_chunk(content=None),
+        _openai_chunk(content="()", finish_reason="stop"),
+        _openai_chunk(empty=True, usage=SimpleNamespace(prompt_tokens=12, completion_tokens=3)),
+    ]:
+        events.extend(openai_chunk_events(chunk))
+
+    assert events == [
+        TextDelta("print"),
+        TextDelta("()"),
+        FinishReason("stop"),
+        Usage(12, 3),
+    ]
+
+
+def test_normalize_finish_reason():
+    """Test that provider stop reasons map onto a common vocabulary."""
+    assert normalize_finish_reason("end_turn") == "stop"
+    assert normalize_finish_reason("max_tokens") == "length"
+    assert normalize_finish_reason(SimpleNamespace(name="MAX_TOKENS")) == "length"
+    assert normalize_finish_reason("length") == "length"
@@ -0,0 +1,95 @@
+"""Tests for the pooled provider HTTP transport."""
+
+import asyncio
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ai_code_converter.models.transport import HttpTransportPool
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_clients_are_shared_per_host():
+    """Test that SDK clients for the same host get the same pooled client."""
+    transport = HttpTransportPool(http2=False)
+    assert transport.client("https://api.example.com/v1") is transport.client("https://api.example.com/v2")
+    assert transport.client("https://api.example.com/v1") is not transport.client("https://other.example.com")
+    assert transport.async_client("https://api.example.com") is transport.async_client("https://api.example.com/v1")
+
+
+def test_warm_up_opens_reusable_connection():
+    """Test that warm-up leaves a keep-alive connection that later requests reuse."""
+    server, url = _serve()
+    transport = HttpTransportPool(http2=False)
+    try:
+        timings = transport.warm_up([url + "/v1"])
+        assert timings[url] is not None
+
+        client = transport.client(url)
+        for _ in range(3):
+            assert client.get(url + "/v1/models").text == "ok"
+
+        stats = transport.stats()[url]
+        assert stats["requests"] == 4
+        assert stats["connections"] == 1
+        assert stats["idle_connections"] == 1
+        assert stats["http_versions"] == {"HTTP/1.1": 4}
+    finally:
+        transport.close()
+        server.shutdown()
+
+
+def test_warm_up_reports_unreachable_hosts():
+    """Test that warm-up failures are reported instead of raised."""
+    transport = HttpTransportPool(http2=False, connect_timeout=0.5)
+    assert transport.warm_up(["http://127.0.0.1:9"]) == {"http://127.0.0.1:9": None}
+    transport.close()
+
+
+def test_async_warm_up_skips_hosts_with_connections():
+    """Test that async warm-up only connects to hosts without an open connection."""
+    server, url = _serve()
+    transport = HttpTransportPool(http2=False)
+
+    async def run():
+        client = transport.async_client(url)
+        await transport.warm_up_async([url])
+        await transport.warm_up_async([url])
+        stats = transport.stats()[url]
+        await client.aclose()
+        return stats
+
+    try:
+        stats = asyncio.run(run())
+        assert stats["requests"] == 1
+        assert stats["connections"] == 1
+    finally:
+        server.shutdown()